@@ -150,3 +150,230 @@ class MenuConstant:
     LAYOUT = 'Layout'
     PARENT_VIEW = 'ParentView'
     INNER_LINK = 'InnerLink'
+
+
+class LogViewConstant:
+    """
+    文本附件在线查看常量
+
+    TEXT_TYPES: 支持在线查看的附件类型
+    LINE_INDEX_INTERVAL: 行索引每隔多少行记录一次行首偏移
+    MAX_PAGE_LINES: 单次读取的最大行数
+    MAX_LINE_BYTES: 单行返回的最大字节数，超出部分截断
+    MAX_SEARCH_RESULTS: 单次搜索返回的最大匹配行数
+    MAX_CONTEXT_LINES: 搜索结果中匹配行前后的最大上下文行数
+    MAX_PATTERN_LENGTH: 搜索正则表达式的最大长度
+    MAX_SEARCH_BYTES: 单次搜索最多扫描的字节数，超出后返回已找到的匹配行，可从nextLine继续搜索
+    MAX_SEARCH_SECONDS: 单次搜索的最长扫描时间(秒)，超出后同MAX_SEARCH_BYTES
+    READ_SIZE: 读取行时每次读取的字节数
+    SCAN_SIZE: 建立行索引及搜索时每次扫描的字节数
+    """
+
+    TEXT_TYPES = ['.log', '.txt']
+    LINE_INDEX_INTERVAL = 1024
+    MAX_PAGE_LINES = 1000
+    MAX_LINE_BYTES = 16 * 1024
+    MAX_SEARCH_RESULTS = 500
+    MAX_CONTEXT_LINES = 20
+    MAX_PATTERN_LENGTH = 200
+    MAX_SEARCH_BYTES = 256 * 1024 * 1024
+    MAX_SEARCH_SECONDS = 5
+    READ_SIZE = 64 * 1024
+    SCAN_SIZE = 8 * 1024 * 1024
+
+
+class LogEventConstant:
+    """
+    日志附件结构化事件常量
+
+    LOG_TYPES: 提取事件的附件类型
+    PATTERN_VERSION: 日志格式版本，内置格式变化后低版本的事件文件会被重新提取
+    SCAN_SIZE: 提取事件时每次读取的字节数
+    BATCH_EVENTS: 每累积多少个事件批量转换一次时间
+    MAX_RESULTS: 单次查询返回的最大事件数
+    MAX_MESSAGE_BYTES: 返回的单条事件内容的最大字节数，超出部分截断
+    MAX_ERROR_LENGTH: 提取失败原因的最大长度
+    """
+
+    LOG_TYPES = ['.log']
+    PATTERN_VERSION = 1
+    SCAN_SIZE = 8 * 1024 * 1024
+    BATCH_EVENTS = 65536
+    MAX_RESULTS = 1000
+    MAX_MESSAGE_BYTES = 2048
+    MAX_ERROR_LENGTH = 500
+
+
+class ArchiveConstant:
+    """
+    压缩包附件在线浏览常量
+
+    ARCHIVE_TYPES: 支持浏览其中文件的附件类型
+    MAX_LIST_MEMBERS: 列出文件时单次返回的最大文件数
+    DIRECTORY_CACHE_SIZE: 内存中缓存的压缩包目录数
+    CHECKPOINT_INTERVAL: 解压时每隔多少原始字节保存一次解压状态，随机读取时最多需要从上一个保存点解压该大小的数据
+    CHECKPOINT_CACHE_SIZE: 内存中保存解压状态的文件数
+    READ_SIZE: 每次从压缩包读取的字节数
+    BUNDLE_STORED_TYPES: 打包下载时不再压缩的附件类型(本身已压缩)
+    BUNDLE_COMPRESS_LEVEL: 打包下载时其他附件的deflate压缩级别，边压缩边发送，优先保证吞吐(Python 3.13及以上生效)
+    """
+
+    ARCHIVE_TYPES = ['.zip']
+    MAX_LIST_MEMBERS = 10000
+    DIRECTORY_CACHE_SIZE = 32
+    CHECKPOINT_INTERVAL = 8 * 1024 * 1024
+    CHECKPOINT_CACHE_SIZE = 8
+    READ_SIZE = 256 * 1024
+    BUNDLE_STORED_TYPES = [
+        '.zip', '.7z', '.rar', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.cab', '.jpg', '.jpeg', '.png', '.gif', '.mp4'
+    ]
+    BUNDLE_COMPRESS_LEVEL = 1
+
+
+class AttachmentIndexConstant:
+    """
+    附件trigram索引常量
+
+    TEXT_TYPES: 建立索引的文本附件类型
+    ARCHIVE_TYPES: 对其中文本文件建立索引的压缩包类型
+    INDEX_PATH: 索引段文件目录(相对于上传根目录)
+    BATCH_POSTINGS: 累积多少倒排项后写入一个新索引段，限制建立索引时的内存占用
+    MAX_SEGMENTS: 索引段数上限，超过时合并较小的索引段
+    MERGE_MAX_POSTINGS: 单次合并的倒排项总数上限，限制合并时的内存占用
+    MAX_PATTERN_LENGTH: 搜索内容的最大长度
+    MAX_CANDIDATES: 单次搜索最多校验的候选文档数
+    MAX_MATCHES: 单次搜索最多返回的附件数
+    MAX_OFFSETS: 每个附件最多返回的匹配偏移数
+    SCAN_SIZE: 提取trigram及校验匹配时每次读取的字节数
+    """
+
+    TEXT_TYPES = ['.log', '.txt']
+    ARCHIVE_TYPES = ArchiveConstant.ARCHIVE_TYPES
+    INDEX_PATH = 'trigram_index'
+    BATCH_POSTINGS = 20_000_000
+    MAX_SEGMENTS = 16
+    MERGE_MAX_POSTINGS = 50_000_000
+    MAX_PATTERN_LENGTH = 200
+    MAX_CANDIDATES = 1000
+    MAX_MATCHES = 200
+    MAX_OFFSETS = 100
+    SCAN_SIZE = 8 * 1024 * 1024
+
+
+class DumpAnalysisConstant:
+    """
+    dump附件自动分析常量
+
+    DUMP_TYPES: 自动分析的附件类型
+    PARSER_VERSION: 解析器版本，升级后低版本的分析结果会被重新分析
+    WORKERS: 分析进程数
+    BATCH_SIZE: 每分析多少个文件提交一次结果
+    MAX_ERROR_LENGTH: 分析失败原因的最大长度
+    BUCKET_BATCH_SIZE: 每次归入崩溃分组的附件数
+    MAX_BUCKET_ISSUES: 崩溃分组中返回的Issue数上限
+    """
+
+    DUMP_TYPES = ['.dmp']
+    # 2: 增加崩溃签名
+    PARSER_VERSION = 2
+    WORKERS = 2
+    BATCH_SIZE = 50
+    MAX_ERROR_LENGTH = 500
+    BUCKET_BATCH_SIZE = 500
+    MAX_BUCKET_ISSUES = 100
+
+
+class AnalysisJobConstant:
+    """
+    附件分析任务队列常量
+
+    KEY_PREFIX: 队列在redis中的键名前缀
+    JOB_TYPES: 任务类型及对应的附件类型，附件关联到Issue后按已关联的附件类型提交任务
+    PRIORITIES: Issue优先级对应的队列顺序，数值越小越先执行
+    DEFAULT_PRIORITY: 没有优先级的Issue及补偿任务使用的优先级
+    MAX_ATTEMPTS: 任务最多执行次数(含重试)
+    RETRY_DELAY: 首次重试前等待的秒数，之后每次翻倍
+    LEASE_SECONDS: 任务租约秒数，worker超过该时间没有上报进度时任务被放回队列
+    POLL_INTERVAL: 队列为空时worker的轮询间隔秒数
+    JOB_TTL: 已结束任务的保留秒数
+    WORKERS: worker默认进程数
+    MAX_JOB_FILES: 单个任务处理的存储文件数上限
+    MAX_ERROR_LENGTH: 任务失败原因的最大长度
+    """
+
+    KEY_PREFIX = 'analysis_job'
+    JOB_TYPES = {'dump_analysis': DumpAnalysisConstant.DUMP_TYPES, 'log_events': LogEventConstant.LOG_TYPES}
+    PRIORITIES = {'high': 0, 'medium': 1, 'low': 2}
+    DEFAULT_PRIORITY = 'low'
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY = 30
+    LEASE_SECONDS = 600
+    POLL_INTERVAL = 2
+    JOB_TTL = 7 * 24 * 3600
+    WORKERS = 2
+    MAX_JOB_FILES = 1000
+    MAX_ERROR_LENGTH = 500
+
+
+class AttachmentConstant:
+    """
+    Issue附件常量
+
+    ALLOWED_TYPES: 允许上传的附件类型
+    MAX_SIZE: 附件大小上限(字节)
+    STREAM_WRITE_SIZE: 流式上传时累积多少字节后写盘一次
+    CHUNK_SIZE: 分片上传默认分片大小
+    MIN_CHUNK_SIZE: 分片上传最小分片大小
+    MAX_CHUNK_SIZE: 分片上传最大分片大小
+    SESSION_PATH: 分片上传临时文件目录(相对于上传根目录)
+    BLOB_PATH: 按内容寻址的附件存储目录(相对于上传根目录)
+    COMPRESS_TYPES: 上传后在后台压缩存储的附件类型
+    COMPRESS_FRAME_SIZE: 压缩文件每帧的原始数据大小，决定区间读取时需要解压的数据量
+    COMPRESS_LEVEL: zstd压缩级别
+    COMPRESS_MIN_SAVING: 压缩后至少节省的比例，达不到时保留原文件
+    COMPRESS_WORKERS: 后台压缩线程数
+    """
+
+    ALLOWED_TYPES = ['.jpg', '.jpeg', '.png', '.pdf', '.zip', '.dmp', '.txt', '.log']
+    MAX_SIZE = 2 * 1024 * 1024 * 1024
+    STREAM_WRITE_SIZE = 1024 * 1024
+    CHUNK_SIZE = 8 * 1024 * 1024
+    MIN_CHUNK_SIZE = 256 * 1024
+    MAX_CHUNK_SIZE = 64 * 1024 * 1024
+    SESSION_PATH = 'upload_session'
+    BLOB_PATH = 'blob'
+    COMPRESS_TYPES = ['.log', '.txt', '.dmp']
+    COMPRESS_FRAME_SIZE = 1024 * 1024
+    COMPRESS_LEVEL = 9
+    COMPRESS_MIN_SAVING = 0.1
+    COMPRESS_WORKERS = 2
+
+
+class AttachmentGcConstant:
+    """
+    临时附件及孤儿文件清理常量
+
+    BATCH_SIZE: 每批处理的过期临时附件数
+    DELETE_WORKERS: 并发删除文件的线程数
+    ORPHAN_BATCH_SIZE: 孤儿扫描时每批与数据库比对的文件摘要数
+    ORPHAN_GRACE_HOURS: 修改时间在该小时数以内的文件不视为孤儿文件，避免误删正在上传或删除的文件
+    """
+
+    BATCH_SIZE = 500
+    DELETE_WORKERS = 8
+    ORPHAN_BATCH_SIZE = 1000
+    ORPHAN_GRACE_HOURS = 24
+
+
+class ExportConstant:
+    """
+    流式导出常量
+
+    BATCH_SIZE: 使用服务端游标导出时每批从数据库读取的行数
+    CHUNK_SIZE: 累积多少字节后向客户端发送一次
+    MAX_CELL_LENGTH: Excel单元格的最大字符数，超出部分截断
+    """
+
+    BATCH_SIZE = 1000
+    CHUNK_SIZE = 256 * 1024
+    MAX_CELL_LENGTH = 32767
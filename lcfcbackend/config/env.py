@@ -144,7 +144,7 @@ class GetConfig:
         else:
             parser = argparse.ArgumentParser(description="命令行参数")
             parser.add_argument("--env", type=str, default="", help="运行环境")
-            args = parser.parse_args()
+            args, _ = parser.parse_known_args()
             os.environ["APP_ENV"] = args.env if args.env else "dev"
         run_env = os.environ.get("APP_ENV", "")
         env_file = ".env.dev"
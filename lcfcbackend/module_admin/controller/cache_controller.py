@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Request
 from typing import List
 from module_admin.aspect.interface_auth import CheckUserInterfaceAuth
-from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
+from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel, PageCountCacheStatsModel
 from module_admin.service.cache_service import CacheService
 from module_admin.service.login_service import LoginService
 from utils.log_util import logger
@@ -87,3 +87,23 @@ def clear_monitor_cache_all(request: Request):
     logger.info(clear_cache_all_result.message)
 
     return ResponseUtil.success(msg=clear_cache_all_result.message)
+
+
+@cacheController.get(
+    '/pageCount',
+    response_model=PageCountCacheStatsModel,
+    dependencies=[Depends(CheckUserInterfaceAuth('monitor:cache:list'))],
+)
+def get_monitor_page_count_cache(request: Request):
+    page_count_stats_result = CacheService.get_page_count_cache_stats_services()
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=page_count_stats_result)
+
+
+@cacheController.delete('/pageCount', dependencies=[Depends(CheckUserInterfaceAuth('monitor:cache:list'))])
+def clear_monitor_page_count_cache(request: Request):
+    clear_page_count_result = CacheService.clear_page_count_cache_services()
+    logger.info(clear_page_count_result.message)
+
+    return ResponseUtil.success(msg=clear_page_count_result.message)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Query, Request, UploadFile
 from module_admin.service.common_service import CommonService
 from module_admin.service.login_service import LoginService
+from utils.download_util import DownloadUtil
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -28,9 +29,9 @@ def common_download(
     return ResponseUtil.streaming(data=download_result.result)
 
 
-@commonController.get('/download/resource')
+@commonController.api_route('/download/resource', methods=['GET', 'HEAD'])
 def common_download_resource(request: Request, resource: str = Query()):
     download_resource_result = CommonService.download_resource_services(resource)
     logger.info(download_resource_result.message)
 
-    return ResponseUtil.streaming(data=download_resource_result.result)
+    return DownloadUtil.file_response(request, download_resource_result.result)
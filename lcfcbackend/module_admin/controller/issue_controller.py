@@ -1,10 +1,13 @@
 import os
 from datetime import datetime
 from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm.session import Session
 from typing import Literal, Optional, Union, List
+from urllib.parse import quote
 from pydantic_validation_decorator import ValidateFields
 from config.get_db import get_db
+from config.constant import AttachmentConstant, LogViewConstant
 from config.enums import BusinessType
 from config.env import UploadConfig
 from module_admin.annotation.log_annotation import Log
@@ -18,24 +21,46 @@ from module_admin.entity.vo.issue_vo import (
     IssuePageQueryModel,
     IssueStatisticsModel,
     AddDiagnosisLogModel,
+    BatchAddDiagnosisLogModel,
     IssueStatisticsResponseModel,
     IssueListResponseModel,
     IssueDetailResponseModel,
     IssueOptionsResponseModel,
     IssueOptionItemModel,
     UploadAttachmentResponseModel, IssueAttachmentModel,
+    IssueImportResultModel,
+    BatchIssueModel,
+    IssueTagCountModel,
+    CreateUploadSessionModel,
+    UploadSessionModel,
+    UploadByHashModel,
+    UploadByHashResultModel,
+    AttachmentStorageStatisticsModel,
+    AttachmentLinesModel,
+    AttachmentSearchModel,
+    AttachmentSearchResultModel,
+    AttachmentGrepModel,
+    AttachmentGrepResultModel,
+    AttachmentArchiveModel,
+    DumpAnalysisModel,
+    CrashBucketModel,
+    LogEventQueryModel,
+    LogEventResultModel,
+    AnalysisJobModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.entity.vo.common_vo import CrudResponseModel
 from module_admin.service.login_service import LoginService
 from module_admin.service.issue_service import IssueService
 from module_admin.service.common_service import CommonService
-from module_admin.dao.issue_dao import IssueDao
+from module_task.compress_attachments import submit_compress_attachment
+from utils.download_util import DownloadUtil
 from utils.log_util import logger
 from utils.page_util import PageResponseModel
 from utils.response_util import ResponseUtil
+from utils.storage_util import StorageUtil
 from utils.upload_util import UploadUtil
-from utils.common_util import bytes2file_response
+from utils.zip_stream_util import ZipStreamUtil
 
 
 issueController = APIRouter(
@@ -109,17 +134,79 @@ def get_system_issue_list_post(
 def export_system_issue_list(
     request: Request,
     issue_main: IssuePageQueryModel = Depends(IssuePageQueryModel.as_query),
+    file_format: Literal["xlsx", "csv"] = Query(default="xlsx", alias="fileFormat", description="导出格式"),
     query_db: Session = Depends(get_db),
 ):
     """
-    导出Issue列表
+    导出Issue列表，使用服务端游标分批读取并边生成边发送，内存占用与导出的Issue数无关
     """
-    # 获取全量数据 - 直接调用DAO获取数据
-    issue_list_data = IssueDao.get_issue_list(query_db, issue_main, is_page=False)
-    issue_export_result = IssueService.export_issue_list_services(issue_list_data)
+    issue_export_result = IssueService.export_issue_list_services(query_db, issue_main, file_format)
     logger.info("导出成功")
 
-    return ResponseUtil.streaming(data=bytes2file_response(issue_export_result))
+    media_types = {
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "csv": "text/csv; charset=utf-8",
+    }
+    file_name = f"Issue列表_{datetime.now().strftime('%Y%m%d%H%M%S')}.{file_format}"
+    return StreamingResponse(
+        issue_export_result,
+        media_type=media_types[file_format],
+        headers={"content-disposition": f"attachment; filename*=utf-8''{quote(file_name)}"},
+    )
+
+
+@issueController.get(
+    "/tags/top",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:list"))],
+    response_model=List[IssueTagCountModel],
+    name="获取热门标签",
+)
+def get_top_issue_tags(
+    request: Request,
+    limit: int = Query(default=20, ge=1, le=200),
+    query_db: Session = Depends(get_db),
+):
+    """
+    获取使用次数最多的标签(标签云)
+    """
+    top_tags_result = IssueService.get_top_tags_services(query_db, limit)
+    logger.info("获取热门标签成功")
+    return ResponseUtil.success(data=top_tags_result)
+
+
+@issueController.get(
+    "/crash-buckets/top",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:list"))],
+    response_model=List[CrashBucketModel],
+    name="获取热门崩溃分组",
+)
+def get_top_crash_buckets(
+    request: Request,
+    days: int = Query(default=7, ge=1, le=365),
+    limit: int = Query(default=20, ge=1, le=200),
+    query_db: Session = Depends(get_db),
+):
+    """
+    获取最近days天内命中dump附件数最多的崩溃分组
+    """
+    top_buckets_result = IssueService.get_top_crash_buckets_services(query_db, days, limit)
+    logger.info("获取热门崩溃分组成功")
+    return ResponseUtil.success(data=top_buckets_result)
+
+
+@issueController.get(
+    "/analysis-job/{job_id}",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=AnalysisJobModel,
+    name="获取附件分析任务",
+)
+def get_analysis_job(request: Request, job_id: int):
+    """
+    获取附件分析任务的状态及进度
+    """
+    job_result = IssueService.get_analysis_job_services(job_id)
+    logger.info("获取附件分析任务成功")
+    return ResponseUtil.success(data=job_result)
 
 
 @issueController.get(
@@ -166,6 +253,33 @@ def add_system_issue(
         return ResponseUtil.error(msg=add_result.message)
 
 
+@issueController.post(
+    "/import",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:add"))],
+    response_model=IssueImportResultModel,
+    name="批量导入Issue",
+)
+@Log(title="Issue管理", business_type=BusinessType.IMPORT)
+def import_system_issue(
+    request: Request,
+    file: UploadFile = File(...),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    批量导入Issue(支持JSONL、CSV、Excel)
+    """
+    import_result = IssueService.import_issue_services(
+        query_db, file.file, file.filename, current_user
+    )
+    message = (
+        f"导入完成，共{import_result.total_count}行，成功{import_result.success_count}行，"
+        f"失败{import_result.failure_count}行"
+    )
+    logger.info(message)
+    return ResponseUtil.success(data=import_result, msg=message)
+
+
 @issueController.put(
     "",
     dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
@@ -224,6 +338,84 @@ def delete_system_issue(
         return ResponseUtil.error(msg=delete_result.message)
 
 
+@issueController.post(
+    "/batch/delete",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:remove"))],
+    response_model=CrudResponseModel,
+    name="批量删除Issue",
+)
+@Log(title="Issue管理", business_type=BusinessType.DELETE)
+def batch_delete_system_issue(
+    request: Request,
+    batch_issue: BatchIssueModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按ID列表或过滤条件批量删除Issue
+    """
+    batch_issue.update_by = current_user.user.user_name
+    batch_issue.update_time = datetime.now()
+    batch_result = IssueService.batch_delete_issue_services(query_db, batch_issue)
+    logger.info(batch_result.message)
+    if batch_result.is_success:
+        return ResponseUtil.success(data=batch_result, msg=batch_result.message)
+    else:
+        return ResponseUtil.error(msg=batch_result.message)
+
+
+@issueController.post(
+    "/batch/status",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=CrudResponseModel,
+    name="批量变更Issue状态",
+)
+@Log(title="Issue管理", business_type=BusinessType.UPDATE)
+def batch_change_system_issue_status(
+    request: Request,
+    batch_issue: BatchIssueModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按ID列表或过滤条件批量变更Issue状态
+    """
+    batch_issue.update_by = current_user.user.user_name
+    batch_issue.update_time = datetime.now()
+    batch_result = IssueService.batch_change_issue_status_services(query_db, batch_issue)
+    logger.info(batch_result.message)
+    if batch_result.is_success:
+        return ResponseUtil.success(data=batch_result, msg=batch_result.message)
+    else:
+        return ResponseUtil.error(msg=batch_result.message)
+
+
+@issueController.post(
+    "/batch/priority",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=CrudResponseModel,
+    name="批量变更Issue优先级",
+)
+@Log(title="Issue管理", business_type=BusinessType.UPDATE)
+def batch_change_system_issue_priority(
+    request: Request,
+    batch_issue: BatchIssueModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按ID列表或过滤条件批量变更Issue优先级
+    """
+    batch_issue.update_by = current_user.user.user_name
+    batch_issue.update_time = datetime.now()
+    batch_result = IssueService.batch_change_issue_priority_services(query_db, batch_issue)
+    logger.info(batch_result.message)
+    if batch_result.is_success:
+        return ResponseUtil.success(data=batch_result, msg=batch_result.message)
+    else:
+        return ResponseUtil.error(msg=batch_result.message)
+
+
 @issueController.post(
     "/diagnosis/log",
     dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
@@ -252,6 +444,36 @@ def add_issue_diagnosis_log(
         return ResponseUtil.error(msg=add_result.message)
 
 
+@issueController.post(
+    "/diagnosis/log/batch",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=CrudResponseModel,
+    name="批量新增Issue诊断记录",
+)
+@Log(title="Issue诊断", business_type=BusinessType.INSERT)
+def batch_add_issue_diagnosis_log(
+    request: Request,
+    batch_diagnosis_log: BatchAddDiagnosisLogModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    批量新增Issue诊断记录，供自动化诊断工具一次提交多个Issue的多个诊断步骤
+    """
+    # 设置操作信息
+    operate_time = datetime.now()
+    for diagnosis_log in batch_diagnosis_log.logs:
+        diagnosis_log.operator = current_user.user.user_name
+        diagnosis_log.operate_time = operate_time
+
+    add_result = IssueService.batch_add_diagnosis_log_services(query_db, batch_diagnosis_log)
+    logger.info(add_result.message)
+    if add_result.is_success:
+        return ResponseUtil.success(data=add_result, msg=add_result.message)
+    else:
+        return ResponseUtil.error(msg=add_result.message)
+
+
 @issueController.post(
     "/attachment/upload",
     dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
@@ -270,28 +492,16 @@ def upload_issue_attachment(
     """
     try:
         # 检查文件类型和大小
-        allowed_types = [
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".pdf",
-            ".zip",
-            ".dmp",
-            ".txt",
-            ".log",
-        ]
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        if file_ext not in allowed_types:
+        if file_ext not in AttachmentConstant.ALLOWED_TYPES:
             return ResponseUtil.error(msg=f"不支持的文件类型: {file_ext}")
 
-        # 限制文件大小为100MB
-        max_size = 1024 * 1024 * 1024 * 2  # 2G
         file.file.seek(0, 2)  # 移动到文件末尾
         file_size = file.file.tell()
         file.file.seek(0)  # 重置到开始位置
 
-        if file_size > max_size:
+        if file_size > AttachmentConstant.MAX_SIZE:
             return ResponseUtil.error(msg="文件大小不能超过2G")
 
         # 使用通用上传服务上传文件
@@ -319,6 +529,7 @@ def upload_issue_attachment(
 
             logger.info(add_result.message)
             if add_result.is_success:
+                submit_compress_attachment(add_result.result)
                 # 返回附件ID和相关信息
                 return ResponseUtil.success(data=add_result.result, msg=add_result.message)
             else:
@@ -331,6 +542,417 @@ def upload_issue_attachment(
         return ResponseUtil.error(msg=f"上传失败: {str(e)}")
 
 
+@issueController.post(
+    "/attachment/upload/stream",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=IssueAttachmentModel,
+    name="流式上传Issue附件（临时）",
+)
+async def upload_issue_attachment_stream(
+    request: Request,
+    file_name: str = Query(alias="fileName", description="原始文件名"),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    流式上传Issue附件（临时附件，不需要issue_id）
+    请求体为文件原始内容(application/octet-stream)，边接收边写入最终位置，返回attachment_id和文件SHA-256
+    """
+    content_length = request.headers.get("content-length")
+    add_result = await IssueService.upload_attachment_stream_services(
+        query_db,
+        request.stream(),
+        file_name,
+        int(content_length) if content_length and content_length.isdigit() else None,
+        current_user.user.user_name,
+    )
+    logger.info(add_result.message)
+    if add_result.is_success:
+        submit_compress_attachment(add_result.result)
+        return ResponseUtil.success(data=add_result.result, msg=add_result.message)
+    else:
+        return ResponseUtil.error(msg=add_result.message)
+
+
+@issueController.post(
+    "/attachment/upload/hash",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=UploadByHashResultModel,
+    name="秒传Issue附件（临时）",
+)
+def upload_issue_attachment_by_hash(
+    request: Request,
+    upload_by_hash: UploadByHashModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按文件SHA-256摘要秒传附件，服务器已有相同内容时直接返回attachment_id，否则客户端再上传文件内容
+    """
+    upload_result = IssueService.upload_attachment_by_hash_services(
+        query_db, upload_by_hash, current_user.user.user_name
+    )
+    logger.info(upload_result.message)
+    if upload_result.is_success:
+        return ResponseUtil.success(data=upload_result.result, msg=upload_result.message)
+    else:
+        return ResponseUtil.error(msg=upload_result.message)
+
+
+@issueController.post(
+    "/attachment/upload/session",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=UploadSessionModel,
+    name="创建Issue附件分片上传会话",
+)
+def create_issue_attachment_upload_session(
+    request: Request,
+    create_session: CreateUploadSessionModel,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    创建分片上传会话，返回uploadId和分片大小；客户端随后按 offset = 分片序号 * chunkSize 上传各分片
+    """
+    create_result = IssueService.create_upload_session_services(
+        query_db, create_session, current_user.user.user_name
+    )
+    logger.info(create_result.message)
+    if create_result.is_success:
+        return ResponseUtil.success(data=create_result.result, msg=create_result.message)
+    else:
+        return ResponseUtil.error(msg=create_result.message)
+
+
+@issueController.get(
+    "/attachment/upload/session/{upload_id}",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=UploadSessionModel,
+    name="查询Issue附件分片上传进度",
+)
+def get_issue_attachment_upload_session(
+    request: Request,
+    upload_id: str,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    查询分片上传进度，断线重连后据此只补传缺失的分片
+    """
+    upload_session = IssueService.get_upload_session_services(
+        query_db, upload_id, current_user.user.user_name
+    )
+    return ResponseUtil.success(data=upload_session)
+
+
+@issueController.put(
+    "/attachment/upload/session/{upload_id}",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=CrudResponseModel,
+    name="上传Issue附件分片",
+)
+async def upload_issue_attachment_chunk(
+    request: Request,
+    upload_id: str,
+    offset: int = Query(description="分片在文件中的起始偏移"),
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    上传分片，请求体为分片原始内容(application/octet-stream)，支持并发及乱序上传
+    """
+    upload_result = await IssueService.upload_chunk_services(
+        query_db, upload_id, offset, request.stream(), current_user.user.user_name
+    )
+    if upload_result.is_success:
+        return ResponseUtil.success(data=upload_result, msg=upload_result.message)
+    else:
+        return ResponseUtil.error(msg=upload_result.message)
+
+
+@issueController.post(
+    "/attachment/upload/session/{upload_id}/complete",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=IssueAttachmentModel,
+    name="完成Issue附件分片上传",
+)
+def complete_issue_attachment_upload_session(
+    request: Request,
+    upload_id: str,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    完成分片上传，生成临时附件并返回attachment_id，在创建Issue时关联
+    """
+    complete_result = IssueService.complete_upload_session_services(
+        query_db, upload_id, current_user.user.user_name
+    )
+    logger.info(complete_result.message)
+    if complete_result.is_success:
+        submit_compress_attachment(complete_result.result)
+        return ResponseUtil.success(data=complete_result.result, msg=complete_result.message)
+    else:
+        return ResponseUtil.error(msg=complete_result.message)
+
+
+@issueController.delete(
+    "/attachment/upload/session/{upload_id}",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:edit"))],
+    response_model=CrudResponseModel,
+    name="取消Issue附件分片上传",
+)
+def delete_issue_attachment_upload_session(
+    request: Request,
+    upload_id: str,
+    current_user: CurrentUserModel = Depends(LoginService.get_current_user),
+    query_db: Session = Depends(get_db),
+):
+    """
+    取消分片上传，删除上传会话及已上传的分片
+    """
+    delete_result = IssueService.delete_upload_session_services(
+        query_db, upload_id, current_user.user.user_name
+    )
+    logger.info(delete_result.message)
+    if delete_result.is_success:
+        return ResponseUtil.success(data=delete_result, msg=delete_result.message)
+    else:
+        return ResponseUtil.error(msg=delete_result.message)
+
+
+@issueController.get(
+    "/attachment/storage/statistics",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:list"))],
+    response_model=AttachmentStorageStatisticsModel,
+    name="获取附件存储空间统计",
+)
+def get_issue_attachment_storage_statistics(request: Request, query_db: Session = Depends(get_db)):
+    """
+    获取附件存储空间统计(原始大小、压缩后实际占用及节省的磁盘空间)
+    """
+    statistics_result = IssueService.get_attachment_storage_statistics_services(query_db)
+    logger.info("获取附件存储空间统计成功")
+    return ResponseUtil.success(data=statistics_result)
+
+
+@issueController.api_route(
+    "/attachment/{attachment_id}/download",
+    methods=["GET", "HEAD"],
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    name="下载Issue附件",
+)
+def download_issue_attachment(
+    request: Request, attachment_id: int, query_db: Session = Depends(get_db)
+):
+    """
+    下载Issue附件，支持Range断点续传及ETag/Last-Modified条件请求，HEAD请求只返回响应头；
+    已压缩存储的附件在客户端支持zstd时直接发送压缩数据，否则按需解压
+    """
+    attachment = IssueService.get_attachment_file_services(query_db, attachment_id)
+    file_path = StorageUtil.resolve_path(attachment.file_path)
+    logger.info("获取附件成功")
+
+    return DownloadUtil.file_response(
+        request,
+        file_path,
+        attachment.file_name,
+        etag=attachment.file_hash,
+        compressed=StorageUtil.is_compressed(file_path),
+    )
+
+
+@issueController.get(
+    "/{issue_id}/attachments.zip",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    name="打包下载Issue全部附件",
+)
+def download_issue_attachment_bundle(request: Request, issue_id: int, query_db: Session = Depends(get_db)):
+    """
+    将Issue的全部附件边读取边打包为zip(超过4GB时为ZIP64)流式下载，不生成临时文件；
+    本身已压缩的附件直接存储，其他附件以deflate压缩
+    """
+    file_name, entries = IssueService.get_attachment_bundle_services(query_db, issue_id)
+    logger.info(f"打包下载issue_id为{issue_id}的Issue附件")
+
+    return StreamingResponse(
+        ZipStreamUtil.iter_zip(entries),
+        media_type="application/zip",
+        headers={"content-disposition": f"attachment; filename*=utf-8''{quote(file_name)}"},
+    )
+
+
+@issueController.get(
+    "/{issue_id}/dump-analysis",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=List[DumpAnalysisModel],
+    name="获取Issue的dump附件分析结果",
+)
+def get_issue_dump_analysis(request: Request, issue_id: int, query_db: Session = Depends(get_db)):
+    """
+    获取Issue的.dmp附件的分析结果(异常代码、异常所在模块及偏移、模块列表、线程数、系统版本号等)，
+    附件关联到Issue后在后台分析，尚未分析完成的附件状态为pending
+    """
+    analysis_result = IssueService.get_issue_dump_analyses_services(query_db, issue_id)
+    logger.info("获取dump分析结果成功")
+    return ResponseUtil.success(data=analysis_result)
+
+
+@issueController.get(
+    "/{issue_id}/crash-buckets",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=List[CrashBucketModel],
+    name="获取Issue的崩溃分组",
+)
+def get_issue_crash_buckets(request: Request, issue_id: int, query_db: Session = Depends(get_db)):
+    """
+    获取Issue的dump附件所属的崩溃分组，以及同一分组中的其他Issue
+    """
+    buckets_result = IssueService.get_issue_crash_buckets_services(query_db, issue_id)
+    logger.info("获取崩溃分组成功")
+    return ResponseUtil.success(data=buckets_result)
+
+
+@issueController.get(
+    "/{issue_id}/log-events",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=LogEventResultModel,
+    name="查询Issue日志事件",
+)
+def get_issue_log_events(
+    request: Request,
+    issue_id: int,
+    event_query: LogEventQueryModel = Depends(LogEventQueryModel.as_query),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按时间范围、最低级别、组件及错误代码查询Issue全部.log附件中提取的结构化事件，按时间排序；
+    附件关联到Issue后在后台提取事件，尚未提取完成的附件数见pendingCount
+    """
+    events_result = IssueService.get_issue_log_events_services(query_db, issue_id, event_query)
+    logger.info("查询日志事件成功")
+    return ResponseUtil.success(data=events_result)
+
+
+@issueController.get(
+    "/{issue_id}/analysis-jobs",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=List[AnalysisJobModel],
+    name="获取Issue的附件分析任务",
+)
+def get_issue_analysis_jobs(request: Request, issue_id: int, query_db: Session = Depends(get_db)):
+    """
+    获取附件关联到Issue后提交的dump分析、日志事件提取等任务的状态及进度，已结束的任务保留7天
+    """
+    jobs_result = IssueService.get_issue_analysis_jobs_services(query_db, issue_id)
+    logger.info("获取附件分析任务成功")
+    return ResponseUtil.success(data=jobs_result)
+
+
+@issueController.get(
+    "/attachment/{attachment_id}/members",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=AttachmentArchiveModel,
+    name="获取压缩包附件目录",
+)
+def get_issue_attachment_members(request: Request, attachment_id: int, query_db: Session = Depends(get_db)):
+    """
+    获取.zip附件内的文件列表，只读取压缩包的中央目录，首次读取后缓存
+    """
+    archive_result = IssueService.get_archive_members_services(query_db, attachment_id)
+    logger.info("获取压缩包目录成功")
+    return ResponseUtil.success(data=archive_result)
+
+
+@issueController.api_route(
+    "/attachment/{attachment_id}/members/download",
+    methods=["GET", "HEAD"],
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    name="下载压缩包附件内的文件",
+)
+def download_issue_attachment_member(
+    request: Request,
+    attachment_id: int,
+    member_name: str = Query(alias="memberName", description="压缩包内的文件名"),
+    query_db: Session = Depends(get_db),
+):
+    """
+    下载.zip附件内的单个文件，不解压整个压缩包，支持Range断点续传及ETag条件请求；
+    未压缩的文件直接发送压缩包的对应区间，deflate压缩的文件从最近的解压保存点开始解压
+    """
+    attachment, file_path, member = IssueService.get_archive_member_services(query_db, attachment_id, member_name)
+    logger.info("获取压缩包内文件成功")
+
+    return DownloadUtil.member_response(request, file_path, member, etag=attachment.file_hash)
+
+
+@issueController.get(
+    "/attachment/grep",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=AttachmentGrepResultModel,
+    name="跨附件搜索",
+)
+def grep_issue_attachments(
+    request: Request,
+    grep_query: AttachmentGrepModel = Depends(AttachmentGrepModel.as_query),
+    query_db: Session = Depends(get_db),
+):
+    """
+    在全部已关联Issue的.log/.txt附件及.zip内的文本文件中搜索字符串或正则表达式，返回匹配的Issue、附件及字节偏移
+    """
+    grep_result = IssueService.grep_attachments_services(query_db, grep_query)
+    logger.info("跨附件搜索成功")
+    return ResponseUtil.success(data=grep_result)
+
+
+@issueController.get(
+    "/attachment/{attachment_id}/lines",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=AttachmentLinesModel,
+    name="分页读取文本附件",
+)
+def get_issue_attachment_lines(
+    request: Request,
+    attachment_id: int,
+    start_line: int = Query(default=1, alias="startLine", ge=1, description="起始行号(从1开始)"),
+    line_count: int = Query(
+        default=200, alias="lineCount", ge=1, le=LogViewConstant.MAX_PAGE_LINES, description="读取行数"
+    ),
+    member_name: Optional[str] = Query(
+        default=None, alias="memberName", description="压缩包内的文件名，读取.zip附件内的文本文件时指定"
+    ),
+    query_db: Session = Depends(get_db),
+):
+    """
+    分页读取.log/.txt附件(或.zip附件内的.log/.txt文件)的指定行，首次访问时建立行索引，之后每页的读取代价与文件大小无关
+    """
+    lines_result = IssueService.get_attachment_lines_services(
+        query_db, attachment_id, start_line, line_count, member_name
+    )
+    logger.info("读取附件成功")
+    return ResponseUtil.success(data=lines_result)
+
+
+@issueController.get(
+    "/attachment/{attachment_id}/search",
+    dependencies=[Depends(CheckUserInterfaceAuth("system:issue:query"))],
+    response_model=AttachmentSearchResultModel,
+    name="搜索文本附件",
+)
+def search_issue_attachment(
+    request: Request,
+    attachment_id: int,
+    search_query: AttachmentSearchModel = Depends(AttachmentSearchModel.as_query),
+    query_db: Session = Depends(get_db),
+):
+    """
+    按正则表达式搜索.log/.txt附件，返回匹配行及上下文，达到返回数量或扫描上限(truncated)时可从nextLine继续搜索
+    """
+    search_result = IssueService.search_attachment_services(query_db, attachment_id, search_query)
+    logger.info("搜索附件成功")
+    return ResponseUtil.success(data=search_result)
+
+
 @issueController.delete(
     "/attachment/{attachment_id}",
     dependencies=[Depends(CheckUserInterfaceAuth("system:issue:remove"))],
@@ -1,23 +1,46 @@
-from datetime import datetime, time
-from typing import List
-from sqlalchemy import and_, delete, desc, func, or_, select, update
+import json
+import re
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import partial
+from typing import List, Optional
+from sqlalchemy import Select, String, and_, bindparam, case, cast, delete, desc, exists, func, insert, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert, match as mysql_match
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.orm.session import Session
+from exceptions.exception import ServiceException
 from module_admin.entity.do.issue_do import (
     IssueMain,
     IssueSystemEnv,
     IssueDiagnosisLog,
     IssueAttachment,
+    IssueAttachmentBlob,
+    IssueAttachmentIndexDoc,
+    IssueDumpAnalysis,
+    IssueCrashBucket,
+    IssueCrashBucketHit,
+    IssueLogEventFile,
     IssueTag,
+    IssueTagDict,
+    IssueSearchDoc,
+    IssueStatCounter,
+    IssueNumberSequence,
+    IssueUploadSession,
+    IssueUploadChunk,
 )
 from module_admin.entity.vo.issue_vo import (
     IssueMainModel,
     IssuePageQueryModel,
+    IssueBatchFilterModel,
     IssueSystemEnvModel,
     IssueDiagnosisLogModel,
     IssueAttachmentModel,
-    IssueTagModel,
 )
 from utils.page_util import PageUtil
+from utils.search_util import NgramTokenizer, SearchIndexUtil
+from utils.transaction_util import TransactionUtil
 
 
 class IssueDao:
@@ -25,6 +48,32 @@ class IssueDao:
     Issue管理模块数据库操作层
     """
 
+    # 兜底倒排索引检索时返回的最大结果数
+    SEARCH_MAX_RESULTS = 5000
+    # 批量按ID查询时IN列表的分片大小
+    ID_CHUNK_SIZE = 500
+    # 统计计数表中的常规计数项，本月新增数按月份单独计数
+    STAT_KEYS = (
+        "total_count",
+        "pending_count",
+        "diagnosis_count",
+        "high_priority_count",
+        "completed_count",
+    )
+    MONTHLY_STAT_KEY_PREFIX = "monthly_new_count:"
+
+    @classmethod
+    def _detail_options(cls):
+        """
+        Issue详情关联数据加载策略：系统环境随主表JOIN加载，集合类关联按IN批量加载
+        """
+        return (
+            joinedload(IssueMain.system_env),
+            selectinload(IssueMain.diagnosis_logs),
+            selectinload(IssueMain.attachments),
+            selectinload(IssueMain.tags),
+        )
+
     @classmethod
     def get_issue_by_id(cls, db: Session, issue_id: int):
         """
@@ -34,68 +83,131 @@ class IssueDao:
         :param issue_id: Issue ID
         :return: Issue详细信息
         """
-        # 获取Issue基本信息
         issue_info = (
             db.execute(
                 select(IssueMain)
+                .options(*cls._detail_options())
                 .where(IssueMain.del_flag == "0", IssueMain.issue_id == issue_id)
-                .distinct()
             )
             .scalars()
             .first()
         )
 
-        # 获取系统环境信息
-        system_env = (
-            db.execute(
-                select(IssueSystemEnv)
-                .where(IssueSystemEnv.issue_id == issue_id)
-                .distinct()
-            )
-            .scalars()
-            .first()
+        results = dict(
+            issue_info=issue_info,
+            system_env=issue_info.system_env if issue_info else None,
+            diagnosis_logs=issue_info.diagnosis_logs if issue_info else [],
+            attachments=issue_info.attachments if issue_info else [],
+            tags=issue_info.tags if issue_info else [],
         )
 
-        # 获取诊断记录
-        diagnosis_logs = (
+        return results
+
+    @classmethod
+    def check_issue_exists(cls, db: Session, issue_id: int) -> bool:
+        """
+        校验Issue是否存在(未删除)
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: 是否存在
+        """
+        return (
             db.execute(
-                select(IssueDiagnosisLog)
-                .where(IssueDiagnosisLog.issue_id == issue_id)
-                .order_by(desc(IssueDiagnosisLog.operate_time))
-                .distinct()
-            )
-            .scalars()
-            .all()
+                select(IssueMain.issue_id)
+                .where(IssueMain.del_flag == "0", IssueMain.issue_id == issue_id)
+                .limit(1)
+            ).scalar()
+            is not None
         )
 
-        # 获取附件信息
-        attachments = (
-            db.execute(
-                select(IssueAttachment)
-                .where(IssueAttachment.issue_id == issue_id)
-                .order_by(desc(IssueAttachment.upload_time))
-                .distinct()
+    @classmethod
+    def lock_issue(cls, db: Session, issue_id: int):
+        """
+        对Issue主记录加行锁(SELECT ... FOR UPDATE)，供写操作在同一事务内读取当前状态
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: Issue当前状态行(issue_id, status, priority, create_time)，不存在时返回None
+        """
+        return db.execute(
+            select(
+                IssueMain.issue_id,
+                IssueMain.status,
+                IssueMain.priority,
+                IssueMain.create_time,
             )
-            .scalars()
-            .all()
-        )
+            .where(IssueMain.del_flag == "0", IssueMain.issue_id == issue_id)
+            .with_for_update()
+        ).first()
 
-        # 获取标签信息
-        tags = (
-            db.execute(select(IssueTag).where(IssueTag.issue_id == issue_id).distinct())
-            .scalars()
-            .all()
-        )
+    @classmethod
+    def lock_issues(cls, db: Session, issue_ids: List[int]):
+        """
+        按ID列表批量对Issue主记录加行锁(分片SELECT ... FOR UPDATE)
 
-        results = dict(
-            issue_info=issue_info,
-            system_env=system_env,
-            diagnosis_logs=diagnosis_logs,
-            attachments=attachments,
-            tags=tags,
-        )
+        :param db: orm对象
+        :param issue_ids: Issue ID列表
+        :return: 存在(未删除)的Issue当前状态行(issue_id, status, priority, create_time)列表
+        """
+        unique_ids = list(dict.fromkeys(issue_ids))
+        rows = []
+        for offset in range(0, len(unique_ids), cls.ID_CHUNK_SIZE):
+            rows.extend(
+                db.execute(
+                    select(
+                        IssueMain.issue_id,
+                        IssueMain.status,
+                        IssueMain.priority,
+                        IssueMain.create_time,
+                    )
+                    .where(
+                        IssueMain.del_flag == "0",
+                        IssueMain.issue_id.in_(unique_ids[offset : offset + cls.ID_CHUNK_SIZE]),
+                    )
+                    .order_by(IssueMain.issue_id)
+                    .with_for_update()
+                ).all()
+            )
 
-        return results
+        return rows
+
+    @classmethod
+    def get_issues_by_ids(cls, db: Session, issue_ids: List[int], with_detail: bool = False):
+        """
+        根据issue_id列表批量获取Issue信息
+
+        :param db: orm对象
+        :param issue_ids: Issue ID列表
+        :param with_detail: 是否同时加载系统环境、诊断记录、附件、标签
+        :return: Issue信息列表，顺序与issue_ids一致，不存在或已删除的ID会被忽略
+        """
+        unique_ids = list(dict.fromkeys(issue_ids))
+        issue_map = {}
+        for offset in range(0, len(unique_ids), cls.ID_CHUNK_SIZE):
+            query = select(IssueMain).where(
+                IssueMain.del_flag == "0",
+                IssueMain.issue_id.in_(unique_ids[offset : offset + cls.ID_CHUNK_SIZE]),
+            )
+            if with_detail:
+                query = query.options(*cls._detail_options())
+            for issue in db.execute(query).unique().scalars():
+                issue_map[issue.issue_id] = issue
+
+        return [issue_map[issue_id] for issue_id in unique_ids if issue_id in issue_map]
+
+    @classmethod
+    def get_system_env_id(cls, db: Session, issue_id: int):
+        """
+        获取Issue对应的系统环境ID
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: 系统环境ID，不存在时返回None
+        """
+        return db.execute(
+            select(IssueSystemEnv.env_id).where(IssueSystemEnv.issue_id == issue_id).limit(1)
+        ).scalar()
 
     @classmethod
     def get_issue_by_number(cls, db: Session, issue_number: str):
@@ -120,6 +232,80 @@ class IssueDao:
 
         return issue_info
 
+    @classmethod
+    def _build_issue_conditions(cls, query_object: IssuePageQueryModel):
+        """
+        根据查询参数构建Issue结构化过滤条件
+
+        :param query_object: 查询参数对象
+        :return: 过滤条件列表
+        """
+        return [
+            IssueMain.del_flag == "0",
+            IssueMain.issue_id == query_object.issue_id
+            if query_object.issue_id is not None
+            else True,
+            IssueMain.issue_number.like(f"%{query_object.issue_number}%")
+            if query_object.issue_number
+            else True,
+            IssueMain.title.like(f"%{query_object.title}%")
+            if query_object.title
+            else True,
+            IssueMain.priority == query_object.priority
+            if query_object.priority
+            else True,
+            IssueMain.status == query_object.status
+            if query_object.status
+            else True,
+            IssueMain.issue_type == query_object.issue_type
+            if query_object.issue_type
+            else True,
+            IssueMain.issue_source.like(f"%{query_object.issue_source}%")
+            if query_object.issue_source
+            else True,
+            IssueMain.create_by.like(f"%{query_object.create_by}%")
+            if query_object.create_by
+            else True,
+            IssueMain.create_time.between(
+                datetime.combine(
+                    datetime.strptime(query_object.begin_time, "%Y-%m-%d"),
+                    time(00, 00, 00),
+                ),
+                datetime.combine(
+                    datetime.strptime(query_object.end_time, "%Y-%m-%d"),
+                    time(23, 59, 59),
+                ),
+            )
+            if query_object.begin_time and query_object.end_time
+            else True,
+            cls._build_tag_condition(query_object.tag_names)
+            if query_object.tag_names
+            else True,
+        ]
+
+    @classmethod
+    def _build_tag_condition(cls, tag_names: str):
+        """
+        构建标签过滤条件，多个标签以逗号分隔时需同时包含全部标签
+
+        :param tag_names: 标签名称
+        :return: 过滤条件
+        """
+        names = list(
+            {
+                cls._tag_key(name): name.strip() for name in re.split(r"[,，]", tag_names) if name.strip()
+            }.values()
+        )
+        if not names:
+            return True
+        return IssueMain.issue_id.in_(
+            select(IssueTag.issue_id)
+            .join(IssueTagDict, IssueTagDict.tag_id == IssueTag.tag_id)
+            .where(IssueTagDict.tag_name.in_(names))
+            .group_by(IssueTag.issue_id)
+            .having(func.count() == len(names))
+        )
+
     @classmethod
     def get_issue_list(
         cls, db: Session, query_object: IssuePageQueryModel, is_page: bool = False
@@ -132,50 +318,18 @@ class IssueDao:
         :param is_page: 是否开启分页
         :return: Issue列表信息对象
         """
-        query = (
-            select(IssueMain)
-            .where(
-                IssueMain.del_flag == "0",
-                IssueMain.issue_id == query_object.issue_id
-                if query_object.issue_id is not None
-                else True,
-                IssueMain.issue_number.like(f"%{query_object.issue_number}%")
-                if query_object.issue_number
-                else True,
-                IssueMain.title.like(f"%{query_object.title}%")
-                if query_object.title
-                else True,
-                IssueMain.priority == query_object.priority
-                if query_object.priority
-                else True,
-                IssueMain.status == query_object.status
-                if query_object.status
-                else True,
-                IssueMain.issue_type == query_object.issue_type
-                if query_object.issue_type
-                else True,
-                IssueMain.issue_source.like(f"%{query_object.issue_source}%")
-                if query_object.issue_source
-                else True,
-                IssueMain.create_by.like(f"%{query_object.create_by}%")
-                if query_object.create_by
-                else True,
-                IssueMain.create_time.between(
-                    datetime.combine(
-                        datetime.strptime(query_object.begin_time, "%Y-%m-%d"),
-                        time(00, 00, 00),
-                    ),
-                    datetime.combine(
-                        datetime.strptime(query_object.end_time, "%Y-%m-%d"),
-                        time(23, 59, 59),
-                    ),
-                )
-                if query_object.begin_time and query_object.end_time
-                else True,
+        query = cls._build_issue_list_query(db, query_object, IssueMain)
+
+        if is_page and query_object.page_mode == "cursor":
+            # 游标分页按(create_time, issue_id)定位，检索关键字仅作为过滤条件
+            return PageUtil.cursor_paginate(
+                db,
+                query,
+                [(IssueMain.create_time, True), (IssueMain.issue_id, True)],
+                query_object.cursor,
+                query_object.page_size,
+                with_total=bool(query_object.with_total),
             )
-            .order_by(desc(IssueMain.create_time))
-            .distinct()
-        )
 
         issue_list = PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
@@ -183,6 +337,201 @@ class IssueDao:
 
         return issue_list
 
+    @classmethod
+    def get_issue_export_rows(cls, db: Session, query_object: IssuePageQueryModel, columns: List, batch_size: int):
+        """
+        根据查询参数使用服务端游标逐行读取导出的Issue数据，每次从数据库读取batch_size行
+
+        查询在调用时即执行，查询失败直接抛出异常；返回的迭代器读取完毕或被关闭时释放游标
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param columns: 导出的列
+        :param batch_size: 每批读取的行数
+        :return: 按列表排序逐行返回的迭代器
+        """
+        result = db.execute(
+            cls._build_issue_list_query(db, query_object, *columns),
+            execution_options={"yield_per": batch_size},
+        )
+        return cls._iter_result_rows(result)
+
+    @staticmethod
+    def _iter_result_rows(result):
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    @classmethod
+    def _build_issue_list_query(cls, db: Session, query_object: IssuePageQueryModel, *entities):
+        """
+        构建Issue列表查询语句，有检索关键字时按相关度排序，否则按创建时间倒序
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param entities: 查询的实体或列
+        :return: 查询语句
+        """
+        query = select(*entities).where(*cls._build_issue_conditions(query_object))
+
+        if query_object.keyword and query_object.keyword.strip():
+            return cls._apply_keyword_search(db, query, query_object.keyword.strip())
+        return query.order_by(desc(IssueMain.create_time), desc(IssueMain.issue_id))
+
+    @classmethod
+    def _apply_keyword_search(cls, db: Session, query: Select, keyword: str):
+        """
+        为Issue列表查询附加全文检索条件，并按相关度排序
+
+        MySQL使用issue_search_doc上的ngram FULLTEXT索引，其他数据库使用进程内倒排索引；
+        短于ngram长度的检索词无法走索引，两种数据库下均作为检索文本的模糊匹配条件同时生效
+
+        :param db: orm对象
+        :param query: Issue列表查询语句
+        :param keyword: 检索关键字
+        :return: 附加检索条件后的查询语句
+        """
+        terms = [term.replace('"', "") for term in keyword.split()]
+        long_terms = [term for term in terms if len(term) >= NgramTokenizer.TOKEN_SIZE]
+        short_terms = [term for term in terms if term and len(term) < NgramTokenizer.TOKEN_SIZE]
+        if short_terms:
+            query = query.join(IssueSearchDoc, IssueSearchDoc.issue_id == IssueMain.issue_id).where(
+                *[IssueSearchDoc.content.contains(term, autoescape=True) for term in short_terms]
+            )
+        if not long_terms:
+            if not short_terms:
+                return query.where(False)
+            return query.order_by(desc(IssueMain.create_time), desc(IssueMain.issue_id))
+
+        if db.get_bind().dialect.name == "mysql":
+            if not short_terms:
+                query = query.join(
+                    IssueSearchDoc, IssueSearchDoc.issue_id == IssueMain.issue_id
+                )
+            relevance = mysql_match(IssueSearchDoc.content, against=" ".join(long_terms))
+            return query.where(
+                mysql_match(
+                    IssueSearchDoc.content,
+                    against=" ".join(f'+"{term}"' for term in long_terms),
+                ).in_boolean_mode()
+            ).order_by(desc(relevance), desc(IssueMain.create_time))
+
+        search_index = cls._get_fallback_search_index(db)
+        ranked_ids = [
+            issue_id
+            for issue_id, _ in search_index.search(
+                " ".join(long_terms), limit=cls.SEARCH_MAX_RESULTS
+            )
+        ]
+        if not ranked_ids:
+            return query.where(False)
+        if db.get_bind().dialect.name == "sqlite":
+            # 通过json_each将排序后的ID列表展开为带序号的临时表，按序号排序
+            ranked = func.json_each(json.dumps(ranked_ids)).table_valued(
+                "key", "value"
+            )
+            return query.join(ranked, ranked.c.value == IssueMain.issue_id).order_by(
+                ranked.c.key
+            )
+        ranked_ids_str = "," + ",".join(str(issue_id) for issue_id in ranked_ids) + ","
+        return query.where(IssueMain.issue_id.in_(ranked_ids)).order_by(
+            func.strpos(ranked_ids_str, "," + cast(IssueMain.issue_id, String) + ",")
+        )
+
+    @classmethod
+    def _get_fallback_search_index(cls, db: Session):
+        """
+        获取当前数据库对应的进程内倒排索引，首次使用时从issue_search_doc加载
+
+        :param db: orm对象
+        :return: 倒排索引对象
+        """
+        search_index = SearchIndexUtil.get_index(db.get_bind().engine)
+        if not search_index.loaded:
+            for issue_id, content in db.execute(
+                select(IssueSearchDoc.issue_id, IssueSearchDoc.content)
+            ):
+                search_index.add_document(issue_id, content)
+            search_index.loaded = True
+        return search_index
+
+    @classmethod
+    def refresh_search_doc(cls, db: Session, issue_ids: List[int]):
+        """
+        重建Issue的全文检索文档(标题、问题描述、解决方案、诊断步骤和标签)
+
+        :param db: orm对象
+        :param issue_ids: Issue ID列表
+        :return:
+        """
+        issue_ids = list(set(issue_ids))
+        if not issue_ids:
+            return
+        db.flush()
+        parts = defaultdict(list)
+        for issue_id, title, description, solution in db.execute(
+            select(
+                IssueMain.issue_id,
+                IssueMain.title,
+                IssueMain.description,
+                IssueMain.solution,
+            ).where(IssueMain.issue_id.in_(issue_ids))
+        ):
+            parts[issue_id].extend([title, description, solution])
+        for issue_id, step_name, method_description in db.execute(
+            select(
+                IssueDiagnosisLog.issue_id,
+                IssueDiagnosisLog.step_name,
+                IssueDiagnosisLog.method_description,
+            ).where(IssueDiagnosisLog.issue_id.in_(issue_ids))
+        ):
+            parts[issue_id].extend([step_name, method_description])
+        for issue_id, tag_name in db.execute(
+            select(IssueTag.issue_id, IssueTagDict.tag_name)
+            .join(IssueTagDict, IssueTagDict.tag_id == IssueTag.tag_id)
+            .where(IssueTag.issue_id.in_(issue_ids))
+        ):
+            parts[issue_id].append(tag_name)
+
+        docs = [
+            dict(
+                issue_id=issue_id,
+                content="\n".join(part for part in parts[issue_id] if part),
+                update_time=datetime.now(),
+            )
+            for issue_id in issue_ids
+            if issue_id in parts
+        ]
+        db.execute(
+            delete(IssueSearchDoc).where(IssueSearchDoc.issue_id.in_(issue_ids))
+        )
+        if docs:
+            db.execute(insert(IssueSearchDoc), docs)
+
+        if db.get_bind().dialect.name != "mysql":
+            # 进程内索引在事务提交后再更新，事务回滚时不会残留未提交的内容
+            TransactionUtil.after_commit(
+                db,
+                partial(
+                    cls._update_fallback_search_index,
+                    SearchIndexUtil.get_index(db.get_bind().engine),
+                    issue_ids,
+                    {doc["issue_id"]: doc["content"] for doc in docs},
+                ),
+            )
+
+    @classmethod
+    def _update_fallback_search_index(cls, search_index, issue_ids: List[int], contents: dict):
+        """
+        将已提交的全文检索文档同步到进程内倒排索引，已不存在的Issue从索引中删除
+        """
+        for issue_id in issue_ids:
+            if issue_id in contents:
+                search_index.add_document(issue_id, contents[issue_id])
+            else:
+                search_index.remove_document(issue_id)
+
     @classmethod
     def add_issue_dao(cls, db: Session, issue: IssueMainModel):
         """
@@ -198,6 +547,63 @@ class IssueDao:
 
         return db_issue
 
+    @classmethod
+    def batch_add_issue_dao(cls, db: Session, issues: List[dict]):
+        """
+        批量新增Issue数据库操作(executemany)
+
+        :param db: orm对象
+        :param issues: Issue字典列表，各字典的键需保持一致
+        :return: Issue编号与Issue ID的映射
+        """
+        if not issues:
+            return {}
+        db.execute(insert(IssueMain), issues)
+        issue_numbers = [issue["issue_number"] for issue in issues]
+
+        return dict(
+            db.execute(
+                select(IssueMain.issue_number, IssueMain.issue_id).where(
+                    IssueMain.issue_number.in_(issue_numbers)
+                )
+            ).all()
+        )
+
+    @classmethod
+    def batch_add_system_env_dao(cls, db: Session, system_envs: List[dict]):
+        """
+        批量新增系统环境信息数据库操作(executemany)
+
+        :param db: orm对象
+        :param system_envs: 系统环境字典列表
+        :return:
+        """
+        if system_envs:
+            db.execute(insert(IssueSystemEnv), system_envs)
+
+    @classmethod
+    def batch_add_tag_dao(cls, db: Session, tags: List[dict]):
+        """
+        批量新增Issue标签关联数据库操作(executemany)
+
+        :param db: orm对象
+        :param tags: 标签字典列表，元素为dict(issue_id=..., tag_name=...)
+        :return:
+        """
+        if not tags:
+            return
+        tag_id_map = cls.get_or_create_tag_ids(db, [tag["tag_name"] for tag in tags])
+        links = list(
+            dict.fromkeys(
+                (tag["issue_id"], tag_id_map[cls._tag_key(tag["tag_name"])]) for tag in tags
+            )
+        )
+        db.execute(insert(IssueTag), [dict(issue_id=issue_id, tag_id=tag_id) for issue_id, tag_id in links])
+        usage_deltas = defaultdict(int)
+        for _, tag_id in links:
+            usage_deltas[tag_id] += 1
+        cls._increase_tag_usage(db, usage_deltas)
+
     @classmethod
     def edit_issue_dao(cls, db: Session, issue: dict):
         """
@@ -226,6 +632,77 @@ class IssueDao:
             )
         )
 
+    @classmethod
+    def has_issue_filter(cls, query_object: IssueBatchFilterModel):
+        """
+        判断过滤条件是否至少包含一个生效的条件(不含删除标志)
+
+        :param query_object: 过滤条件对象
+        :return: 是否包含生效的条件
+        """
+        if query_object.keyword and query_object.keyword.strip():
+            return True
+        return any(condition is not True for condition in cls._build_issue_conditions(query_object)[1:])
+
+    @classmethod
+    def get_issue_ids_by_filter(cls, db: Session, query_object: IssueBatchFilterModel):
+        """
+        根据过滤条件获取Issue ID列表
+
+        :param db: orm对象
+        :param query_object: 过滤条件对象
+        :return: Issue ID列表
+        """
+        query = select(IssueMain.issue_id).where(*cls._build_issue_conditions(query_object))
+        if query_object.keyword and query_object.keyword.strip():
+            query = cls._apply_keyword_search(db, query, query_object.keyword.strip())
+
+        return list(dict.fromkeys(db.execute(query).scalars()))
+
+    @classmethod
+    def batch_update_issue_dao(
+        cls, db: Session, issue_ids: List[int], values: dict, changed_column=None
+    ):
+        """
+        按ID列表分片批量更新Issue(仅未删除的记录)，每个分片先锁定待更新记录再执行一次UPDATE
+
+        :param db: orm对象
+        :param issue_ids: Issue ID列表
+        :param values: 需要更新的字段字典
+        :param changed_column: 指定时仅更新该列当前值与目标值不同的记录
+        :return: 实际更新的记录在更新前的(issue_id, status, priority, create_time)列表
+        """
+        unique_ids = list(dict.fromkeys(issue_ids))
+        affected_rows = []
+        for offset in range(0, len(unique_ids), cls.ID_CHUNK_SIZE):
+            conditions = [
+                IssueMain.del_flag == "0",
+                IssueMain.issue_id.in_(unique_ids[offset : offset + cls.ID_CHUNK_SIZE]),
+            ]
+            if changed_column is not None:
+                conditions.append(changed_column != values[changed_column.key])
+            rows = db.execute(
+                select(
+                    IssueMain.issue_id,
+                    IssueMain.status,
+                    IssueMain.priority,
+                    IssueMain.create_time,
+                )
+                .where(*conditions)
+                .with_for_update()
+            ).all()
+            if not rows:
+                continue
+            db.execute(
+                update(IssueMain)
+                .where(IssueMain.issue_id.in_([row.issue_id for row in rows]))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            affected_rows.extend(rows)
+
+        return affected_rows
+
     @classmethod
     def add_system_env_dao(cls, db: Session, system_env: IssueSystemEnvModel):
         """
@@ -261,6 +738,37 @@ class IssueDao:
         db_diagnosis_log = IssueDiagnosisLog(**diagnosis_log.model_dump())
         db.add(db_diagnosis_log)
 
+    @classmethod
+    def batch_add_diagnosis_log_dao(cls, db: Session, diagnosis_logs: List[dict]):
+        """
+        批量新增诊断记录数据库操作(executemany)
+
+        :param db: orm对象
+        :param diagnosis_logs: 诊断记录字典列表
+        :return:
+        """
+        if diagnosis_logs:
+            db.execute(insert(IssueDiagnosisLog), diagnosis_logs)
+
+    @classmethod
+    def start_diagnosis_dao(cls, db: Session, issue_ids: List[int], update_time: datetime):
+        """
+        将待诊断的Issue批量变更为诊断中
+
+        :param db: orm对象
+        :param issue_ids: Issue ID列表
+        :param update_time: 更新时间
+        :return: 变更的记录数
+        """
+        if not issue_ids:
+            return 0
+        return db.execute(
+            update(IssueMain)
+            .where(IssueMain.issue_id.in_(issue_ids), IssueMain.status == "pending")
+            .values(status="diagnosing", update_time=update_time)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
     @classmethod
     def add_attachment_dao(cls, db: Session, attachment: IssueAttachmentModel):
         """
@@ -268,10 +776,13 @@ class IssueDao:
 
         :param db: orm对象
         :param attachment: 附件对象
-        :return:
+        :return: 附件ORM对象
         """
         db_attachment = IssueAttachment(**attachment.model_dump())
         db.add(db_attachment)
+        db.flush()
+
+        return db_attachment
 
     @classmethod
     def delete_attachment_dao(cls, db: Session, attachment_id: int):
@@ -287,6 +798,7 @@ class IssueDao:
                 IssueAttachment.attachment_id == attachment_id
             )
         )
+        db.execute(delete(IssueCrashBucketHit).where(IssueCrashBucketHit.attachment_id == attachment_id))
 
     @classmethod
     def link_attachments_to_issue(cls, db: Session, issue_id: int, attachment_ids: List[int]):
@@ -301,10 +813,35 @@ class IssueDao:
         if attachment_ids:
             db.execute(
                 update(IssueAttachment)
-                .where(IssueAttachment.attachment_id.in_(attachment_ids))
+                .where(IssueAttachment.attachment_id.in_(attachment_ids), IssueAttachment.status != "deleting")
                 .values(issue_id=issue_id, status="linked")
             )
 
+    @classmethod
+    def has_linked_attachments(cls, db: Session, issue_id: int, attachment_ids: List[int], file_types: List[str]):
+        """
+        判断指定附件中是否有已关联到Issue的指定类型附件
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param attachment_ids: 附件ID列表
+        :param file_types: 附件类型列表
+        :return: 是否存在
+        """
+        return (
+            db.execute(
+                select(IssueAttachment.attachment_id)
+                .where(
+                    IssueAttachment.attachment_id.in_(attachment_ids),
+                    IssueAttachment.issue_id == issue_id,
+                    IssueAttachment.status == "linked",
+                    cls._file_type_condition(file_types),
+                )
+                .limit(1)
+            ).first()
+            is not None
+        )
+
     @classmethod
     def get_attachment_by_id(cls, db: Session, attachment_id: int):
         """
@@ -326,125 +863,1294 @@ class IssueDao:
         return attachment
 
     @classmethod
-    def delete_temporary_attachments(cls, db: Session, hours: int = 24):
+    def get_issue_attachments(cls, db: Session, issue_id: int):
         """
-        删除超过指定时间的临时附件
+        获取Issue已关联的全部附件
 
         :param db: orm对象
-        :param hours: 小时数，默认24小时
-        :return: 删除的附件数量
+        :param issue_id: Issue ID
+        :return: 附件列表
         """
-        from datetime import timedelta
-        threshold_time = datetime.now() - timedelta(hours=hours)
-        
-        # 查询需要删除的附件
-        attachments_to_delete = (
+        return (
             db.execute(
                 select(IssueAttachment)
-                .where(
-                    IssueAttachment.status == "temporary",
-                    IssueAttachment.upload_time < threshold_time
-                )
-                .distinct()
+                .where(IssueAttachment.issue_id == issue_id, IssueAttachment.status == "linked")
+                .order_by(IssueAttachment.attachment_id)
             )
             .scalars()
             .all()
         )
-        
-        # 删除附件记录
-        db.execute(
-            delete(IssueAttachment).where(
-                IssueAttachment.status == "temporary",
-                IssueAttachment.upload_time < threshold_time
+
+    @classmethod
+    def get_expired_temporary_attachment_ids(cls, db: Session, hours: int, limit: int):
+        """
+        按上传时间顺序获取一批超过指定时间的临时附件ID
+
+        :param db: orm对象
+        :param hours: 小时数
+        :param limit: 数量上限
+        :return: 附件ID列表
+        """
+        threshold_time = datetime.now() - timedelta(hours=hours)
+
+        return (
+            db.execute(
+                select(IssueAttachment.attachment_id)
+                .where(IssueAttachment.status == "temporary", IssueAttachment.upload_time < threshold_time)
+                .order_by(IssueAttachment.upload_time, IssueAttachment.attachment_id)
+                .limit(limit)
             )
+            .scalars()
+            .all()
         )
-        
-        return attachments_to_delete
 
     @classmethod
-    def add_tag_dao(cls, db: Session, tag: IssueTagModel):
+    def mark_attachments_deleting(cls, db: Session, attachment_ids: List[int]):
         """
-        新增标签信息数据库操作
+        将临时附件标记为删除中，已被关联的附件不受影响
 
         :param db: orm对象
-        :param tag: 标签对象
-        :return:
+        :param attachment_ids: 附件ID列表
+        :return: 标记的附件数量
         """
-        db_tag = IssueTag(**tag.model_dump(by_alias=False))
-        db.add(db_tag)
+        if not attachment_ids:
+            return 0
+
+        return db.execute(
+            update(IssueAttachment)
+            .where(IssueAttachment.attachment_id.in_(attachment_ids), IssueAttachment.status == "temporary")
+            .values(status="deleting")
+        ).rowcount
 
     @classmethod
-    def delete_tags_by_issue_dao(cls, db: Session, issue_id: int):
+    def get_deleting_attachments(cls, db: Session, limit: int):
         """
-        根据Issue ID删除所有标签数据库操作
+        按上传时间顺序获取一批删除中的附件
 
         :param db: orm对象
-        :param issue_id: Issue ID
-        :return:
+        :param limit: 数量上限
+        :return: 附件列表
         """
-        db.execute(delete(IssueTag).where(IssueTag.issue_id == issue_id))
+        return (
+            db.execute(
+                select(IssueAttachment)
+                .where(IssueAttachment.status == "deleting")
+                .order_by(IssueAttachment.upload_time, IssueAttachment.attachment_id)
+                .limit(limit)
+            )
+            .scalars()
+            .all()
+        )
 
     @classmethod
-    def get_issue_statistics(cls, db: Session):
+    def delete_attachments_dao(cls, db: Session, attachment_ids: List[int]):
         """
-        获取Issue统计数据
+        批量删除附件记录
 
         :param db: orm对象
-        :return: 统计数据字典
+        :param attachment_ids: 附件ID列表
+        :return:
         """
-        # Issue总数
-        total_count = db.execute(
-            select(func.count("*"))
-            .select_from(IssueMain)
-            .where(IssueMain.del_flag == "0")
-        ).scalar()
+        if attachment_ids:
+            db.execute(delete(IssueAttachment).where(IssueAttachment.attachment_id.in_(attachment_ids)))
+            db.execute(delete(IssueCrashBucketHit).where(IssueCrashBucketHit.attachment_id.in_(attachment_ids)))
 
-        # 本月新增Issue数
-        current_month_start = datetime.now().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
+    @classmethod
+    def get_blob_hashes_in_range(cls, db: Session, lower: Optional[str], upper: Optional[str]):
+        """
+        按顺序获取摘要在(lower, upper]区间内的存储记录摘要
+
+        :param db: orm对象
+        :param lower: 区间下界(不含)，为空表示不限
+        :param upper: 区间上界(含)，为空表示不限
+        :return: 文件摘要列表
+        """
+        query = select(IssueAttachmentBlob.file_hash).order_by(IssueAttachmentBlob.file_hash)
+        if lower is not None:
+            query = query.where(IssueAttachmentBlob.file_hash > lower)
+        if upper is not None:
+            query = query.where(IssueAttachmentBlob.file_hash <= upper)
+
+        return db.execute(query).scalars().all()
+
+    @classmethod
+    def get_existing_upload_ids(cls, db: Session, upload_ids: List[str]):
+        """
+        获取仍存在的分片上传会话ID
+
+        :param db: orm对象
+        :param upload_ids: 上传会话ID列表
+        :return: 存在的上传会话ID集合
+        """
+        if not upload_ids:
+            return set()
+
+        return set(
+            db.execute(
+                select(IssueUploadSession.upload_id).where(IssueUploadSession.upload_id.in_(upload_ids))
+            ).scalars()
         )
-        monthly_new_count = db.execute(
-            select(func.count("*"))
-            .select_from(IssueMain)
+
+    @classmethod
+    def get_blob(cls, db: Session, file_hash: str, for_update: bool = False):
+        """
+        根据文件摘要获取附件内容存储记录
+
+        :param db: orm对象
+        :param file_hash: 文件SHA-256摘要
+        :param for_update: 是否对记录加行锁
+        :return: 附件内容存储对象
+        """
+        query = select(IssueAttachmentBlob).where(IssueAttachmentBlob.file_hash == file_hash)
+        if for_update:
+            query = query.with_for_update()
+
+        return db.execute(query).scalars().first()
+
+    @classmethod
+    def _compress_candidate_query(cls, file_types: List[str]):
+        """
+        待压缩存储文件的查询：未处理过且被指定类型附件引用
+        """
+        return (
+            select(IssueAttachmentBlob.file_hash)
+            .join(
+                IssueAttachment,
+                and_(
+                    IssueAttachment.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueAttachment.file_path == IssueAttachmentBlob.file_path,
+                ),
+            )
             .where(
-                IssueMain.del_flag == "0", IssueMain.create_time >= current_month_start
+                IssueAttachmentBlob.compression.is_(None),
+                IssueAttachmentBlob.ref_count > 0,
+                or_(*[func.lower(IssueAttachment.file_name).like(f"%{file_type}") for file_type in file_types]),
             )
-        ).scalar()
+            .distinct()
+        )
+
+    @classmethod
+    def get_compress_candidates(cls, db: Session, file_types: List[str], limit: int):
+        """
+        获取待压缩的存储文件摘要
+
+        :param db: orm对象
+        :param file_types: 需要压缩的附件类型
+        :param limit: 最多返回的数量
+        :return: 文件摘要列表
+        """
+        return db.execute(
+            cls._compress_candidate_query(file_types).order_by(IssueAttachmentBlob.file_hash).limit(limit)
+        ).scalars().all()
+
+    @classmethod
+    def update_blob_compression(cls, db: Session, blob: IssueAttachmentBlob, compression: str, compressed_size=None):
+        """
+        记录存储文件的压缩结果，并同步引用该文件的附件的压缩后大小
+
+        :param db: orm对象
+        :param blob: 附件内容存储对象
+        :param compression: 压缩方式
+        :param compressed_size: 压缩后大小
+        :return:
+        """
+        db.execute(
+            update(IssueAttachmentBlob)
+            .where(IssueAttachmentBlob.file_hash == blob.file_hash)
+            .values(compression=compression, compressed_size=compressed_size)
+        )
+        db.execute(
+            update(IssueAttachment)
+            .where(IssueAttachment.file_hash == blob.file_hash, IssueAttachment.file_path == blob.file_path)
+            .values(compressed_size=compressed_size)
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    def get_blob_storage_statistics(cls, db: Session, file_types: List[str]):
+        """
+        统计内容寻址存储的原始大小及实际占用大小
 
-        # 待处理Issue数
+        :param db: orm对象
+        :param file_types: 需要压缩的附件类型
+        :return: 统计结果
+        """
+        statistics = db.execute(
+            select(
+                func.count(),
+                func.count(IssueAttachmentBlob.compressed_size),
+                func.coalesce(func.sum(IssueAttachmentBlob.file_size), 0),
+                func.coalesce(
+                    func.sum(func.coalesce(IssueAttachmentBlob.compressed_size, IssueAttachmentBlob.file_size)), 0
+                ),
+            )
+        ).one()
         pending_count = db.execute(
-            select(func.count("*"))
-            .select_from(IssueMain)
-            .where(IssueMain.del_flag == "0", IssueMain.status == "pending")
+            select(func.count()).select_from(cls._compress_candidate_query(file_types).subquery())
         ).scalar()
 
-        # Issue诊断次数(诊断记录总数)
-        diagnosis_count = db.execute(
-            select(func.count("*")).select_from(IssueDiagnosisLog)
-        ).scalar()
+        return dict(
+            blob_count=statistics[0],
+            compressed_count=statistics[1],
+            pending_count=pending_count,
+            original_size=int(statistics[2]),
+            stored_size=int(statistics[3]),
+        )
 
-        # 高优先级Issue数
-        high_priority_count = db.execute(
-            select(func.count("*"))
-            .select_from(IssueMain)
-            .where(IssueMain.del_flag == "0", IssueMain.priority == "high")
-        ).scalar()
+    @classmethod
+    def _file_type_condition(cls, file_types: List[str]):
+        """
+        附件文件名后缀的过滤条件
+        """
+        return or_(*[func.lower(IssueAttachment.file_name).like(f"%{file_type}") for file_type in file_types])
 
-        # 已完成Issue数
-        completed_count = db.execute(
-            select(func.count("*"))
-            .select_from(IssueMain)
-            .where(IssueMain.del_flag == "0", IssueMain.status == "completed")
-        ).scalar()
+    @classmethod
+    def get_unindexed_blobs(cls, db: Session, file_types: List[str], limit: int):
+        """
+        获取尚未建立trigram索引、且被已关联Issue的指定类型附件引用的存储文件
+
+        :param db: orm对象
+        :param file_types: 需要建立索引的附件类型
+        :param limit: 最多返回的数量
+        :return: 存储文件列表(file_hash, file_path, file_name)
+        """
+        return db.execute(
+            select(
+                IssueAttachmentBlob.file_hash,
+                IssueAttachmentBlob.file_path,
+                func.min(IssueAttachment.file_name).label("file_name"),
+            )
+            .join(
+                IssueAttachment,
+                and_(
+                    IssueAttachment.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueAttachment.file_path == IssueAttachmentBlob.file_path,
+                ),
+            )
+            .where(
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+                ~exists().where(IssueAttachmentIndexDoc.file_hash == IssueAttachmentBlob.file_hash),
+            )
+            .group_by(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path)
+            .order_by(IssueAttachmentBlob.file_hash)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def add_index_docs(cls, db: Session, file_hash: str, members: List[tuple], index_time: datetime = None):
+        """
+        新增trigram索引文档
+
+        :param db: orm对象
+        :param file_hash: 文件SHA-256摘要
+        :param members: (压缩包内的文件名, 原始内容大小)列表
+        :param index_time: 写入索引段的时间，为空表示等待写入
+        :return: 索引文档ORM对象列表
+        """
+        docs = [
+            IssueAttachmentIndexDoc(
+                file_hash=file_hash,
+                member_name=member_name,
+                content_size=content_size,
+                create_time=datetime.now(),
+                index_time=index_time,
+            )
+            for member_name, content_size in members
+        ]
+        db.add_all(docs)
+        db.flush()
+
+        return docs
+
+    @classmethod
+    def mark_index_docs(cls, db: Session, doc_ids: List[int], index_time: datetime):
+        """
+        记录索引文档已写入索引段
+
+        :param db: orm对象
+        :param doc_ids: 索引文档ID列表
+        :param index_time: 写入索引段的时间
+        :return:
+        """
+        if doc_ids:
+            db.execute(
+                update(IssueAttachmentIndexDoc)
+                .where(IssueAttachmentIndexDoc.doc_id.in_(doc_ids))
+                .values(index_time=index_time)
+                .execution_options(synchronize_session=False)
+            )
+
+    @classmethod
+    def delete_stale_index_docs(cls, db: Session, hours: int = 1):
+        """
+        删除未完成写入的索引文档(建立索引中途服务退出)及存储文件已不再被任何附件引用的索引文档
+
+        :param db: orm对象
+        :param hours: 超过多少小时仍未写入索引段的文档视为未完成
+        :return: 删除的文档数
+        """
+        incomplete_count = db.execute(
+            delete(IssueAttachmentIndexDoc).where(
+                IssueAttachmentIndexDoc.index_time.is_(None),
+                IssueAttachmentIndexDoc.create_time < datetime.now() - timedelta(hours=hours),
+            )
+        ).rowcount
+        orphan_count = db.execute(
+            delete(IssueAttachmentIndexDoc).where(
+                ~exists().where(IssueAttachment.file_hash == IssueAttachmentIndexDoc.file_hash)
+            )
+        ).rowcount
+
+        return incomplete_count + orphan_count
+
+    @classmethod
+    def get_index_doc_ids(cls, db: Session):
+        """
+        获取已写入索引段的全部索引文档ID
+
+        :param db: orm对象
+        :return: 索引文档ID集合
+        """
+        return set(
+            db.execute(
+                select(IssueAttachmentIndexDoc.doc_id).where(IssueAttachmentIndexDoc.index_time.isnot(None))
+            ).scalars()
+        )
 
-        return {
-            "total_count": total_count or 0,
-            "monthly_new_count": monthly_new_count or 0,
-            "pending_count": pending_count or 0,
-            "diagnosis_count": diagnosis_count or 0,
-            "high_priority_count": high_priority_count or 0,
-            "completed_count": completed_count or 0,
+    @classmethod
+    def get_index_doc_attachments(
+        cls, db: Session, doc_ids: List[int], text_types: List[str], archive_types: List[str]
+    ):
+        """
+        获取索引文档对应的、已关联未删除Issue的附件
+
+        :param db: orm对象
+        :param doc_ids: 索引文档ID列表
+        :param text_types: 文本附件类型
+        :param archive_types: 压缩包附件类型
+        :return: 附件列表(doc_id, member_name, attachment_id, issue_id, file_name, file_path)
+        """
+        if not doc_ids:
+            return []
+
+        return db.execute(
+            select(
+                IssueAttachmentIndexDoc.doc_id,
+                IssueAttachmentIndexDoc.member_name,
+                IssueAttachment.attachment_id,
+                IssueAttachment.issue_id,
+                IssueAttachment.file_name,
+                IssueAttachment.file_path,
+            )
+            .join(IssueAttachment, IssueAttachment.file_hash == IssueAttachmentIndexDoc.file_hash)
+            .join(IssueMain, IssueMain.issue_id == IssueAttachment.issue_id)
+            .where(
+                IssueAttachmentIndexDoc.doc_id.in_(doc_ids),
+                IssueAttachmentIndexDoc.index_time.isnot(None),
+                IssueAttachment.status == "linked",
+                IssueMain.del_flag == "0",
+                or_(
+                    and_(IssueAttachmentIndexDoc.member_name == "", cls._file_type_condition(text_types)),
+                    and_(IssueAttachmentIndexDoc.member_name != "", cls._file_type_condition(archive_types)),
+                ),
+            )
+            .order_by(
+                IssueAttachment.issue_id.desc(), IssueAttachment.attachment_id, IssueAttachmentIndexDoc.member_name
+            )
+        ).all()
+
+    @classmethod
+    def get_unanalyzed_dump_blobs(
+        cls, db: Session, file_types: List[str], parser_version: int, limit: int, issue_id: Optional[int] = None
+    ):
+        """
+        获取尚未分析(或分析结果的解析器版本较低)、且被已关联Issue的dump附件引用的存储文件
+
+        :param db: orm对象
+        :param file_types: 需要分析的附件类型
+        :param parser_version: 当前解析器版本
+        :param limit: 最多返回的数量
+        :param issue_id: 只返回该Issue的附件引用的存储文件，为空时不限
+        :return: 存储文件列表(file_hash, file_path)
+        """
+        return db.execute(
+            select(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path)
+            .join(
+                IssueAttachment,
+                and_(
+                    IssueAttachment.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueAttachment.file_path == IssueAttachmentBlob.file_path,
+                ),
+            )
+            .where(
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+                IssueAttachment.issue_id == issue_id if issue_id is not None else True,
+                ~exists().where(
+                    IssueDumpAnalysis.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueDumpAnalysis.parser_version >= parser_version,
+                ),
+            )
+            .group_by(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path)
+            .order_by(IssueAttachmentBlob.file_hash)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def save_dump_analyses(cls, db: Session, analyses: List[dict]):
+        """
+        保存dump分析结果，已有的分析结果被替换
+
+        :param db: orm对象
+        :param analyses: 分析结果列表
+        :return:
+        """
+        if not analyses:
+            return
+        db.execute(
+            delete(IssueDumpAnalysis).where(
+                IssueDumpAnalysis.file_hash.in_([analysis["file_hash"] for analysis in analyses])
+            )
+        )
+        db.execute(insert(IssueDumpAnalysis), analyses)
+
+    @classmethod
+    def get_issue_dump_analyses(cls, db: Session, issue_id: int, file_types: List[str]):
+        """
+        获取Issue的dump附件及其分析结果
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param file_types: dump附件类型
+        :return: (附件, 分析结果)列表，尚未分析的附件分析结果为None
+        """
+        return db.execute(
+            select(IssueAttachment, IssueDumpAnalysis)
+            .outerjoin(IssueDumpAnalysis, IssueDumpAnalysis.file_hash == IssueAttachment.file_hash)
+            .where(
+                IssueAttachment.issue_id == issue_id,
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+            )
+            .order_by(IssueAttachment.attachment_id)
+        ).all()
+
+    @classmethod
+    def get_unbucketed_dump_attachments(cls, db: Session, file_types: List[str], limit: int):
+        """
+        获取已分析出崩溃签名、但尚未归入对应崩溃分组的已关联dump附件(含解析器升级后签名变化的附件)
+
+        :param db: orm对象
+        :param file_types: dump附件类型
+        :param limit: 最多返回的数量
+        :return: 附件列表(attachment_id, issue_id, upload_time及分析结果中的崩溃签名、异常代码、异常模块及偏移)
+        """
+        return db.execute(
+            select(
+                IssueAttachment.attachment_id,
+                IssueAttachment.issue_id,
+                IssueAttachment.upload_time,
+                IssueDumpAnalysis.crash_signature,
+                IssueDumpAnalysis.dump_type,
+                IssueDumpAnalysis.exception_code,
+                IssueDumpAnalysis.faulting_module,
+                IssueDumpAnalysis.faulting_offset,
+            )
+            .join(IssueDumpAnalysis, IssueDumpAnalysis.file_hash == IssueAttachment.file_hash)
+            .where(
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+                IssueDumpAnalysis.crash_signature.isnot(None),
+                ~exists().where(
+                    IssueCrashBucketHit.attachment_id == IssueAttachment.attachment_id,
+                    IssueCrashBucketHit.signature == IssueDumpAnalysis.crash_signature,
+                ),
+            )
+            .order_by(IssueAttachment.attachment_id)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def save_crash_bucket_hits(cls, db: Session, hits: List[dict], buckets: List[dict]):
+        """
+        保存崩溃分组命中记录，附件已有的命中记录被替换；新的崩溃分组写入分组表，已有分组更新首次及最近出现时间
+
+        多个worker可能同时处理相同的附件，MySQL及SQLite使用upsert写入，由数据库合并首次及最近出现时间；
+        按主键顺序写入，避免并发写入时互相等待对方已锁定的记录
+
+        :param db: orm对象
+        :param hits: 命中记录列表(attachment_id, signature, issue_id, hit_time)
+        :param buckets: 本批命中的崩溃分组列表(signature, dump_type, exception_code, faulting_module,
+                        faulting_offset, first_hit_time, last_hit_time)
+        :return:
+        """
+        if not hits:
+            return
+        hits = sorted(hits, key=lambda hit: hit["attachment_id"])
+        buckets = sorted(buckets, key=lambda bucket: bucket["signature"])
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "mysql":
+            hit_statement = mysql_insert(IssueCrashBucketHit)
+            hit_statement = hit_statement.on_duplicate_key_update(
+                signature=hit_statement.inserted.signature,
+                issue_id=hit_statement.inserted.issue_id,
+                hit_time=hit_statement.inserted.hit_time,
+            )
+            bucket_statement = mysql_insert(IssueCrashBucket)
+            bucket_statement = bucket_statement.on_duplicate_key_update(
+                first_hit_time=func.least(IssueCrashBucket.first_hit_time, bucket_statement.inserted.first_hit_time),
+                last_hit_time=func.greatest(IssueCrashBucket.last_hit_time, bucket_statement.inserted.last_hit_time),
+            )
+        elif dialect_name == "sqlite":
+            hit_statement = sqlite_insert(IssueCrashBucketHit)
+            hit_statement = hit_statement.on_conflict_do_update(
+                index_elements=[IssueCrashBucketHit.attachment_id],
+                set_=dict(
+                    signature=hit_statement.excluded.signature,
+                    issue_id=hit_statement.excluded.issue_id,
+                    hit_time=hit_statement.excluded.hit_time,
+                ),
+            )
+            bucket_statement = sqlite_insert(IssueCrashBucket)
+            # SQLite中多参数的min/max为标量函数
+            bucket_statement = bucket_statement.on_conflict_do_update(
+                index_elements=[IssueCrashBucket.signature],
+                set_=dict(
+                    first_hit_time=func.min(IssueCrashBucket.first_hit_time, bucket_statement.excluded.first_hit_time),
+                    last_hit_time=func.max(IssueCrashBucket.last_hit_time, bucket_statement.excluded.last_hit_time),
+                ),
+            )
+        else:
+            cls._save_crash_bucket_hits_by_lock(db, hits, buckets)
+            return
+        db.execute(hit_statement, hits)
+        db.execute(bucket_statement, buckets)
+
+    @classmethod
+    def _save_crash_bucket_hits_by_lock(cls, db: Session, hits: List[dict], buckets: List[dict]):
+        """
+        不支持upsert的数据库锁定已有的崩溃分组后合并出现时间
+        """
+        db.execute(
+            delete(IssueCrashBucketHit).where(
+                IssueCrashBucketHit.attachment_id.in_([hit["attachment_id"] for hit in hits])
+            )
+        )
+        db.execute(insert(IssueCrashBucketHit), hits)
+
+        existing = {
+            bucket.signature: bucket
+            for bucket in db.execute(
+                select(IssueCrashBucket)
+                .where(IssueCrashBucket.signature.in_([bucket["signature"] for bucket in buckets]))
+                .with_for_update()
+            ).scalars()
         }
+        new_buckets = [bucket for bucket in buckets if bucket["signature"] not in existing]
+        if new_buckets:
+            db.execute(insert(IssueCrashBucket), new_buckets)
+        changed_buckets = [
+            dict(
+                signature=bucket["signature"],
+                first_hit_time=min(bucket["first_hit_time"], existing[bucket["signature"]].first_hit_time),
+                last_hit_time=max(bucket["last_hit_time"], existing[bucket["signature"]].last_hit_time),
+            )
+            for bucket in buckets
+            if bucket["signature"] in existing
+        ]
+        if changed_buckets:
+            db.execute(update(IssueCrashBucket), changed_buckets)
+
+    @classmethod
+    def get_issue_crash_signatures(cls, db: Session, issue_id: int):
+        """
+        获取Issue的dump附件所属的崩溃签名
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: 崩溃签名列表
+        """
+        return (
+            db.execute(
+                select(IssueCrashBucketHit.signature)
+                .where(IssueCrashBucketHit.issue_id == issue_id)
+                .distinct()
+                .order_by(IssueCrashBucketHit.signature)
+            )
+            .scalars()
+            .all()
+        )
+
+    @classmethod
+    def _crash_bucket_hit_query(cls, *conditions):
+        """
+        按崩溃签名统计未删除Issue的命中数及Issue数
+        """
+        return (
+            select(
+                IssueCrashBucketHit.signature,
+                func.count(IssueCrashBucketHit.attachment_id).label("hit_count"),
+                func.count(IssueCrashBucketHit.issue_id.distinct()).label("issue_count"),
+            )
+            .join(IssueMain, IssueMain.issue_id == IssueCrashBucketHit.issue_id)
+            .where(IssueMain.del_flag == "0", *conditions)
+            .group_by(IssueCrashBucketHit.signature)
+        )
+
+    @classmethod
+    def get_crash_buckets(cls, db: Session, signatures: List[str]):
+        """
+        获取崩溃分组及其命中数
+
+        :param db: orm对象
+        :param signatures: 崩溃签名列表
+        :return: (崩溃分组, 命中数, Issue数)列表
+        """
+        if not signatures:
+            return []
+        hit_query = cls._crash_bucket_hit_query(IssueCrashBucketHit.signature.in_(signatures)).subquery()
+        return db.execute(
+            select(IssueCrashBucket, hit_query.c.hit_count, hit_query.c.issue_count)
+            .join(hit_query, hit_query.c.signature == IssueCrashBucket.signature)
+            .order_by(hit_query.c.hit_count.desc(), IssueCrashBucket.signature)
+        ).all()
+
+    @classmethod
+    def get_top_crash_buckets(cls, db: Session, since: datetime, limit: int):
+        """
+        获取时间范围内命中数最多的崩溃分组，只统计该时间范围内的命中记录
+
+        :param db: orm对象
+        :param since: 起始时间
+        :param limit: 返回数量
+        :return: (崩溃分组, 命中数, Issue数)列表
+        """
+        hit_query = (
+            cls._crash_bucket_hit_query(IssueCrashBucketHit.hit_time >= since)
+            .order_by(desc("hit_count"), IssueCrashBucketHit.signature)
+            .limit(limit)
+            .subquery()
+        )
+        return db.execute(
+            select(IssueCrashBucket, hit_query.c.hit_count, hit_query.c.issue_count)
+            .join(hit_query, hit_query.c.signature == IssueCrashBucket.signature)
+            .order_by(hit_query.c.hit_count.desc(), IssueCrashBucket.signature)
+        ).all()
+
+    @classmethod
+    def get_crash_bucket_issues(cls, db: Session, signature: str, limit: int):
+        """
+        获取崩溃分组内的未删除Issue，按最近命中时间倒序
+
+        :param db: orm对象
+        :param signature: 崩溃签名
+        :param limit: 返回数量
+        :return: Issue列表(issue_id, issue_number, title, status, hit_count, last_hit_time)
+        """
+        last_hit_time = func.max(IssueCrashBucketHit.hit_time)
+        return db.execute(
+            select(
+                IssueMain.issue_id,
+                IssueMain.issue_number,
+                IssueMain.title,
+                IssueMain.status,
+                func.count(IssueCrashBucketHit.attachment_id).label("hit_count"),
+                last_hit_time.label("last_hit_time"),
+            )
+            .join(IssueMain, IssueMain.issue_id == IssueCrashBucketHit.issue_id)
+            .where(IssueCrashBucketHit.signature == signature, IssueMain.del_flag == "0")
+            .group_by(IssueMain.issue_id, IssueMain.issue_number, IssueMain.title, IssueMain.status)
+            .order_by(last_hit_time.desc(), IssueMain.issue_id.desc())
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def get_unextracted_log_blobs(
+        cls, db: Session, file_types: List[str], pattern_version: int, limit: int, issue_id: Optional[int] = None
+    ):
+        """
+        获取尚未提取事件(或提取时的日志格式版本较低)、且被已关联Issue的日志附件引用的存储文件
+
+        :param db: orm对象
+        :param file_types: 提取事件的附件类型
+        :param pattern_version: 当前日志格式版本
+        :param limit: 最多返回的数量
+        :param issue_id: 只返回该Issue的附件引用的存储文件，为空时不限
+        :return: 存储文件列表(file_hash, file_path)
+        """
+        return db.execute(
+            select(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path)
+            .join(
+                IssueAttachment,
+                and_(
+                    IssueAttachment.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueAttachment.file_path == IssueAttachmentBlob.file_path,
+                ),
+            )
+            .where(
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+                IssueAttachment.issue_id == issue_id if issue_id is not None else True,
+                ~exists().where(
+                    IssueLogEventFile.file_hash == IssueAttachmentBlob.file_hash,
+                    IssueLogEventFile.pattern_version >= pattern_version,
+                ),
+            )
+            .group_by(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path)
+            .order_by(IssueAttachmentBlob.file_hash)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def save_log_event_file(cls, db: Session, event_file: dict):
+        """
+        保存事件文件记录，已有的记录被替换
+
+        :param db: orm对象
+        :param event_file: 事件文件记录
+        :return:
+        """
+        db.execute(delete(IssueLogEventFile).where(IssueLogEventFile.file_hash == event_file["file_hash"]))
+        db.execute(insert(IssueLogEventFile), [event_file])
+
+    @classmethod
+    def get_issue_log_event_files(cls, db: Session, issue_id: int, file_types: List[str]):
+        """
+        获取Issue的日志附件及其事件文件记录
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param file_types: 提取事件的附件类型
+        :return: (附件, 事件文件记录)列表，尚未提取事件的附件事件文件记录为None
+        """
+        return db.execute(
+            select(IssueAttachment, IssueLogEventFile)
+            .outerjoin(IssueLogEventFile, IssueLogEventFile.file_hash == IssueAttachment.file_hash)
+            .where(
+                IssueAttachment.issue_id == issue_id,
+                IssueAttachment.status == "linked",
+                cls._file_type_condition(file_types),
+            )
+            .order_by(IssueAttachment.attachment_id)
+        ).all()
+
+    @classmethod
+    def acquire_blob(cls, db: Session, file_hash: str, file_size: int, file_path: str):
+        """
+        增加附件内容存储的引用计数，记录不存在时新增，并对该记录加锁直至事务结束
+
+        :param db: orm对象
+        :param file_hash: 文件SHA-256摘要
+        :param file_size: 文件大小
+        :param file_path: 文件存储路径
+        :return:
+        """
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "mysql":
+            statement = mysql_insert(IssueAttachmentBlob).prefix_with("IGNORE")
+        elif dialect_name == "sqlite":
+            statement = sqlite_insert(IssueAttachmentBlob).on_conflict_do_nothing()
+        else:
+            statement = insert(IssueAttachmentBlob)
+        db.execute(
+            statement,
+            [
+                dict(
+                    file_hash=file_hash,
+                    file_path=file_path,
+                    file_size=file_size,
+                    ref_count=0,
+                    create_time=datetime.now(),
+                )
+            ],
+        )
+        db.execute(
+            update(IssueAttachmentBlob)
+            .where(IssueAttachmentBlob.file_hash == file_hash)
+            .values(ref_count=IssueAttachmentBlob.ref_count + 1)
+        )
+
+    @classmethod
+    def release_blobs(cls, db: Session, file_hashes: List[str]):
+        """
+        按附件的文件摘要扣减引用计数(同一摘要出现多次时扣减多次)，并删除引用计数归零的存储记录
+
+        :param db: orm对象
+        :param file_hashes: 被删除附件的文件摘要列表
+        :return: 引用计数归零、需要删除的文件存储路径列表
+        """
+        release_counts = defaultdict(int)
+        for file_hash in file_hashes:
+            if file_hash:
+                release_counts[file_hash] += 1
+        if not release_counts:
+            return []
+        db.connection().execute(
+            update(IssueAttachmentBlob)
+            .where(IssueAttachmentBlob.file_hash == bindparam("b_file_hash"))
+            .values(ref_count=IssueAttachmentBlob.ref_count - bindparam("b_count")),
+            [dict(b_file_hash=file_hash, b_count=count) for file_hash, count in sorted(release_counts.items())],
+        )
+        released_blobs = db.execute(
+            select(IssueAttachmentBlob.file_hash, IssueAttachmentBlob.file_path).where(
+                IssueAttachmentBlob.file_hash.in_(list(release_counts)),
+                IssueAttachmentBlob.ref_count <= 0,
+            )
+        ).all()
+        if released_blobs:
+            released_hashes = [blob.file_hash for blob in released_blobs]
+            db.execute(delete(IssueAttachmentBlob).where(IssueAttachmentBlob.file_hash.in_(released_hashes)))
+            # 事件文件随存储文件一起删除
+            db.execute(delete(IssueLogEventFile).where(IssueLogEventFile.file_hash.in_(released_hashes)))
+
+        return [blob.file_path for blob in released_blobs]
+
+    @classmethod
+    def add_upload_session_dao(cls, db: Session, upload_session: dict):
+        """
+        新增分片上传会话数据库操作
+
+        :param db: orm对象
+        :param upload_session: 上传会话字典
+        :return:
+        """
+        db.execute(insert(IssueUploadSession), [upload_session])
+
+    @classmethod
+    def get_upload_session(cls, db: Session, upload_id: str, for_update: bool = False):
+        """
+        获取分片上传会话
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param for_update: 是否对会话加排他行锁
+        :return: 上传会话对象
+        """
+        query = select(IssueUploadSession).where(IssueUploadSession.upload_id == upload_id)
+        if for_update:
+            query = query.with_for_update()
+
+        return db.execute(query).scalars().first()
+
+    @classmethod
+    def update_upload_session_status(cls, db: Session, upload_id: str, status: str, expected_status: str):
+        """
+        按预期的当前状态修改分片上传会话状态
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param status: 新状态
+        :param expected_status: 预期的当前状态
+        :return: 是否修改成功，会话不存在或状态已变化时为False
+        """
+        result = db.execute(
+            update(IssueUploadSession)
+            .where(IssueUploadSession.upload_id == upload_id, IssueUploadSession.status == expected_status)
+            .values(status=status, update_time=datetime.now())
+        )
+
+        return result.rowcount > 0
+
+    @classmethod
+    def get_upload_chunks(cls, db: Session, upload_id: str):
+        """
+        获取分片上传会话已接收的分片
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :return: (分片序号, 分片大小)列表
+        """
+        return db.execute(
+            select(IssueUploadChunk.chunk_index, IssueUploadChunk.chunk_size)
+            .where(IssueUploadChunk.upload_id == upload_id)
+            .order_by(IssueUploadChunk.chunk_index)
+        ).all()
+
+    @classmethod
+    def add_upload_chunk_dao(cls, db: Session, upload_id: str, chunk_index: int, chunk_size: int):
+        """
+        记录已接收的分片，重复上传同一分片时忽略；会话已删除或正在完成时不记录
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param chunk_index: 分片序号
+        :param chunk_size: 分片大小
+        :return: 是否记录成功
+        """
+        now = datetime.now()
+        # 先按状态更新会话，与完成上传修改状态互斥
+        result = db.execute(
+            update(IssueUploadSession)
+            .where(IssueUploadSession.upload_id == upload_id, IssueUploadSession.status == "uploading")
+            .values(update_time=now)
+        )
+        if not result.rowcount:
+            return False
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "mysql":
+            statement = mysql_insert(IssueUploadChunk).prefix_with("IGNORE")
+        elif dialect_name == "sqlite":
+            statement = sqlite_insert(IssueUploadChunk).on_conflict_do_nothing()
+        else:
+            statement = insert(IssueUploadChunk)
+        db.execute(
+            statement,
+            [dict(upload_id=upload_id, chunk_index=chunk_index, chunk_size=chunk_size, upload_time=now)],
+        )
+
+        return True
+
+    @classmethod
+    def delete_upload_session_dao(cls, db: Session, upload_ids: List[str]):
+        """
+        删除分片上传会话及其分片记录
+
+        :param db: orm对象
+        :param upload_ids: 上传会话ID列表
+        :return:
+        """
+        if not upload_ids:
+            return
+        db.execute(delete(IssueUploadChunk).where(IssueUploadChunk.upload_id.in_(upload_ids)))
+        db.execute(delete(IssueUploadSession).where(IssueUploadSession.upload_id.in_(upload_ids)))
+
+    @classmethod
+    def get_expired_upload_sessions(cls, db: Session, hours: int = 24):
+        """
+        获取超过指定时间未收到分片的上传会话
+
+        :param db: orm对象
+        :param hours: 小时数，默认24小时
+        :return: 过期的上传会话列表
+        """
+        threshold_time = datetime.now() - timedelta(hours=hours)
+
+        return (
+            db.execute(
+                select(IssueUploadSession).where(IssueUploadSession.update_time < threshold_time)
+            )
+            .scalars()
+            .all()
+        )
+
+    @classmethod
+    def _tag_key(cls, tag_name: str):
+        # 标签名按大小写不敏感匹配，与MySQL utf8mb4_unicode_ci唯一索引的比较规则保持一致
+        return tag_name.strip().lower()
+
+    @classmethod
+    def _tag_name_in(cls, db: Session, tag_names: List[str]):
+        if db.get_bind().dialect.name == "mysql":
+            return IssueTagDict.tag_name.in_(tag_names)
+        # 其他数据库默认区分大小写，按小写比较以保持与MySQL一致
+        return func.lower(IssueTagDict.tag_name).in_([cls._tag_key(name) for name in tag_names])
+
+    @classmethod
+    def get_or_create_tag_ids(cls, db: Session, tag_names: List[str]):
+        """
+        获取标签名对应的标签ID，标签字典中不存在的标签会被新增
+
+        :param db: orm对象
+        :param tag_names: 标签名列表
+        :return: 标签名(小写)与标签ID的映射
+        """
+        names = {cls._tag_key(name): name.strip() for name in tag_names if name and name.strip()}
+        if not names:
+            return {}
+        tag_id_map = {}
+        for offset in range(0, len(names), cls.ID_CHUNK_SIZE):
+            chunk = list(names.values())[offset : offset + cls.ID_CHUNK_SIZE]
+            for tag_id, tag_name in db.execute(
+                select(IssueTagDict.tag_id, IssueTagDict.tag_name).where(cls._tag_name_in(db, chunk))
+            ):
+                tag_id_map.setdefault(cls._tag_key(tag_name), tag_id)
+        missing = [name for key, name in names.items() if key not in tag_id_map]
+        if missing:
+            dialect_name = db.get_bind().dialect.name
+            if dialect_name == "mysql":
+                statement = mysql_insert(IssueTagDict).prefix_with("IGNORE")
+            elif dialect_name == "sqlite":
+                statement = sqlite_insert(IssueTagDict).on_conflict_do_nothing()
+            else:
+                statement = insert(IssueTagDict)
+            # 并发新增同名标签时忽略唯一键冲突，随后统一回查标签ID
+            db.execute(
+                statement,
+                [dict(tag_name=name, usage_count=0, create_time=datetime.now()) for name in missing],
+            )
+            for offset in range(0, len(missing), cls.ID_CHUNK_SIZE):
+                for tag_id, tag_name in db.execute(
+                    select(IssueTagDict.tag_id, IssueTagDict.tag_name).where(
+                        cls._tag_name_in(db, missing[offset : offset + cls.ID_CHUNK_SIZE])
+                    )
+                ):
+                    tag_id_map.setdefault(cls._tag_key(tag_name), tag_id)
+
+        return tag_id_map
+
+    @classmethod
+    def set_issue_tags(cls, db: Session, issue_id: int, tag_names: List[str]):
+        """
+        按差集更新Issue的标签，仅新增缺少的关联、删除多余的关联
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param tag_names: 目标标签名列表
+        :return: 是否有变更
+        """
+        current_tag_ids = set(
+            db.execute(select(IssueTag.tag_id).where(IssueTag.issue_id == issue_id)).scalars()
+        )
+        target_tag_ids = set(cls.get_or_create_tag_ids(db, tag_names).values())
+        added_tag_ids = target_tag_ids - current_tag_ids
+        removed_tag_ids = current_tag_ids - target_tag_ids
+        if added_tag_ids:
+            db.execute(
+                insert(IssueTag),
+                [dict(issue_id=issue_id, tag_id=tag_id) for tag_id in added_tag_ids],
+            )
+        if removed_tag_ids:
+            db.execute(
+                delete(IssueTag).where(
+                    IssueTag.issue_id == issue_id, IssueTag.tag_id.in_(removed_tag_ids)
+                )
+            )
+        cls._increase_tag_usage(
+            db,
+            {
+                **{tag_id: 1 for tag_id in added_tag_ids},
+                **{tag_id: -1 for tag_id in removed_tag_ids},
+            },
+        )
+
+        return bool(added_tag_ids or removed_tag_ids)
+
+    @classmethod
+    def decrease_tag_usage_by_issues(cls, db: Session, issue_ids: List[int]):
+        """
+        Issue被删除后扣减其标签的使用次数
+
+        :param db: orm对象
+        :param issue_ids: 被删除的Issue ID列表
+        :return:
+        """
+        usage_deltas = defaultdict(int)
+        for offset in range(0, len(issue_ids), cls.ID_CHUNK_SIZE):
+            for tag_id, count in db.execute(
+                select(IssueTag.tag_id, func.count())
+                .where(IssueTag.issue_id.in_(issue_ids[offset : offset + cls.ID_CHUNK_SIZE]))
+                .group_by(IssueTag.tag_id)
+            ):
+                usage_deltas[tag_id] -= count
+        cls._increase_tag_usage(db, usage_deltas)
+
+    @classmethod
+    def _increase_tag_usage(cls, db: Session, usage_deltas: dict):
+        """
+        累加标签使用次数(executemany)
+        """
+        params = [
+            dict(b_tag_id=tag_id, b_delta=delta)
+            for tag_id, delta in sorted(usage_deltas.items())
+            if delta
+        ]
+        if params:
+            db.connection().execute(
+                update(IssueTagDict)
+                .where(IssueTagDict.tag_id == bindparam("b_tag_id"))
+                .values(usage_count=IssueTagDict.usage_count + bindparam("b_delta")),
+                params,
+            )
+
+    @classmethod
+    def get_top_tags(cls, db: Session, limit: int):
+        """
+        获取使用次数最多的标签
+
+        :param db: orm对象
+        :param limit: 返回数量
+        :return: 标签列表
+        """
+        return db.execute(
+            select(IssueTagDict.tag_id, IssueTagDict.tag_name, IssueTagDict.usage_count)
+            .where(IssueTagDict.usage_count > 0)
+            .order_by(desc(IssueTagDict.usage_count), IssueTagDict.tag_name)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def reconcile_tag_usage(cls, db: Session):
+        """
+        以关联表的实际数据校准标签使用次数
+
+        :param db: orm对象
+        :return: 被修正的标签数
+        """
+        actual_count = (
+            select(func.count())
+            .select_from(IssueTag)
+            .join(IssueMain, IssueMain.issue_id == IssueTag.issue_id)
+            .where(IssueTag.tag_id == IssueTagDict.tag_id, IssueMain.del_flag == "0")
+            .scalar_subquery()
+        )
+        return db.execute(
+            update(IssueTagDict)
+            .where(IssueTagDict.usage_count != actual_count)
+            .values(usage_count=actual_count)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    @classmethod
+    def get_issue_statistics(cls, db: Session):
+        """
+        通过一次条件聚合查询实时统计Issue数据
+
+        :param db: orm对象
+        :return: 统计数据字典
+        """
+        current_month_start = datetime.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        diagnosis_count = (
+            select(func.count("*")).select_from(IssueDiagnosisLog).scalar_subquery()
+        )
+        row = db.execute(
+            select(
+                func.count("*").label("total_count"),
+                func.sum(case((IssueMain.create_time >= current_month_start, 1), else_=0)).label(
+                    "monthly_new_count"
+                ),
+                func.sum(case((IssueMain.status == "pending", 1), else_=0)).label("pending_count"),
+                diagnosis_count.label("diagnosis_count"),
+                func.sum(case((IssueMain.priority == "high", 1), else_=0)).label(
+                    "high_priority_count"
+                ),
+                func.sum(case((IssueMain.status == "completed", 1), else_=0)).label(
+                    "completed_count"
+                ),
+            )
+            .select_from(IssueMain)
+            .where(IssueMain.del_flag == "0")
+        ).one()
+
+        return {key: value or 0 for key, value in row._mapping.items()}
+
+    @classmethod
+    def get_monthly_stat_key(cls, create_time: datetime):
+        """
+        获取创建时间所在月份的新增计数项
+
+        :param create_time: 创建时间
+        :return: 计数项
+        """
+        return f"{cls.MONTHLY_STAT_KEY_PREFIX}{create_time:%Y-%m}"
+
+    @classmethod
+    def get_issue_stat_contribution(cls, status: str, priority: str, create_time: datetime):
+        """
+        获取单个(未删除)Issue对各计数项的贡献值
+
+        :param status: 状态
+        :param priority: 优先级
+        :param create_time: 创建时间
+        :return: 计数项与贡献值字典
+        """
+        contribution = {"total_count": 1}
+        if status == "pending":
+            contribution["pending_count"] = 1
+        elif status == "completed":
+            contribution["completed_count"] = 1
+        if priority == "high":
+            contribution["high_priority_count"] = 1
+        if create_time:
+            contribution[cls.get_monthly_stat_key(create_time)] = 1
+        return contribution
+
+    @classmethod
+    def get_issue_stat_counters(cls, db: Session):
+        """
+        从统计计数表读取Issue统计数据
+
+        :param db: orm对象
+        :return: 统计数据字典，计数项未初始化(需校准)时返回None
+        """
+        monthly_key = cls.get_monthly_stat_key(datetime.now())
+        keys = [*cls.STAT_KEYS, monthly_key]
+        counters = dict(
+            db.execute(
+                select(IssueStatCounter.counter_key, IssueStatCounter.counter_value).where(
+                    IssueStatCounter.counter_key.in_(keys)
+                )
+            ).all()
+        )
+        if len(counters) < len(keys):
+            return None
+        counters["monthly_new_count"] = counters.pop(monthly_key)
+
+        return {key: max(value, 0) for key, value in counters.items()}
+
+    @classmethod
+    def apply_stat_deltas(cls, db: Session, deltas: dict):
+        """
+        在当前事务内累加统计计数，计数项不存在时跳过，由校准任务补齐
+
+        :param db: orm对象
+        :param deltas: 计数项与增量字典
+        :return:
+        """
+        # 按固定顺序更新，避免并发事务交叉加锁导致死锁
+        for key in sorted(deltas):
+            delta = deltas[key]
+            if not delta:
+                continue
+            db.execute(
+                update(IssueStatCounter)
+                .where(IssueStatCounter.counter_key == key)
+                .values(
+                    counter_value=IssueStatCounter.counter_value + delta,
+                    update_time=datetime.now(),
+                )
+            )
+
+    @classmethod
+    def reconcile_issue_statistics(cls, db: Session):
+        """
+        以实时聚合结果校准统计计数表
+
+        :param db: orm对象
+        :return: 校准后的统计数据字典
+        """
+        now = datetime.now()
+        monthly_key = cls.get_monthly_stat_key(now)
+        keys = [*cls.STAT_KEYS, monthly_key]
+        # 先锁定计数行再做聚合：进行中的写事务提交后才能拿到锁，聚合结果因此包含其写入，
+        # 之后的写事务则会等待本次校准提交，校准期间不会丢失增量
+        existing_keys = set(
+            db.execute(
+                select(IssueStatCounter.counter_key)
+                .where(IssueStatCounter.counter_key.in_(keys))
+                .with_for_update()
+            ).scalars()
+        )
+        statistics = cls.get_issue_statistics(db)
+        values = {key: statistics[key] for key in cls.STAT_KEYS}
+        values[monthly_key] = statistics["monthly_new_count"]
+        for key, value in values.items():
+            if key in existing_keys:
+                db.execute(
+                    update(IssueStatCounter)
+                    .where(IssueStatCounter.counter_key == key)
+                    .values(counter_value=value, update_time=now)
+                )
+            else:
+                db.execute(
+                    insert(IssueStatCounter).values(
+                        counter_key=key, counter_value=value, update_time=now
+                    )
+                )
+
+        return statistics
 
     @classmethod
     def generate_issue_number(cls, db: Session) -> str:
@@ -454,29 +2160,75 @@ class IssueDao:
         :param db: orm对象
         :return: Issue编号
         """
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        day = current_date.day
+        return cls.allocate_issue_numbers(db, 1)[0]
 
-        # 查询当天最大的Issue编号
-        max_number = db.execute(
-            select(func.max(IssueMain.issue_number)).where(
-                IssueMain.issue_number.like(f"ISU-{year}-{month:02d}-{day:02d}-%")
-            )
-        ).scalar()
+    @classmethod
+    def allocate_issue_numbers(cls, db: Session, count: int, current_date: datetime = None) -> List[str]:
+        """
+        从按日序列中批量分配连续的Issue编号
 
-        print(f"Debug: max_number = {max_number}")  # 调试输出
+        序列在当前事务中递增，复用请求会话的连接，不额外占用连接池；序列行锁持有到业务事务结束，
+        同一天的并发新增依次分配，应在业务事务中尽早调用以缩短持锁时间；业务事务回滚时已分配的编号随之回收
 
-        if max_number:
-            # 提取序号并递增
+        :param db: orm对象
+        :param count: 分配数量
+        :param current_date: 编号日期，默认为当前日期
+        :return: Issue编号列表
+        """
+        if count <= 0:
+            return []
+        seq_date = (current_date or datetime.now()).strftime("%Y-%m-%d")
+        last_value = cls._increase_issue_number_sequence(db, seq_date, count)
+
+        return [f"ISU-{seq_date}-{value:04d}" for value in range(last_value - count + 1, last_value + 1)]
+
+    @classmethod
+    def _increase_issue_number_sequence(cls, db: Session, seq_date: str, count: int) -> int:
+        """
+        递增当日序列并返回递增后的最大序号，当日序列不存在时以已有最大编号初始化
+        """
+        increase = (
+            update(IssueNumberSequence)
+            .where(IssueNumberSequence.seq_date == seq_date)
+            .values(last_value=IssueNumberSequence.last_value + count, update_time=datetime.now())
+        )
+        if not db.execute(increase).rowcount:
+            # 兼容上线前按max(issue_number)生成的编号，序号超过4位时按长度优先取最大值
+            max_number = db.execute(
+                select(IssueMain.issue_number)
+                .where(IssueMain.issue_number.like(f"ISU-{seq_date}-%"))
+                .order_by(func.length(IssueMain.issue_number).desc(), IssueMain.issue_number.desc())
+                .limit(1)
+            ).scalar()
             try:
-                seq_num = int(max_number.split("-")[-1]) + 1
-            except (ValueError, IndexError):
-                seq_num = 1
-        else:
-            seq_num = 1
+                last_value = int(max_number.rsplit("-", 1)[-1]) if max_number else 0
+            except ValueError:
+                last_value = 0
+            values = dict(seq_date=seq_date, last_value=last_value + count, update_time=datetime.now())
+            # 其他事务同时初始化当日序列时改为递增
+            dialect_name = db.get_bind().dialect.name
+            if dialect_name == "mysql":
+                db.execute(
+                    mysql_insert(IssueNumberSequence)
+                    .values(**values)
+                    .on_duplicate_key_update(last_value=IssueNumberSequence.last_value + count)
+                )
+            elif dialect_name == "sqlite":
+                db.execute(
+                    sqlite_insert(IssueNumberSequence)
+                    .values(**values)
+                    .on_conflict_do_update(
+                        index_elements=[IssueNumberSequence.seq_date],
+                        set_=dict(last_value=IssueNumberSequence.last_value + count),
+                    )
+                )
+            else:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(IssueNumberSequence).values(**values))
+                except IntegrityError:
+                    db.execute(increase)
 
-        result = f"ISU-{year}-{month:02d}-{day:02d}-{seq_num:04d}"
-        print(f"Debug: generated issue_number = {result}")  # 调试输出
-        return result
+        return db.execute(
+            select(IssueNumberSequence.last_value).where(IssueNumberSequence.seq_date == seq_date)
+        ).scalar()
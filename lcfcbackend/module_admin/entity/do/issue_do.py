@@ -1,8 +1,13 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, Text, BigInteger, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Text, BigInteger, ForeignKey, Index, select
+from sqlalchemy.orm import column_property, relationship
 from config.database import Base
 
 
+# SQLite仅对INTEGER主键自增，测试库中使用Integer变体
+IdType = BigInteger().with_variant(Integer, "sqlite")
+
+
 class IssueMain(Base):
     """
     Issue主表
@@ -11,7 +16,7 @@ class IssueMain(Base):
     __tablename__ = "issue_main"
 
     issue_id = Column(
-        BigInteger, primary_key=True, autoincrement=True, comment="Issue ID"
+        IdType, primary_key=True, autoincrement=True, comment="Issue ID"
     )
     issue_number = Column(
         String(32), nullable=False, unique=True, comment="Issue编号(如ISU-2023-1542)"
@@ -39,6 +44,20 @@ class IssueMain(Base):
     update_time = Column(DateTime, comment="更新时间", default=datetime.now())
     del_flag = Column(String(1), default="0", comment="删除标志（0代表存在 2代表删除）")
 
+    # 关联数据仅用于详情加载(加载策略由查询时的options指定)，写操作仍通过各自的DAO完成
+    system_env = relationship("IssueSystemEnv", uselist=False, viewonly=True)
+    diagnosis_logs = relationship(
+        "IssueDiagnosisLog",
+        viewonly=True,
+        order_by="desc(IssueDiagnosisLog.operate_time)",
+    )
+    attachments = relationship(
+        "IssueAttachment",
+        viewonly=True,
+        order_by="desc(IssueAttachment.upload_time)",
+    )
+    tags = relationship("IssueTag", viewonly=True)
+
 
 class IssueSystemEnv(Base):
     """
@@ -47,7 +66,7 @@ class IssueSystemEnv(Base):
 
     __tablename__ = "issue_system_env"
 
-    env_id = Column(BigInteger, primary_key=True, autoincrement=True, comment="环境ID")
+    env_id = Column(IdType, primary_key=True, autoincrement=True, comment="环境ID")
     issue_id = Column(
         BigInteger,
         ForeignKey("issue_main.issue_id"),
@@ -69,7 +88,7 @@ class IssueDiagnosisLog(Base):
 
     __tablename__ = "issue_diagnosis_log"
 
-    log_id = Column(BigInteger, primary_key=True, autoincrement=True, comment="记录ID")
+    log_id = Column(IdType, primary_key=True, autoincrement=True, comment="记录ID")
     issue_id = Column(
         BigInteger,
         ForeignKey("issue_main.issue_id"),
@@ -90,7 +109,7 @@ class IssueAttachment(Base):
     __tablename__ = "issue_attachment"
 
     attachment_id = Column(
-        BigInteger, primary_key=True, autoincrement=True, comment="附件ID"
+        IdType, primary_key=True, autoincrement=True, comment="附件ID"
     )
     issue_id = Column(
         BigInteger,
@@ -104,26 +123,260 @@ class IssueAttachment(Base):
     file_type = Column(String(50), comment="文件类型")
     upload_time = Column(DateTime, comment="上传时间", default=datetime.now())
     upload_by = Column(String(64), comment="上传者")
+    file_hash = Column(String(64), index=True, comment="文件SHA-256摘要")
+    compressed_size = Column(BigInteger, comment="压缩存储后大小(字节)，未压缩时为空")
     status = Column(
         String(20), 
         nullable=False, 
         default="temporary", 
-        comment="附件状态(temporary临时,linked已关联)"
+        comment="附件状态(temporary临时,linked已关联,deleting删除中)"
+    )
+
+
+class IssueAttachmentBlob(Base):
+    """
+    Issue附件内容存储表(按SHA-256去重)
+    """
+
+    __tablename__ = "issue_attachment_blob"
+
+    file_hash = Column(String(64), primary_key=True, comment="文件SHA-256摘要")
+    file_path = Column(String(500), nullable=False, comment="文件存储路径")
+    file_size = Column(BigInteger, nullable=False, comment="文件大小(字节)")
+    ref_count = Column(BigInteger, nullable=False, default=0, comment="引用该文件的附件数")
+    compression = Column(String(16), index=True, comment="压缩方式(zstd已压缩 none不压缩 空为待压缩)")
+    compressed_size = Column(BigInteger, comment="压缩后大小(字节)")
+    create_time = Column(DateTime, comment="创建时间")
+
+
+class IssueAttachmentIndexDoc(Base):
+    """
+    Issue附件trigram索引文档表(每个文本存储文件或压缩包内的每个文本文件一条)
+    """
+
+    __tablename__ = "issue_attachment_index_doc"
+
+    doc_id = Column(IdType, primary_key=True, autoincrement=True, comment="索引文档ID")
+    file_hash = Column(String(64), nullable=False, index=True, comment="文件SHA-256摘要")
+    member_name = Column(String(500), nullable=False, default="", comment="压缩包内的文件名，非压缩包为空字符串")
+    content_size = Column(BigInteger, nullable=False, default=0, comment="建立索引的原始内容大小(字节)，无法读取时为0")
+    create_time = Column(DateTime, comment="创建时间")
+    index_time = Column(DateTime, comment="写入索引段的时间，为空表示正在建立索引")
+
+
+class IssueDumpAnalysis(Base):
+    """
+    dump附件分析结果表(按文件SHA-256摘要缓存，相同内容的附件共用分析结果)
+    """
+
+    __tablename__ = "issue_dump_analysis"
+
+    file_hash = Column(String(64), primary_key=True, comment="文件SHA-256摘要")
+    parser_version = Column(Integer, nullable=False, comment="解析器版本")
+    status = Column(String(16), nullable=False, comment="分析状态(success成功 failed失败)")
+    dump_type = Column(String(16), comment="dump类型(user用户态 kernel内核)")
+    exception_code = Column(String(10), index=True, comment="异常代码，内核dump为蓝屏代码")
+    exception_address = Column(String(18), comment="异常地址")
+    faulting_module = Column(String(255), index=True, comment="异常所在模块")
+    faulting_offset = Column(String(18), comment="异常地址相对模块基址的偏移")
+    faulting_module_version = Column(String(64), comment="异常所在模块的版本")
+    process_name = Column(String(255), comment="进程名")
+    os_build = Column(String(128), comment="系统版本号")
+    thread_count = Column(Integer, comment="线程数")
+    module_count = Column(Integer, comment="模块数")
+    crash_time = Column(DateTime, comment="dump生成时间")
+    crash_signature = Column(String(40), index=True, comment="崩溃签名，没有异常记录或分析失败时为空")
+    result = Column(Text, comment="完整分析结果(JSON，含模块列表)")
+    error_message = Column(String(500), comment="分析失败原因")
+    analyze_time = Column(DateTime, comment="分析时间")
+
+
+class IssueLogEventFile(Base):
+    """
+    日志附件结构化事件文件表(按文件SHA-256摘要，相同内容的附件共用事件文件)
+    """
+
+    __tablename__ = "issue_log_event_file"
+
+    file_hash = Column(String(64), primary_key=True, comment="文件SHA-256摘要")
+    pattern_version = Column(Integer, nullable=False, comment="日志格式版本")
+    status = Column(String(16), nullable=False, comment="提取状态(success成功 failed失败)")
+    event_count = Column(BigInteger, nullable=False, default=0, comment="事件数")
+    line_count = Column(BigInteger, nullable=False, default=0, comment="文件总行数")
+    begin_time = Column(DateTime, comment="最早的事件时间")
+    end_time = Column(DateTime, comment="最晚的事件时间")
+    event_file_size = Column(BigInteger, nullable=False, default=0, comment="事件文件大小(字节)")
+    error_message = Column(String(500), comment="提取失败原因")
+    extract_time = Column(DateTime, comment="提取时间")
+
+
+class IssueCrashBucket(Base):
+    """
+    崩溃分组表(崩溃签名相同的dump附件归为一组)
+    """
+
+    __tablename__ = "issue_crash_bucket"
+
+    signature = Column(String(40), primary_key=True, comment="崩溃签名")
+    dump_type = Column(String(16), comment="dump类型(user用户态 kernel内核)")
+    exception_code = Column(String(10), comment="异常代码，内核dump为蓝屏代码")
+    faulting_module = Column(String(255), comment="异常所在模块")
+    faulting_offset = Column(String(18), comment="异常地址相对模块基址的偏移")
+    first_hit_time = Column(DateTime, comment="首次出现时间(附件上传时间)")
+    last_hit_time = Column(DateTime, comment="最近出现时间(附件上传时间)")
+
+
+class IssueCrashBucketHit(Base):
+    """
+    崩溃分组命中表(每个已分析的dump附件一条)
+    """
+
+    __tablename__ = "issue_crash_bucket_hit"
+    __table_args__ = (
+        Index("idx_crash_bucket_hit_signature", "signature", "issue_id"),
+        Index("idx_crash_bucket_hit_time", "hit_time", "signature"),
     )
 
+    attachment_id = Column(IdType, primary_key=True, autoincrement=False, comment="附件ID")
+    signature = Column(String(40), nullable=False, comment="崩溃签名")
+    issue_id = Column(BigInteger, nullable=False, index=True, comment="Issue ID")
+    hit_time = Column(DateTime, nullable=False, comment="命中时间(附件上传时间)")
+
+
+class IssueUploadSession(Base):
+    """
+    Issue附件分片上传会话表
+    """
+
+    __tablename__ = "issue_upload_session"
+
+    upload_id = Column(String(32), primary_key=True, comment="上传会话ID")
+    file_name = Column(String(255), nullable=False, comment="原始文件名")
+    file_size = Column(BigInteger, nullable=False, comment="文件总大小(字节)")
+    chunk_size = Column(BigInteger, nullable=False, comment="分片大小(字节)")
+    temp_path = Column(String(500), nullable=False, comment="临时文件路径")
+    upload_by = Column(String(64), comment="上传者")
+    status = Column(
+        String(16), nullable=False, default="uploading", comment="会话状态(uploading上传中 completing完成中)"
+    )
+    create_time = Column(DateTime, comment="创建时间")
+    update_time = Column(DateTime, index=True, comment="最近一次收到分片的时间")
+
+
+class IssueUploadChunk(Base):
+    """
+    Issue附件分片上传已接收分片表
+    """
+
+    __tablename__ = "issue_upload_chunk"
+
+    upload_id = Column(
+        String(32),
+        ForeignKey("issue_upload_session.upload_id"),
+        primary_key=True,
+        comment="上传会话ID",
+    )
+    chunk_index = Column(BigInteger, primary_key=True, autoincrement=False, comment="分片序号")
+    chunk_size = Column(BigInteger, nullable=False, comment="分片大小(字节)")
+    upload_time = Column(DateTime, comment="接收时间")
+
+
+class IssueTagDict(Base):
+    """
+    Issue标签字典表
+    """
+
+    __tablename__ = "issue_tag_dict"
+
+    tag_id = Column(IdType, primary_key=True, autoincrement=True, comment="标签ID")
+    tag_name = Column(String(50), nullable=False, unique=True, comment="标签名称")
+    usage_count = Column(
+        BigInteger, nullable=False, default=0, index=True, comment="使用次数(关联的未删除Issue数)"
+    )
+    create_time = Column(DateTime, comment="创建时间", default=datetime.now)
+
 
 class IssueTag(Base):
     """
-    Issue标签表
+    Issue与标签关联表
     """
 
     __tablename__ = "issue_tag"
 
-    tag_id = Column(BigInteger, primary_key=True, autoincrement=True, comment="标签ID")
     issue_id = Column(
         BigInteger,
         ForeignKey("issue_main.issue_id"),
-        nullable=False,
+        primary_key=True,
+        autoincrement=False,
         comment="Issue ID",
     )
-    tag_name = Column(String(50), nullable=False, comment="标签名称")
+    tag_id = Column(
+        BigInteger,
+        ForeignKey("issue_tag_dict.tag_id"),
+        primary_key=True,
+        autoincrement=False,
+        index=True,
+        comment="标签ID",
+    )
+    tag_name = column_property(
+        select(IssueTagDict.tag_name)
+        .where(IssueTagDict.tag_id == tag_id)
+        .correlate_except(IssueTagDict)
+        .scalar_subquery()
+    )
+
+
+class IssueSearchDoc(Base):
+    """
+    Issue全文检索文档表
+    """
+
+    __tablename__ = "issue_search_doc"
+    __table_args__ = (
+        Index(
+            "ft_issue_search_content",
+            "content",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
+
+    issue_id = Column(
+        BigInteger,
+        ForeignKey("issue_main.issue_id"),
+        primary_key=True,
+        autoincrement=False,
+        comment="Issue ID",
+    )
+    content = Column(
+        Text, comment="检索文本(标题、问题描述、解决方案、诊断步骤、标签)"
+    )
+    update_time = Column(DateTime, comment="更新时间", default=datetime.now)
+
+
+class IssueStatCounter(Base):
+    """
+    Issue统计计数表
+    """
+
+    __tablename__ = "issue_stat_counter"
+
+    counter_key = Column(
+        String(64),
+        primary_key=True,
+        comment="计数项(total_count,pending_count,monthly_new_count:yyyy-MM等)",
+    )
+    counter_value = Column(BigInteger, nullable=False, default=0, comment="计数值")
+    update_time = Column(DateTime, comment="更新时间", default=datetime.now)
+
+
+class IssueNumberSequence(Base):
+    """
+    Issue编号按日序列表
+    """
+
+    __tablename__ = "issue_number_sequence"
+
+    seq_date = Column(String(10), primary_key=True, comment="序列日期(yyyy-MM-dd)")
+    last_value = Column(BigInteger, nullable=False, default=0, comment="当日已分配的最大序号")
+    update_time = Column(DateTime, comment="更新时间", default=datetime.now)
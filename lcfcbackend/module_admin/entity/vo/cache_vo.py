@@ -26,3 +26,17 @@ class CacheInfoModel(BaseModel):
     cache_name: Optional[str] = Field(default=None, description='缓存名称')
     cache_value: Optional[Any] = Field(default=None, description='缓存内容')
     remark: Optional[str] = Field(default=None, description='备注')
+
+
+class PageCountCacheStatsModel(BaseModel):
+    """
+    分页总数缓存统计信息对应pydantic模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    hits: Optional[int] = Field(default=0, description='命中次数')
+    misses: Optional[int] = Field(default=0, description='未命中次数')
+    hit_rate: Optional[float] = Field(default=0.0, description='命中率')
+    invalidations: Optional[int] = Field(default=0, description='表版本失效次数')
+    size: Optional[int] = Field(default=0, description='当前缓存条数')
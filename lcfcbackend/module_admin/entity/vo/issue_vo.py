@@ -3,6 +3,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from pydantic_validation_decorator import NotBlank, Size, Xss
 from typing import List, Literal, Optional, Union
+from config.constant import AttachmentIndexConstant, LogEventConstant, LogViewConstant
 from module_admin.annotation.pydantic_annotation import as_query
 
 
@@ -109,11 +110,406 @@ class IssueAttachmentModel(BaseModel):
     file_type: Optional[str] = Field(default=None, description="文件类型")
     upload_time: Optional[datetime] = Field(default=None, description="上传时间")
     upload_by: Optional[str] = Field(default=None, description="上传者")
+    file_hash: Optional[str] = Field(default=None, description="文件SHA-256摘要")
+    compressed_size: Optional[int] = Field(default=None, description="压缩存储后大小，未压缩时为空")
     status: Optional[Literal["temporary", "linked"]] = Field(
         default="temporary", description="附件状态(temporary临时,linked已关联)"
     )
 
 
+class UploadByHashModel(BaseModel):
+    """
+    秒传附件模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    file_name: str = Field(min_length=1, max_length=255, description="原始文件名")
+    file_size: int = Field(ge=0, description="文件大小(字节)")
+    file_hash: str = Field(min_length=64, max_length=64, description="文件SHA-256摘要")
+
+
+class UploadByHashResultModel(BaseModel):
+    """
+    秒传附件结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    hit: bool = Field(description="服务器是否已存储相同内容，未命中时需要上传文件内容")
+    attachment: Optional[IssueAttachmentModel] = Field(default=None, description="命中时创建的临时附件")
+
+
+class AttachmentStorageStatisticsModel(BaseModel):
+    """
+    附件存储空间统计模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    blob_count: int = Field(description="存储文件数")
+    compressed_count: int = Field(description="已压缩存储的文件数")
+    pending_count: int = Field(description="等待后台压缩的文件数")
+    original_size: int = Field(description="存储文件原始总大小(字节)")
+    stored_size: int = Field(description="实际占用磁盘大小(字节)")
+    saved_size: int = Field(description="压缩节省的磁盘空间(字节)")
+    compression_ratio: float = Field(description="原始大小与实际占用大小之比")
+
+
+class AttachmentGcResultModel(BaseModel):
+    """
+    临时附件及孤儿文件清理结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    session_count: int = Field(default=0, description="清理的过期分片上传会话数")
+    attachment_count: int = Field(default=0, description="删除的过期临时附件数")
+    batch_count: int = Field(default=0, description="处理的临时附件批次数")
+    released_blob_count: int = Field(default=0, description="引用计数归零后删除的存储文件数")
+    deleted_file_count: int = Field(default=0, description="删除的文件数(含附属文件)")
+    freed_size: int = Field(default=0, description="释放的磁盘空间(字节)")
+    failed_file_count: int = Field(default=0, description="删除失败的文件数")
+    scanned_file_count: int = Field(default=0, description="孤儿扫描检查的文件数")
+    orphan_file_count: int = Field(default=0, description="删除的孤儿文件数")
+    orphan_size: int = Field(default=0, description="孤儿文件占用的磁盘空间(字节)")
+    restored_file_count: int = Field(default=0, description="恢复的中断删除文件数")
+    missing_blob_count: int = Field(default=0, description="存储记录存在但文件缺失的数量")
+    elapsed: float = Field(default=0, description="耗时(秒)")
+
+
+class AttachmentLinesModel(BaseModel):
+    """
+    文本附件分页读取结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    attachment_id: int = Field(description="附件ID")
+    member_name: Optional[str] = Field(default=None, description="压缩包内的文件名，非压缩包为空")
+    start_line: int = Field(description="起始行号(从1开始)")
+    lines: List[str] = Field(default=[], description="行内容，超长的行被截断")
+    total_lines: int = Field(description="文件总行数")
+    next_line: Optional[int] = Field(default=None, description="下一页起始行号，已读到文件末尾时为空")
+
+
+@as_query
+class AttachmentSearchModel(BaseModel):
+    """
+    文本附件搜索查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    pattern: str = Field(
+        min_length=1, max_length=LogViewConstant.MAX_PATTERN_LENGTH, description="正则表达式"
+    )
+    member_name: Optional[str] = Field(default=None, description="压缩包内的文件名，搜索压缩包附件中的文本文件时指定")
+    ignore_case: bool = Field(default=False, description="是否忽略大小写")
+    start_line: int = Field(default=1, ge=1, description="从第几行开始搜索(从1开始)")
+    context_lines: int = Field(
+        default=2, ge=0, le=LogViewConstant.MAX_CONTEXT_LINES, description="匹配行前后返回的上下文行数"
+    )
+    max_results: int = Field(
+        default=100, ge=1, le=LogViewConstant.MAX_SEARCH_RESULTS, description="最多返回的匹配行数"
+    )
+
+
+class AttachmentSearchMatchModel(BaseModel):
+    """
+    文本附件搜索匹配行模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    line_number: int = Field(description="行号(从1开始)")
+    line: str = Field(description="匹配行内容")
+    before: List[str] = Field(default=[], description="匹配行之前的上下文")
+    after: List[str] = Field(default=[], description="匹配行之后的上下文")
+
+
+class AttachmentSearchResultModel(BaseModel):
+    """
+    文本附件搜索结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    matches: List[AttachmentSearchMatchModel] = Field(default=[], description="匹配行")
+    total_lines: int = Field(description="文件总行数")
+    next_line: Optional[int] = Field(
+        default=None, description="达到返回数量或扫描上限时继续搜索的起始行号，已搜索到文件末尾时为空"
+    )
+    truncated: bool = Field(default=False, description="是否因单次扫描的字节数或耗时达到上限而提前停止")
+
+
+class ArchiveMemberModel(BaseModel):
+    """
+    压缩包内文件模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    name: str = Field(description="文件名(含压缩包内路径)")
+    file_size: int = Field(description="原始大小(字节)")
+    compress_size: int = Field(description="压缩后大小(字节)")
+    compress_type: str = Field(description="压缩方式(stored,deflated,bzip2,lzma)")
+    modify_time: str = Field(description="修改时间")
+    is_dir: bool = Field(default=False, description="是否为目录")
+    encrypted: bool = Field(default=False, description="是否加密，加密的文件不支持读取")
+    viewable: bool = Field(default=False, description="是否支持在线查看")
+
+
+class AttachmentArchiveModel(BaseModel):
+    """
+    压缩包附件目录模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    attachment_id: int = Field(description="附件ID")
+    file_name: str = Field(description="附件文件名")
+    member_count: int = Field(description="压缩包内文件总数(含目录)")
+    total_size: int = Field(description="压缩包内文件原始总大小(字节)")
+    members: List[ArchiveMemberModel] = Field(default=[], description="压缩包内文件")
+    truncated: bool = Field(default=False, description="是否因达到数量上限而未返回全部文件")
+
+
+@as_query
+class AttachmentGrepModel(BaseModel):
+    """
+    跨附件搜索查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    pattern: str = Field(
+        min_length=1, max_length=AttachmentIndexConstant.MAX_PATTERN_LENGTH, description="搜索内容(字符串或正则表达式)"
+    )
+    regex: bool = Field(default=False, description="是否按正则表达式搜索")
+    ignore_case: bool = Field(default=False, description="是否忽略大小写")
+    max_matches: int = Field(
+        default=100, ge=1, le=AttachmentIndexConstant.MAX_MATCHES, description="最多返回的附件数"
+    )
+    max_offsets: int = Field(
+        default=10, ge=1, le=AttachmentIndexConstant.MAX_OFFSETS, description="每个附件最多返回的匹配偏移数"
+    )
+
+
+class AttachmentGrepMatchModel(BaseModel):
+    """
+    跨附件搜索匹配附件模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    issue_id: int = Field(description="Issue ID")
+    attachment_id: int = Field(description="附件ID")
+    file_name: str = Field(description="附件文件名")
+    member_name: Optional[str] = Field(default=None, description="压缩包内的文件名，非压缩包为空")
+    offsets: List[int] = Field(default=[], description="匹配位置在文件(压缩包内的文件)原始内容中的字节偏移")
+    more_offsets: bool = Field(default=False, description="是否还有未返回的匹配位置")
+
+
+class AttachmentGrepResultModel(BaseModel):
+    """
+    跨附件搜索结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    issue_ids: List[int] = Field(default=[], description="包含匹配内容的Issue ID(降序)")
+    matches: List[AttachmentGrepMatchModel] = Field(default=[], description="包含匹配内容的附件")
+    candidate_count: int = Field(description="索引筛选出的候选文件数")
+    scanned_count: int = Field(description="实际扫描校验的文件数")
+    truncated: bool = Field(default=False, description="是否因达到数量上限而未返回全部结果")
+
+
+@as_query
+class LogEventQueryModel(BaseModel):
+    """
+    日志事件查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    begin_time: Optional[datetime] = Field(default=None, description="起始时间(包含)")
+    end_time: Optional[datetime] = Field(default=None, description="结束时间(不包含)")
+    level: Optional[Literal["DEBUG", "INFO", "WARN", "ERROR", "FATAL"]] = Field(
+        default=None, description="最低级别，返回该级别及更严重的事件"
+    )
+    component: Optional[str] = Field(default=None, max_length=64, description="组件(忽略大小写)")
+    error_code: Optional[str] = Field(default=None, max_length=64, description="错误代码(忽略大小写)")
+    limit: int = Field(
+        default=200, ge=1, le=LogEventConstant.MAX_RESULTS, description="最多返回的事件数，按时间顺序返回最早的事件"
+    )
+
+
+class LogEventModel(BaseModel):
+    """
+    日志事件模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    attachment_id: int = Field(description="附件ID")
+    file_name: str = Field(description="文件名")
+    line_number: int = Field(description="行号(从1开始)")
+    event_time: Optional[datetime] = Field(default=None, description="事件时间，日志中没有时间时为空")
+    level: Optional[str] = Field(default=None, description="级别")
+    component: Optional[str] = Field(default=None, description="组件")
+    error_code: Optional[str] = Field(default=None, description="错误代码")
+    message: str = Field(description="事件所在行内容，超长的行被截断")
+
+
+class LogEventResultModel(BaseModel):
+    """
+    日志事件查询结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    total: int = Field(description="满足条件的事件总数")
+    file_count: int = Field(description="扫描的事件文件数")
+    pending_count: int = Field(description="尚未提取事件的日志附件数")
+    events: List[LogEventModel] = Field(default=[], description="事件列表，按时间排序")
+
+
+class DumpModuleModel(BaseModel):
+    """
+    dump中加载的模块模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    name: str = Field(description="模块名")
+    base_address: str = Field(description="模块基址")
+    size: int = Field(description="模块大小(字节)")
+    version: Optional[str] = Field(default=None, description="文件版本")
+    timestamp: int = Field(description="模块链接时间戳")
+
+
+class DumpAnalysisModel(BaseModel):
+    """
+    dump附件分析结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    attachment_id: int = Field(description="附件ID")
+    file_name: str = Field(description="文件名")
+    status: Literal["pending", "success", "failed"] = Field(description="分析状态(pending等待分析)")
+    dump_type: Optional[str] = Field(default=None, description="dump类型(user用户态 kernel内核)")
+    crash_time: Optional[datetime] = Field(default=None, description="dump生成时间")
+    exception_code: Optional[str] = Field(default=None, description="异常代码，内核dump为蓝屏代码")
+    exception_address: Optional[str] = Field(default=None, description="异常地址")
+    exception_parameters: List[str] = Field(default=[], description="异常参数，内核dump为蓝屏参数")
+    exception_thread_id: Optional[int] = Field(default=None, description="发生异常的线程ID")
+    faulting_module: Optional[str] = Field(default=None, description="异常所在模块")
+    faulting_offset: Optional[str] = Field(default=None, description="异常地址相对模块基址的偏移")
+    faulting_module_version: Optional[str] = Field(default=None, description="异常所在模块的版本")
+    process_name: Optional[str] = Field(default=None, description="进程名")
+    process_id: Optional[int] = Field(default=None, description="进程ID")
+    os_version: Optional[str] = Field(default=None, description="系统版本")
+    os_build: Optional[str] = Field(default=None, description="系统版本号")
+    processor_architecture: Optional[str] = Field(default=None, description="处理器架构")
+    processor_count: Optional[int] = Field(default=None, description="处理器数")
+    thread_count: Optional[int] = Field(default=None, description="线程数")
+    modules: List[DumpModuleModel] = Field(default=[], description="模块列表")
+    error_message: Optional[str] = Field(default=None, description="分析失败原因")
+    analyze_time: Optional[datetime] = Field(default=None, description="分析时间")
+
+
+class CrashBucketIssueModel(BaseModel):
+    """
+    崩溃分组内的Issue模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, from_attributes=True)
+
+    issue_id: int = Field(description="Issue ID")
+    issue_number: str = Field(description="Issue编号")
+    title: str = Field(description="Issue标题")
+    status: Optional[str] = Field(default=None, description="Issue状态")
+    hit_count: int = Field(description="该Issue中属于本分组的dump附件数")
+    last_hit_time: Optional[datetime] = Field(default=None, description="最近命中时间")
+
+
+class CrashBucketModel(BaseModel):
+    """
+    崩溃分组模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, from_attributes=True)
+
+    signature: str = Field(description="崩溃签名")
+    dump_type: Optional[str] = Field(default=None, description="dump类型(user用户态 kernel内核)")
+    exception_code: Optional[str] = Field(default=None, description="异常代码，内核dump为蓝屏代码")
+    faulting_module: Optional[str] = Field(default=None, description="异常所在模块")
+    faulting_offset: Optional[str] = Field(default=None, description="异常地址相对模块基址的偏移")
+    hit_count: int = Field(description="命中的dump附件数，热门分组只统计时间范围内的命中")
+    issue_count: int = Field(description="命中的Issue数，热门分组只统计时间范围内的命中")
+    first_hit_time: Optional[datetime] = Field(default=None, description="首次出现时间")
+    last_hit_time: Optional[datetime] = Field(default=None, description="最近出现时间")
+    issues: List[CrashBucketIssueModel] = Field(default=[], description="分组内的Issue，按最近命中时间倒序")
+
+
+class AnalysisJobModel(BaseModel):
+    """
+    附件分析任务模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    job_id: int = Field(description="任务ID")
+    job_type: str = Field(description="任务类型(dump_analysis dump分析 log_events 日志事件提取)")
+    issue_id: Optional[int] = Field(default=None, description="Issue ID，补偿任务为空")
+    priority: str = Field(description="优先级")
+    status: Literal["queued", "running", "success", "failed"] = Field(
+        description="状态(queued等待执行 running执行中 success成功 failed失败)"
+    )
+    attempts: int = Field(description="已执行次数")
+    max_attempts: int = Field(description="最多执行次数")
+    processed: int = Field(default=0, description="已处理的文件数")
+    total: int = Field(default=0, description="需要处理的文件数")
+    progress: float = Field(default=0, description="进度百分比")
+    message: Optional[str] = Field(default=None, description="执行结果")
+    error: Optional[str] = Field(default=None, description="最近一次失败原因")
+    worker: Optional[str] = Field(default=None, description="最近一次执行的worker")
+    enqueue_time: Optional[datetime] = Field(default=None, description="提交时间")
+    start_time: Optional[datetime] = Field(default=None, description="最近一次开始执行时间")
+    finish_time: Optional[datetime] = Field(default=None, description="结束时间")
+    next_run_time: Optional[datetime] = Field(default=None, description="等待重试时的下次执行时间")
+
+
+class CreateUploadSessionModel(BaseModel):
+    """
+    创建分片上传会话模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    file_name: str = Field(min_length=1, max_length=255, description="原始文件名")
+    file_size: int = Field(gt=0, description="文件总大小(字节)")
+    chunk_size: Optional[int] = Field(default=None, gt=0, description="分片大小(字节)，不指定时使用默认值")
+
+
+class UploadSessionModel(BaseModel):
+    """
+    分片上传会话进度模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    upload_id: str = Field(description="上传会话ID")
+    file_name: str = Field(description="原始文件名")
+    file_size: int = Field(description="文件总大小(字节)")
+    chunk_size: int = Field(description="分片大小(字节)，最后一个分片可小于该值")
+    chunk_count: int = Field(description="分片总数")
+    uploaded_chunks: List[int] = Field(default=[], description="已接收的分片序号")
+    uploaded_size: int = Field(default=0, description="已接收的字节数")
+
+
 class IssueTagModel(BaseModel):
     """
     Issue标签表对应pydantic模型
@@ -126,6 +522,18 @@ class IssueTagModel(BaseModel):
     tag_name: Optional[str] = Field(default=None, description="标签名称")
 
 
+class IssueTagCountModel(BaseModel):
+    """
+    标签使用次数模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, from_attributes=True)
+
+    tag_id: int = Field(description="标签ID")
+    tag_name: str = Field(description="标签名称")
+    usage_count: int = Field(description="使用次数")
+
+
 class IssueDetailModel(BaseModel):
     """
     Issue详情信息响应模型
@@ -151,6 +559,13 @@ class IssueQueryModel(IssueMainModel):
 
     begin_time: Optional[str] = Field(default=None, description="开始时间")
     end_time: Optional[str] = Field(default=None, description="结束时间")
+    keyword: Optional[str] = Field(
+        default=None,
+        description="全文检索关键字(检索标题、问题描述、解决方案、诊断步骤和标签，结果按相关度排序)",
+    )
+    tag_names: Optional[str] = Field(
+        default=None, description="标签名称，多个以逗号分隔，返回同时包含全部标签的Issue"
+    )
 
 
 @as_query
@@ -161,6 +576,16 @@ class IssuePageQueryModel(IssueQueryModel):
 
     page_num: int = Field(default=1, description="当前页码")
     page_size: int = Field(default=10, description="每页记录数")
+    page_mode: Literal["offset", "cursor"] = Field(
+        default="offset",
+        description="分页模式(offset页码分页,cursor游标分页，按创建时间和ID定位，适合深度翻页)",
+    )
+    cursor: Optional[str] = Field(
+        default=None, description="游标分页时上一页返回的nextCursor，为空表示第一页"
+    )
+    with_total: Optional[bool] = Field(
+        default=None, description="游标分页时是否统计总记录数，默认不统计"
+    )
 
 
 class AddIssueModel(IssueMainModel):
@@ -197,6 +622,67 @@ class DeleteIssueModel(BaseModel):
     update_time: Optional[datetime] = Field(default=None, description="更新时间")
 
 
+class IssueBatchFilterModel(BaseModel):
+    """
+    批量操作Issue过滤条件模型，只包含列表查询实际生效的条件，不支持的字段直接拒绝
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, extra="forbid")
+
+    issue_id: Optional[int] = Field(default=None, description="Issue ID")
+    issue_number: Optional[str] = Field(default=None, description="Issue编号")
+    title: Optional[str] = Field(default=None, description="Issue标题")
+    priority: Optional[Literal["high", "medium", "low"]] = Field(
+        default=None, description="优先级"
+    )
+    status: Optional[Literal["pending", "diagnosing", "completed", "cancelled"]] = (
+        Field(default=None, description="状态")
+    )
+    issue_type: Optional[str] = Field(default=None, description="Issue类型")
+    issue_source: Optional[str] = Field(default=None, description="Issue来源")
+    create_by: Optional[str] = Field(default=None, description="创建者")
+    begin_time: Optional[str] = Field(default=None, description="开始时间(需与结束时间同时指定)")
+    end_time: Optional[str] = Field(default=None, description="结束时间(需与开始时间同时指定)")
+    keyword: Optional[str] = Field(default=None, description="全文检索关键字")
+    tag_names: Optional[str] = Field(
+        default=None, description="标签名称，多个以逗号分隔，返回同时包含全部标签的Issue"
+    )
+
+
+class BatchIssueModel(BaseModel):
+    """
+    批量操作Issue模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    issue_ids: Optional[List[int]] = Field(default=None, description="需要操作的Issue ID列表")
+    filter: Optional[IssueBatchFilterModel] = Field(
+        default=None, description="过滤条件(与列表查询参数一致)，未指定issueIds时按过滤条件批量操作"
+    )
+    status: Optional[Literal["pending", "diagnosing", "completed", "cancelled"]] = (
+        Field(default=None, description="目标状态")
+    )
+    priority: Optional[Literal["high", "medium", "low"]] = Field(
+        default=None, description="目标优先级"
+    )
+    update_by: Optional[str] = Field(default=None, description="更新者")
+    update_time: Optional[datetime] = Field(default=None, description="更新时间")
+
+
+class BatchIssueResultModel(BaseModel):
+    """
+    批量操作Issue结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    matched_count: int = Field(
+        default=0, description="待操作的Issue数(ID列表去重后的数量或过滤条件命中数)"
+    )
+    affected_count: int = Field(default=0, description="实际变更的Issue数")
+
+
 class AddDiagnosisLogModel(IssueDiagnosisLogModel):
     """
     新增诊断记录模型
@@ -205,6 +691,30 @@ class AddDiagnosisLogModel(IssueDiagnosisLogModel):
     pass
 
 
+class BatchAddDiagnosisLogModel(BaseModel):
+    """
+    批量新增诊断记录模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    logs: List[AddDiagnosisLogModel] = Field(
+        min_length=1, max_length=1000, description="诊断记录列表，可包含多个Issue的诊断步骤"
+    )
+
+
+class BatchAddDiagnosisLogResultModel(BaseModel):
+    """
+    批量新增诊断记录结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    log_count: int = Field(default=0, description="新增的诊断记录数")
+    issue_count: int = Field(default=0, description="涉及的Issue数")
+    diagnosing_count: int = Field(default=0, description="由待诊断变更为诊断中的Issue数")
+
+
 class IssueStatisticsModel(BaseModel):
     """
     Issue统计数据模型
@@ -248,8 +758,13 @@ class IssueListResponseModel(BaseModel):
     rows: List[IssueMainModel] = Field(default=[], description="Issue列表数据")
     page_num: Optional[int] = Field(default=None, description="当前页码")
     page_size: Optional[int] = Field(default=None, description="每页记录数")
-    total: int = Field(description="总记录数")
+    total: Optional[int] = Field(
+        default=None, description="总记录数(游标分页未要求统计时为空)"
+    )
     has_next: Optional[bool] = Field(default=None, description="是否有下一页")
+    next_cursor: Optional[str] = Field(
+        default=None, alias="nextCursor", description="游标分页时下一页的游标"
+    )
 
 
 class IssueDetailResponseModel(BaseModel):
@@ -302,4 +817,30 @@ class UploadAttachmentResponseModel(BaseModel):
     file_name: str = Field(description="文件名")
     file_path: str = Field(description="文件路径")
     file_size: int = Field(description="文件大小")
-    file_type: str = Field(description="文件类型")
\ No newline at end of file
+    file_type: str = Field(description="文件类型")
+
+class IssueImportErrorModel(BaseModel):
+    """
+    Issue导入错误行模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    row_number: int = Field(description="文件中的行号")
+    title: Optional[str] = Field(default=None, description="Issue标题")
+    message: str = Field(description="错误信息")
+
+
+class IssueImportResultModel(BaseModel):
+    """
+    Issue批量导入结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    total_count: int = Field(default=0, description="数据行数")
+    success_count: int = Field(default=0, description="导入成功数")
+    failure_count: int = Field(default=0, description="导入失败数")
+    errors: List[IssueImportErrorModel] = Field(
+        default=[], description="错误行明细(最多返回前1000条)"
+    )
@@ -1,8 +1,9 @@
 from fastapi import Request
 from config.enums import RedisInitKeyConfig
 from config.get_redis import RedisUtil
-from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
+from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel, PageCountCacheStatsModel
 from module_admin.entity.vo.common_vo import CrudResponseModel
+from utils.page_util import PageCountCache
 
 
 class CacheService:
@@ -120,5 +121,26 @@ class CacheService:
 
         RedisUtil.init_sys_dict(request.app.state.redis)
         RedisUtil.init_sys_config(request.app.state.redis)
+        PageCountCache.clear()
 
         return CrudResponseModel(is_success=True, message='所有缓存清除成功')
+
+    @classmethod
+    def get_page_count_cache_stats_services(cls):
+        """
+        获取分页总数缓存统计信息service
+
+        :return: 分页总数缓存统计信息
+        """
+        return PageCountCacheStatsModel(**PageCountCache.stats())
+
+    @classmethod
+    def clear_page_count_cache_services(cls):
+        """
+        清空分页总数缓存service
+
+        :return: 操作缓存响应信息
+        """
+        PageCountCache.clear()
+
+        return CrudResponseModel(is_success=True, message='分页总数缓存清除成功')
@@ -1,5 +1,4 @@
 import os
-from datetime import datetime
 from fastapi import BackgroundTasks, Request, UploadFile
 from config.env import UploadConfig
 from exceptions.exception import ServiceException
@@ -24,13 +23,12 @@ class CommonService:
         if not UploadUtil.check_file_extension(file):
             raise ServiceException(message='文件类型不合法')
         else:
-            relative_path = f'upload/{datetime.now().strftime("%Y")}/{datetime.now().strftime("%m")}/{datetime.now().strftime("%d")}'
+            relative_path, filename = UploadUtil.generate_upload_file_path(file.filename)
             dir_path = os.path.join(UploadConfig.UPLOAD_PATH, relative_path)
             try:
                 os.makedirs(dir_path)
             except FileExistsError:
                 pass
-            filename = f'{file.filename.rsplit(".", 1)[0]}_{datetime.now().strftime("%Y%m%d%H%M%S")}{UploadConfig.UPLOAD_MACHINE}{UploadUtil.generate_random_number()}.{file.filename.rsplit(".")[-1]}'
             filepath = os.path.join(dir_path, filename)
             with open(filepath, 'wb') as f:
                 # 流式写出大型文件，这里的10代表10MB
@@ -74,7 +72,7 @@ class CommonService:
         下载上传目录文件service
 
         :param resource: 下载的文件名称
-        :return: 上传结果
+        :return: 文件路径
         """
         filepath = os.path.join(resource.replace(UploadConfig.UPLOAD_PREFIX, UploadConfig.UPLOAD_PATH))
         filename = resource.rsplit('/', 1)[-1]
@@ -88,4 +86,4 @@ class CommonService:
         elif not UploadUtil.check_file_exists(filepath):
             raise ServiceException(message='文件不存在')
         else:
-            return CrudResponseModel(is_success=True, result=UploadUtil.generate_file(filepath), message='下载成功')
+            return CrudResponseModel(is_success=True, result=filepath, message='下载成功')
@@ -1,9 +1,37 @@
-from datetime import datetime
+import json
+import os
+import re
+import struct
+import time
+import uuid
+import zipfile
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import chain
+from pydantic import ValidationError
+from pydantic.alias_generators import to_camel
 from sqlalchemy.orm.session import Session
-from sqlalchemy import text
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, BinaryIO, Callable, Iterator, List, Optional
+from config.constant import (
+    AnalysisJobConstant,
+    ArchiveConstant,
+    AttachmentConstant,
+    AttachmentGcConstant,
+    AttachmentIndexConstant,
+    DumpAnalysisConstant,
+    ExportConstant,
+    LogEventConstant,
+    LogViewConstant,
+)
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
 from module_admin.dao.issue_dao import IssueDao
-from module_admin.entity.do.issue_do import IssueMain
+from module_admin.entity.do.issue_do import IssueAttachment, IssueAttachmentIndexDoc, IssueMain, IssueUploadSession
 from module_admin.entity.vo.issue_vo import (
     AddIssueModel,
     DeleteIssueModel,
@@ -13,16 +41,60 @@ from module_admin.entity.vo.issue_vo import (
     IssueSystemEnvModel,
     IssueAttachmentModel,
     IssueTagModel,
+    IssueDiagnosisLogModel,
     AddDiagnosisLogModel,
+    BatchAddDiagnosisLogModel,
+    BatchAddDiagnosisLogResultModel,
     IssueStatisticsResponseModel,
     IssueListResponseModel,
     IssueDetailResponseModel,
     IssueOptionsResponseModel,
     IssueOptionItemModel,
+    IssueImportErrorModel,
+    IssueImportResultModel,
+    BatchIssueModel,
+    BatchIssueResultModel,
+    IssueTagCountModel,
+    CreateUploadSessionModel,
+    UploadSessionModel,
+    UploadByHashModel,
+    UploadByHashResultModel,
+    AttachmentStorageStatisticsModel,
+    AttachmentLinesModel,
+    AttachmentSearchModel,
+    AttachmentSearchMatchModel,
+    AttachmentSearchResultModel,
+    AttachmentGrepModel,
+    AttachmentGrepMatchModel,
+    AttachmentGrepResultModel,
+    ArchiveMemberModel,
+    AttachmentArchiveModel,
+    AttachmentGcResultModel,
+    DumpAnalysisModel,
+    CrashBucketIssueModel,
+    CrashBucketModel,
+    LogEventQueryModel,
+    LogEventModel,
+    LogEventResultModel,
+    AnalysisJobModel,
 )
+from utils.compress_util import CompressUtil, SeekableZstdReader
+from utils.export_util import ExportUtil
+from utils.import_util import ImportUtil
+from utils.job_queue_util import JobQueueUtil
+from utils.log_util import logger
+from utils.log_event_util import LogEventFile, LogEventUtil
+from utils.log_view_util import LogViewUtil
+from utils.minidump_util import MinidumpUtil
+from utils.storage_util import StorageUtil
+from utils.transaction_util import TransactionUtil
+from utils.trigram_util import TrigramIndex, TrigramUtil
+from utils.zip_stream_util import ZipStreamEntry, ZipStreamUtil
+from utils.zip_util import ZipUtil
+from utils.upload_util import UploadUtil
 from utils.response_util import ResponseUtil
 from module_admin.entity.vo.common_vo import CrudResponseModel
-from utils.common_util import export_list2excel
+from utils.common_util import CamelCaseUtil
 
 
 class IssueService:
@@ -30,6 +102,47 @@ class IssueService:
     Issue管理模块服务层
     """
 
+    # 附件关联到Issue并提交后触发后台建立附件索引的回调，由服务启动时设置；未设置时由定时任务补偿索引
+    attachment_index_trigger: Optional[Callable[[], None]] = None
+    # 批量导入时每批写入的行数
+    IMPORT_BATCH_SIZE = 500
+    # 导入结果中返回的错误行明细上限
+    IMPORT_ERROR_LIMIT = 1000
+    # 导入文件表头(与导出文件一致的中文表头)与字段的映射
+    IMPORT_HEADER_MAPPING = {
+        "Issue标题": "title",
+        "优先级": "priority",
+        "状态": "status",
+        "Issue类型": "issueType",
+        "Issue来源": "issueSource",
+        "问题描述": "description",
+        "解决方案": "solution",
+        "预期解决日期": "expectedResolveDate",
+        "标签": "tags",
+        "CPU信息": "cpuInfo",
+        "内存信息": "memoryInfo",
+        "显卡信息": "gpuInfo",
+        "操作系统信息": "osInfo",
+        "显卡驱动版本": "gpuDriverVersion",
+        "BIOS版本": "biosVersion",
+    }
+    IMPORT_HEADER_MAPPING_REVERSE = {value: key for key, value in IMPORT_HEADER_MAPPING.items()}
+    IMPORT_SYSTEM_ENV_FIELDS = (
+        "cpuInfo",
+        "memoryInfo",
+        "gpuInfo",
+        "osInfo",
+        "gpuDriverVersion",
+        "biosVersion",
+    )
+    IMPORT_PRIORITY_MAPPING = {"高": "high", "中": "medium", "低": "low"}
+    IMPORT_STATUS_MAPPING = {
+        "待诊断": "pending",
+        "诊断中": "diagnosing",
+        "已完成": "completed",
+        "已取消": "cancelled",
+    }
+
     @classmethod
     def get_issue_detail_services(cls, db: Session, issue_id: int):
         """
@@ -45,13 +158,20 @@ class IssueService:
             # 返回None表示出错，Controller层会处理
             return None
 
-        # 转换为响应模型
+        # 转换为响应模型(VO字段以小驼峰为别名，需先将ORM对象转换为小驼峰字典)
+        issue_info = CamelCaseUtil.transform_result(issue_detail_result["issue_info"])
+        system_env = CamelCaseUtil.transform_result(issue_detail_result["system_env"])
+        diagnosis_logs = CamelCaseUtil.transform_result(
+            issue_detail_result["diagnosis_logs"]
+        )
+        attachments = CamelCaseUtil.transform_result(issue_detail_result["attachments"])
+        tags = CamelCaseUtil.transform_result(issue_detail_result["tags"])
         response_model = IssueDetailResponseModel(
-            issue_info=issue_detail_result["issue_info"],
-            system_env=issue_detail_result["system_env"],
-            diagnosis_logs=issue_detail_result["diagnosis_logs"] or [],
-            attachments=issue_detail_result["attachments"] or [],
-            tags=issue_detail_result["tags"] or [],
+            issue_info=IssueMainModel(**issue_info),
+            system_env=IssueSystemEnvModel(**system_env) if system_env else None,
+            diagnosis_logs=[IssueDiagnosisLogModel(**row) for row in diagnosis_logs],
+            attachments=[IssueAttachmentModel(**row) for row in attachments],
+            tags=[IssueTagModel(**row) for row in tags],
         )
 
         return response_model
@@ -79,6 +199,7 @@ class IssueService:
                 page_size=issue_list_result.page_size,
                 total=issue_list_result.total,
                 has_next=issue_list_result.has_next,
+                next_cursor=issue_list_result.next_cursor,
             )
         else:
             # 不分页时，只返回列表数据
@@ -133,16 +254,20 @@ class IssueService:
 
             # 添加标签信息
             if add_issue.tags:
-                for tag_name in add_issue.tags:
-                    if tag_name.strip():  # 过滤空字符串
-                        tag = IssueTagModel(
-                            issueId=db_issue.issue_id, tagName=tag_name.strip()
-                        )
-                        IssueDao.add_tag_dao(db, tag)
+                IssueDao.set_issue_tags(db, db_issue.issue_id, add_issue.tags)
 
             # 关联附件（将临时附件关联到Issue）
             if add_issue.attachment_ids:
-                IssueDao.link_attachments_to_issue(db, db_issue.issue_id, add_issue.attachment_ids)
+                cls._link_attachments(db, db_issue.issue_id, db_issue.priority, add_issue.attachment_ids)
+
+            # 更新全文检索文档及统计计数
+            IssueDao.refresh_search_doc(db, [db_issue.issue_id])
+            IssueDao.apply_stat_deltas(
+                db,
+                IssueDao.get_issue_stat_contribution(
+                    db_issue.status, db_issue.priority, db_issue.create_time
+                ),
+            )
 
             db.commit()
             return CrudResponseModel(is_success=True, message="新增成功")
@@ -151,6 +276,198 @@ class IssueService:
             db.rollback()
             return CrudResponseModel(is_success=False, message=f"新增失败: {str(e)}")
 
+    @classmethod
+    def _link_attachments(cls, db: Session, issue_id: int, priority: str, attachment_ids: List[int]):
+        """
+        将临时附件关联到Issue，所有关联附件的入口均通过该方法；事务提交后触发建立附件索引，
+        并按关联的附件类型提交分析任务由worker按Issue优先级执行
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param priority: Issue优先级
+        :param attachment_ids: 附件ID列表
+        """
+        IssueDao.link_attachments_to_issue(db, issue_id, attachment_ids)
+        if cls.attachment_index_trigger is not None:
+            TransactionUtil.after_commit(db, cls.attachment_index_trigger, key="index_attachments")
+        for job_type, file_types in AnalysisJobConstant.JOB_TYPES.items():
+            if IssueDao.has_linked_attachments(db, issue_id, attachment_ids, file_types):
+                JobQueueUtil.enqueue_after_commit(db, job_type, issue_id, priority)
+
+    @classmethod
+    def import_issue_services(
+            cls, db: Session, file: BinaryIO, filename: str, current_user=None
+    ):
+        """
+        批量导入Issue services
+
+        逐行校验并按批写入，单行校验失败或写入失败不影响其他行
+
+        :param db: orm对象
+        :param file: 导入文件(JSONL、CSV、Excel)二进制对象
+        :param filename: 导入文件名
+        :param current_user: 当前用户对象
+        :return: 导入结果
+        """
+        file_format = ImportUtil.get_file_format(filename)
+        operator = (
+            current_user.user.user_name
+            if hasattr(current_user, "user")
+            else getattr(current_user, "user_name", "admin")
+        )
+        result = IssueImportResultModel()
+        errors = []
+        batch = []
+        for row_number, row, error in ImportUtil.iter_rows(file, file_format):
+            result.total_count += 1
+            if error is None:
+                try:
+                    batch.append((row_number, cls._build_import_issue(row)))
+                except Exception as e:
+                    error = cls._format_import_error(e)
+            if error is not None:
+                errors.append(
+                    IssueImportErrorModel(
+                        rowNumber=row_number, title=cls._get_import_title(row), message=error
+                    )
+                )
+            if len(batch) >= cls.IMPORT_BATCH_SIZE:
+                errors.extend(cls._flush_import_batch(db, batch, operator))
+                batch = []
+        errors.extend(cls._flush_import_batch(db, batch, operator))
+
+        result.failure_count = len(errors)
+        result.success_count = result.total_count - result.failure_count
+        result.errors = sorted(errors, key=lambda item: item.row_number)[: cls.IMPORT_ERROR_LIMIT]
+
+        return result
+
+    @classmethod
+    def _get_import_title(cls, row: Optional[dict]):
+        if not row:
+            return None
+        title = row.get("title", row.get(cls.IMPORT_HEADER_MAPPING_REVERSE["title"]))
+        return str(title) if title is not None else None
+
+    @classmethod
+    def _format_import_error(cls, e: Exception):
+        if isinstance(e, ValidationError):
+            return "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+        return getattr(e, "message", None) or str(e)
+
+    @classmethod
+    def _build_import_issue(cls, row: dict) -> AddIssueModel:
+        """
+        将导入行转换为新增Issue模型，支持小驼峰、下划线及导出文件中的中文表头
+        """
+        data = {}
+        system_env = dict(row.pop("systemEnv", None) or row.pop("system_env", None) or {})
+        for key, value in row.items():
+            field = cls.IMPORT_HEADER_MAPPING.get(key, key)
+            field = to_camel(field) if "_" in field else field
+            if field in cls.IMPORT_SYSTEM_ENV_FIELDS:
+                system_env[field] = value
+            else:
+                data[field] = value
+        for field, value_map in (
+            ("priority", cls.IMPORT_PRIORITY_MAPPING),
+            ("status", cls.IMPORT_STATUS_MAPPING),
+        ):
+            if isinstance(data.get(field), str):
+                data[field] = value_map.get(data[field], data[field])
+        if isinstance(data.get("tags"), str):
+            data["tags"] = [tag for tag in re.split(r"[,，;；]", data["tags"]) if tag.strip()]
+        for field, value in list(data.items()):
+            # CSV中的数字列为字符串，Excel中的文本列可能被识别为数字
+            if field not in ("tags", "expectedResolveDate") and not isinstance(value, (str, list)):
+                data[field] = str(value)
+        if system_env:
+            data["systemEnv"] = {
+                key: str(value) if value is not None else None for key, value in system_env.items()
+            }
+        data.pop("issueId", None)
+        data.pop("issueNumber", None)
+        data.pop("attachmentIds", None)
+
+        issue = AddIssueModel(**data)
+        issue.validate_fields()
+        if not issue.issue_type or not issue.issue_type.strip():
+            raise ValueError("Issue类型不能为空")
+
+        return issue
+
+    @classmethod
+    def _flush_import_batch(cls, db: Session, batch: List[tuple], operator: str):
+        """
+        写入一批已校验的导入行，整批写入失败时逐行重试以定位失败行
+
+        :param db: orm对象
+        :param batch: (行号, 新增Issue模型)列表
+        :param operator: 操作人
+        :return: 写入失败的错误行列表
+        """
+        if not batch:
+            return []
+        try:
+            issue_numbers = IssueDao.allocate_issue_numbers(db, len(batch))
+            now = datetime.now()
+            issues = []
+            for (_, issue), issue_number in zip(batch, issue_numbers):
+                issue_dict = issue.model_dump(
+                    exclude={"issue_id", "system_env", "tags", "attachment_ids"}
+                )
+                issue_dict.update(
+                    issue_number=issue_number,
+                    priority=issue.priority or "low",
+                    status=issue.status or "pending",
+                    create_by=operator,
+                    create_time=now,
+                    update_by=operator,
+                    update_time=now,
+                    del_flag="0",
+                )
+                issues.append(issue_dict)
+            issue_id_map = IssueDao.batch_add_issue_dao(db, issues)
+
+            system_envs = []
+            tags = []
+            stat_deltas = defaultdict(int)
+            for (_, issue), issue_dict in zip(batch, issues):
+                issue_id = issue_id_map[issue_dict["issue_number"]]
+                if issue.system_env:
+                    system_env_dict = issue.system_env.model_dump(exclude={"env_id"})
+                    system_env_dict["issue_id"] = issue_id
+                    system_envs.append(system_env_dict)
+                for tag_name in dict.fromkeys(tag.strip() for tag in issue.tags or [] if tag.strip()):
+                    tags.append(dict(issue_id=issue_id, tag_name=tag_name))
+                for key, value in IssueDao.get_issue_stat_contribution(
+                    issue_dict["status"], issue_dict["priority"], now
+                ).items():
+                    stat_deltas[key] += value
+            IssueDao.batch_add_system_env_dao(db, system_envs)
+            IssueDao.batch_add_tag_dao(db, tags)
+            IssueDao.refresh_search_doc(db, list(issue_id_map.values()))
+            IssueDao.apply_stat_deltas(db, stat_deltas)
+
+            db.commit()
+            return []
+        except Exception as e:
+            db.rollback()
+            if len(batch) > 1:
+                errors = []
+                for item in batch:
+                    errors.extend(cls._flush_import_batch(db, [item], operator))
+                return errors
+            row_number, issue = batch[0]
+            return [
+                IssueImportErrorModel(
+                    rowNumber=row_number, title=issue.title, message=f"写入失败: {str(e)}"
+                )
+            ]
+
     @classmethod
     def edit_issue_services(cls, db: Session, edit_issue: EditIssueModel):
         """
@@ -161,14 +478,14 @@ class IssueService:
         :return: 编辑Issue校验结果
         """
         try:
-            # 检查Issue是否存在
-            existing_issue = IssueDao.get_issue_by_id(db, edit_issue.issue_id)
-            if not existing_issue.get("issue_info"):
+            # 检查Issue是否存在并锁定主记录
+            current_issue = IssueDao.lock_issue(db, edit_issue.issue_id)
+            if not current_issue:
                 return CrudResponseModel(is_success=False, message="Issue不存在")
 
             # 更新Issue主记录 - 只更新提供的字段，排除None值
             edit_issue_dict = edit_issue.model_dump(
-                exclude={"system_env", "tags"}, exclude_none=True
+                exclude={"system_env", "tags", "attachment_ids"}, exclude_none=True
             )
             edit_issue_dict["issue_id"] = edit_issue.issue_id
             edit_issue_dict["update_time"] = datetime.now()
@@ -189,30 +506,44 @@ class IssueService:
                 system_env_dict = edit_issue.system_env.model_dump()
                 system_env_dict["issue_id"] = edit_issue.issue_id
 
-                if existing_issue.get("system_env"):
+                env_id = IssueDao.get_system_env_id(db, edit_issue.issue_id)
+                if env_id is not None:
                     # 更新现有环境信息
-                    env_info = existing_issue["system_env"]
-                    system_env_dict["env_id"] = (
-                        env_info.env_id
-                        if hasattr(env_info, "env_id")
-                        else env_info.get("env_id")
-                    )
+                    system_env_dict["env_id"] = env_id
                     IssueDao.edit_system_env_dao(db, system_env_dict)
                 else:
                     # 新增环境信息
                     system_env = IssueSystemEnvModel(**system_env_dict)
                     IssueDao.add_system_env_dao(db, system_env)
 
-            # 更新标签信息（先删除后新增）
+            # 更新标签信息（按差集仅变更增删的标签）
             if edit_issue.tags is not None:
-                IssueDao.delete_tags_by_issue_dao(db, edit_issue.issue_id)
+                IssueDao.set_issue_tags(db, edit_issue.issue_id, edit_issue.tags)
+
+            # 关联新上传的附件
+            if edit_issue.attachment_ids:
+                cls._link_attachments(
+                    db,
+                    edit_issue.issue_id,
+                    edit_issue_dict.get("priority", current_issue.priority),
+                    edit_issue.attachment_ids,
+                )
 
-                for tag_name in edit_issue.tags:
-                    if tag_name.strip():
-                        tag = IssueTagModel(
-                            issue_id=edit_issue.issue_id, tag_name=tag_name.strip()
-                        )
-                        IssueDao.add_tag_dao(db, tag)
+            # 更新全文检索文档及统计计数
+            IssueDao.refresh_search_doc(db, [edit_issue.issue_id])
+            IssueDao.apply_stat_deltas(
+                db,
+                cls._diff_stat_contribution(
+                    before=IssueDao.get_issue_stat_contribution(
+                        current_issue.status, current_issue.priority, current_issue.create_time
+                    ),
+                    after=IssueDao.get_issue_stat_contribution(
+                        edit_issue_dict.get("status", current_issue.status),
+                        edit_issue_dict.get("priority", current_issue.priority),
+                        current_issue.create_time,
+                    ),
+                ),
+            )
 
             db.commit()
             return CrudResponseModel(is_success=True, message="编辑成功")
@@ -231,25 +562,122 @@ class IssueService:
         :return: 删除Issue校验结果
         """
         try:
-            delete_issue_id_list = delete_issue.issue_ids.split(",")
+            batch_issue = BatchIssueModel(
+                issueIds=[
+                    int(issue_id) for issue_id in delete_issue.issue_ids.split(",") if issue_id.strip()
+                ],
+                updateBy=delete_issue.update_by,
+                updateTime=delete_issue.update_time,
+            )
+        except ValueError as e:
+            # ID格式错误时返回删除失败(pydantic的ValidationError同为ValueError)
+            return CrudResponseModel(is_success=False, message=f"删除失败: {str(e)}")
+        delete_result = cls._batch_update_issues(db, batch_issue, dict(del_flag="2"), None, "删除")
+        if delete_result.is_success:
+            delete_result.message = "删除成功"
 
-            for issue_id in delete_issue_id_list:
-                if issue_id.strip():
-                    existing_issue = IssueDao.get_issue_by_id(db, int(issue_id))
-                    if existing_issue.get("issue_info"):
-                        delete_issue_obj = IssueMainModel(
-                            issue_id=int(issue_id),
-                            update_by=delete_issue.update_by,
-                            update_time=delete_issue.update_time,
-                        )
-                        IssueDao.delete_issue_dao(db, delete_issue_obj)
+        return delete_result
+
+    @classmethod
+    def batch_delete_issue_services(cls, db: Session, batch_issue: BatchIssueModel):
+        """
+        批量软删除Issue services
+
+        :param db: orm对象
+        :param batch_issue: 批量操作Issue对象
+        :return: 批量删除结果
+        """
+        return cls._batch_update_issues(db, batch_issue, dict(del_flag="2"), None, "批量删除")
+
+    @classmethod
+    def batch_change_issue_status_services(cls, db: Session, batch_issue: BatchIssueModel):
+        """
+        批量变更Issue状态services
+
+        :param db: orm对象
+        :param batch_issue: 批量操作Issue对象
+        :return: 批量变更结果
+        """
+        if not batch_issue.status:
+            return CrudResponseModel(is_success=False, message="请指定目标状态")
+        return cls._batch_update_issues(
+            db, batch_issue, dict(status=batch_issue.status), IssueMain.status, "批量变更状态"
+        )
+
+    @classmethod
+    def batch_change_issue_priority_services(cls, db: Session, batch_issue: BatchIssueModel):
+        """
+        批量变更Issue优先级services
+
+        :param db: orm对象
+        :param batch_issue: 批量操作Issue对象
+        :return: 批量变更结果
+        """
+        if not batch_issue.priority:
+            return CrudResponseModel(is_success=False, message="请指定目标优先级")
+        return cls._batch_update_issues(
+            db, batch_issue, dict(priority=batch_issue.priority), IssueMain.priority, "批量变更优先级"
+        )
+
+    @classmethod
+    def _batch_update_issues(
+            cls, db: Session, batch_issue: BatchIssueModel, values: dict, changed_column, action: str
+    ):
+        """
+        按ID列表或过滤条件批量更新Issue，并同步统计计数
+
+        :param db: orm对象
+        :param batch_issue: 批量操作Issue对象
+        :param values: 需要更新的字段字典
+        :param changed_column: 指定时仅更新该列当前值与目标值不同的记录
+        :param action: 操作名称
+        :return: 批量操作结果
+        """
+        if batch_issue.issue_ids is None:
+            if not batch_issue.filter or not IssueDao.has_issue_filter(batch_issue.filter):
+                # 防止误操作全部Issue
+                return CrudResponseModel(is_success=False, message="请指定Issue ID列表或过滤条件")
+        try:
+            if batch_issue.issue_ids is not None:
+                issue_ids = batch_issue.issue_ids
+            else:
+                issue_ids = IssueDao.get_issue_ids_by_filter(db, batch_issue.filter)
+            values = dict(
+                values,
+                update_by=batch_issue.update_by,
+                update_time=batch_issue.update_time or datetime.now(),
+            )
+            affected_rows = IssueDao.batch_update_issue_dao(db, issue_ids, values, changed_column)
+            if values.get("del_flag") == "2":
+                IssueDao.decrease_tag_usage_by_issues(db, [row.issue_id for row in affected_rows])
+
+            stat_deltas = defaultdict(int)
+            for row in affected_rows:
+                before = IssueDao.get_issue_stat_contribution(row.status, row.priority, row.create_time)
+                after = (
+                    {}
+                    if values.get("del_flag") == "2"
+                    else IssueDao.get_issue_stat_contribution(
+                        values.get("status", row.status), values.get("priority", row.priority), row.create_time
+                    )
+                )
+                for key, value in cls._diff_stat_contribution(before, after).items():
+                    stat_deltas[key] += value
+            IssueDao.apply_stat_deltas(db, stat_deltas)
 
             db.commit()
-            return CrudResponseModel(is_success=True, message="删除成功")
+            batch_result = BatchIssueResultModel(
+                matchedCount=len(set(issue_ids)), affectedCount=len(affected_rows)
+            )
+            return CrudResponseModel(
+                is_success=True,
+                message=f"{action}成功，共变更{batch_result.affected_count}条",
+                result=batch_result,
+            )
 
         except Exception as e:
             db.rollback()
-            return CrudResponseModel(is_success=False, message=f"删除失败: {str(e)}")
+            return CrudResponseModel(is_success=False, message=f"{action}失败: {str(e)}")
 
     @classmethod
     def add_diagnosis_log_services(
@@ -263,22 +691,18 @@ class IssueService:
         :return: 新增诊断记录校验结果
         """
         try:
-            # 检查Issue是否存在
-            existing_issue = IssueDao.get_issue_by_id(db, diagnosis_log.issue_id)
-            if not existing_issue.get("issue_info"):
+            # 检查Issue是否存在并锁定主记录
+            issue_info = IssueDao.lock_issue(db, diagnosis_log.issue_id)
+            if not issue_info:
                 return CrudResponseModel(is_success=False, message="Issue不存在")
 
             # 添加诊断记录
             IssueDao.add_diagnosis_log_dao(db, diagnosis_log)
 
+            stat_deltas = {"diagnosis_count": 1}
             # 如果Issue状态为待诊断，则更新为诊断中
-            issue_info = existing_issue["issue_info"]
-            current_status = (
-                issue_info.status
-                if hasattr(issue_info, "status")
-                else issue_info.get("status")
-            )
-            if current_status == "pending":
+            if issue_info.status == "pending":
+                stat_deltas["pending_count"] = -1
                 issue_update_dict = {
                     "issue_id": diagnosis_log.issue_id,
                     "status": "diagnosing",
@@ -286,6 +710,10 @@ class IssueService:
                 }
                 IssueDao.edit_issue_dao(db, issue_update_dict)
 
+            # 更新全文检索文档及统计计数
+            IssueDao.refresh_search_doc(db, [diagnosis_log.issue_id])
+            IssueDao.apply_stat_deltas(db, stat_deltas)
+
             db.commit()
             return CrudResponseModel(is_success=True, message="新增诊断记录成功")
 
@@ -295,6 +723,79 @@ class IssueService:
                 is_success=False, message=f"新增诊断记录失败: {str(e)}"
             )
 
+    @classmethod
+    def batch_add_diagnosis_log_services(
+            cls, db: Session, batch_diagnosis_log: BatchAddDiagnosisLogModel
+    ):
+        """
+        批量新增诊断记录services
+
+        :param db: orm对象
+        :param batch_diagnosis_log: 批量诊断记录对象
+        :return: 批量新增诊断记录校验结果
+        """
+        for index, diagnosis_log in enumerate(batch_diagnosis_log.logs, start=1):
+            if diagnosis_log.issue_id is None or not (diagnosis_log.step_name or "").strip():
+                return CrudResponseModel(
+                    is_success=False, message=f"第{index}条诊断记录缺少Issue ID或诊断步骤名称"
+                )
+        try:
+            issue_ids = list(dict.fromkeys(log.issue_id for log in batch_diagnosis_log.logs))
+            # 一次查询校验全部Issue是否存在并锁定主记录
+            issue_rows = IssueDao.lock_issues(db, issue_ids)
+            missing_ids = set(issue_ids) - {row.issue_id for row in issue_rows}
+            if missing_ids:
+                db.rollback()
+                return CrudResponseModel(
+                    is_success=False,
+                    message=f"Issue不存在: {','.join(str(issue_id) for issue_id in sorted(missing_ids))}",
+                )
+
+            now = datetime.now()
+            IssueDao.batch_add_diagnosis_log_dao(
+                db,
+                [
+                    dict(
+                        issue_id=log.issue_id,
+                        step_name=log.step_name,
+                        method_description=log.method_description,
+                        operator=log.operator,
+                        operate_time=log.operate_time or now,
+                    )
+                    for log in batch_diagnosis_log.logs
+                ],
+            )
+            # 待诊断的Issue一次性更新为诊断中
+            pending_ids = [row.issue_id for row in issue_rows if row.status == "pending"]
+            IssueDao.start_diagnosis_dao(db, pending_ids, now)
+
+            IssueDao.refresh_search_doc(db, issue_ids)
+            IssueDao.apply_stat_deltas(
+                db,
+                {
+                    "diagnosis_count": len(batch_diagnosis_log.logs),
+                    "pending_count": -len(pending_ids),
+                },
+            )
+
+            db.commit()
+            batch_result = BatchAddDiagnosisLogResultModel(
+                logCount=len(batch_diagnosis_log.logs),
+                issueCount=len(issue_ids),
+                diagnosingCount=len(pending_ids),
+            )
+            return CrudResponseModel(
+                is_success=True,
+                message=f"批量新增诊断记录成功，共{batch_result.log_count}条",
+                result=batch_result,
+            )
+
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(
+                is_success=False, message=f"批量新增诊断记录失败: {str(e)}"
+            )
+
     @classmethod
     def upload_attachment_services(
             cls,
@@ -304,41 +805,38 @@ class IssueService:
             file_size: int,
             file_type: str,
             upload_by: str,
+            file_hash: Optional[str] = None,
     ):
         """
-        上传附件services（临时附件，不需要issue_id）
+        上传附件services（临时附件，不需要issue_id），文件按SHA-256存入内容寻址存储，相同内容只保存一份
 
         :param db: orm对象
         :param file_name: 文件名
-        :param file_path: 文件路径
+        :param file_path: 已接收文件的路径，存入存储后该文件会被移动或删除
         :param file_size: 文件大小
         :param file_type: 文件类型
         :param upload_by: 上传者
+        :param file_hash: 文件SHA-256摘要，未指定时根据文件内容计算
         :return: 上传附件校验结果，包含attachment_id
         """
+        created_blob_path = None
         try:
             # 创建临时附件记录（不关联issue_id）
             attachment = IssueAttachmentModel(
                 issueId=None,  # 临时附件，不关联Issue
                 fileName=file_name,
-                filePath=file_path,
                 fileSize=file_size,
                 fileType=file_type,
                 uploadBy=upload_by,
                 uploadTime=datetime.now(),
+                fileHash=file_hash or UploadUtil.hash_file(file_path),
                 status="temporary",  # 标记为临时状态
             )
-
-            IssueDao.add_attachment_dao(db, attachment)
-            db.flush()  # 刷新以获取attachment_id
-            
-            # 获取生成的attachment_id
-            attachment_id = db.execute(
-                text("SELECT LAST_INSERT_ID()")
-            ).scalar()
+            created_blob_path = cls._store_attachment(db, attachment, file_path)
 
             db.commit()
-            attachment.attachment_id = attachment_id
+            if os.path.exists(file_path):
+                os.remove(file_path)
             # 返回附件信息
             return CrudResponseModel(
                 is_success=True, 
@@ -348,224 +846,1947 @@ class IssueService:
 
         except Exception as e:
             db.rollback()
+            for path in (created_blob_path, file_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
             return CrudResponseModel(
                 is_success=False, message=f"上传附件失败: {str(e)}"
             )
 
     @classmethod
-    def delete_attachment_services(cls, db: Session, attachment_id: int):
+    def upload_attachment_by_hash_services(
+            cls, db: Session, upload_by_hash: UploadByHashModel, upload_by: str
+    ):
         """
-        删除附件services
+        秒传附件services，服务器已存储相同内容(摘要及大小一致)时直接创建临时附件，无需再上传文件内容
 
         :param db: orm对象
-        :param attachment_id: 附件ID
-        :return: 删除附件校验结果
+        :param upload_by_hash: 秒传附件对象
+        :param upload_by: 上传者
+        :return: 秒传结果，未命中时需要客户端上传文件内容
         """
+        file_ext = os.path.splitext(upload_by_hash.file_name)[1].lower()
+        if file_ext not in AttachmentConstant.ALLOWED_TYPES:
+            return CrudResponseModel(is_success=False, message=f"不支持的文件类型: {file_ext}")
+        file_hash = upload_by_hash.file_hash.lower()
+        if not StorageUtil.is_valid_hash(file_hash):
+            return CrudResponseModel(is_success=False, message="文件摘要格式不合法")
+
         try:
-            IssueDao.delete_attachment_dao(db, attachment_id)
-            db.commit()
+            blob = IssueDao.get_blob(db, file_hash)
+            if (
+                not blob
+                or blob.ref_count <= 0
+                or blob.file_size != upload_by_hash.file_size
+                or not StorageUtil.resolve_path(blob.file_path)
+            ):
+                db.rollback()
+                return CrudResponseModel(
+                    is_success=True, message="服务器不存在该文件，请上传文件内容", result=UploadByHashResultModel(hit=False)
+                )
 
-            return CrudResponseModel(is_success=True, message="删除附件成功")
+            attachment = IssueAttachmentModel(
+                fileName=os.path.basename(upload_by_hash.file_name),
+                filePath=blob.file_path,
+                fileSize=blob.file_size,
+                fileType=file_ext,
+                uploadBy=upload_by,
+                uploadTime=datetime.now(),
+                fileHash=file_hash,
+                compressedSize=blob.compressed_size,
+                status="temporary",
+            )
+            IssueDao.acquire_blob(db, file_hash, blob.file_size, blob.file_path)
+            attachment.attachment_id = IssueDao.add_attachment_dao(db, attachment).attachment_id
+            db.commit()
+            return CrudResponseModel(
+                is_success=True, message="秒传成功", result=UploadByHashResultModel(hit=True, attachment=attachment)
+            )
 
         except Exception as e:
             db.rollback()
-            return CrudResponseModel(
-                is_success=False, message=f"删除附件失败: {str(e)}"
-            )
+            return CrudResponseModel(is_success=False, message=f"秒传失败: {str(e)}")
 
     @classmethod
-    def get_issue_statistics_services(cls, db: Session):
+    def _store_attachment(cls, db: Session, attachment: IssueAttachmentModel, temp_path: str):
         """
-        获取Issue统计数据services
+        增加存储引用计数、新增附件记录，并将已接收的文件放入内容寻址存储(不提交事务)
 
         :param db: orm对象
-        :return: 统计数据响应模型
+        :param attachment: 附件对象，需包含文件摘要和大小
+        :param temp_path: 已接收文件的路径，存储中已有相同内容时保留原文件，由调用方在提交后删除
+        :return: 新建的存储文件路径，存储中已有相同内容时为None
         """
-        statistics_result = IssueDao.get_issue_statistics(db)
+        blob_path = StorageUtil.get_blob_path(attachment.file_hash)
+        # 存储记录在事务结束前保持加锁，与引用计数归零时的删除互斥
+        IssueDao.acquire_blob(db, attachment.file_hash, attachment.file_size, blob_path)
+        attachment.file_path = blob_path
+        attachment.compressed_size = IssueDao.get_blob(db, attachment.file_hash).compressed_size
+        attachment.attachment_id = IssueDao.add_attachment_dao(db, attachment).attachment_id
 
-        # 转换为响应模型
-        response_model = IssueStatisticsResponseModel(**statistics_result)
+        return blob_path if StorageUtil.store_blob(temp_path, blob_path) else None
 
-        return response_model
+    @classmethod
+    def _is_blob_attachment(cls, attachment: IssueAttachment):
+        return bool(attachment.file_hash) and attachment.file_path == StorageUtil.get_blob_path(attachment.file_hash)
 
     @classmethod
-    def get_issue_type_options(cls):
+    def _get_blob_hashes(cls, attachments: List[IssueAttachment]):
         """
-        获取Issue类型选项
-
-        :return: Issue类型选项响应模型
+        获取存放在内容寻址存储中的附件的文件摘要，未迁移的历史附件不参与引用计数
         """
-        issue_types = [
-            {"label": "BUG报告", "value": "BUG"},
-            {"label": "问题工单", "value": "工单"},
-            {"label": "系统日志", "value": "系统日志"},
-            {"label": "测试报告", "value": "测试报告"},
-            {"label": "功能需求", "value": "功能需求"},
-            {"label": "性能优化", "value": "性能优化"},
-            {"label": "其他", "value": "其他"},
-        ]
-
-        # 转换为响应模型
-        response_model = [IssueOptionItemModel(**item) for item in issue_types]
-
-        return response_model
+        return [attachment.file_hash for attachment in attachments if cls._is_blob_attachment(attachment)]
 
     @classmethod
-    def get_priority_options(cls):
+    def _commit_with_released_blobs(cls, db: Session, blob_paths: List[str]):
         """
-        获取优先级选项
-
-        :return: 优先级选项响应模型
+        提交事务并删除引用计数归零的存储文件，提交失败时恢复存储文件
         """
-        priority_options = [
-            {"label": "高", "value": "high"},
-            {"label": "中", "value": "medium"},
-            {"label": "低", "value": "low"},
-        ]
-
-        # 转换为响应模型
-        response_model = [IssueOptionItemModel(**item) for item in priority_options]
-
-        return response_model
+        detached_paths = StorageUtil.detach_blobs(blob_paths)
+        try:
+            db.commit()
+        except Exception:
+            StorageUtil.restore_blobs(detached_paths)
+            raise
+        StorageUtil.purge_blobs(detached_paths)
 
     @classmethod
-    def get_status_options(cls):
+    async def upload_attachment_stream_services(
+            cls,
+            db: Session,
+            stream: AsyncIterator[bytes],
+            file_name: str,
+            content_length: Optional[int],
+            upload_by: str,
+    ):
         """
-        获取状态选项
+        流式上传附件services（临时附件，不需要issue_id），请求体单次写入存储目录并同时计算大小和SHA-256
 
-        :return: 状态选项响应模型
+        :param db: orm对象
+        :param stream: 请求体字节流
+        :param file_name: 原始文件名
+        :param content_length: 请求头声明的内容长度
+        :param upload_by: 上传者
+        :return: 上传附件校验结果，包含attachment_id
         """
-        status_options = [
-            {"label": "待诊断", "value": "pending"},
-            {"label": "诊断中", "value": "diagnosing"},
-            {"label": "已完成", "value": "completed"},
-            {"label": "已取消", "value": "cancelled"},
-        ]
-
-        # 转换为响应模型
-        response_model = [IssueOptionItemModel(**item) for item in status_options]
-
+        file_ext = os.path.splitext(file_name or "")[1].lower()
+        if file_ext not in AttachmentConstant.ALLOWED_TYPES:
+            raise ServiceException(message=f"不支持的文件类型: {file_ext}")
+        if content_length is not None and content_length > AttachmentConstant.MAX_SIZE:
+            # 声明的长度已超限时不读取请求体
+            raise ServiceException(message=f"文件大小不能超过{AttachmentConstant.MAX_SIZE // (1024 * 1024)}MB")
+
+        temp_path = await run_in_threadpool(StorageUtil.get_temp_path)
+        file_size, file_hash = await UploadUtil.save_stream(
+            stream, temp_path, AttachmentConstant.MAX_SIZE, AttachmentConstant.STREAM_WRITE_SIZE
+        )
 
-        return response_model
+        return await run_in_threadpool(
+            cls.upload_attachment_services,
+            db,
+            os.path.basename(file_name),
+            temp_path,
+            file_size,
+            file_ext,
+            upload_by,
+            file_hash,
+        )
 
     @classmethod
-    def clean_temporary_attachments_services(cls, db: Session, hours: int = 24):
+    def create_upload_session_services(
+            cls, db: Session, create_session: CreateUploadSessionModel, upload_by: str
+    ):
         """
-        清理超过指定时间的临时附件
+        创建分片上传会话services，预先分配与文件等大的临时文件供分片按偏移写入
 
         :param db: orm对象
-        :param hours: 小时数，默认24小时
-        :return: 清理结果
+        :param create_session: 创建上传会话对象
+        :param upload_by: 上传者
+        :return: 创建结果，包含上传会话信息
         """
+        file_ext = os.path.splitext(create_session.file_name)[1].lower()
+        if file_ext not in AttachmentConstant.ALLOWED_TYPES:
+            return CrudResponseModel(is_success=False, message=f"不支持的文件类型: {file_ext}")
+        if create_session.file_size > AttachmentConstant.MAX_SIZE:
+            return CrudResponseModel(
+                is_success=False,
+                message=f"文件大小不能超过{AttachmentConstant.MAX_SIZE // (1024 * 1024)}MB",
+            )
+
+        chunk_size = min(
+            max(create_session.chunk_size or AttachmentConstant.CHUNK_SIZE, AttachmentConstant.MIN_CHUNK_SIZE),
+            AttachmentConstant.MAX_CHUNK_SIZE,
+        )
+        upload_id = uuid.uuid4().hex
+        temp_path = os.path.join(UploadConfig.UPLOAD_PATH, AttachmentConstant.SESSION_PATH, f"{upload_id}.part")
+        now = datetime.now()
+        upload_session = dict(
+            upload_id=upload_id,
+            file_name=os.path.basename(create_session.file_name),
+            file_size=create_session.file_size,
+            chunk_size=chunk_size,
+            temp_path=temp_path,
+            upload_by=upload_by,
+            status="uploading",
+            create_time=now,
+            update_time=now,
+        )
         try:
-            import os
-            
-            # 获取需要删除的附件列表
-            attachments_to_delete = IssueDao.delete_temporary_attachments(db, hours)
-            
-            # 删除物理文件
-            deleted_count = 0
-            for attachment in attachments_to_delete:
-                try:
-                    file_path = attachment.file_path
-                    if file_path and os.path.exists(file_path):
-                        os.remove(file_path)
-                        deleted_count += 1
-                except Exception as e:
-                    # 记录文件删除失败，但继续处理
-                    print(f"删除文件失败: {file_path}, 错误: {str(e)}")
-            
+            UploadUtil.allocate_file(temp_path, create_session.file_size)
+            IssueDao.add_upload_session_dao(db, upload_session)
             db.commit()
-            
             return CrudResponseModel(
-                is_success=True, 
-                message=f"成功清理 {deleted_count} 个临时附件"
+                is_success=True,
+                message="创建上传会话成功",
+                result=cls._build_upload_session(IssueUploadSession(**upload_session), []),
             )
-        
+
         except Exception as e:
             db.rollback()
-            return CrudResponseModel(
-                is_success=False, 
-                message=f"清理临时附件失败: {str(e)}"
-            )
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return CrudResponseModel(is_success=False, message=f"创建上传会话失败: {str(e)}")
 
-    @staticmethod
-    def export_issue_list_services(issue_list: List):
-        """
-        导出Issue信息service
-
-        :param issue_list: Issue信息列表
-        :return: Issue信息对应excel的二进制数据
-        """
-        # 创建一个映射字典，将英文键映射到中文键
-        mapping_dict = {
-            "issueId": "Issue编号",
-            "issueNumber": "Issue编号",
-            "title": "Issue标题",
-            "priority": "优先级",
-            "status": "状态",
-            "issueType": "Issue类型",
-            "issueSource": "Issue来源",
-            "description": "问题描述",
-            "solution": "解决方案",
-            "expectedResolveDate": "预期解决日期",
-            "createBy": "创建者",
-            "createTime": "创建时间",
-            "updateBy": "更新者",
-            "updateTime": "更新时间",
-        }
+    @classmethod
+    def get_upload_session_services(cls, db: Session, upload_id: str, upload_by: str):
+        """
+        查询分片上传会话进度services
 
-        data = issue_list
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param upload_by: 上传者
+        :return: 上传会话进度
+        """
+        upload_session = IssueDao.get_upload_session(db, upload_id)
+        if not upload_session or upload_session.upload_by != upload_by:
+            raise ServiceException(message="上传会话不存在或已过期")
 
-        # 转换状态和优先级为中文
-        priority_map = {"high": "高", "medium": "中", "low": "低"}
+        return cls._build_upload_session(upload_session, IssueDao.get_upload_chunks(db, upload_id))
 
-        status_map = {
-            "pending": "待诊断",
-            "diagnosing": "诊断中",
-            "completed": "已完成",
-            "cancelled": "已取消",
-        }
+    @classmethod
+    async def upload_chunk_services(
+            cls,
+            db: Session,
+            upload_id: str,
+            offset: int,
+            stream: AsyncIterator[bytes],
+            upload_by: str,
+    ):
+        """
+        上传分片services，分片按偏移直接写入临时文件，支持并发及乱序上传，重复上传同一分片会覆盖原数据；
+        接收分片期间不持有数据库事务及连接，分片写入完成后在短事务中记录
 
-        for item in data:
-            # 转换优先级
-            if item.get("priority"):
-                item["priority"] = priority_map.get(
-                    item.get("priority"), item.get("priority")
-                )
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param offset: 分片在文件中的起始偏移，必须是分片大小的整数倍
+        :param stream: 请求体字节流
+        :param upload_by: 上传者
+        :return: 上传分片结果
+        """
+        upload_session = await run_in_threadpool(cls._get_uploading_session, db, upload_id, upload_by)
+        if offset < 0 or offset >= upload_session.file_size or offset % upload_session.chunk_size:
+            raise ServiceException(message=f"分片偏移不合法: {offset}")
+
+        chunk_index = offset // upload_session.chunk_size
+        chunk_size = min(upload_session.chunk_size, upload_session.file_size - offset)
+        await UploadUtil.write_stream_at(
+            stream, upload_session.temp_path, offset, chunk_size, AttachmentConstant.STREAM_WRITE_SIZE
+        )
+        # 分片完整写入后才记录，连接中断的分片需要重新上传
+        return await run_in_threadpool(cls._record_upload_chunk, db, upload_id, chunk_index, chunk_size)
 
-            # 转换状态
-            if item.get("status"):
-                item["status"] = status_map.get(item.get("status"), item.get("status"))
+    @classmethod
+    def _get_uploading_session(cls, db: Session, upload_id: str, upload_by: str):
+        """
+        校验上传会话可以接收分片，读取后立即结束事务，归还数据库连接
+        """
+        try:
+            upload_session = IssueDao.get_upload_session(db, upload_id)
+            if upload_session:
+                db.expunge(upload_session)
+        finally:
+            db.rollback()
+        if not upload_session or upload_session.upload_by != upload_by:
+            raise ServiceException(message="上传会话不存在或已过期")
+        if upload_session.status != "uploading":
+            raise ServiceException(message="上传会话正在完成，不再接收分片")
 
-            # 格式化日期
-            if item.get("createTime"):
-                item["createTime"] = (
-                    item.get("createTime").strftime("%Y-%m-%d %H:%M:%S")
-                    if hasattr(item.get("createTime"), "strftime")
-                    else str(item.get("createTime"))
-                )
-            if item.get("updateTime"):
-                item["updateTime"] = (
-                    item.get("updateTime").strftime("%Y-%m-%d %H:%M:%S")
-                    if hasattr(item.get("updateTime"), "strftime")
-                    else str(item.get("updateTime"))
-                )
-            if item.get("expectedResolveDate"):
-                item["expectedResolveDate"] = (
-                    item.get("expectedResolveDate").strftime("%Y-%m-%d")
-                    if hasattr(item.get("expectedResolveDate"), "strftime")
-                    else str(item.get("expectedResolveDate"))
+        return upload_session
+
+    @classmethod
+    def _record_upload_chunk(cls, db: Session, upload_id: str, chunk_index: int, chunk_size: int):
+        try:
+            if not IssueDao.add_upload_chunk_dao(db, upload_id, chunk_index, chunk_size):
+                db.rollback()
+                return CrudResponseModel(is_success=False, message="上传会话已取消或正在完成，分片未被记录")
+            db.commit()
+            return CrudResponseModel(is_success=True, message=f"上传分片{chunk_index}成功")
+
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"上传分片失败: {str(e)}")
+
+    @classmethod
+    def complete_upload_session_services(cls, db: Session, upload_id: str, upload_by: str):
+        """
+        完成分片上传services，校验分片完整后将临时文件存入内容寻址存储并创建临时附件记录；
+        会话先在短事务中置为完成中，不再记录新分片，计算摘要期间不持有行锁
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param upload_by: 上传者
+        :return: 完成上传结果，包含attachment_id
+        """
+        upload_session = IssueDao.get_upload_session(db, upload_id)
+        if not upload_session or upload_session.upload_by != upload_by:
+            db.rollback()
+            raise ServiceException(message="上传会话不存在或已过期")
+        progress = cls._build_upload_session(upload_session, IssueDao.get_upload_chunks(db, upload_id))
+        missing_count = progress.chunk_count - len(progress.uploaded_chunks)
+        if missing_count:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"还有{missing_count}个分片未上传")
+        if not IssueDao.update_upload_session_status(db, upload_id, "completing", "uploading"):
+            db.rollback()
+            return CrudResponseModel(is_success=False, message="上传会话正在完成或已取消")
+        temp_path, file_name, file_size = upload_session.temp_path, upload_session.file_name, upload_session.file_size
+        db.commit()
+
+        # 临时文件移到完成中路径，仍在写入的重复分片在下次写盘前停止
+        completing_path = cls._get_completing_path(temp_path)
+        created_blob_path = None
+        try:
+            os.replace(temp_path, completing_path)
+            before = os.stat(completing_path)
+            file_hash = UploadUtil.hash_file(completing_path)
+            after = os.stat(completing_path)
+            if (before.st_mtime_ns, before.st_size) != (after.st_mtime_ns, after.st_size):
+                cls._abort_upload_completion(db, upload_id, temp_path)
+                return CrudResponseModel(is_success=False, message="分片仍在写入，请稍后重试")
+            attachment = IssueAttachmentModel(
+                fileName=file_name,
+                fileSize=file_size,
+                fileType=os.path.splitext(file_name)[1].lower(),
+                uploadBy=upload_by,
+                uploadTime=datetime.now(),
+                fileHash=file_hash,
+                status="temporary",
+            )
+            completing_session = IssueDao.get_upload_session(db, upload_id, for_update=True)
+            if not completing_session or completing_session.status != "completing":
+                cls._abort_upload_completion(db, upload_id, temp_path)
+                return CrudResponseModel(is_success=False, message="上传会话已取消或已过期")
+            IssueDao.delete_upload_session_dao(db, [upload_id])
+            created_blob_path = cls._store_attachment(db, attachment, completing_path)
+            db.commit()
+            if os.path.exists(completing_path):
+                os.remove(completing_path)
+            return CrudResponseModel(is_success=True, message="上传附件成功", result=attachment)
+
+        except Exception as e:
+            cls._abort_upload_completion(db, upload_id, temp_path, created_blob_path)
+            return CrudResponseModel(is_success=False, message=f"完成上传失败: {str(e)}")
+
+    @classmethod
+    def _abort_upload_completion(
+        cls, db: Session, upload_id: str, temp_path: str, created_blob_path: Optional[str] = None
+    ):
+        """
+        回滚完成上传，恢复临时文件及会话状态，客户端可以重新上传分片或重试完成操作
+        """
+        db.rollback()
+        completing_path = cls._get_completing_path(temp_path)
+        if created_blob_path:
+            os.replace(created_blob_path, temp_path)
+        elif os.path.exists(completing_path):
+            os.replace(completing_path, temp_path)
+        try:
+            IssueDao.update_upload_session_status(db, upload_id, "uploading", "completing")
+            db.commit()
+        except Exception:
+            db.rollback()
+
+    @classmethod
+    def _get_completing_path(cls, temp_path: str):
+        """
+        获取完成上传期间临时文件的路径
+        """
+        return f"{os.path.splitext(temp_path)[0]}.completing"
+
+    @classmethod
+    def delete_upload_session_services(cls, db: Session, upload_id: str, upload_by: str):
+        """
+        取消分片上传services，删除上传会话及临时文件
+
+        :param db: orm对象
+        :param upload_id: 上传会话ID
+        :param upload_by: 上传者
+        :return: 取消上传结果
+        """
+        upload_session = IssueDao.get_upload_session(db, upload_id, for_update=True)
+        if not upload_session or upload_session.upload_by != upload_by:
+            db.rollback()
+            raise ServiceException(message="上传会话不存在或已过期")
+        if upload_session.status != "uploading":
+            db.rollback()
+            return CrudResponseModel(is_success=False, message="上传会话正在完成，无法取消")
+        try:
+            IssueDao.delete_upload_session_dao(db, [upload_id])
+            db.commit()
+            if os.path.exists(upload_session.temp_path):
+                os.remove(upload_session.temp_path)
+            return CrudResponseModel(is_success=True, message="取消上传成功")
+
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"取消上传失败: {str(e)}")
+
+    @classmethod
+    def _build_upload_session(cls, upload_session: IssueUploadSession, chunks: List):
+        return UploadSessionModel(
+            uploadId=upload_session.upload_id,
+            fileName=upload_session.file_name,
+            fileSize=upload_session.file_size,
+            chunkSize=upload_session.chunk_size,
+            chunkCount=-(-upload_session.file_size // upload_session.chunk_size),
+            uploadedChunks=[chunk.chunk_index for chunk in chunks],
+            uploadedSize=sum(chunk.chunk_size for chunk in chunks),
+        )
+
+    @classmethod
+    def delete_attachment_services(cls, db: Session, attachment_id: int):
+        """
+        删除附件services
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :return: 删除附件校验结果
+        """
+        try:
+            attachment = IssueDao.get_attachment_by_id(db, attachment_id)
+            IssueDao.delete_attachment_dao(db, attachment_id)
+            # 引用计数归零时才删除存储文件
+            released_paths = IssueDao.release_blobs(db, cls._get_blob_hashes([attachment] if attachment else []))
+            cls._commit_with_released_blobs(db, released_paths)
+
+            return CrudResponseModel(is_success=True, message="删除附件成功")
+
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(
+                is_success=False, message=f"删除附件失败: {str(e)}"
+            )
+
+    @classmethod
+    def get_attachment_file_services(cls, db: Session, attachment_id: int):
+        """
+        获取待下载附件services
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :return: 附件信息
+        """
+        attachment = IssueDao.get_attachment_by_id(db, attachment_id)
+        if not attachment or not attachment.file_path or not StorageUtil.resolve_path(attachment.file_path):
+            raise ServiceException(message="附件不存在")
+
+        return attachment
+
+    @classmethod
+    def get_attachment_bundle_services(cls, db: Session, issue_id: int):
+        """
+        获取Issue全部附件的打包下载内容services，附件文件在返回前全部打开，内容在发送时才逐个读取，
+        发送过程中附件被压缩或清理不影响已打开的文件
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: (压缩包文件名, 压缩包内的文件列表)
+        """
+        issues = IssueDao.get_issues_by_ids(db, [issue_id])
+        if not issues:
+            raise ServiceException(message="Issue不存在")
+        attachments = IssueDao.get_issue_attachments(db, issue_id)
+        if not attachments:
+            raise ServiceException(message="Issue没有附件")
+
+        entries = []
+        used_names = set()
+        try:
+            for attachment in attachments:
+                source = cls._open_bundle_source(attachment.file_path) if attachment.file_path else None
+                if not source:
+                    raise ServiceException(message=f"附件文件不存在: {attachment.file_name}")
+                file_size, open_chunks, close = source
+                file_name = ZipStreamUtil.unique_name(attachment.file_name, used_names)
+                entries.append(
+                    ZipStreamEntry(
+                        name=file_name,
+                        file_size=file_size,
+                        modify_time=attachment.upload_time,
+                        compress=os.path.splitext(file_name)[1].lower() not in ArchiveConstant.BUNDLE_STORED_TYPES,
+                        open_chunks=open_chunks,
+                        close=close,
+                    )
+                )
+        except BaseException:
+            for entry in entries:
+                entry.close()
+            raise
+
+        return f"{issues[0].issue_number}_attachments.zip", entries
+
+    @classmethod
+    def _open_bundle_source(cls, file_path: str):
+        """
+        打开附件实际存放的文件，打开前恰好被压缩替换时重新获取实际存放路径
+
+        :return: (原始大小, 读取函数, 关闭函数)，文件不存在时为None
+        """
+        for _ in range(2):
+            real_path = StorageUtil.resolve_path(file_path)
+            if not real_path:
+                return None
+            try:
+                if StorageUtil.is_compressed(real_path):
+                    reader = SeekableZstdReader(real_path)
+                    return reader.size, partial(ZipStreamUtil.iter_reader, reader), reader.close
+                file = open(real_path, "rb")
+                return os.fstat(file.fileno()).st_size, partial(ZipStreamUtil.iter_file, file), file.close
+            except FileNotFoundError:
+                continue
+
+        return None
+
+    @classmethod
+    def _get_archive_attachment(cls, db: Session, attachment_id: int):
+        """
+        获取压缩包附件、实际存放路径及压缩包目录
+        """
+        attachment = cls.get_attachment_file_services(db, attachment_id)
+        file_ext = os.path.splitext(attachment.file_name or "")[1].lower()
+        if file_ext not in ArchiveConstant.ARCHIVE_TYPES:
+            raise ServiceException(message=f"不支持浏览的文件类型: {file_ext}")
+        file_path = StorageUtil.resolve_path(attachment.file_path)
+        if StorageUtil.is_compressed(file_path):
+            raise ServiceException(message="压缩存储的附件不支持浏览")
+        try:
+            members = ZipUtil.get_directory(file_path, StorageUtil.get_zip_directory_path(attachment.file_path))
+        except (OSError, ValueError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+            raise ServiceException(message=f"压缩包已损坏: {str(e)}")
+
+        return attachment, file_path, members
+
+    @classmethod
+    def get_archive_members_services(cls, db: Session, attachment_id: int):
+        """
+        获取压缩包附件目录services，首次读取后缓存
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :return: 压缩包目录
+        """
+        attachment, _, members = cls._get_archive_attachment(db, attachment_id)
+        max_members = ArchiveConstant.MAX_LIST_MEMBERS
+
+        return AttachmentArchiveModel(
+            attachmentId=attachment.attachment_id,
+            fileName=attachment.file_name,
+            memberCount=len(members),
+            totalSize=sum(member.file_size for member in members),
+            members=[
+                ArchiveMemberModel(
+                    name=member.name,
+                    fileSize=member.file_size,
+                    compressSize=member.compress_size,
+                    compressType=ZipUtil.get_compress_type_name(member.compress_type),
+                    modifyTime=member.modify_time,
+                    isDir=member.is_dir,
+                    encrypted=member.encrypted,
+                    viewable=not member.is_dir
+                    and not member.encrypted
+                    and os.path.splitext(member.name)[1].lower() in LogViewConstant.TEXT_TYPES,
+                )
+                for member in members[:max_members]
+            ],
+            truncated=len(members) > max_members,
+        )
+
+    @classmethod
+    def get_archive_member_services(cls, db: Session, attachment_id: int, member_name: str):
+        """
+        获取压缩包附件内的单个文件services
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :param member_name: 压缩包内的文件名
+        :return: (附件信息, 压缩包实际存放路径, 压缩包内文件)
+        """
+        attachment, file_path, members = cls._get_archive_attachment(db, attachment_id)
+        member = ZipUtil.find_member(members, member_name)
+        if member is None or member.is_dir:
+            raise ServiceException(message="压缩包内文件不存在")
+        if member.encrypted:
+            raise ServiceException(message="不支持读取加密的文件")
+        if member.compress_type not in ZipUtil.COMPRESS_TYPE_NAMES:
+            raise ServiceException(message=f"不支持的压缩方式: {member.compress_type}")
+
+        return attachment, file_path, member
+
+    @classmethod
+    def _get_text_attachment_file(cls, db: Session, attachment_id: int, member_name: Optional[str] = None):
+        """
+        获取可在线查看的文本附件(或压缩包内的文本文件)的实际存放路径、行索引路径、是否已压缩及压缩包内文件
+        """
+        if member_name:
+            attachment, file_path, member = cls.get_archive_member_services(db, attachment_id, member_name)
+            file_ext = os.path.splitext(member_name)[1].lower()
+            if file_ext not in LogViewConstant.TEXT_TYPES:
+                raise ServiceException(message=f"不支持在线查看的文件类型: {file_ext}")
+            return file_path, StorageUtil.get_line_index_path(attachment.file_path, member_name), False, member
+        attachment = cls.get_attachment_file_services(db, attachment_id)
+        file_ext = os.path.splitext(attachment.file_name or "")[1].lower()
+        if file_ext not in LogViewConstant.TEXT_TYPES:
+            raise ServiceException(message=f"不支持在线查看的文件类型: {file_ext}")
+        file_path = StorageUtil.resolve_path(attachment.file_path)
+
+        return (
+            file_path,
+            StorageUtil.get_line_index_path(attachment.file_path),
+            StorageUtil.is_compressed(file_path),
+            None,
+        )
+
+    @classmethod
+    def get_attachment_lines_services(
+        cls, db: Session, attachment_id: int, start_line: int, line_count: int, member_name: Optional[str] = None
+    ):
+        """
+        分页读取文本附件services
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :param start_line: 起始行号(从1开始)
+        :param line_count: 读取行数
+        :param member_name: 压缩包内的文件名，读取压缩包附件中的文本文件时指定
+        :return: 分页读取结果
+        """
+        file_path, index_path, compressed, member = cls._get_text_attachment_file(db, attachment_id, member_name)
+        with LogViewUtil.open_text(file_path, compressed, member) as reader:
+            line_index = LogViewUtil.get_line_index(reader, index_path)
+            lines = LogViewUtil.read_lines(reader, line_index, start_line - 1, line_count)
+        next_line = start_line + len(lines)
+
+        return AttachmentLinesModel(
+            attachmentId=attachment_id,
+            memberName=member_name or None,
+            startLine=start_line,
+            lines=lines,
+            totalLines=line_index.line_count,
+            nextLine=next_line if next_line <= line_index.line_count else None,
+        )
+
+    @classmethod
+    def search_attachment_services(cls, db: Session, attachment_id: int, query_object: AttachmentSearchModel):
+        """
+        按正则表达式搜索文本附件services
+
+        :param db: orm对象
+        :param attachment_id: 附件ID
+        :param query_object: 搜索查询对象
+        :return: 匹配行及上下文，扫描量达到上限时提前返回，可从nextLine继续搜索
+        """
+        flags = re.MULTILINE | (re.IGNORECASE if query_object.ignore_case else 0)
+        try:
+            pattern = re.compile(query_object.pattern.encode("utf-8"), flags)
+        except re.error as e:
+            raise ServiceException(message=f"正则表达式不合法: {str(e)}")
+        file_path, index_path, compressed, member = cls._get_text_attachment_file(
+            db, attachment_id, query_object.member_name
+        )
+        context_lines = query_object.context_lines
+        with LogViewUtil.open_text(file_path, compressed, member) as reader:
+            line_index = LogViewUtil.get_line_index(reader, index_path)
+            matches, next_line, truncated = LogViewUtil.search(
+                reader, line_index, pattern, query_object.start_line - 1, query_object.max_results
+            )
+            search_matches = []
+            for line_number, line in matches:
+                before_start = max(line_number - context_lines, 0)
+                search_matches.append(
+                    AttachmentSearchMatchModel(
+                        lineNumber=line_number + 1,
+                        line=line,
+                        before=LogViewUtil.read_lines(reader, line_index, before_start, line_number - before_start),
+                        after=LogViewUtil.read_lines(reader, line_index, line_number + 1, context_lines),
+                    )
+                )
+
+        return AttachmentSearchResultModel(
+            matches=search_matches,
+            totalLines=line_index.line_count,
+            nextLine=next_line + 1 if next_line is not None else None,
+            truncated=truncated,
+        )
+
+    @classmethod
+    def get_compress_candidates_services(cls, db: Session, limit: int = 1000):
+        """
+        获取待压缩的存储文件services
+
+        :param db: orm对象
+        :param limit: 最多返回的数量
+        :return: 文件摘要列表
+        """
+        return IssueDao.get_compress_candidates(db, AttachmentConstant.COMPRESS_TYPES, limit)
+
+    @classmethod
+    def compress_blob_services(cls, db: Session, file_hash: str):
+        """
+        压缩存储文件services，压缩在事务外进行，完成后对存储记录加锁再替换原文件，与引用计数归零时的删除互斥
+
+        :param db: orm对象
+        :param file_hash: 文件SHA-256摘要
+        :return: 压缩结果，result为节省的字节数
+        """
+        blob = IssueDao.get_blob(db, file_hash)
+        if not blob or blob.compression is not None:
+            db.rollback()
+            return CrudResponseModel(is_success=True, message="存储文件无需压缩", result=0)
+        source_path, file_size = blob.file_path, blob.file_size
+        db.rollback()
+        if not os.path.isfile(source_path):
+            return CrudResponseModel(is_success=False, message="存储文件不存在", result=0)
+
+        temp_path = StorageUtil.get_temp_path()
+        compressed_path = source_path + StorageUtil.COMPRESSED_SUFFIX
+        replaced = False
+        try:
+            compressed_size = CompressUtil.compress_file(
+                source_path, temp_path, AttachmentConstant.COMPRESS_FRAME_SIZE, AttachmentConstant.COMPRESS_LEVEL
+            )
+            blob = IssueDao.get_blob(db, file_hash, for_update=True)
+            if not blob or blob.compression is not None:
+                db.rollback()
+                return CrudResponseModel(is_success=True, message="存储文件已删除或已压缩", result=0)
+            if compressed_size > file_size * (1 - AttachmentConstant.COMPRESS_MIN_SAVING):
+                IssueDao.update_blob_compression(db, blob, "none")
+                db.commit()
+                return CrudResponseModel(is_success=True, message="压缩率过低，保留原文件", result=0)
+            os.replace(temp_path, compressed_path)
+            replaced = True
+            IssueDao.update_blob_compression(db, blob, "zstd", compressed_size)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            if replaced:
+                os.remove(compressed_path)
+            return CrudResponseModel(is_success=False, message=f"压缩存储文件失败: {str(e)}", result=0)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        os.remove(source_path)
+
+        return CrudResponseModel(
+            is_success=True,
+            message=f"压缩存储文件成功: {file_size}字节压缩为{compressed_size}字节",
+            result=file_size - compressed_size,
+        )
+
+    @classmethod
+    def get_attachment_storage_statistics_services(cls, db: Session):
+        """
+        获取附件存储空间统计services
+
+        :param db: orm对象
+        :return: 附件存储空间统计
+        """
+        statistics = IssueDao.get_blob_storage_statistics(db, AttachmentConstant.COMPRESS_TYPES)
+
+        original_size, stored_size = statistics["original_size"], statistics["stored_size"]
+
+        return AttachmentStorageStatisticsModel(
+            blobCount=statistics["blob_count"],
+            compressedCount=statistics["compressed_count"],
+            pendingCount=statistics["pending_count"],
+            originalSize=original_size,
+            storedSize=stored_size,
+            savedSize=original_size - stored_size,
+            compressionRatio=round(original_size / stored_size, 2) if stored_size else 1.0,
+        )
+
+    @classmethod
+    def _get_attachment_index(cls):
+        """
+        获取附件trigram索引
+        """
+        return TrigramIndex(os.path.join(UploadConfig.UPLOAD_PATH, AttachmentIndexConstant.INDEX_PATH))
+
+    @classmethod
+    def get_attachment_index_size_services(cls):
+        """
+        获取附件trigram索引大小services
+
+        :return: (索引段数, 索引文档数, 倒排项数, 索引文件字节数)
+        """
+        return cls._get_attachment_index().get_size()
+
+    @classmethod
+    def _list_index_members(cls, file_path: str, file_name: str):
+        """
+        获取存储文件中需要建立索引的文本：文本附件为其本身，压缩包为其中的文本文件
+
+        :return: (压缩包内的文件名, 原始内容大小)列表
+        """
+        if os.path.splitext(file_name or "")[1].lower() not in AttachmentIndexConstant.ARCHIVE_TYPES:
+            if StorageUtil.is_compressed(file_path):
+                return [("", CompressUtil.get_content_size(file_path))]
+            return [("", os.path.getsize(file_path))]
+        max_name_length = IssueAttachmentIndexDoc.member_name.type.length
+        with zipfile.ZipFile(file_path) as archive:
+            return [
+                (info.filename, info.file_size)
+                for info in archive.infolist()
+                if not info.is_dir()
+                and len(info.filename) <= max_name_length
+                and os.path.splitext(info.filename)[1].lower() in AttachmentIndexConstant.TEXT_TYPES
+            ]
+
+    @classmethod
+    def _iter_index_content(cls, file_path: str, member_name: str = "") -> Iterator[bytes]:
+        """
+        按块读取存储文件(压缩包内的文件)的原始内容
+        """
+        scan_size = AttachmentIndexConstant.SCAN_SIZE
+        if member_name:
+            with zipfile.ZipFile(file_path) as archive, archive.open(member_name) as f:
+                yield from iter(lambda: f.read(scan_size), b"")
+        elif StorageUtil.is_compressed(file_path):
+            with SeekableZstdReader(file_path) as reader:
+                for offset in range(0, reader.size, scan_size):
+                    yield reader.read(offset, scan_size)
+        else:
+            with open(file_path, "rb") as f:
+                yield from iter(lambda: f.read(scan_size), b"")
+
+    @classmethod
+    def index_attachments_services(cls, db: Session, limit: int = 1000):
+        """
+        为已关联Issue的文本附件及压缩包内的文本文件建立trigram索引services
+
+        索引文档先以未完成状态提交，写入索引段后再标记完成，中途退出时未完成的文档在之后的任务中清理并重新建立
+
+        :param db: orm对象
+        :param limit: 单次处理的存储文件数
+        :return: 建立索引结果，result为新写入索引的文档数
+        """
+        index = cls._get_attachment_index()
+        doc_count = 0
+        batch = []
+        try:
+            IssueDao.delete_stale_index_docs(db)
+            db.commit()
+            blobs = IssueDao.get_unindexed_blobs(
+                db, AttachmentIndexConstant.TEXT_TYPES + AttachmentIndexConstant.ARCHIVE_TYPES, limit
+            )
+            for blob in blobs:
+                file_path = StorageUtil.resolve_path(blob.file_path)
+                try:
+                    members = cls._list_index_members(file_path, blob.file_name) if file_path else []
+                except (OSError, ValueError, zipfile.BadZipFile):
+                    members = []
+                if not members:
+                    # 无法读取或不包含文本文件时记录空文档，避免重复处理
+                    IssueDao.add_index_docs(db, blob.file_hash, [("", 0)], datetime.now())
+                    db.commit()
+                    continue
+                doc_ids = [doc.doc_id for doc in IssueDao.add_index_docs(db, blob.file_hash, members)]
+                db.commit()
+                for doc_id, (member_name, _) in zip(doc_ids, members):
+                    try:
+                        batch.append((doc_id, TrigramUtil.extract(cls._iter_index_content(file_path, member_name))))
+                    except Exception:
+                        # 加密、损坏的压缩包成员等无法读取的内容只记录文档，不写入倒排项
+                        batch.append((doc_id, TrigramUtil.extract([])))
+                if sum(len(trigrams) for _, trigrams in batch) >= AttachmentIndexConstant.BATCH_POSTINGS:
+                    doc_count += cls._flush_index_batch(db, index, batch)
+                    batch = []
+            doc_count += cls._flush_index_batch(db, index, batch)
+            merged_count = index.merge(
+                AttachmentIndexConstant.MAX_SEGMENTS,
+                AttachmentIndexConstant.MERGE_MAX_POSTINGS,
+                IssueDao.get_index_doc_ids(db),
+            )
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"建立附件索引失败: {str(e)}", result=doc_count)
+
+        return CrudResponseModel(
+            is_success=True,
+            message=f"处理存储文件{len(blobs)}个，写入索引文档{doc_count}个，合并索引段{merged_count}个",
+            result=doc_count,
+        )
+
+    @classmethod
+    def _flush_index_batch(cls, db: Session, index: TrigramIndex, batch: List[tuple]):
+        """
+        将一批文档写入新的索引段并标记完成
+        """
+        if not batch:
+            return 0
+        index.add_documents(batch)
+        IssueDao.mark_index_docs(db, [doc_id for doc_id, _ in batch], datetime.now())
+        db.commit()
+
+        return len(batch)
+
+    @classmethod
+    def grep_attachments_services(cls, db: Session, query_object: AttachmentGrepModel):
+        """
+        跨附件搜索services，先用trigram索引筛选候选文件，再逐个扫描校验并定位匹配位置
+
+        :param db: orm对象
+        :param query_object: 搜索查询对象
+        :return: 包含匹配内容的Issue及附件
+        """
+        flags = re.MULTILINE | (re.IGNORECASE if query_object.ignore_case else 0)
+        pattern_bytes = query_object.pattern.encode("utf-8")
+        try:
+            if query_object.regex:
+                pattern = re.compile(pattern_bytes, flags)
+                trigrams = TrigramUtil.regex_trigrams(pattern_bytes, flags)
+            else:
+                pattern = re.compile(re.escape(pattern_bytes), flags)
+                trigrams = TrigramUtil.literal_trigrams(pattern_bytes)
+        except re.error as e:
+            raise ServiceException(message=f"正则表达式不合法: {str(e)}")
+        if not trigrams:
+            raise ServiceException(message="搜索内容需包含至少3个连续的普通字符")
+
+        # 优先校验最近建立索引的文档
+        doc_ids = sorted(cls._get_attachment_index().lookup(trigrams), reverse=True)
+        truncated = len(doc_ids) > AttachmentIndexConstant.MAX_CANDIDATES
+        attachments = IssueDao.get_index_doc_attachments(
+            db,
+            doc_ids[: AttachmentIndexConstant.MAX_CANDIDATES],
+            AttachmentIndexConstant.TEXT_TYPES,
+            AttachmentIndexConstant.ARCHIVE_TYPES,
+        )
+        # 同一内容被多个附件引用时只扫描一次
+        scan_results = {}
+        matches = []
+        for attachment in attachments:
+            if len(matches) >= query_object.max_matches:
+                truncated = True
+                break
+            if attachment.doc_id not in scan_results:
+                file_path = StorageUtil.resolve_path(attachment.file_path)
+                try:
+                    scan_results[attachment.doc_id] = (
+                        LogViewUtil.find_offsets(
+                            cls._iter_index_content(file_path, attachment.member_name),
+                            pattern,
+                            query_object.max_offsets,
+                            AttachmentIndexConstant.SCAN_SIZE,
+                        )
+                        if file_path
+                        else ([], False)
+                    )
+                except Exception:
+                    scan_results[attachment.doc_id] = ([], False)
+            offsets, more_offsets = scan_results[attachment.doc_id]
+            if offsets:
+                matches.append(
+                    AttachmentGrepMatchModel(
+                        issueId=attachment.issue_id,
+                        attachmentId=attachment.attachment_id,
+                        fileName=attachment.file_name,
+                        memberName=attachment.member_name or None,
+                        offsets=offsets,
+                        moreOffsets=more_offsets,
+                    )
+                )
+
+        return AttachmentGrepResultModel(
+            issueIds=sorted({match.issue_id for match in matches}, reverse=True),
+            matches=matches,
+            candidateCount=len(doc_ids),
+            scannedCount=len(scan_results),
+            truncated=truncated,
+        )
+
+    @classmethod
+    def extract_log_events_services(
+        cls,
+        db: Session,
+        limit: int = 1000,
+        issue_id: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        提取已关联Issue的日志附件的结构化事件services，事件文件按文件摘要存放，相同内容的附件只提取一次
+
+        :param db: orm对象
+        :param limit: 单次处理的存储文件数
+        :param issue_id: 只处理该Issue的附件，为空时处理全部Issue的附件
+        :param progress: 进度回调，参数为(已处理数, 总数)
+        :return: 提取结果，result为(成功数, 失败数)
+        """
+        success_count = failed_count = 0
+        try:
+            blobs = IssueDao.get_unextracted_log_blobs(
+                db, LogEventConstant.LOG_TYPES, LogEventConstant.PATTERN_VERSION, limit, issue_id
+            )
+            for blob in blobs:
+                event_file = dict(
+                    file_hash=blob.file_hash,
+                    pattern_version=LogEventConstant.PATTERN_VERSION,
+                    status="success",
+                    event_count=0,
+                    line_count=0,
+                    begin_time=None,
+                    end_time=None,
+                    event_file_size=0,
+                    error_message=None,
+                    extract_time=datetime.now(),
+                )
+                try:
+                    file_path = StorageUtil.resolve_path(blob.file_path)
+                    if not file_path:
+                        raise FileNotFoundError("附件文件不存在")
+                    with LogViewUtil.open_text(file_path, StorageUtil.is_compressed(file_path)) as reader:
+                        columns, line_count = LogEventUtil.extract(reader)
+                    begin_time, end_time = LogEventUtil.get_time_range(columns)
+                    event_file.update(
+                        event_count=len(columns.levels),
+                        line_count=line_count,
+                        begin_time=begin_time,
+                        end_time=end_time,
+                        event_file_size=LogEventUtil.write(StorageUtil.get_event_path(blob.file_path), columns),
+                    )
+                    success_count += 1
+                except Exception as e:
+                    # 单个文件损坏(如压缩数据损坏)只记录为失败，不影响其余文件的提取
+                    event_file.update(
+                        status="failed", error_message=(str(e) or type(e).__name__)[: LogEventConstant.MAX_ERROR_LENGTH]
+                    )
+                    failed_count += 1
+                IssueDao.save_log_event_file(db, event_file)
+                db.commit()
+                if progress:
+                    progress(success_count + failed_count, len(blobs))
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(
+                is_success=False, message=f"提取日志事件失败: {str(e)}", result=(success_count, failed_count)
+            )
+
+        return CrudResponseModel(
+            is_success=True,
+            message=f"提取日志事件完成，成功{success_count}个，失败{failed_count}个",
+            result=(success_count, failed_count),
+        )
+
+    @classmethod
+    def get_issue_log_events_services(cls, db: Session, issue_id: int, query_object: LogEventQueryModel):
+        """
+        查询Issue日志附件中的结构化事件services，按事件文件记录的时间范围跳过无关文件，文件内按列向量化筛选
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :param query_object: 查询条件对象
+        :return: 按时间排序的事件
+        """
+        if not IssueDao.get_issues_by_ids(db, [issue_id]):
+            raise ServiceException(message="Issue不存在")
+        if query_object.begin_time and query_object.end_time and query_object.begin_time >= query_object.end_time:
+            raise ServiceException(message="起始时间需早于结束时间")
+
+        begin = LogEventUtil.to_timestamp(query_object.begin_time) if query_object.begin_time else None
+        end = LogEventUtil.to_timestamp(query_object.end_time) if query_object.end_time else None
+        min_level = LogEventUtil.LEVELS.index(query_object.level) if query_object.level else 0
+        limit = query_object.limit
+        total = file_count = pending_count = 0
+        candidates = []
+        for attachment, event_file in IssueDao.get_issue_log_event_files(db, issue_id, LogEventConstant.LOG_TYPES):
+            if event_file is None:
+                pending_count += 1
+                continue
+            if event_file.status != "success" or not event_file.event_count:
+                continue
+            if (query_object.begin_time or query_object.end_time) and (
+                event_file.begin_time is None
+                or (query_object.end_time and event_file.begin_time >= query_object.end_time)
+                or (query_object.begin_time and event_file.end_time < query_object.begin_time)
+            ):
+                continue
+            try:
+                events = LogEventFile(StorageUtil.get_event_path(attachment.file_path))
+            except (OSError, ValueError):
+                pending_count += 1
+                continue
+            with events:
+                file_count += 1
+                indices = events.filter(begin, end, min_level, query_object.component, query_object.error_code)
+                total += len(indices)
+                if len(indices) > limit:
+                    # 只保留本文件最早的limit个事件参与合并
+                    indices = indices[np.argsort(events.timestamps[indices], kind="stable")[:limit]]
+                for timestamp, line_number, offset, length, level, component, code in zip(
+                    events.timestamps[indices].tolist(),
+                    events.line_numbers[indices].tolist(),
+                    events.offsets[indices].tolist(),
+                    events.lengths[indices].tolist(),
+                    events.levels[indices].tolist(),
+                    events.components[indices].tolist(),
+                    events.codes[indices].tolist(),
+                ):
+                    candidates.append(
+                        (
+                            timestamp,
+                            attachment.attachment_id,
+                            line_number,
+                            offset,
+                            length,
+                            LogEventUtil.LEVELS[level] or None,
+                            events.component_names[component] or None,
+                            events.code_names[code] or None,
+                            attachment,
+                        )
+                    )
+        candidates.sort(key=lambda candidate: candidate[:3])
+
+        return LogEventResultModel(
+            total=total,
+            fileCount=file_count,
+            pendingCount=pending_count,
+            events=cls._read_log_event_messages(candidates[:limit]),
+        )
+
+    @classmethod
+    def _read_log_event_messages(cls, candidates: List[tuple]):
+        """
+        读取事件所在行的内容，每个附件只打开一次
+        """
+        messages = {}
+        by_attachment = defaultdict(list)
+        for candidate in candidates:
+            by_attachment[candidate[1]].append(candidate)
+        for attachment_id, items in by_attachment.items():
+            file_path = StorageUtil.resolve_path(items[0][-1].file_path)
+            if not file_path:
+                continue
+            with LogViewUtil.open_text(file_path, StorageUtil.is_compressed(file_path)) as reader:
+                for _, _, line_number, offset, length, *_ in items:
+                    data = reader.read(offset, min(length, LogEventConstant.MAX_MESSAGE_BYTES))
+                    messages[(attachment_id, line_number)] = data.rstrip(b"\r").decode("utf-8", errors="replace")
+
+        return [
+            LogEventModel(
+                attachmentId=attachment_id,
+                fileName=attachment.file_name,
+                lineNumber=line_number,
+                eventTime=LogEventUtil.to_datetime(timestamp),
+                level=level,
+                component=component,
+                errorCode=code,
+                message=messages.get((attachment_id, line_number), ""),
+            )
+            for timestamp, attachment_id, line_number, _, _, level, component, code, attachment in candidates
+        ]
+
+    @classmethod
+    def analyze_dumps_services(
+        cls,
+        db: Session,
+        executor: Optional[Executor] = None,
+        limit: int = 1000,
+        issue_id: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        分析已关联Issue的dump附件services，分析结果按文件摘要缓存，相同内容的附件只分析一次
+
+        :param db: orm对象
+        :param executor: 执行解析的进程池，为空时在当前进程中依次解析
+        :param limit: 单次处理的存储文件数
+        :param issue_id: 只处理该Issue的附件，为空时处理全部Issue的附件
+        :param progress: 进度回调，参数为(已处理数, 总数)，每批结果保存后调用
+        :return: 分析结果，result为(成功数, 失败数)
+        """
+        success_count = failed_count = 0
+        futures = {}
+        try:
+            blobs = IssueDao.get_unanalyzed_dump_blobs(
+                db, DumpAnalysisConstant.DUMP_TYPES, DumpAnalysisConstant.PARSER_VERSION, limit, issue_id
+            )
+            outcomes = []
+            tasks = []
+            for blob in blobs:
+                file_path = StorageUtil.resolve_path(blob.file_path)
+                if file_path:
+                    tasks.append((blob.file_hash, file_path, StorageUtil.is_compressed(file_path)))
+                else:
+                    outcomes.append((blob.file_hash, None, "附件文件不存在"))
+            if executor is None:
+                outcomes = chain(
+                    outcomes,
+                    (
+                        (file_hash, *cls._get_dump_result(MinidumpUtil.analyze_file, file_path, compressed))
+                        for file_hash, file_path, compressed in tasks
+                    ),
+                )
+            else:
+                # 解析为CPU密集型操作，提交到进程池并行执行，按完成顺序分批保存
+                futures = {
+                    executor.submit(MinidumpUtil.analyze_file, file_path, compressed): file_hash
+                    for file_hash, file_path, compressed in tasks
+                }
+                outcomes = chain(
+                    outcomes,
+                    ((futures[future], *cls._get_dump_result(future.result)) for future in as_completed(futures)),
+                )
+
+            analyses = []
+            for file_hash, result, error in outcomes:
+                analyses.append(cls._build_dump_analysis(file_hash, result, error))
+                if result is None:
+                    failed_count += 1
+                else:
+                    success_count += 1
+                if len(analyses) >= DumpAnalysisConstant.BATCH_SIZE:
+                    IssueDao.save_dump_analyses(db, analyses)
+                    db.commit()
+                    analyses = []
+                    if progress:
+                        progress(success_count + failed_count, len(blobs))
+            IssueDao.save_dump_analyses(db, analyses)
+            db.commit()
+            if progress:
+                progress(success_count + failed_count, len(blobs))
+        except BrokenProcessPool:
+            # 进程池已不可用，由调用方重建后重试
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            for future in futures:
+                future.cancel()
+            return CrudResponseModel(
+                is_success=False, message=f"分析dump附件失败: {str(e)}", result=(success_count, failed_count)
+            )
+
+        return CrudResponseModel(
+            is_success=True,
+            message=f"分析dump附件完成，成功{success_count}个，失败{failed_count}个",
+            result=(success_count, failed_count),
+        )
+
+    @classmethod
+    def _get_dump_result(cls, func, *args):
+        """
+        执行dump解析，dump格式错误或读取失败时返回失败原因
+
+        :param func: 解析函数
+        :param args: 解析函数参数
+        :return: (解析结果, 失败原因)
+        """
+        try:
+            return func(*args), None
+        except (ValueError, struct.error, OSError) as e:
+            return None, str(e) or type(e).__name__
+
+    @classmethod
+    def _build_dump_analysis(cls, file_hash: str, result: Optional[dict] = None, error: Optional[str] = None):
+        """
+        根据解析结果构建分析结果记录，批量插入要求各记录字段一致
+
+        :param file_hash: 文件摘要
+        :param result: 解析结果
+        :param error: 失败原因
+        :return: 分析结果记录
+        """
+        result = result or {}
+        crash_time = result.get("crash_time")
+        return dict(
+            file_hash=file_hash,
+            parser_version=DumpAnalysisConstant.PARSER_VERSION,
+            status="failed" if error else "success",
+            dump_type=result.get("dump_type"),
+            exception_code=result.get("exception_code"),
+            exception_address=result.get("exception_address"),
+            faulting_module=(result.get("faulting_module") or "")[:255] or None,
+            faulting_offset=result.get("faulting_offset"),
+            faulting_module_version=result.get("faulting_module_version"),
+            process_name=(result.get("process_name") or "")[:255] or None,
+            os_build=(result.get("os_build") or "")[:128] or None,
+            thread_count=result.get("thread_count"),
+            module_count=len(result["modules"]) if result else None,
+            crash_time=datetime.strptime(crash_time, "%Y-%m-%d %H:%M:%S") if crash_time else None,
+            crash_signature=MinidumpUtil.get_signature(result) if result else None,
+            result=json.dumps(result, ensure_ascii=False) if result else None,
+            error_message=error[: DumpAnalysisConstant.MAX_ERROR_LENGTH] if error else None,
+            analyze_time=datetime.now(),
+        )
+
+    @classmethod
+    def get_issue_dump_analyses_services(cls, db: Session, issue_id: int):
+        """
+        获取Issue的dump附件分析结果services
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: dump附件分析结果列表，尚未分析的附件状态为pending
+        """
+        if not IssueDao.get_issues_by_ids(db, [issue_id]):
+            raise ServiceException(message="Issue不存在")
+
+        analyses = []
+        for attachment, analysis in IssueDao.get_issue_dump_analyses(db, issue_id, DumpAnalysisConstant.DUMP_TYPES):
+            data = dict(attachmentId=attachment.attachment_id, fileName=attachment.file_name, status="pending")
+            if analysis:
+                data.update(
+                    status=analysis.status,
+                    errorMessage=analysis.error_message,
+                    analyzeTime=analysis.analyze_time,
                 )
+                if analysis.result:
+                    result = json.loads(analysis.result)
+                    result["modules"] = [
+                        {to_camel(key): value for key, value in module.items()} for module in result["modules"]
+                    ]
+                    data.update({to_camel(key): value for key, value in result.items()})
+            analyses.append(DumpAnalysisModel(**data))
+        return analyses
 
-        new_data = [
-            {
-                mapping_dict.get(key): value
-                for key, value in item.items()
-                if mapping_dict.get(key)
-            }
-            for item in data
+    @classmethod
+    def bucket_crash_dumps_services(cls, db: Session):
+        """
+        将已分析出崩溃签名的dump附件归入崩溃分组services，每批处理后提交，只处理尚未归入分组的附件
+
+        :param db: orm对象
+        :return: 归组结果，result为本次归入分组的附件数
+        """
+        hit_count = 0
+        try:
+            while True:
+                rows = IssueDao.get_unbucketed_dump_attachments(
+                    db, DumpAnalysisConstant.DUMP_TYPES, DumpAnalysisConstant.BUCKET_BATCH_SIZE
+                )
+                if not rows:
+                    break
+                hits = []
+                buckets = {}
+                for row in rows:
+                    hit_time = row.upload_time or datetime.now()
+                    hits.append(
+                        dict(
+                            attachment_id=row.attachment_id,
+                            signature=row.crash_signature,
+                            issue_id=row.issue_id,
+                            hit_time=hit_time,
+                        )
+                    )
+                    bucket = buckets.setdefault(
+                        row.crash_signature,
+                        dict(
+                            signature=row.crash_signature,
+                            dump_type=row.dump_type,
+                            exception_code=row.exception_code,
+                            faulting_module=row.faulting_module,
+                            faulting_offset=row.faulting_offset,
+                            first_hit_time=hit_time,
+                            last_hit_time=hit_time,
+                        ),
+                    )
+                    bucket["first_hit_time"] = min(bucket["first_hit_time"], hit_time)
+                    bucket["last_hit_time"] = max(bucket["last_hit_time"], hit_time)
+                IssueDao.save_crash_bucket_hits(db, hits, list(buckets.values()))
+                db.commit()
+                hit_count += len(hits)
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"崩溃分组失败: {str(e)}", result=hit_count)
+
+        return CrudResponseModel(is_success=True, message=f"归入崩溃分组的dump附件{hit_count}个", result=hit_count)
+
+    @classmethod
+    def get_issue_crash_buckets_services(cls, db: Session, issue_id: int):
+        """
+        获取Issue的dump附件所属的崩溃分组services，包含分组内的其他Issue
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: 崩溃分组列表
+        """
+        if not IssueDao.get_issues_by_ids(db, [issue_id]):
+            raise ServiceException(message="Issue不存在")
+
+        buckets = cls._build_crash_buckets(
+            IssueDao.get_crash_buckets(db, IssueDao.get_issue_crash_signatures(db, issue_id))
+        )
+        for bucket in buckets:
+            bucket.issues = [
+                CrashBucketIssueModel(**{to_camel(key): value for key, value in row._mapping.items()})
+                for row in IssueDao.get_crash_bucket_issues(db, bucket.signature, DumpAnalysisConstant.MAX_BUCKET_ISSUES)
+            ]
+        return buckets
+
+    @classmethod
+    def get_top_crash_buckets_services(cls, db: Session, days: int = 7, limit: int = 20):
+        """
+        获取最近一段时间内命中数最多的崩溃分组services
+
+        :param db: orm对象
+        :param days: 统计最近多少天的命中
+        :param limit: 返回数量
+        :return: 崩溃分组列表
+        """
+        return cls._build_crash_buckets(IssueDao.get_top_crash_buckets(db, datetime.now() - timedelta(days=days), limit))
+
+    @classmethod
+    def _build_crash_buckets(cls, rows):
+        """
+        将(崩溃分组, 命中数, Issue数)列表转换为崩溃分组模型列表
+        """
+        return [
+            CrashBucketModel(
+                signature=bucket.signature,
+                dumpType=bucket.dump_type,
+                exceptionCode=bucket.exception_code,
+                faultingModule=bucket.faulting_module,
+                faultingOffset=bucket.faulting_offset,
+                hitCount=hit_count,
+                issueCount=issue_count,
+                firstHitTime=bucket.first_hit_time,
+                lastHitTime=bucket.last_hit_time,
+            )
+            for bucket, hit_count, issue_count in rows
+        ]
+
+    @classmethod
+    def run_analysis_job_services(
+        cls, db: Session, job: dict, progress: Optional[Callable[[int, int], None]] = None
+    ):
+        """
+        执行附件分析任务services，由分析任务worker调用，执行失败时抛出异常由队列重试
+
+        :param db: orm对象
+        :param job: 领取的任务
+        :param progress: 进度回调，参数为(已处理数, 总数)
+        :return: 执行结果
+        """
+        if job["job_type"] == "dump_analysis":
+            result = cls.analyze_dumps_services(
+                db, None, AnalysisJobConstant.MAX_JOB_FILES, job.get("issue_id"), progress
+            )
+        elif job["job_type"] == "log_events":
+            result = cls.extract_log_events_services(
+                db, AnalysisJobConstant.MAX_JOB_FILES, job.get("issue_id"), progress
+            )
+        else:
+            raise ServiceException(message=f"不支持的任务类型: {job['job_type']}")
+        if not result.is_success:
+            raise ServiceException(message=result.message)
+        message = result.message
+
+        if job["job_type"] == "dump_analysis":
+            # 新分析的dump及关联了已分析内容的dump归入崩溃分组
+            bucket_result = cls.bucket_crash_dumps_services(db)
+            if not bucket_result.is_success:
+                raise ServiceException(message=bucket_result.message)
+            message = f"{message}，{bucket_result.message}"
+        return message
+
+    @classmethod
+    def get_issue_analysis_jobs_services(cls, db: Session, issue_id: int):
+        """
+        获取Issue的附件分析任务services
+
+        :param db: orm对象
+        :param issue_id: Issue ID
+        :return: 按提交顺序排列的任务列表
+        """
+        if not IssueDao.get_issues_by_ids(db, [issue_id]):
+            raise ServiceException(message="Issue不存在")
+
+        return [cls._build_analysis_job(job) for job in cls._get_analysis_job_queue().get_issue_jobs(issue_id)]
+
+    @classmethod
+    def get_analysis_job_services(cls, job_id: int):
+        """
+        获取附件分析任务services
+
+        :param job_id: 任务ID
+        :return: 任务
+        """
+        job = cls._get_analysis_job_queue().get_job(job_id)
+        if not job:
+            raise ServiceException(message="分析任务不存在或已过期")
+
+        return cls._build_analysis_job(job)
+
+    @classmethod
+    def _get_analysis_job_queue(cls):
+        """
+        获取附件分析任务队列，未启用时抛出异常
+        """
+        queue = JobQueueUtil.get_queue()
+        if queue is None:
+            raise ServiceException(message="附件分析任务队列未启用")
+        return queue
+
+    @classmethod
+    def _build_analysis_job(cls, job: dict):
+        """
+        根据队列中的任务构建任务模型
+        """
+        fields = {to_camel(key): value for key, value in job.items() if key != "score"}
+        if job["total"]:
+            fields["progress"] = round(job["processed"] * 100 / job["total"], 1)
+        elif job["status"] == "success":
+            fields["progress"] = 100
+        return AnalysisJobModel(**fields)
+
+    @classmethod
+    def get_issue_statistics_services(cls, db: Session):
+        """
+        获取Issue统计数据services
+
+        :param db: orm对象
+        :return: 统计数据响应模型
+        """
+        statistics_result = IssueDao.get_issue_stat_counters(db)
+        if statistics_result is None:
+            # 计数表尚未初始化(或跨月后本月计数项不存在)，以实时聚合结果校准
+            try:
+                statistics_result = IssueDao.reconcile_issue_statistics(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                statistics_result = IssueDao.get_issue_statistics(db)
+
+        # 转换为响应模型
+        response_model = IssueStatisticsResponseModel(**statistics_result)
+
+        return response_model
+
+    @classmethod
+    def get_top_tags_services(cls, db: Session, limit: int = 20):
+        """
+        获取使用次数最多的标签services(标签云)
+
+        :param db: orm对象
+        :param limit: 返回数量
+        :return: 标签使用次数列表
+        """
+        return [
+            IssueTagCountModel(tagId=row.tag_id, tagName=row.tag_name, usageCount=row.usage_count)
+            for row in IssueDao.get_top_tags(db, limit)
+        ]
+
+    @classmethod
+    def reconcile_issue_statistics_services(cls, db: Session):
+        """
+        校准Issue统计计数services
+
+        :param db: orm对象
+        :return: 校准结果
+        """
+        try:
+            drift = {}
+            before = IssueDao.get_issue_stat_counters(db) or {}
+            after = IssueDao.reconcile_issue_statistics(db)
+            tag_drift_count = IssueDao.reconcile_tag_usage(db)
+            db.commit()
+            for key, value in after.items():
+                if before.get(key) != value:
+                    drift[key] = (before.get(key), value)
+            if tag_drift_count:
+                drift["tag_usage_count"] = tag_drift_count
+            message = "统计计数校准完成" + (f"，修正计数项: {drift}" if drift else "，计数无偏差")
+            return CrudResponseModel(is_success=True, message=message, result=drift)
+        except Exception as e:
+            db.rollback()
+            return CrudResponseModel(is_success=False, message=f"统计计数校准失败: {str(e)}")
+
+    @classmethod
+    def _diff_stat_contribution(cls, before: dict, after: dict):
+        """
+        计算Issue变更前后统计计数贡献值的差额
+
+        :param before: 变更前贡献值
+        :param after: 变更后贡献值
+        :return: 计数项与增量字典
+        """
+        deltas = defaultdict(int)
+        for key, value in after.items():
+            deltas[key] += value
+        for key, value in before.items():
+            deltas[key] -= value
+        return deltas
+
+    @classmethod
+    def get_issue_type_options(cls):
+        """
+        获取Issue类型选项
+
+        :return: Issue类型选项响应模型
+        """
+        issue_types = [
+            {"label": "BUG报告", "value": "BUG"},
+            {"label": "问题工单", "value": "工单"},
+            {"label": "系统日志", "value": "系统日志"},
+            {"label": "测试报告", "value": "测试报告"},
+            {"label": "功能需求", "value": "功能需求"},
+            {"label": "性能优化", "value": "性能优化"},
+            {"label": "其他", "value": "其他"},
+        ]
+
+        # 转换为响应模型
+        response_model = [IssueOptionItemModel(**item) for item in issue_types]
+
+        return response_model
+
+    @classmethod
+    def get_priority_options(cls):
+        """
+        获取优先级选项
+
+        :return: 优先级选项响应模型
+        """
+        priority_options = [
+            {"label": "高", "value": "high"},
+            {"label": "中", "value": "medium"},
+            {"label": "低", "value": "low"},
+        ]
+
+        # 转换为响应模型
+        response_model = [IssueOptionItemModel(**item) for item in priority_options]
+
+        return response_model
+
+    @classmethod
+    def get_status_options(cls):
+        """
+        获取状态选项
+
+        :return: 状态选项响应模型
+        """
+        status_options = [
+            {"label": "待诊断", "value": "pending"},
+            {"label": "诊断中", "value": "diagnosing"},
+            {"label": "已完成", "value": "completed"},
+            {"label": "已取消", "value": "cancelled"},
+        ]
+
+        # 转换为响应模型
+        response_model = [IssueOptionItemModel(**item) for item in status_options]
+
+
+        return response_model
+
+    @classmethod
+    def clean_temporary_attachments_services(cls, db: Session, hours: int = 24, scan_orphans: bool = True):
+        """
+        清理超过指定时间的临时附件及分片上传会话，并扫描存储目录中没有记录的孤儿文件
+
+        过期临时附件按上传时间分批处理：先将一批记录标记为删除中并提交，删除历史附件的物理文件后，
+        再删除记录、扣减引用计数并提交，最后删除引用计数归零的存储文件；任务中断后从删除中的记录继续，
+        提交前中断而残留的待删除存储文件由孤儿扫描恢复或删除
+
+        :param db: orm对象
+        :param hours: 小时数，默认24小时
+        :param scan_orphans: 是否扫描孤儿文件
+        :return: 清理结果，result为清理统计
+        """
+        metrics = AttachmentGcResultModel()
+        begin = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(AttachmentGcConstant.DELETE_WORKERS) as executor:
+                cls._clean_expired_upload_sessions(db, hours, executor, metrics)
+                while True:
+                    # 优先处理上次中断遗留的删除中记录
+                    attachments = IssueDao.get_deleting_attachments(db, AttachmentGcConstant.BATCH_SIZE)
+                    if attachments:
+                        cls._sweep_attachment_batch(db, attachments, executor, metrics)
+                        continue
+                    attachment_ids = IssueDao.get_expired_temporary_attachment_ids(
+                        db, hours, AttachmentGcConstant.BATCH_SIZE
+                    )
+                    if not attachment_ids:
+                        break
+                    IssueDao.mark_attachments_deleting(db, attachment_ids)
+                    db.commit()
+                if scan_orphans:
+                    cls._scan_orphan_files(db, executor, metrics)
+            metrics.elapsed = round(time.perf_counter() - begin, 3)
+
+            return CrudResponseModel(
+                is_success=True,
+                message=f"成功清理 {metrics.attachment_count} 个临时附件, {metrics.session_count} 个过期的分片上传会话, "
+                f"{metrics.orphan_file_count} 个孤儿文件",
+                result=metrics,
+            )
+
+        except Exception as e:
+            db.rollback()
+            metrics.elapsed = round(time.perf_counter() - begin, 3)
+            return CrudResponseModel(is_success=False, message=f"清理临时附件失败: {str(e)}", result=metrics)
+
+    @classmethod
+    def _clean_expired_upload_sessions(
+        cls, db: Session, hours: int, executor: ThreadPoolExecutor, metrics: AttachmentGcResultModel
+    ):
+        """
+        删除过期的分片上传会话，先提交记录删除再删除临时文件，中断时残留的临时文件由孤儿扫描删除
+        """
+        expired_sessions = IssueDao.get_expired_upload_sessions(db, hours)
+        if not expired_sessions:
+            return
+        temp_paths = [upload_session.temp_path for upload_session in expired_sessions]
+        # 完成上传中断时残留的文件
+        temp_paths += [cls._get_completing_path(temp_path) for temp_path in temp_paths]
+        IssueDao.delete_upload_session_dao(db, [upload_session.upload_id for upload_session in expired_sessions])
+        db.commit()
+        metrics.session_count += len(expired_sessions)
+        cls._remove_files(executor, temp_paths, metrics)
+
+    @classmethod
+    def _sweep_attachment_batch(
+        cls,
+        db: Session,
+        attachments: List[IssueAttachment],
+        executor: ThreadPoolExecutor,
+        metrics: AttachmentGcResultModel,
+    ):
+        """
+        删除一批已标记为删除中的附件
+        """
+        # 未迁移到内容寻址存储的历史附件在删除记录前删除物理文件，中断后重新处理时文件已不存在
+        legacy_paths = []
+        for attachment in attachments:
+            if attachment.file_path and not cls._is_blob_attachment(attachment):
+                legacy_paths += [attachment.file_path] + StorageUtil.get_sidecar_paths(attachment.file_path)
+        cls._remove_files(executor, legacy_paths, metrics)
+
+        IssueDao.delete_attachments_dao(db, [attachment.attachment_id for attachment in attachments])
+        released_paths = IssueDao.release_blobs(db, cls._get_blob_hashes(attachments))
+        # 提交前将存储文件重命名为删除中状态，使并发上传的相同内容重新写入存储文件
+        detached_paths = StorageUtil.detach_blobs(released_paths)
+        try:
+            db.commit()
+        except Exception:
+            StorageUtil.restore_blobs(detached_paths)
+            raise
+        cls._remove_files(executor, detached_paths, metrics)
+        metrics.attachment_count += len(attachments)
+        metrics.released_blob_count += len(released_paths)
+        metrics.batch_count += 1
+
+    @classmethod
+    def _scan_orphan_files(cls, db: Session, executor: ThreadPoolExecutor, metrics: AttachmentGcResultModel):
+        """
+        按摘要顺序遍历存储目录，分批与存储记录比对：删除没有记录的文件，恢复或删除中断删除残留的文件，
+        并统计有记录但文件缺失的数量；修改时间在保留期内的文件不处理
+        """
+        expire_time = time.time() - AttachmentGcConstant.ORPHAN_GRACE_HOURS * 3600
+        batch = defaultdict(list)
+        lower = None
+        for file_hash, file_path in StorageUtil.iter_blob_files():
+            metrics.scanned_file_count += 1
+            if file_hash is None:
+                continue
+            if file_hash not in batch and len(batch) >= AttachmentGcConstant.ORPHAN_BATCH_SIZE:
+                lower = cls._check_orphan_batch(db, batch, lower, False, expire_time, executor, metrics)
+                batch = defaultdict(list)
+            batch[file_hash].append(file_path)
+        cls._check_orphan_batch(db, batch, lower, True, expire_time, executor, metrics)
+
+        # 中断的流式上传及已删除上传会话残留的临时文件
+        temp_dir = StorageUtil.get_temp_dir()
+        temp_paths = [entry.path for entry in os.scandir(temp_dir) if entry.is_file()] if os.path.isdir(temp_dir) else []
+        metrics.scanned_file_count += len(temp_paths)
+        cls._remove_expired_files(executor, temp_paths, expire_time, metrics)
+        session_dir = os.path.join(UploadConfig.UPLOAD_PATH, AttachmentConstant.SESSION_PATH)
+        if os.path.isdir(session_dir):
+            session_files = sorted(entry.name for entry in os.scandir(session_dir) if entry.is_file())
+            for offset in range(0, len(session_files), AttachmentGcConstant.ORPHAN_BATCH_SIZE):
+                file_names = session_files[offset : offset + AttachmentGcConstant.ORPHAN_BATCH_SIZE]
+                upload_ids = IssueDao.get_existing_upload_ids(
+                    db, [os.path.splitext(file_name)[0] for file_name in file_names]
+                )
+                cls._remove_expired_files(
+                    executor,
+                    [
+                        os.path.join(session_dir, file_name)
+                        for file_name in file_names
+                        if os.path.splitext(file_name)[0] not in upload_ids
+                    ],
+                    expire_time,
+                    metrics,
+                )
+            metrics.scanned_file_count += len(session_files)
+        db.rollback()
+
+    @classmethod
+    def _check_orphan_batch(
+        cls,
+        db: Session,
+        batch: dict,
+        lower: Optional[str],
+        is_last: bool,
+        expire_time: float,
+        executor: ThreadPoolExecutor,
+        metrics: AttachmentGcResultModel,
+    ):
+        """
+        将一批按摘要有序的文件与摘要区间(lower, 本批最大摘要]内的存储记录比对
+
+        :return: 下一批的区间下界
+        """
+        upper = None if is_last else max(batch)
+        blob_hashes = IssueDao.get_blob_hashes_in_range(db, lower, upper)
+        existing_hashes = set(blob_hashes)
+        missing_hashes = [file_hash for file_hash in blob_hashes if file_hash not in batch]
+        if missing_hashes:
+            metrics.missing_blob_count += len(missing_hashes)
+            logger.warning(f"存储文件缺失: {', '.join(missing_hashes[:10])}")
+
+        orphan_paths = []
+        for file_hash, file_paths in batch.items():
+            for file_path in file_paths:
+                if file_hash not in existing_hashes or file_path.endswith(".part"):
+                    orphan_paths.append(file_path)
+                elif file_path.endswith(StorageUtil.DELETING_SUFFIX):
+                    # 存储记录仍存在，说明删除在提交前中断，原文件不存在时恢复被重命名的文件
+                    original_path = file_path[: -len(StorageUtil.DELETING_SUFFIX)]
+                    if not os.path.exists(original_path) and cls._is_expired_file(file_path, expire_time):
+                        os.replace(file_path, original_path)
+                        metrics.restored_file_count += 1
+                    else:
+                        orphan_paths.append(file_path)
+        cls._remove_expired_files(executor, orphan_paths, expire_time, metrics)
+
+        return upper
+
+    @classmethod
+    def _is_expired_file(cls, file_path: str, expire_time: float):
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+        # 重命名会更新ctime，取较晚的时间判断
+        return max(stat_result.st_mtime, stat_result.st_ctime) < expire_time
+
+    @classmethod
+    def _remove_expired_files(
+        cls, executor: ThreadPoolExecutor, file_paths: List[str], expire_time: float, metrics: AttachmentGcResultModel
+    ):
+        expired_paths = [file_path for file_path in file_paths if cls._is_expired_file(file_path, expire_time)]
+        freed_size = metrics.freed_size
+        removed_count = metrics.deleted_file_count
+        cls._remove_files(executor, expired_paths, metrics)
+        metrics.orphan_file_count += metrics.deleted_file_count - removed_count
+        metrics.orphan_size += metrics.freed_size - freed_size
+
+    @classmethod
+    def _remove_files(cls, executor: ThreadPoolExecutor, file_paths: List[str], metrics: AttachmentGcResultModel):
+        """
+        并发删除文件并累计统计，文件不存在时忽略
+        """
+        for removed_size in executor.map(cls._remove_file, file_paths):
+            if removed_size is None:
+                metrics.failed_file_count += 1
+            elif removed_size >= 0:
+                metrics.deleted_file_count += 1
+                metrics.freed_size += removed_size
+
+    @classmethod
+    def _remove_file(cls, file_path: str):
+        """
+        删除文件
+
+        :return: 释放的字节数，文件不存在时为-1，删除失败时为None
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+            os.remove(file_path)
+            return file_size
+        except FileNotFoundError:
+            return -1
+        except OSError as e:
+            logger.warning(f"删除文件失败: {file_path}, 错误: {str(e)}")
+            return None
+
+    @classmethod
+    def export_issue_list_services(
+        cls, db: Session, query_object: IssuePageQueryModel, file_format: str = "xlsx"
+    ) -> Iterator[bytes]:
+        """
+        导出Issue信息service，使用服务端游标分批读取，边生成边输出
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param file_format: 导出格式(xlsx,csv)
+        :return: 按块返回导出文件数据的迭代器
+        """
+        # 导出的列及对应的中文表头，与导入时识别的表头一致
+        columns = [
+            ("issue_number", "Issue编号"),
+            ("title", "Issue标题"),
+            ("priority", "优先级"),
+            ("status", "状态"),
+            ("issue_type", "Issue类型"),
+            ("issue_source", "Issue来源"),
+            ("description", "问题描述"),
+            ("solution", "解决方案"),
+            ("expected_resolve_date", "预期解决日期"),
+            ("create_by", "创建者"),
+            ("create_time", "创建时间"),
+            ("update_by", "更新者"),
+            ("update_time", "更新时间"),
         ]
-        binary_data = export_list2excel(new_data)
+        rows = IssueDao.get_issue_export_rows(
+            db,
+            query_object,
+            [getattr(IssueMain, name) for name, _ in columns],
+            ExportConstant.BATCH_SIZE,
+        )
+        header = [title for _, title in columns]
+        formatted_rows = (cls._format_export_row(row) for row in rows)
+        if file_format == "csv":
+            return ExportUtil.iter_csv(header, formatted_rows)
+        return ExportUtil.iter_xlsx(header, formatted_rows, "Issue列表")
 
-        return binary_data
+    @staticmethod
+    def _format_export_row(row):
+        """
+        将导出的一行Issue数据中的优先级、状态转换为中文，预期解决日期只保留日期
+        """
+        priority_map = {"high": "高", "medium": "中", "low": "低"}
+        status_map = {
+            "pending": "待诊断",
+            "diagnosing": "诊断中",
+            "completed": "已完成",
+            "cancelled": "已取消",
+        }
+        (
+            issue_number, title, priority, status, issue_type, issue_source, description, solution,
+            expected_resolve_date, create_by, create_time, update_by, update_time,
+        ) = row
+        return (
+            issue_number,
+            title,
+            priority_map.get(priority, priority),
+            status_map.get(status, status),
+            issue_type,
+            issue_source,
+            description,
+            solution,
+            expected_resolve_date.date() if isinstance(expected_resolve_date, datetime) else expected_resolve_date,
+            create_by,
+            create_time,
+            update_by,
+            update_time,
+        )
@@ -0,0 +1,135 @@
+"""
+附件分析任务worker
+
+从redis任务队列中按优先级领取dump分析、日志事件提取等CPU密集型任务，在独立的进程中执行，不占用接口及定时任务的线程。
+附件关联到Issue后任务即被提交，高优先级Issue的任务先执行；执行失败或worker退出的任务按指数退避重试。
+
+用法(在lcfcbackend目录下)：
+    python -m module_task.analysis_worker --workers 4 --env prod
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+from typing import Callable
+from config.constant import AnalysisJobConstant
+from config.database import SessionLocal, engine
+from config.get_redis import RedisUtil
+from module_admin.service.issue_service import IssueService
+from utils.job_queue_util import AnalysisJobQueue, RedisJobQueue
+from utils.log_util import logger
+
+
+def run_once(queue: AnalysisJobQueue, worker: str, session_factory: Callable = SessionLocal):
+    """
+    收回租约过期的任务后领取并执行一个任务
+
+    :param queue: 任务队列
+    :param worker: worker名称
+    :param session_factory: 数据库会话工厂
+    :return: 是否领取到任务
+    """
+    recovered = queue.recover_expired()
+    if recovered:
+        logger.warning(f"[分析任务] 收回租约过期的任务{recovered}个")
+    job = queue.dequeue(worker)
+    if job is None:
+        return False
+
+    logger.info(
+        f"[分析任务] 开始执行任务{job['job_id']}({job['job_type']})，Issue: {job.get('issue_id')}，"
+        f"第{job['attempts']}次执行"
+    )
+    try:
+        with session_factory() as db:
+            message = IssueService.run_analysis_job_services(
+                db, job, lambda processed, total: queue.update_progress(job, processed, total)
+            )
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        if not queue.fail(job, error):
+            logger.warning(f"[分析任务] 任务{job['job_id']}的租约已过期，忽略执行结果")
+        elif job['attempts'] < job['max_attempts']:
+            logger.warning(f"[分析任务] 任务{job['job_id']}执行失败，等待重试: {error}")
+        else:
+            logger.error(f"[分析任务] 任务{job['job_id']}执行失败: {error}")
+        return True
+
+    if queue.complete(job, message):
+        logger.info(f"[分析任务] 任务{job['job_id']}执行完成，{message}")
+    else:
+        logger.warning(f"[分析任务] 任务{job['job_id']}的租约已过期，忽略执行结果")
+    return True
+
+
+def run_worker(queue: AnalysisJobQueue, worker: str, stop_event):
+    """
+    循环执行任务直到收到停止信号，当前任务执行完成后退出
+
+    :param queue: 任务队列
+    :param worker: worker名称
+    :param stop_event: 停止信号
+    """
+    while not stop_event.is_set():
+        try:
+            if run_once(queue, worker):
+                continue
+        except Exception as e:
+            # redis连接中断等异常，等待后重试
+            logger.error(f"[分析任务] 领取任务异常: {str(e)}")
+        stop_event.wait(AnalysisJobConstant.POLL_INTERVAL)
+
+
+def _worker_process(stop_event):
+    """
+    worker进程入口，使用独立的数据库及redis连接
+    """
+    # 不复用父进程的数据库连接
+    engine.dispose(close=False)
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    logger.info(f"[分析任务] worker {worker} 启动")
+    redis = RedisUtil.create_redis_pool()
+    try:
+        run_worker(RedisJobQueue(redis), worker, stop_event)
+    finally:
+        redis.close()
+    logger.info(f"[分析任务] worker {worker} 退出")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="附件分析任务worker")
+    parser.add_argument("--workers", type=int, default=AnalysisJobConstant.WORKERS, help="worker进程数")
+    parser.add_argument("--env", type=str, default="", help="运行环境")
+    args = parser.parse_args()
+
+    # 子进程继承已加载的配置，使用fork启动
+    context = multiprocessing.get_context("fork")
+    stop_event = context.Event()
+
+    def stop(signum, frame):
+        stop_event.set()
+
+    # 子进程继承信号处理，收到信号后执行完当前任务再退出
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    processes = [None] * max(args.workers, 1)
+    while not stop_event.is_set():
+        for index, process in enumerate(processes):
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                logger.error(f"[分析任务] worker进程{process.pid}异常退出(退出码{process.exitcode})，重新启动")
+            processes[index] = context.Process(target=_worker_process, args=(stop_event,), daemon=False)
+            processes[index].start()
+        stop_event.wait(AnalysisJobConstant.POLL_INTERVAL)
+
+    for process in processes:
+        if process is not None:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
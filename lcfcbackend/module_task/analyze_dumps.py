@@ -0,0 +1,99 @@
+"""
+后台分析dump附件任务
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config.constant import DumpAnalysisConstant
+from config.database import SessionLocal
+from module_admin.service.issue_service import IssueService
+from utils.job_queue_util import JobQueueUtil
+from utils.log_util import logger
+
+# 分析结果按批次写入，同一进程内串行提交分析；解析在进程池中并行执行，不占用接口线程的GIL
+_analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dump_analysis')
+_process_pool = None
+
+
+def _get_process_pool():
+    """
+    获取解析dump的进程池，首次使用时创建
+
+    :return: 进程池
+    """
+    global _process_pool
+    if _process_pool is None:
+        # 接口进程中已有多个线程在运行，fork可能复制其他线程持有的锁导致子进程死锁，
+        # 使用forkserver(不支持时使用spawn)从干净的进程启动子进程，并预先导入解析模块
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['utils.minidump_util'])
+        else:
+            context = multiprocessing.get_context('spawn')
+        _process_pool = ProcessPoolExecutor(max_workers=DumpAnalysisConstant.WORKERS, mp_context=context)
+    return _process_pool
+
+
+def _discard_process_pool():
+    """
+    丢弃已损坏的进程池(子进程异常退出)，下次使用时重新创建
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _analyze_dumps(limit: int = 1000):
+    """
+    分析尚未分析的dump附件，并将dump附件归入崩溃分组
+
+    :param limit: 单次处理的存储文件数
+    :return: (成功数, 失败数)
+    """
+    try:
+        with SessionLocal() as db:
+            try:
+                result = IssueService.analyze_dumps_services(db, _get_process_pool(), limit)
+            except BrokenProcessPool:
+                _discard_process_pool()
+                raise
+            # 分析完成后将新分析的附件及关联了已分析内容的附件归入崩溃分组
+            bucket_result = IssueService.bucket_crash_dumps_services(db)
+        for crud_result in (result, bucket_result):
+            if crud_result.is_success:
+                logger.info(f"[dump分析] {crud_result.message}")
+            else:
+                logger.error(f"[dump分析] {crud_result.message}")
+        return result.result
+    except Exception as e:
+        logger.error(f"[dump分析] 分析dump附件异常: {str(e)}")
+        return 0, 0
+
+
+def analyze_dumps(*args, **kwargs):
+    """
+    解析已关联Issue的dump附件，提取异常代码、异常所在模块及偏移、模块版本、线程数及系统版本号，
+    并按崩溃签名将dump附件归入崩溃分组
+
+    附件关联到Issue后会立即提交分析任务，该任务用于补偿任务队列不可用等原因未完成的分析，
+    以及解析器升级后重新分析旧版本的结果；已启用任务队列时提交低优先级的分析任务由worker执行
+
+    :param args: 位置参数（可选）
+    :param kwargs: 关键字参数（可选，可传入limit参数指定单次处理的文件数）
+    """
+    try:
+        queue = JobQueueUtil.get_queue()
+        if queue is not None:
+            job_id = queue.enqueue('dump_analysis')
+            logger.info(f"[定时任务] 已提交dump分析任务{job_id}")
+            return
+
+        limit = kwargs.get('limit', 1000) if kwargs else 1000
+        logger.info("[定时任务] 开始分析dump附件...")
+
+        success_count, failed_count = _analysis_executor.submit(_analyze_dumps, limit).result()
+        logger.info(f"[定时任务] 分析dump附件完成，成功{success_count}个，失败{failed_count}个")
+
+    except Exception as e:
+        logger.error(f"[定时任务] 分析dump附件任务异常: {str(e)}")
@@ -10,32 +10,36 @@ from utils.log_util import logger
 def clean_temporary_attachments(*args, **kwargs):
     """
     清理超过24小时的临时附件
-    
+
     这个任务会：
-    1. 删除超过24小时未关联到Issue的临时附件记录
-    2. 同时删除对应的物理文件
-    
+    1. 删除超过24小时未收到分片的分片上传会话及其临时文件
+    2. 按上传时间分批删除超过24小时未关联到Issue的临时附件记录，以及引用计数归零的物理文件；
+       中断后下次执行时从已标记为删除中的附件继续
+    3. 扫描存储目录，删除没有存储记录的孤儿文件，恢复删除中断时残留的文件
+
     :param args: 位置参数（可选）
-    :param kwargs: 关键字参数（可选，可传入hours参数自定义清理时间）
+    :param kwargs: 关键字参数（可选，可传入hours参数自定义清理时间，scan_orphans参数为False时跳过孤儿扫描）
     """
     try:
         # 获取清理时间（默认24小时）
         hours = kwargs.get('hours', 24) if kwargs else 24
-        
+        scan_orphans = kwargs.get('scan_orphans', True) if kwargs else True
+
         logger.info(f"[定时任务] 开始清理超过{hours}小时的临时附件...")
-        
+
         # 创建数据库会话
         with SessionLocal() as db:
             # 调用服务层方法清理临时附件
-            result = IssueService.clean_temporary_attachments_services(db, hours)
-            
+            result = IssueService.clean_temporary_attachments_services(db, hours, scan_orphans)
+
             if result.is_success:
                 logger.info(f"[定时任务] {result.message}")
             else:
                 logger.error(f"[定时任务] 清理失败: {result.message}")
-        
+            logger.info(f"[定时任务] 清理统计: {result.result.model_dump_json()}")
+
         logger.info(f"[定时任务] 临时附件清理任务完成，时间: {datetime.now()}")
-        
+
     except Exception as e:
         logger.error(f"[定时任务] 清理临时附件任务异常: {str(e)}")
 
@@ -43,9 +47,8 @@ def clean_temporary_attachments(*args, **kwargs):
 async def async_clean_temporary_attachments(*args, **kwargs):
     """
     异步版本的清理临时附件任务
-    
+
     :param args: 位置参数（可选）
     :param kwargs: 关键字参数（可选，可传入hours参数自定义清理时间）
     """
     clean_temporary_attachments(*args, **kwargs)
-
@@ -0,0 +1,75 @@
+"""
+后台压缩附件存储文件任务
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from config.constant import AttachmentConstant
+from config.database import SessionLocal
+from module_admin.entity.vo.issue_vo import IssueAttachmentModel
+from module_admin.service.issue_service import IssueService
+from utils.log_util import logger
+
+# zstd压缩时释放GIL，使用线程池即可并行压缩
+_compress_executor = ThreadPoolExecutor(
+    max_workers=AttachmentConstant.COMPRESS_WORKERS, thread_name_prefix='attachment_compress'
+)
+
+
+def _compress_blob(file_hash: str):
+    """
+    压缩单个存储文件
+
+    :param file_hash: 文件SHA-256摘要
+    :return: 节省的字节数
+    """
+    try:
+        with SessionLocal() as db:
+            result = IssueService.compress_blob_services(db, file_hash)
+        if result.is_success:
+            logger.info(f"[附件压缩] {file_hash}: {result.message}")
+        else:
+            logger.error(f"[附件压缩] {file_hash}: {result.message}")
+        return result.result or 0
+    except Exception as e:
+        logger.error(f"[附件压缩] {file_hash}: 压缩异常: {str(e)}")
+        return 0
+
+
+def submit_compress_attachment(attachment: IssueAttachmentModel):
+    """
+    附件上传完成后提交到后台线程池压缩，非压缩类型或已压缩的附件忽略
+
+    :param attachment: 附件对象
+    """
+    file_ext = os.path.splitext(attachment.file_name or "")[1].lower()
+    if attachment.file_hash and attachment.compressed_size is None and file_ext in AttachmentConstant.COMPRESS_TYPES:
+        _compress_executor.submit(_compress_blob, attachment.file_hash)
+
+
+def compress_attachments(*args, **kwargs):
+    """
+    批量压缩待压缩的附件存储文件
+
+    上传完成后会立即提交后台压缩，该任务用于补偿服务重启、压缩失败等原因未完成的压缩
+
+    :param args: 位置参数（可选）
+    :param kwargs: 关键字参数（可选，可传入limit参数指定单次处理的文件数）
+    """
+    try:
+        limit = kwargs.get('limit', 1000) if kwargs else 1000
+        logger.info("[定时任务] 开始压缩附件存储文件...")
+
+        with SessionLocal() as db:
+            file_hashes = IssueService.get_compress_candidates_services(db, limit)
+        saved_size = sum(_compress_executor.map(_compress_blob, file_hashes))
+
+        with SessionLocal() as db:
+            statistics = IssueService.get_attachment_storage_statistics_services(db)
+        logger.info(
+            f"[定时任务] 压缩附件存储文件{len(file_hashes)}个，节省{saved_size // (1024 * 1024)}MB；"
+            f"累计原始大小{statistics.original_size // (1024 * 1024)}MB，"
+            f"实际占用{statistics.stored_size // (1024 * 1024)}MB，压缩比{statistics.compression_ratio}"
+        )
+
+    except Exception as e:
+        logger.error(f"[定时任务] 压缩附件存储文件任务异常: {str(e)}")
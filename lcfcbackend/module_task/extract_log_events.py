@@ -0,0 +1,58 @@
+"""
+后台提取日志附件结构化事件任务
+"""
+from concurrent.futures import ThreadPoolExecutor
+from config.database import SessionLocal
+from module_admin.service.issue_service import IssueService
+from utils.job_queue_util import JobQueueUtil
+from utils.log_util import logger
+
+# 事件文件按文件摘要写入，同一进程内串行提取
+_extract_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log_event')
+
+
+def _extract_log_events(limit: int = 1000):
+    """
+    为尚未提取事件的日志附件提取事件
+
+    :param limit: 单次处理的存储文件数
+    :return: (成功数, 失败数)
+    """
+    try:
+        with SessionLocal() as db:
+            result = IssueService.extract_log_events_services(db, limit)
+        if result.is_success:
+            logger.info(f"[日志事件] {result.message}")
+        else:
+            logger.error(f"[日志事件] {result.message}")
+        return result.result
+    except Exception as e:
+        logger.error(f"[日志事件] 提取日志事件异常: {str(e)}")
+        return 0, 0
+
+
+def extract_log_events(*args, **kwargs):
+    """
+    逐块扫描已关联Issue的.log附件，按BIOS、驱动、系统事件等日志格式提取时间、级别、组件及错误代码，写入按列存放的事件文件
+
+    附件关联到Issue后会立即提交提取任务，该任务用于补偿任务队列不可用等原因未完成的提取，
+    以及日志格式升级后重新提取旧版本的事件文件；已启用任务队列时提交低优先级的提取任务由worker执行
+
+    :param args: 位置参数（可选）
+    :param kwargs: 关键字参数（可选，可传入limit参数指定单次处理的文件数）
+    """
+    try:
+        queue = JobQueueUtil.get_queue()
+        if queue is not None:
+            job_id = queue.enqueue('log_events')
+            logger.info(f"[定时任务] 已提交日志事件提取任务{job_id}")
+            return
+
+        limit = kwargs.get('limit', 1000) if kwargs else 1000
+        logger.info("[定时任务] 开始提取日志事件...")
+
+        success_count, failed_count = _extract_executor.submit(_extract_log_events, limit).result()
+        logger.info(f"[定时任务] 提取日志事件完成，成功{success_count}个，失败{failed_count}个")
+
+    except Exception as e:
+        logger.error(f"[定时任务] 提取日志事件任务异常: {str(e)}")
@@ -0,0 +1,67 @@
+"""
+后台建立附件trigram索引任务
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.database import SessionLocal
+from module_admin.service.issue_service import IssueService
+from utils.log_util import logger
+
+# 索引段按批次追加，同一进程内串行建立索引
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='attachment_index')
+_index_pending = threading.Event()
+
+
+def _index_attachments(limit: int = 1000):
+    """
+    为尚未建立索引的附件建立索引
+
+    :param limit: 单次处理的存储文件数
+    :return: 新写入索引的文档数
+    """
+    _index_pending.clear()
+    try:
+        with SessionLocal() as db:
+            result = IssueService.index_attachments_services(db, limit)
+        if result.is_success:
+            logger.info(f"[附件索引] {result.message}")
+        else:
+            logger.error(f"[附件索引] {result.message}")
+        return result.result or 0
+    except Exception as e:
+        logger.error(f"[附件索引] 建立索引异常: {str(e)}")
+        return 0
+
+
+def submit_index_attachments():
+    """
+    附件关联到Issue后提交后台建立索引，已有等待执行的任务时不重复提交
+    """
+    if not _index_pending.is_set():
+        _index_pending.set()
+        _index_executor.submit(_index_attachments)
+
+
+def index_attachments(*args, **kwargs):
+    """
+    为已关联Issue的文本附件及压缩包内的文本文件建立trigram索引，并合并较小的索引段
+
+    新增Issue关联附件后会立即提交后台建立索引，该任务用于补偿服务重启等原因未完成的索引
+
+    :param args: 位置参数（可选）
+    :param kwargs: 关键字参数（可选，可传入limit参数指定单次处理的文件数）
+    """
+    try:
+        limit = kwargs.get('limit', 1000) if kwargs else 1000
+        logger.info("[定时任务] 开始建立附件索引...")
+
+        doc_count = _index_executor.submit(_index_attachments, limit).result()
+        segment_count, total_doc_count, posting_count, index_size = IssueService.get_attachment_index_size_services()
+        logger.info(
+            f"[定时任务] 建立附件索引完成，新增索引文档{doc_count}个；"
+            f"累计索引文档{total_doc_count}个，索引段{segment_count}个，"
+            f"倒排项{posting_count}个，索引大小{index_size // (1024 * 1024)}MB"
+        )
+
+    except Exception as e:
+        logger.error(f"[定时任务] 建立附件索引任务异常: {str(e)}")
@@ -0,0 +1,31 @@
+"""
+定时校准Issue统计计数任务
+"""
+from config.database import SessionLocal
+from module_admin.service.issue_service import IssueService
+from utils.log_util import logger
+
+
+def reconcile_issue_statistics(*args, **kwargs):
+    """
+    以实时聚合结果校准issue_stat_counter统计计数表及issue_tag_dict标签使用次数
+
+    增量计数在新增、编辑、删除Issue及新增诊断记录时同事务更新，
+    该任务用于修正手工改库、异常中断等原因造成的计数偏差
+
+    :param args: 位置参数（可选）
+    :param kwargs: 关键字参数（可选）
+    """
+    try:
+        logger.info("[定时任务] 开始校准Issue统计计数...")
+
+        with SessionLocal() as db:
+            result = IssueService.reconcile_issue_statistics_services(db)
+
+            if result.is_success:
+                logger.info(f"[定时任务] {result.message}")
+            else:
+                logger.error(f"[定时任务] {result.message}")
+
+    except Exception as e:
+        logger.error(f"[定时任务] 校准Issue统计计数任务异常: {str(e)}")
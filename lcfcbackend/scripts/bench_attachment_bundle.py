@@ -0,0 +1,144 @@
+"""
+Issue附件流式打包下载性能测试
+
+在临时目录中生成多个GB级附件(可压缩的日志及不可压缩的压缩包)并关联到同一Issue，
+流式生成全部附件的zip压缩包(总大小超过4GB时为ZIP64)，输出吞吐及打包前后的进程内存峰值，验证内存占用与附件大小无关
+
+用法：
+    python scripts/bench_attachment_bundle.py --logs 2 --archives 1 --file-size 1.9
+    python scripts/bench_attachment_bundle.py --logs 1 --archives 1 --file-size 1 --compress --verify
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.database import Base
+from config.env import UploadConfig
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.zip_stream_util import ZipStreamUtil
+
+BLOCK_SIZE = 1024 * 1024
+GB = 1024 * 1024 * 1024
+
+
+def max_rss_mb():
+    # Linux下ru_maxrss单位为KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def log_block(rng: random.Random):
+    lines = []
+    total = 0
+    while total < BLOCK_SIZE:
+        line = f"2024-01-15 10:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} [INFO] request 0x{rng.getrandbits(32):08x}\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines).encode()[:BLOCK_SIZE]
+
+
+async def _stream(blocks, size: int):
+    for index in range(size // BLOCK_SIZE):
+        yield blocks[index % len(blocks)]
+
+
+def upload(db, blocks, size: int, file_name: str):
+    result = asyncio.run(IssueService.upload_attachment_stream_services(db, _stream(blocks, size), file_name, size, "bench"))
+    if not result.is_success:
+        raise RuntimeError(result.message)
+    return result.result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Issue附件流式打包下载性能测试")
+    parser.add_argument("--logs", type=int, default=2, help="日志附件数量")
+    parser.add_argument("--archives", type=int, default=1, help="压缩包附件数量，打包时直接存储")
+    parser.add_argument("--file-size", type=float, default=1.9, help="单个附件大小(GB)，不超过附件大小上限")
+    parser.add_argument("--compress", action="store_true", help="先将日志附件压缩存储，打包时边解压边打包")
+    parser.add_argument("--verify", action="store_true", help="将打包结果写入临时文件并用zipfile校验CRC")
+    parser.add_argument("--seed", type=int, default=20240101, help="随机种子")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as upload_path, session_factory() as db:
+        UploadConfig.UPLOAD_PATH = upload_path
+        begin = time.perf_counter()
+        file_size = int(args.file_size * GB) // BLOCK_SIZE * BLOCK_SIZE
+        log_blocks = [log_block(rng) for _ in range(16)]
+        archive_blocks = [rng.randbytes(BLOCK_SIZE) for _ in range(16)]
+        logs = [upload(db, log_blocks, file_size, f"system_{index}.log") for index in range(args.logs)]
+        archives = [upload(db, archive_blocks, file_size, f"dumps_{index}.zip") for index in range(args.archives)]
+        IssueService.add_issue_services(
+            db,
+            AddIssueModel(
+                title="bundle bench",
+                priority="low",
+                issueType="BUG",
+                attachmentIds=[attachment.attachment_id for attachment in logs + archives],
+            ),
+        )
+        issue_id = IssueDao.get_issue_list(db, IssuePageQueryModel(title="bundle bench"))[0]["issueId"]
+        if args.compress:
+            for attachment in logs:
+                IssueService.compress_blob_services(db, attachment.file_hash)
+        print(
+            f"附件准备完成: 日志{args.logs}个{'(已压缩存储)' if args.compress else ''}, 压缩包{args.archives}个, "
+            f"每个{file_size / GB:.2f}GB, 耗时{time.perf_counter() - begin:.1f}s"
+        )
+
+        rss_before = max_rss_mb()
+        output_path = os.path.join(upload_path, "bundle.zip")
+        output = open(output_path, "wb") if args.verify else None
+        begin = time.perf_counter()
+        total = chunks = largest = 0
+        _, entries = IssueService.get_attachment_bundle_services(db, issue_id)
+        for data in ZipStreamUtil.iter_zip(entries):
+            total += len(data)
+            chunks += 1
+            largest = max(largest, len(data))
+            if output:
+                output.write(data)
+        elapsed = time.perf_counter() - begin
+        if output:
+            output.close()
+        rss_after = max_rss_mb()
+
+        source_size = file_size * (args.logs + args.archives)
+        print(
+            f"打包完成: 原始{source_size / GB:.2f}GB -> 压缩包{total / GB:.2f}GB, 耗时{elapsed:.1f}s, "
+            f"吞吐{source_size / 1024 / 1024 / elapsed:.0f}MB/s"
+        )
+        print(f"输出块: {chunks}个, 最大{largest / 1024:.0f}KB")
+        print(f"进程内存峰值: 打包前{rss_before:.0f}MB, 打包后{rss_after:.0f}MB, 增加{rss_after - rss_before:.0f}MB")
+
+        if args.verify:
+            begin = time.perf_counter()
+            with zipfile.ZipFile(output_path) as bundle:
+                infos = bundle.infolist()
+                bad_file = bundle.testzip()
+            print(
+                f"校验: {'通过' if bad_file is None else f'CRC错误 {bad_file}'}, "
+                + ", ".join(f"{info.filename} {info.file_size / GB:.2f}GB" for info in infos)
+                + f", 耗时{time.perf_counter() - begin:.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+跨附件搜索性能测试：trigram索引 vs 逐个扫描全部附件
+
+在临时目录中生成合成日志语料(.log附件及包含多个日志的.zip附件)，关联到Issue后建立索引，
+输出索引大小、建立耗时，以及不同查询下索引搜索与逐个扫描的耗时
+
+用法：
+    python scripts/bench_attachment_grep.py --files 200 --file-size 2
+    python scripts/bench_attachment_grep.py --files 1000 --file-size 1 --rounds 10
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.database import Base
+from config.env import UploadConfig
+from module_admin.entity.do.issue_do import IssueAttachment
+from module_admin.entity.vo.issue_vo import AddIssueModel, AttachmentGrepModel
+from module_admin.service.issue_service import IssueService
+from utils.log_view_util import LogViewUtil
+from utils.storage_util import StorageUtil
+
+MODULES = ["nvlddmkm", "ntoskrnl", "acpi", "usbxhci", "storport", "dxgkrnl", "iaStorAC", "Netwtw10", "intelppm"]
+MESSAGES = [
+    "device power state changed to D{n}",
+    "request 0x{h:08x} completed in {n} ms",
+    "queue depth {n}, pending {n2}",
+    "link speed renegotiated, lane {n}",
+    "interrupt moderation set to {n} us",
+    "firmware handshake ok, build {h:04x}",
+]
+# 每25个附件中1个包含故障签名，模拟新出现的故障特征
+SIGNATURES = [
+    f"BUGCHECK 0x{code:08X} module={module}" for code, module in ((0x116, "nvlddmkm"), (0x9F, "acpi"), (0xEF, "storport"))
+]
+QUERIES = [
+    ("罕见字符串", SIGNATURES[0], False),
+    ("罕见正则", r"BUGCHECK 0x0000009F module=\w+", True),
+    ("常见字符串", "dxgkrnl", False),
+    ("不存在", "this string never appears", False),
+]
+
+
+def generate_log(rng: random.Random, size: int, signature: str = None):
+    lines = []
+    total = 0
+    while total < size:
+        message = rng.choice(MESSAGES).format(n=rng.randint(0, 999), n2=rng.randint(0, 99), h=rng.getrandbits(32))
+        level = rng.choice(["INFO", "INFO", "INFO", "WARN", "ERROR"])
+        line = (
+            f"2024-01-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+            f"{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d} [{level}] {rng.choice(MODULES)}: {message}\n"
+        )
+        lines.append(line)
+        total += len(line)
+    if signature:
+        lines.insert(rng.randrange(len(lines)), f"2024-01-15 10:00:00.000 [ERROR] {signature}\n")
+    return "".join(lines).encode()
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def populate(db, files: int, file_size: int, seed: int):
+    rng = random.Random(seed)
+    corpus_size = 0
+    for index in range(files):
+        signature = SIGNATURES[index // 25 % len(SIGNATURES)] if index % 25 == 12 else None
+        if index % 5 == 4:
+            # 每5个附件中1个为包含多个日志的压缩包
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                for member in range(4):
+                    member_data = generate_log(rng, file_size // 4, signature if member == 0 else None)
+                    archive.writestr(f"logs/{member}.log", member_data)
+                    corpus_size += len(member_data)
+            data, file_name = buffer.getvalue(), f"logs_{index}.zip"
+        else:
+            data, file_name = generate_log(rng, file_size, signature), f"system_{index}.log"
+            corpus_size += len(data)
+        result = asyncio.run(
+            IssueService.upload_attachment_stream_services(db, _stream(data), file_name, len(data), "bench")
+        )
+        IssueService.add_issue_services(
+            db,
+            AddIssueModel(
+                title=f"bench {index}", priority="low", issueType="BUG", attachmentIds=[result.result.attachment_id]
+            ),
+        )
+    return corpus_size
+
+
+def brute_force(db, pattern: str, regex: bool):
+    """
+    不使用索引，逐个扫描全部已关联附件
+    """
+    compiled = re.compile(pattern.encode() if regex else re.escape(pattern.encode()), re.MULTILINE)
+    issue_ids = set()
+    attachments = db.execute(select(IssueAttachment).where(IssueAttachment.status == "linked")).scalars().all()
+    for attachment in attachments:
+        file_path = StorageUtil.resolve_path(attachment.file_path)
+        for member_name, _ in IssueService._list_index_members(file_path, attachment.file_name):
+            offsets, _ = LogViewUtil.find_offsets(IssueService._iter_index_content(file_path, member_name), compiled, 1)
+            if offsets:
+                issue_ids.add(attachment.issue_id)
+    return issue_ids
+
+
+def measure(func, rounds: int):
+    timings = []
+    result = None
+    for _ in range(rounds):
+        begin = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨附件搜索性能测试")
+    parser.add_argument("--files", type=int, default=200, help="附件数量")
+    parser.add_argument("--file-size", type=float, default=2, help="单个附件的日志大小(MB)")
+    parser.add_argument("--rounds", type=int, default=5, help="每个查询的执行轮数")
+    parser.add_argument("--seed", type=int, default=20240101, help="随机种子")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with tempfile.TemporaryDirectory() as upload_path, session_factory() as db:
+        UploadConfig.UPLOAD_PATH = upload_path
+        begin = time.perf_counter()
+        corpus_size = populate(db, args.files, int(args.file_size * 1024 * 1024), args.seed)
+        print(
+            f"语料准备完成: {args.files}个附件, 日志原始大小{corpus_size / 1024 / 1024:.1f}MB, "
+            f"耗时{time.perf_counter() - begin:.1f}s"
+        )
+
+        begin = time.perf_counter()
+        result = IssueService.index_attachments_services(db, limit=args.files)
+        elapsed = time.perf_counter() - begin
+        segment_count, doc_count, posting_count, index_size = IssueService.get_attachment_index_size_services()
+        print(f"建立索引: {result.message}, 耗时{elapsed:.1f}s, 吞吐{corpus_size / 1024 / 1024 / elapsed:.1f}MB/s")
+        print(
+            f"索引大小: {index_size / 1024 / 1024:.1f}MB (语料的{index_size / corpus_size:.1%}), "
+            f"索引段{segment_count}个, 文档{doc_count}个, 倒排项{posting_count}个"
+        )
+
+        print(f"{'查询':<10}{'索引搜索 ms':>14}{'逐个扫描 ms':>14}{'候选文件':>10}{'扫描文件':>10}{'命中Issue':>10}")
+        for name, pattern, regex in QUERIES:
+            query = AttachmentGrepModel(pattern=pattern, regex=regex, maxMatches=200)
+            indexed, grep_result = measure(lambda: IssueService.grep_attachments_services(db, query), args.rounds)
+            scanned, issue_ids = measure(lambda: brute_force(db, pattern, regex), 1)
+            consistent = "" if grep_result.truncated or set(grep_result.issue_ids) == issue_ids else " (结果不一致)"
+            print(
+                f"{name:<10}{indexed:>14.1f}{scanned:>14.1f}{grep_result.candidate_count:>10}"
+                f"{grep_result.scanned_count:>10}{len(grep_result.issue_ids):>10}{consistent}"
+            )
+
+
+if __name__ == "__main__":
+    main()
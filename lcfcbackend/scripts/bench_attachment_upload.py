@@ -0,0 +1,203 @@
+"""
+附件上传对比：multipart上传(/attachment/upload) vs 流式上传(/attachment/upload/stream)
+
+在子进程中启动仅挂载Issue路由的uvicorn服务，客户端并发上传大体积.dmp文件，
+采样服务进程的峰值RSS并统计总耗时和吞吐。
+
+用法：
+    python scripts/bench_attachment_upload.py --size-mb 512 --concurrency 4
+    python scripts/bench_attachment_upload.py --size-mb 2000 --concurrency 2 --work-dir /data/bench
+
+注意：--work-dir 下会生成测试文件和上传文件，运行结束后自动删除
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+import requests
+
+
+def serve(port: int, work_dir: str):
+    import uvicorn
+    from fastapi import FastAPI
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from config.database import Base
+    from config.env import UploadConfig
+    from config.get_db import get_db
+    from exceptions.handle import handle_exception
+    from module_admin.controller.issue_controller import issueController
+    from module_admin.service.login_service import LoginService
+
+    UploadConfig.UPLOAD_PATH = os.path.join(work_dir, "upload_path")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(work_dir, 'bench.db')}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_bench_db():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    handle_exception(app)
+    app.include_router(issueController)
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[LoginService.get_current_user] = lambda: SimpleNamespace(
+        permissions=["*:*:*"], roles=[], user=SimpleNamespace(user_name="bench")
+    )
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+class MultipartFileBody:
+    """
+    以multipart/form-data格式流式读取本地文件，避免客户端把整个文件读入内存
+    """
+
+    def __init__(self, filepath: str, field_name: str = "file"):
+        self.boundary = uuid.uuid4().hex
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{os.path.basename(filepath)}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self.length = len(head) + os.path.getsize(filepath) + len(tail)
+        self.parts = [io.BytesIO(head), open(filepath, "rb"), io.BytesIO(tail)]
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size: int = -1):
+        while self.parts:
+            data = self.parts[0].read(size)
+            if data:
+                return data
+            self.parts.pop(0).close()
+        return b""
+
+
+def upload_multipart(base_url: str, filepath: str):
+    body = MultipartFileBody(filepath)
+    response = requests.post(
+        f"{base_url}/system/issue/attachment/upload",
+        data=body,
+        headers={"Content-Type": body.content_type, "Content-Length": str(len(body))},
+    )
+    return response.json()
+
+
+def upload_stream(base_url: str, filepath: str):
+    with open(filepath, "rb") as f:
+        response = requests.post(
+            f"{base_url}/system/issue/attachment/upload/stream",
+            params={"fileName": os.path.basename(filepath)},
+            data=f,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+    return response.json()
+
+
+def sample_rss(pid: int, stop: threading.Event, peak: list):
+    process = psutil.Process(pid)
+    while not stop.is_set():
+        peak[0] = max(peak[0], process.memory_info().rss)
+        time.sleep(0.02)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("benchmark server did not start")
+
+
+def run_case(name, upload, work_dir, files, concurrency):
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, work_dir), daemon=True)
+    server.start()
+    try:
+        wait_ready(port)
+        base_url = f"http://127.0.0.1:{port}"
+        baseline = psutil.Process(server.pid).memory_info().rss
+        peak, stop = [baseline], threading.Event()
+        sampler = threading.Thread(target=sample_rss, args=(server.pid, stop, peak), daemon=True)
+        sampler.start()
+        begin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda filepath: upload(base_url, filepath), files))
+        elapsed = time.perf_counter() - begin
+        stop.set()
+        sampler.join()
+    finally:
+        server.terminate()
+        server.join()
+
+    failures = [result.get("msg") for result in results if result.get("code") != 200]
+    if failures:
+        raise RuntimeError(f"{name} failed: {failures[0]}")
+    total_mb = sum(os.path.getsize(filepath) for filepath in files) / 1024 / 1024
+    print(
+        f"{name:<14}{elapsed:>10.2f}{total_mb / elapsed:>14.1f}"
+        f"{baseline / 1024 / 1024:>14.1f}{(peak[0] - baseline) / 1024 / 1024:>16.1f}"
+    )
+    shutil.rmtree(os.path.join(work_dir, "upload_path"), ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="附件上传峰值内存及耗时对比")
+    parser.add_argument("--size-mb", type=int, default=512, help="每个测试文件的大小(MB)")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发上传数")
+    parser.add_argument("--work-dir", type=str, default="", help="测试文件及上传目录，默认使用系统临时目录")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_upload_", dir=args.work_dir or None)
+    try:
+        files = []
+        chunk = os.urandom(1024 * 1024)
+        for i in range(args.concurrency):
+            filepath = os.path.join(work_dir, f"bench_{i}.dmp")
+            with open(filepath, "wb") as f:
+                for _ in range(args.size_mb):
+                    f.write(chunk)
+            files.append(filepath)
+
+        print(f"文件大小: {args.size_mb}MB x {args.concurrency}个并发")
+        print(f"{'方式':<14}{'耗时 s':>10}{'吞吐 MB/s':>14}{'基线RSS MB':>14}{'峰值增量 MB':>16}")
+        run_case("multipart", upload_multipart, work_dir, files, args.concurrency)
+        run_case("stream", upload_stream, work_dir, files, args.concurrency)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+dump附件自动分析性能测试
+
+在临时目录中生成一批用户态minidump附件(包含模块列表、线程列表、异常记录及内存数据)并关联到Issue，
+分别在当前进程中依次解析及使用进程池并行解析，输出每秒解析的dump数及吞吐，并验证相同内容的附件只解析一次
+
+用法：
+    python scripts/bench_dump_analysis.py --dumps 200 --modules 150 --dump-size 8
+    python scripts/bench_dump_analysis.py --dumps 500 --workers 4 --duplicate 0.3
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.database import Base
+from config.env import UploadConfig
+from module_admin.entity.do.issue_do import IssueDumpAnalysis
+from module_admin.entity.vo.issue_vo import AddIssueModel
+from module_admin.service.issue_service import IssueService
+
+MB = 1024 * 1024
+
+
+def _string(value: str):
+    data = value.encode("utf-16-le")
+    return struct.pack("<I", len(data)) + data + b"\x00\x00"
+
+
+def build_minidump(rng: random.Random, module_count: int, thread_count: int, size: int):
+    """
+    构造用户态minidump，模块按基址连续排列，异常地址随机落在某个模块内
+    """
+    modules = []
+    base = 0x7FF800000000
+    for index in range(module_count):
+        module_size = rng.randrange(0x10000, 0x400000, 0x1000)
+        modules.append((f"C:\\Windows\\System32\\module_{index}.dll", base, module_size))
+        base += module_size + 0x10000
+    faulting = rng.choice(modules)
+    exception_address = faulting[1] + rng.randrange(faulting[2])
+
+    streams = [
+        (7, struct.pack("<HHHBBIIIIIHH", 9, 6, 0, 8, 1, 10, 0, 19045, 2, 0, 0, 0).ljust(56, b"\x00")),
+        (3, struct.pack("<I", thread_count) + b"\x00" * 48 * thread_count),
+        (
+            6,
+            struct.pack("<II" + "IIQQII15Q", 1, 0, 0xC0000005, 0, 0, exception_address, 2, 0, 1, 0, *[0] * 13)
+            + b"\x00" * 8,
+        ),
+    ]
+    misc_info = bytearray(832)
+    struct.pack_into("<III", misc_info, 0, 832, 0x1, rng.randint(1000, 60000))
+    build = "19041.1.amd64fre.vb_release.191206-1406".encode("utf-16-le")
+    misc_info[232 : 232 + len(build)] = build
+    streams.append((15, bytes(misc_info)))
+
+    offset = 32 + 12 * (len(streams) + 1)
+    blob = bytearray()
+    module_list = struct.pack("<I", module_count)
+    for index, (path, module_base, module_size) in enumerate(modules):
+        name_rva = offset + len(blob)
+        blob += _string(path)
+        fixed = [0xFEEF04BD, 0x10000, 10 << 16, 19041 << 16 | index] + [0] * 9
+        module_list += struct.pack("<QIIII13I8x8x8x8x", module_base, module_size, 0, 0x5F000000, name_rva, *fixed)
+    streams.insert(0, (4, module_list))
+    entries = []
+    for stream_type, data in streams:
+        entries.append((stream_type, len(data), offset + len(blob)))
+        blob += data
+    # 内存数据，解析时不读取
+    blob += rng.randbytes(max(size - offset - len(blob), 0))
+
+    header = struct.pack("<4sIIIIIQ", b"MDMP", 0xA793, len(entries), 32, 0, int(datetime.now().timestamp()), 0)
+    return header + b"".join(struct.pack("<III", *entry) for entry in entries) + bytes(blob)
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def upload(db, data: bytes, file_name: str):
+    result = asyncio.run(IssueService.upload_attachment_stream_services(db, _stream(data), file_name, len(data), "bench"))
+    if not result.is_success:
+        raise RuntimeError(result.message)
+    return result.result
+
+
+def run(db, executor, total_size: int, unique_count: int, label: str):
+    db.execute(delete(IssueDumpAnalysis))
+    db.commit()
+    begin = time.perf_counter()
+    result = IssueService.analyze_dumps_services(db, executor, limit=unique_count)
+    elapsed = time.perf_counter() - begin
+    if not result.is_success:
+        raise RuntimeError(result.message)
+    success_count, failed_count = result.result
+    print(
+        f"{label}: 成功{success_count}个, 失败{failed_count}个, 耗时{elapsed:.2f}s, "
+        f"{success_count / elapsed:.0f}个/s, {total_size / MB / elapsed:.0f}MB/s"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dump附件自动分析性能测试")
+    parser.add_argument("--dumps", type=int, default=200, help="dump附件数量")
+    parser.add_argument("--duplicate", type=float, default=0.2, help="与其他附件内容相同的附件比例")
+    parser.add_argument("--modules", type=int, default=150, help="每个dump的模块数")
+    parser.add_argument("--threads", type=int, default=40, help="每个dump的线程数")
+    parser.add_argument("--dump-size", type=float, default=8, help="每个dump的大小(MB)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程池大小")
+    parser.add_argument("--seed", type=int, default=20240101, help="随机种子")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as upload_path, session_factory() as db:
+        UploadConfig.UPLOAD_PATH = upload_path
+        begin = time.perf_counter()
+        unique_count = max(int(args.dumps * (1 - args.duplicate)), 1)
+        size = int(args.dump_size * MB)
+        attachments = []
+        unique_size = 0
+        dumps = []
+        for index in range(args.dumps):
+            if index < unique_count:
+                data = build_minidump(rng, args.modules, args.threads, size)
+                dumps.append(data)
+                unique_size += len(data)
+            else:
+                data = rng.choice(dumps)
+            attachments.append(upload(db, data, f"crash_{index}.dmp"))
+        dumps.clear()
+        IssueService.add_issue_services(
+            db,
+            AddIssueModel(
+                title="dump bench",
+                priority="high",
+                issueType="BUG",
+                attachmentIds=[attachment.attachment_id for attachment in attachments],
+            ),
+        )
+        print(
+            f"附件准备完成: dump{args.dumps}个(不同内容{unique_count}个), 每个{size / MB:.1f}MB, "
+            f"模块{args.modules}个, 线程{args.threads}个, 耗时{time.perf_counter() - begin:.1f}s"
+        )
+
+        serial = run(db, None, unique_size, unique_count, "当前进程依次解析")
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            pool = run(db, executor, unique_size, unique_count, f"进程池并行解析({args.workers}进程)")
+        print(f"加速比: {serial / pool:.2f}x")
+
+        # 相同内容的附件已有分析结果，再次执行不重复解析
+        result = IssueService.analyze_dumps_services(db, None, limit=unique_count)
+        print(f"再次执行: 解析{sum(result.result)}个")
+
+
+if __name__ == "__main__":
+    main()
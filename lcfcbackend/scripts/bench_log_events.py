@@ -0,0 +1,169 @@
+"""
+日志附件结构化事件提取及查询性能测试
+
+在临时目录中生成若干混合格式的 .log 附件(驱动、CBS、系统事件导出、BIOS串口及通用格式，夹杂堆栈等不匹配的续行)
+并关联到Issue，测试事件提取的吞吐(MB/s、行/s)，以及按时间范围、级别、组件、错误代码查询事件的耗时
+
+用法：
+    python scripts/bench_log_events.py --files 4 --file-size 64
+    python scripts/bench_log_events.py --files 8 --file-size 128 --compress
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.database import Base
+from config.env import UploadConfig
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueLogEventFile
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel, LogEventQueryModel
+from module_admin.service.issue_service import IssueService
+
+MB = 1024 * 1024
+LEVELS = ["INFO"] * 12 + ["WARN"] * 4 + ["ERROR"] * 2 + ["DEBUG"] * 6
+COMPONENTS = ["iaStorAC", "Netwtw10", "igfx", "RtkAudio", "ACPI", "USBXHCI", "nvlddmkm", "WiFi", "Battery"]
+CODES = ["0xC0000185", "0x800F0831", "0x8000000E", "0xC000009C", "0x80070005"]
+
+
+def build_log(rng: random.Random, size: int, start: datetime):
+    """
+    构造混合格式日志，时间单调递增
+    """
+    lines = []
+    total = 0
+    now = start
+    while total < size:
+        now += timedelta(milliseconds=rng.randint(1, 200))
+        level = rng.choice(LEVELS)
+        component = rng.choice(COMPONENTS)
+        code = rng.choice(CODES) if level == "ERROR" else ""
+        kind = rng.random()
+        if kind < 0.45:
+            line = f"[{now:%Y-%m-%d %H:%M:%S}.{now.microsecond // 1000:03d}] [{level}] [{component}] request completed {code}"
+        elif kind < 0.6:
+            line = f"{now:%Y-%m-%d %H:%M:%S}, {level.title():<21} CBS    Processing package {rng.randint(1, 9999)} {code}"
+        elif kind < 0.7:
+            line = (
+                f"{'Error' if level == 'ERROR' else 'Information'}\t{now.month}/{now.day}/{now.year} "
+                f"{now:%I:%M:%S %p}\t{component}\t{rng.randint(1, 8000)}\t(63)\tEvent message"
+            )
+        elif kind < 0.75:
+            line = f"[DXE] {level}: driver start, Status = {code or '0x00000000'}"
+        elif kind < 0.9:
+            line = f"{now:%Y-%m-%d %H:%M:%S} [{level}] {component.lower()}: state changed"
+        else:
+            line = f"    at {component}!Function{rng.randint(1, 500)}+0x{rng.randint(0, 0xFFFF):x}"
+        lines.append(line)
+        total += len(line) + 2
+    return ("\r\n".join(lines) + "\r\n").encode(), len(lines)
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def upload(db, data: bytes, file_name: str):
+    result = asyncio.run(IssueService.upload_attachment_stream_services(db, _stream(data), file_name, len(data), "bench"))
+    if not result.is_success:
+        raise RuntimeError(result.message)
+    return result.result
+
+
+def query(db, issue_id: int, label: str, rounds: int, **kwargs):
+    query_object = LogEventQueryModel(**kwargs)
+    result = None
+    begin = time.perf_counter()
+    for _ in range(rounds):
+        result = IssueService.get_issue_log_events_services(db, issue_id, query_object)
+    elapsed = (time.perf_counter() - begin) / rounds
+    print(f"{label}: 匹配{result.total}条, 返回{len(result.events)}条, 平均耗时{elapsed * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志附件结构化事件提取及查询性能测试")
+    parser.add_argument("--files", type=int, default=4, help="日志附件数量")
+    parser.add_argument("--file-size", type=float, default=64, help="每个日志附件的大小(MB)")
+    parser.add_argument("--compress", action="store_true", help="提取前压缩存储文件")
+    parser.add_argument("--rounds", type=int, default=5, help="每种查询的执行次数")
+    parser.add_argument("--seed", type=int, default=20240101, help="随机种子")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as upload_path, session_factory() as db:
+        UploadConfig.UPLOAD_PATH = upload_path
+        begin = time.perf_counter()
+        attachments = []
+        total_size = 0
+        total_lines = 0
+        start = datetime(2024, 1, 15)
+        for index in range(args.files):
+            data, line_count = build_log(rng, int(args.file_size * MB), start + timedelta(hours=index * 6))
+            total_size += len(data)
+            total_lines += line_count
+            attachment = upload(db, data, f"system_{index}.log")
+            if args.compress:
+                IssueService.compress_blob_services(db, attachment.file_hash)
+            attachments.append(attachment)
+        IssueService.add_issue_services(
+            db,
+            AddIssueModel(
+                title="log event bench",
+                priority="high",
+                issueType="BUG",
+                attachmentIds=[attachment.attachment_id for attachment in attachments],
+            ),
+        )
+        issue_id = IssueDao.get_issue_list(db, IssuePageQueryModel(title="log event bench"))[0]["issueId"]
+        print(
+            f"附件准备完成: 日志{args.files}个, 共{total_size / MB:.0f}MB, {total_lines}行, "
+            f"{'压缩' if args.compress else '未压缩'}, 耗时{time.perf_counter() - begin:.1f}s"
+        )
+
+        begin = time.perf_counter()
+        result = IssueService.extract_log_events_services(db)
+        elapsed = time.perf_counter() - begin
+        if not result.is_success:
+            raise RuntimeError(result.message)
+        event_count, event_size = db.execute(
+            select(func.sum(IssueLogEventFile.event_count), func.sum(IssueLogEventFile.event_file_size))
+        ).one()
+        print(
+            f"事件提取: 成功{result.result[0]}个, 失败{result.result[1]}个, 耗时{elapsed:.2f}s, "
+            f"{total_size / MB / elapsed:.1f}MB/s, {total_lines / elapsed:.0f}行/s"
+        )
+        print(
+            f"事件文件: 事件{event_count}条, 共{event_size / MB:.1f}MB, 占日志大小的{event_size / total_size:.1%}"
+        )
+
+        query(db, issue_id, "全部事件(前200条)", args.rounds)
+        query(db, issue_id, "ERROR级别", args.rounds, level="ERROR")
+        query(db, issue_id, "组件iaStorAC", args.rounds, component="iaStorAC")
+        query(db, issue_id, "错误代码0xC0000185", args.rounds, errorCode="0xC0000185")
+        query(
+            db,
+            issue_id,
+            "1小时时间范围内的WARN及以上",
+            args.rounds,
+            level="WARN",
+            beginTime=start + timedelta(hours=1),
+            endTime=start + timedelta(hours=2),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+将已有附件迁移到内容寻址存储
+
+逐个处理文件路径不在内容寻址存储中的附件：计算SHA-256(已有摘要时直接使用)，增加存储引用计数，
+将文件移动到 blob/摘要前2位/摘要3-4位/摘要，相同内容的重复文件直接删除，并更新附件的file_hash和file_path。
+每个附件单独提交，中断后重新执行即可继续。
+
+用法：
+    python scripts/migrate_attachment_blobs.py --dry-run
+    python scripts/migrate_attachment_blobs.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from config.database import SessionLocal
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueAttachment
+from utils.storage_util import StorageUtil
+from utils.upload_util import UploadUtil
+
+
+def migrate(dry_run: bool):
+    migrated_count = deduplicated_count = missing_count = 0
+    with SessionLocal() as db:
+        attachment_ids = db.execute(select(IssueAttachment.attachment_id).order_by(IssueAttachment.attachment_id)).scalars().all()
+        for attachment_id in attachment_ids:
+            attachment = db.execute(
+                select(IssueAttachment).where(IssueAttachment.attachment_id == attachment_id).with_for_update()
+            ).scalars().first()
+            if attachment.file_hash and attachment.file_path == StorageUtil.get_blob_path(attachment.file_hash):
+                db.rollback()
+                continue
+            if not attachment.file_path or not os.path.exists(attachment.file_path):
+                print(f"文件不存在，跳过: attachment_id={attachment_id}, file_path={attachment.file_path}")
+                missing_count += 1
+                db.rollback()
+                continue
+
+            file_hash = attachment.file_hash or UploadUtil.hash_file(attachment.file_path)
+            blob_path = StorageUtil.get_blob_path(file_hash)
+            if dry_run:
+                print(f"attachment_id={attachment_id}: {attachment.file_path} -> {blob_path}")
+                migrated_count += 1
+                db.rollback()
+                continue
+
+            file_path = attachment.file_path
+            file_size = os.path.getsize(file_path)
+            IssueDao.acquire_blob(db, file_hash, file_size, blob_path)
+            db.execute(
+                update(IssueAttachment)
+                .where(IssueAttachment.attachment_id == attachment_id)
+                .values(file_hash=file_hash, file_path=blob_path, file_size=file_size)
+            )
+            created = StorageUtil.store_blob(file_path, blob_path)
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                if created:
+                    os.replace(blob_path, file_path)
+                raise
+            if not created:
+                os.remove(file_path)
+                deduplicated_count += 1
+            migrated_count += 1
+
+    print(f"迁移附件{migrated_count}个，其中重复内容{deduplicated_count}个，文件缺失{missing_count}个")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="将已有附件迁移到内容寻址存储")
+    parser.add_argument("--dry-run", action="store_true", help="只打印待迁移的附件，不做修改")
+    args = parser.parse_args()
+    migrate(args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from starlette.responses import FileResponse
 from sub_applications.handle import handle_sub_applications
 from utils.common_util import worship
 from config.get_redis import RedisUtil
+from utils.job_queue_util import JobQueueUtil, RedisJobQueue
 from utils.log_util import logger
 from module_admin.controller import login_controller
 from module_admin.controller import user_controller
@@ -31,6 +32,8 @@ from module_admin.controller import notice_controller
 from module_admin.controller import cache_controller
 from module_admin.controller import log_controller
 from module_admin.controller import issue_controller
+from module_admin.service.issue_service import IssueService
+from module_task.index_attachments import submit_index_attachments
 
 app = FastAPI(
     docs_url=f"{AppConfig.app_root_path}/docs",
@@ -58,6 +61,8 @@ def startup():
     app.state.redis = RedisUtil.create_redis_pool()
     RedisUtil.init_sys_dict(app.state.redis)
     RedisUtil.init_sys_config(app.state.redis)
+    JobQueueUtil.init_queue(RedisJobQueue(app.state.redis))
+    IssueService.attachment_index_trigger = submit_index_attachments
     SchedulerUtil.init_system_scheduler()
     logger.info(f"{AppConfig.app_name}启动成功")
 
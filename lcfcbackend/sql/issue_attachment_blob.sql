@@ -0,0 +1,26 @@
+-- ========================================
+-- Issue附件内容寻址存储表
+-- ========================================
+-- 说明：
+-- 1. 附件文件按SHA-256摘要存放在 {UPLOAD_PATH}/blob/摘要前2位/摘要3-4位/摘要，相同内容只保存一份
+-- 2. issue_attachment.file_hash 指向本表，file_path 为存储文件路径
+-- 3. ref_count 为引用该文件的附件数，删除附件或清理临时附件时扣减，归零时删除存储文件
+-- 4. 建表后执行 python scripts/migrate_attachment_blobs.py 将已有附件迁移到内容寻址存储并建立引用计数；
+--    迁移前的附件仍按原路径访问，不参与引用计数
+-- ========================================
+
+CREATE TABLE `issue_attachment_blob` (
+    `file_hash` CHAR(64) NOT NULL COMMENT '文件SHA-256摘要',
+    `file_path` VARCHAR(500) NOT NULL COMMENT '文件存储路径',
+    `file_size` BIGINT NOT NULL COMMENT '文件大小(字节)',
+    `ref_count` BIGINT NOT NULL DEFAULT 0 COMMENT '引用该文件的附件数',
+    `create_time` DATETIME DEFAULT NULL COMMENT '创建时间',
+    PRIMARY KEY (`file_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue附件内容寻址存储表';
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DROP TABLE `issue_attachment_blob`;
+*/
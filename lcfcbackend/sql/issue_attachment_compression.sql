@@ -0,0 +1,62 @@
+-- ========================================
+-- Issue附件压缩存储
+-- ========================================
+-- 说明：
+-- 1. .log/.txt/.dmp 附件上传后由后台线程池压缩为zstd可寻址格式(按1MB原始数据分帧，文件末尾附帧索引)，
+--    压缩文件存放在原存储路径加 .zst 后缀处，原文件随后删除；file_path 保持不变
+-- 2. issue_attachment_blob.compression 为压缩方式：zstd已压缩，none压缩率过低保留原文件，空为待压缩
+-- 3. compressed_size 为压缩后大小，原始大小仍为 file_size；issue_attachment.compressed_size 与存储记录同步
+-- 4. 定时任务用于补偿服务重启等原因未完成的压缩，并在日志中输出累计节省的磁盘空间
+-- ========================================
+
+ALTER TABLE `issue_attachment_blob`
+ADD COLUMN `compression` VARCHAR(16) NULL COMMENT '压缩方式(zstd已压缩 none不压缩 空为待压缩)' AFTER `ref_count`,
+ADD COLUMN `compressed_size` BIGINT NULL COMMENT '压缩后大小(字节)' AFTER `compression`;
+
+CREATE INDEX `idx_attachment_blob_compression` ON `issue_attachment_blob` (`compression`);
+
+ALTER TABLE `issue_attachment`
+ADD COLUMN `compressed_size` BIGINT NULL COMMENT '压缩存储后大小(字节)，未压缩时为空' AFTER `file_hash`;
+
+INSERT INTO `sys_job` (
+    `job_id`,
+    `job_name`,
+    `job_group`,
+    `job_executor`,
+    `invoke_target`,
+    `job_args`,
+    `job_kwargs`,
+    `cron_expression`,
+    `misfire_policy`,
+    `concurrent`,
+    `status`,
+    `create_by`,
+    `create_time`,
+    `remark`
+) VALUES (
+    102,
+    '压缩附件存储文件',
+    'default',
+    'default',
+    'module_task.compress_attachments.compress_attachments',
+    NULL,
+    NULL,
+    '0 30 3 * * ?',  -- 每天凌晨3点30分执行
+    '3',  -- 计划执行错误策略：放弃执行
+    '1',  -- 禁止并发执行
+    '1',  -- 状态：暂停（需要手动启用）
+    'admin',
+    NOW(),
+    '压缩上传后未完成后台压缩的日志及dump附件'
+);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- 回滚前需先将 .zst 文件解压回原存储路径
+-- ========================================
+/*
+DELETE FROM `sys_job` WHERE `job_id` = 102;
+ALTER TABLE `issue_attachment` DROP COLUMN `compressed_size`;
+DROP INDEX `idx_attachment_blob_compression` ON `issue_attachment_blob`;
+ALTER TABLE `issue_attachment_blob` DROP COLUMN `compressed_size`, DROP COLUMN `compression`;
+*/
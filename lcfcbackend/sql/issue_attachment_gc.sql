@@ -0,0 +1,34 @@
+-- ========================================
+-- 临时附件分批清理及孤儿文件扫描
+-- ========================================
+-- 说明：
+-- 1. 清理任务按上传时间分批处理过期临时附件：先将一批记录的status改为deleting并提交，删除物理文件后再删除记录，
+--    任务中断后下次执行时优先处理deleting状态的附件；deleting状态的附件不能再关联到Issue
+-- 2. 清理任务结束后按摘要顺序扫描 {UPLOAD_PATH}/blob 存储目录，分批与 issue_attachment_blob 比对，
+--    删除没有记录的孤儿文件，恢复删除中断时残留的 .deleting 文件；同时清理 blob/tmp 及 upload_session 下
+--    没有对应上传会话的临时文件。24小时内修改过的文件不处理
+-- 3. 孤儿扫描只处理附件存储目录，上传根目录下其他模块的文件不受影响；
+--    文件较多时可通过任务参数 {"scan_orphans": false} 跳过扫描
+-- ========================================
+
+ALTER TABLE `issue_attachment`
+MODIFY COLUMN `status` VARCHAR(20) NOT NULL DEFAULT 'temporary'
+COMMENT '附件状态(temporary临时,linked已关联,deleting删除中)';
+
+CREATE INDEX `idx_attachment_status_upload_time` ON `issue_attachment` (`status`, `upload_time`, `attachment_id`);
+
+UPDATE `sys_job`
+SET `remark` = '分批清理超过24小时未关联的临时附件及过期分片上传会话，并扫描删除存储目录中的孤儿文件'
+WHERE `job_id` = 100;
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- 回滚前需确认没有deleting状态的附件
+-- ========================================
+/*
+UPDATE `sys_job` SET `remark` = '自动清理超过24小时未关联的临时附件' WHERE `job_id` = 100;
+DROP INDEX `idx_attachment_status_upload_time` ON `issue_attachment`;
+ALTER TABLE `issue_attachment`
+MODIFY COLUMN `status` VARCHAR(20) NOT NULL DEFAULT 'temporary'
+COMMENT '附件状态(temporary临时,linked已关联)';
+*/
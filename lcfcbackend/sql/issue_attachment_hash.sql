@@ -0,0 +1,22 @@
+-- ========================================
+-- Issue附件表增加文件摘要字段
+-- ========================================
+-- 说明：
+-- 1. 流式上传接口(/system/issue/attachment/upload/stream)在写盘的同时计算文件SHA-256
+-- 2. file_hash 记录该摘要，用于校验文件完整性及按内容查找重复附件
+-- 3. 历史附件的 file_hash 为空
+-- ========================================
+
+ALTER TABLE `issue_attachment`
+ADD COLUMN `file_hash` CHAR(64) NULL COMMENT '文件SHA-256摘要'
+AFTER `upload_by`;
+
+CREATE INDEX `idx_attachment_file_hash` ON `issue_attachment` (`file_hash`);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DROP INDEX `idx_attachment_file_hash` ON `issue_attachment`;
+ALTER TABLE `issue_attachment` DROP COLUMN `file_hash`;
+*/
@@ -0,0 +1,65 @@
+-- ========================================
+-- Issue附件trigram索引
+-- ========================================
+-- 说明：
+-- 1. 附件关联到Issue后，后台为 .log/.txt 附件及 .zip 内的 .log/.txt 文件建立trigram(连续3字节，ASCII字母转小写)倒排索引，
+--    每个存储文件(或压缩包内的每个文本文件)对应本表一条索引文档，相同内容的附件共用同一文档
+-- 2. 倒排索引存放在 {UPLOAD_PATH}/trigram_index 下的只读索引段文件中，manifest.json 记录当前生效的索引段；
+--    新文档按批次写入新的索引段，索引段过多时由定时任务合并，并丢弃已删除附件的倒排项
+-- 3. index_time 为空表示文档正在建立索引，超过1小时仍未完成的文档由定时任务删除后重新建立；
+--    无法读取或不包含文本文件的附件记录 content_size 为0的文档，避免重复处理
+-- 4. 跨附件搜索先用索引筛选包含全部所需trigram的文件，再扫描文件内容校验并返回匹配位置的字节偏移
+-- 5. 索引段按批次追加，定时任务需禁止并发执行；多实例部署时只在一个实例上启用该任务
+-- ========================================
+
+CREATE TABLE `issue_attachment_index_doc` (
+    `doc_id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '索引文档ID',
+    `file_hash` CHAR(64) NOT NULL COMMENT '文件SHA-256摘要',
+    `member_name` VARCHAR(500) NOT NULL DEFAULT '' COMMENT '压缩包内的文件名，非压缩包为空字符串',
+    `content_size` BIGINT NOT NULL DEFAULT 0 COMMENT '建立索引的原始内容大小(字节)，无法读取时为0',
+    `create_time` DATETIME DEFAULT NULL COMMENT '创建时间',
+    `index_time` DATETIME DEFAULT NULL COMMENT '写入索引段的时间，为空表示正在建立索引',
+    PRIMARY KEY (`doc_id`),
+    KEY `idx_attachment_index_doc_hash` (`file_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue附件trigram索引文档表';
+
+INSERT INTO `sys_job` (
+    `job_id`,
+    `job_name`,
+    `job_group`,
+    `job_executor`,
+    `invoke_target`,
+    `job_args`,
+    `job_kwargs`,
+    `cron_expression`,
+    `misfire_policy`,
+    `concurrent`,
+    `status`,
+    `create_by`,
+    `create_time`,
+    `remark`
+) VALUES (
+    103,
+    '建立附件搜索索引',
+    'default',
+    'default',
+    'module_task.index_attachments.index_attachments',
+    NULL,
+    NULL,
+    '0 */10 * * * ?',  -- 每10分钟执行一次
+    '3',  -- 计划执行错误策略：放弃执行
+    '1',  -- 禁止并发执行
+    '1',  -- 状态：暂停（需要手动启用）
+    'admin',
+    NOW(),
+    '为已关联Issue的日志附件建立跨附件搜索索引并合并索引段'
+);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- 回滚后可删除 {UPLOAD_PATH}/trigram_index 目录
+-- ========================================
+/*
+DELETE FROM `sys_job` WHERE `job_id` = 103;
+DROP TABLE `issue_attachment_index_doc`;
+*/
@@ -0,0 +1,51 @@
+-- ========================================
+-- dump附件崩溃分组
+-- ========================================
+-- 说明：
+-- 1. dump分析结果增加崩溃签名：异常代码、异常所在模块(忽略大小写及版本)及模块内偏移的SHA-1摘要，
+--    内核dump按蓝屏代码计算；解析器版本升级为2，已有的分析结果由定时任务(job_id 104)重新分析
+-- 2. 分析完成后按附件增量写入 issue_crash_bucket_hit(每个dump附件一条，命中时间为附件上传时间)，
+--    签名首次出现时写入 issue_crash_bucket；相同内容的附件关联到新Issue时同样归入分组
+-- 3. 查询Issue的崩溃分组按 issue_id 索引定位签名，再按签名索引统计；热门分组按命中时间索引只统计时间范围内的命中，
+--    均不扫描分析结果表；已删除Issue的命中不计入统计
+-- ========================================
+
+ALTER TABLE `issue_dump_analysis`
+ADD COLUMN `crash_signature` CHAR(40) DEFAULT NULL COMMENT '崩溃签名，没有异常记录或分析失败时为空' AFTER `crash_time`,
+ADD KEY `ix_issue_dump_analysis_crash_signature` (`crash_signature`);
+
+CREATE TABLE `issue_crash_bucket` (
+    `signature` CHAR(40) NOT NULL COMMENT '崩溃签名',
+    `dump_type` VARCHAR(16) DEFAULT NULL COMMENT 'dump类型(user用户态 kernel内核)',
+    `exception_code` VARCHAR(10) DEFAULT NULL COMMENT '异常代码，内核dump为蓝屏代码',
+    `faulting_module` VARCHAR(255) DEFAULT NULL COMMENT '异常所在模块',
+    `faulting_offset` VARCHAR(18) DEFAULT NULL COMMENT '异常地址相对模块基址的偏移',
+    `first_hit_time` DATETIME DEFAULT NULL COMMENT '首次出现时间(附件上传时间)',
+    `last_hit_time` DATETIME DEFAULT NULL COMMENT '最近出现时间(附件上传时间)',
+    PRIMARY KEY (`signature`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='崩溃分组表';
+
+CREATE TABLE `issue_crash_bucket_hit` (
+    `attachment_id` BIGINT NOT NULL COMMENT '附件ID',
+    `signature` CHAR(40) NOT NULL COMMENT '崩溃签名',
+    `issue_id` BIGINT NOT NULL COMMENT 'Issue ID',
+    `hit_time` DATETIME NOT NULL COMMENT '命中时间(附件上传时间)',
+    PRIMARY KEY (`attachment_id`),
+    KEY `idx_crash_bucket_hit_signature` (`signature`, `issue_id`),
+    KEY `idx_crash_bucket_hit_time` (`hit_time`, `signature`),
+    KEY `ix_issue_crash_bucket_hit_issue_id` (`issue_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='崩溃分组命中表';
+
+UPDATE `sys_job`
+SET `remark` = '解析已关联Issue的dump附件并归入崩溃分组，补偿未完成的分析及解析器升级后的重新分析'
+WHERE `job_id` = 104;
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+UPDATE `sys_job` SET `remark` = '解析已关联Issue的dump附件，补偿未完成的分析及解析器升级后的重新分析' WHERE `job_id` = 104;
+DROP TABLE `issue_crash_bucket_hit`;
+DROP TABLE `issue_crash_bucket`;
+ALTER TABLE `issue_dump_analysis` DROP KEY `ix_issue_dump_analysis_crash_signature`, DROP COLUMN `crash_signature`;
+*/
@@ -0,0 +1,74 @@
+-- ========================================
+-- Issue dump附件自动分析
+-- ========================================
+-- 说明：
+-- 1. 附件关联到Issue后，后台解析 .dmp 附件(用户态minidump及内核dump文件头)，提取异常代码、异常地址、
+--    异常所在模块及偏移、模块版本、线程数、系统版本号等信息；解析在独立进程池中执行
+-- 2. 分析结果按文件SHA-256摘要缓存，相同内容的附件共用同一条记录，只分析一次；
+--    完整结果(含模块列表)以JSON存放在 result 列，常用字段单独存放并对异常代码、异常模块建立索引便于统计
+-- 3. 无法解析的dump记录为failed及失败原因，不再重复分析；解析器版本(parser_version)升级后由定时任务重新分析
+-- 4. 压缩包(.zip)内的dump文件不做分析
+-- ========================================
+
+CREATE TABLE `issue_dump_analysis` (
+    `file_hash` CHAR(64) NOT NULL COMMENT '文件SHA-256摘要',
+    `parser_version` INT NOT NULL COMMENT '解析器版本',
+    `status` VARCHAR(16) NOT NULL COMMENT '分析状态(success成功 failed失败)',
+    `dump_type` VARCHAR(16) DEFAULT NULL COMMENT 'dump类型(user用户态 kernel内核)',
+    `exception_code` VARCHAR(10) DEFAULT NULL COMMENT '异常代码，内核dump为蓝屏代码',
+    `exception_address` VARCHAR(18) DEFAULT NULL COMMENT '异常地址',
+    `faulting_module` VARCHAR(255) DEFAULT NULL COMMENT '异常所在模块',
+    `faulting_offset` VARCHAR(18) DEFAULT NULL COMMENT '异常地址相对模块基址的偏移',
+    `faulting_module_version` VARCHAR(64) DEFAULT NULL COMMENT '异常所在模块的版本',
+    `process_name` VARCHAR(255) DEFAULT NULL COMMENT '进程名',
+    `os_build` VARCHAR(128) DEFAULT NULL COMMENT '系统版本号',
+    `thread_count` INT DEFAULT NULL COMMENT '线程数',
+    `module_count` INT DEFAULT NULL COMMENT '模块数',
+    `crash_time` DATETIME DEFAULT NULL COMMENT 'dump生成时间',
+    `result` MEDIUMTEXT COMMENT '完整分析结果(JSON，含模块列表)',
+    `error_message` VARCHAR(500) DEFAULT NULL COMMENT '分析失败原因',
+    `analyze_time` DATETIME DEFAULT NULL COMMENT '分析时间',
+    PRIMARY KEY (`file_hash`),
+    KEY `ix_issue_dump_analysis_exception_code` (`exception_code`),
+    KEY `ix_issue_dump_analysis_faulting_module` (`faulting_module`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue dump附件分析结果表';
+
+INSERT INTO `sys_job` (
+    `job_id`,
+    `job_name`,
+    `job_group`,
+    `job_executor`,
+    `invoke_target`,
+    `job_args`,
+    `job_kwargs`,
+    `cron_expression`,
+    `misfire_policy`,
+    `concurrent`,
+    `status`,
+    `create_by`,
+    `create_time`,
+    `remark`
+) VALUES (
+    104,
+    '分析dump附件',
+    'default',
+    'default',
+    'module_task.analyze_dumps.analyze_dumps',
+    NULL,
+    NULL,
+    '0 */10 * * * ?',  -- 每10分钟执行一次
+    '3',  -- 计划执行错误策略：放弃执行
+    '1',  -- 禁止并发执行
+    '1',  -- 状态：暂停（需要手动启用）
+    'admin',
+    NOW(),
+    '解析已关联Issue的dump附件，补偿未完成的分析及解析器升级后的重新分析'
+);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DELETE FROM `sys_job` WHERE `job_id` = 104;
+DROP TABLE `issue_dump_analysis`;
+*/
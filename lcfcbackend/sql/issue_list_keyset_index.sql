@@ -0,0 +1,17 @@
+-- ========================================
+-- Issue列表游标分页索引
+-- ========================================
+-- 说明：
+-- 1. /system/issue/list 支持pageMode=cursor游标分页，按(create_time, issue_id)倒序定位
+-- 2. 以del_flag为前缀的联合索引使 WHERE del_flag='0' AND (create_time, issue_id) < (?, ?)
+--    ORDER BY create_time DESC, issue_id DESC LIMIT n 直接在索引上定位，翻页深度不影响耗时
+-- ========================================
+
+CREATE INDEX `idx_del_flag_create_time_id` ON `issue_main` (`del_flag`, `create_time`, `issue_id`);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DROP INDEX `idx_del_flag_create_time_id` ON `issue_main`;
+*/
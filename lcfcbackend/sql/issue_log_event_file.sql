@@ -0,0 +1,66 @@
+-- ========================================
+-- 日志附件结构化事件
+-- ========================================
+-- 说明：
+-- 1. 附件关联到Issue后，后台逐块扫描 .log 附件，按驱动、CBS、系统事件导出、BIOS串口及通用日志格式提取事件行的
+--    时间、级别、组件及错误代码，不匹配任何格式的行(堆栈、续行等)不作为事件
+-- 2. 事件按列存放在存储文件旁的 {摘要}.evt 文件中(时间戳、级别、行号、行首偏移等数组，组件及错误代码按字典编码)，
+--    相同内容的附件共用同一事件文件；存储文件删除时事件文件及本表记录一并删除
+-- 3. 本表记录各事件文件的事件数及时间范围，查询时先跳过时间范围不相交的文件，再对事件文件按列向量化筛选
+-- 4. 无法读取的附件记录为failed，不再重复提取；日志格式版本(pattern_version)升级后由定时任务重新提取
+-- ========================================
+
+CREATE TABLE `issue_log_event_file` (
+    `file_hash` CHAR(64) NOT NULL COMMENT '文件SHA-256摘要',
+    `pattern_version` INT NOT NULL COMMENT '日志格式版本',
+    `status` VARCHAR(16) NOT NULL COMMENT '提取状态(success成功 failed失败)',
+    `event_count` BIGINT NOT NULL DEFAULT 0 COMMENT '事件数',
+    `line_count` BIGINT NOT NULL DEFAULT 0 COMMENT '文件总行数',
+    `begin_time` DATETIME DEFAULT NULL COMMENT '最早的事件时间',
+    `end_time` DATETIME DEFAULT NULL COMMENT '最晚的事件时间',
+    `event_file_size` BIGINT NOT NULL DEFAULT 0 COMMENT '事件文件大小(字节)',
+    `error_message` VARCHAR(500) DEFAULT NULL COMMENT '提取失败原因',
+    `extract_time` DATETIME DEFAULT NULL COMMENT '提取时间',
+    PRIMARY KEY (`file_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='日志附件结构化事件文件表';
+
+INSERT INTO `sys_job` (
+    `job_id`,
+    `job_name`,
+    `job_group`,
+    `job_executor`,
+    `invoke_target`,
+    `job_args`,
+    `job_kwargs`,
+    `cron_expression`,
+    `misfire_policy`,
+    `concurrent`,
+    `status`,
+    `create_by`,
+    `create_time`,
+    `remark`
+) VALUES (
+    105,
+    '提取日志事件',
+    'default',
+    'default',
+    'module_task.extract_log_events.extract_log_events',
+    NULL,
+    NULL,
+    '0 */10 * * * ?',  -- 每10分钟执行一次
+    '3',  -- 计划执行错误策略：放弃执行
+    '1',  -- 禁止并发执行
+    '1',  -- 状态：暂停（需要手动启用）
+    'admin',
+    NOW(),
+    '提取已关联Issue的日志附件的结构化事件，补偿未完成的提取及日志格式升级后的重新提取'
+);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- 回滚后可删除 {UPLOAD_PATH}/blob 下的 *.evt 文件
+-- ========================================
+/*
+DELETE FROM `sys_job` WHERE `job_id` = 105;
+DROP TABLE `issue_log_event_file`;
+*/
@@ -0,0 +1,33 @@
+-- ========================================
+-- Issue编号按日序列表
+-- ========================================
+-- 说明：
+-- 1. 替代按 max(issue_number) LIKE 'ISU-yyyy-MM-dd-%' 生成编号的方式，避免并发新增时编号冲突
+-- 2. 每天一行，编号分配在业务事务中执行 UPDATE last_value = last_value + n，不额外占用数据库连接，
+--    业务事务回滚时编号随之回收
+-- 3. 支持一次分配N个连续编号(批量导入)；服务重启后从表中继续递增
+-- 4. 当天序列不存在时以当天已有的最大编号初始化，兼容上线前生成的编号
+-- ========================================
+
+CREATE TABLE `issue_number_sequence` (
+    `seq_date` VARCHAR(10) NOT NULL COMMENT '序列日期(yyyy-MM-dd)',
+    `last_value` BIGINT NOT NULL DEFAULT 0 COMMENT '当日已分配的最大序号',
+    `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '更新时间',
+    PRIMARY KEY (`seq_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue编号按日序列表';
+
+-- 以当天已有的最大编号初始化当天序列
+INSERT INTO `issue_number_sequence` (`seq_date`, `last_value`, `update_time`)
+SELECT
+    DATE_FORMAT(NOW(), '%Y-%m-%d'),
+    IFNULL(MAX(CAST(SUBSTRING_INDEX(`issue_number`, '-', -1) AS UNSIGNED)), 0),
+    NOW()
+FROM `issue_main`
+WHERE `issue_number` LIKE CONCAT('ISU-', DATE_FORMAT(NOW(), '%Y-%m-%d'), '-%');
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DROP TABLE `issue_number_sequence`;
+*/
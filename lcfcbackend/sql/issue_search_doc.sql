@@ -0,0 +1,43 @@
+-- ========================================
+-- Issue全文检索文档表
+-- ========================================
+-- 说明：
+-- 1. 每个Issue一行，content汇总标题、问题描述、解决方案、诊断步骤和标签
+-- 2. 使用ngram全文解析器(默认ngram_token_size=2)，支持中英文混合检索
+-- 3. 文档由服务层在新增/编辑Issue、新增诊断记录时同步刷新
+-- 4. 列表接口通过keyword参数走全文检索，替代LIKE '%x%'全表扫描
+-- ========================================
+
+CREATE TABLE `issue_search_doc` (
+    `issue_id` BIGINT NOT NULL COMMENT 'Issue ID',
+    `content` MEDIUMTEXT COMMENT '检索文本(标题、问题描述、解决方案、诊断步骤、标签)',
+    `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '更新时间',
+    PRIMARY KEY (`issue_id`),
+    FULLTEXT KEY `ft_issue_search_content` (`content`) WITH PARSER ngram,
+    CONSTRAINT `fk_search_doc_issue` FOREIGN KEY (`issue_id`) REFERENCES `issue_main` (`issue_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue全文检索文档表';
+
+-- 为已存在的Issue回填检索文档
+SET SESSION group_concat_max_len = 16777216;
+
+INSERT INTO `issue_search_doc` (`issue_id`, `content`, `update_time`)
+SELECT
+    m.`issue_id`,
+    CONCAT_WS('\n',
+        m.`title`,
+        m.`description`,
+        m.`solution`,
+        (SELECT GROUP_CONCAT(CONCAT_WS('\n', l.`step_name`, l.`method_description`) SEPARATOR '\n')
+           FROM `issue_diagnosis_log` l WHERE l.`issue_id` = m.`issue_id`),
+        (SELECT GROUP_CONCAT(t.`tag_name` SEPARATOR '\n')
+           FROM `issue_tag` t WHERE t.`issue_id` = m.`issue_id`)
+    ),
+    NOW()
+FROM `issue_main` m;
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DROP TABLE `issue_search_doc`;
+*/
@@ -0,0 +1,78 @@
+-- ========================================
+-- Issue统计计数表
+-- ========================================
+-- 说明：
+-- 1. /system/issue/statistics 直接读取计数表，不再对issue_main、issue_diagnosis_log做COUNT(*)
+-- 2. 新增/编辑/删除Issue、新增诊断记录时在同一事务内累加对应计数项
+-- 3. 本月新增数按月份计数，计数项为 monthly_new_count:yyyy-MM
+-- 4. 定时任务以实时聚合结果校准计数表，修正手工改库等原因造成的偏差
+-- ========================================
+
+CREATE TABLE `issue_stat_counter` (
+    `counter_key` VARCHAR(64) NOT NULL COMMENT '计数项(total_count,pending_count,monthly_new_count:yyyy-MM等)',
+    `counter_value` BIGINT NOT NULL DEFAULT 0 COMMENT '计数值',
+    `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '更新时间',
+    PRIMARY KEY (`counter_key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue统计计数表';
+
+-- 初始化计数
+INSERT INTO `issue_stat_counter` (`counter_key`, `counter_value`, `update_time`)
+SELECT 'total_count', COUNT(*), NOW() FROM `issue_main` WHERE `del_flag` = '0'
+UNION ALL
+SELECT 'pending_count', COUNT(*), NOW() FROM `issue_main` WHERE `del_flag` = '0' AND `status` = 'pending'
+UNION ALL
+SELECT 'completed_count', COUNT(*), NOW() FROM `issue_main` WHERE `del_flag` = '0' AND `status` = 'completed'
+UNION ALL
+SELECT 'high_priority_count', COUNT(*), NOW() FROM `issue_main` WHERE `del_flag` = '0' AND `priority` = 'high'
+UNION ALL
+SELECT 'diagnosis_count', COUNT(*), NOW() FROM `issue_diagnosis_log`
+UNION ALL
+SELECT CONCAT('monthly_new_count:', DATE_FORMAT(`create_time`, '%Y-%m')), COUNT(*), NOW()
+  FROM `issue_main` WHERE `del_flag` = '0' AND `create_time` IS NOT NULL
+ GROUP BY DATE_FORMAT(`create_time`, '%Y-%m');
+
+-- ========================================
+-- 定时任务配置
+-- ========================================
+-- 每小时校准一次统计计数
+-- 注意：需要根据实际情况调整任务ID，避免冲突
+
+INSERT INTO `sys_job` (
+    `job_id`,
+    `job_name`,
+    `job_group`,
+    `job_executor`,
+    `invoke_target`,
+    `job_args`,
+    `job_kwargs`,
+    `cron_expression`,
+    `misfire_policy`,
+    `concurrent`,
+    `status`,
+    `create_by`,
+    `create_time`,
+    `remark`
+) VALUES (
+    101,
+    '校准Issue统计计数',
+    'default',
+    'default',
+    'module_task.reconcile_issue_statistics.reconcile_issue_statistics',
+    NULL,
+    NULL,
+    '0 0 * * * ?',  -- 每小时整点执行
+    '3',  -- 计划执行错误策略：放弃执行
+    '1',  -- 禁止并发执行
+    '0',  -- 状态：正常
+    'admin',
+    NOW(),
+    '以实时聚合结果校准issue_stat_counter统计计数表'
+);
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+DELETE FROM `sys_job` WHERE `job_id` = 101;
+DROP TABLE `issue_stat_counter`;
+*/
@@ -0,0 +1,82 @@
+-- ========================================
+-- Issue标签规范化 - 标签字典表 + 关联表
+-- ========================================
+-- 说明：
+-- 1. 新增issue_tag_dict标签字典表，标签名唯一，usage_count记录关联的未删除Issue数
+-- 2. issue_tag改为Issue与标签的关联表(issue_id, tag_id)，不再逐行存储标签名
+-- 3. 编辑Issue时按差集增删关联并同步usage_count，标签云接口直接按usage_count取前N个
+-- 4. 统计计数校准任务同时校准usage_count
+-- ========================================
+
+-- 1. 创建标签字典表
+CREATE TABLE `issue_tag_dict` (
+    `tag_id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '标签ID',
+    `tag_name` VARCHAR(50) NOT NULL COMMENT '标签名称',
+    `usage_count` BIGINT NOT NULL DEFAULT 0 COMMENT '使用次数(关联的未删除Issue数)',
+    `create_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    PRIMARY KEY (`tag_id`),
+    UNIQUE KEY `uk_tag_name` (`tag_name`),
+    KEY `idx_usage_count` (`usage_count`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue标签字典表';
+
+-- 2. 由原标签数据生成标签字典
+INSERT INTO `issue_tag_dict` (`tag_name`, `usage_count`, `create_time`)
+SELECT TRIM(`tag_name`), 0, NOW()
+FROM `issue_tag`
+WHERE TRIM(`tag_name`) <> ''
+GROUP BY TRIM(`tag_name`);
+
+-- 3. 重建issue_tag为关联表
+RENAME TABLE `issue_tag` TO `issue_tag_bak`;
+
+CREATE TABLE `issue_tag` (
+    `issue_id` BIGINT NOT NULL COMMENT 'Issue ID',
+    `tag_id` BIGINT NOT NULL COMMENT '标签ID',
+    PRIMARY KEY (`issue_id`, `tag_id`),
+    KEY `idx_tag_id` (`tag_id`),
+    CONSTRAINT `fk_issue_tag_issue` FOREIGN KEY (`issue_id`) REFERENCES `issue_main` (`issue_id`) ON DELETE CASCADE,
+    CONSTRAINT `fk_issue_tag_dict` FOREIGN KEY (`tag_id`) REFERENCES `issue_tag_dict` (`tag_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue与标签关联表';
+
+INSERT IGNORE INTO `issue_tag` (`issue_id`, `tag_id`)
+SELECT b.`issue_id`, d.`tag_id`
+FROM `issue_tag_bak` b
+JOIN `issue_tag_dict` d ON d.`tag_name` = TRIM(b.`tag_name`);
+
+-- 4. 初始化标签使用次数
+UPDATE `issue_tag_dict` d
+SET d.`usage_count` = (
+    SELECT COUNT(*)
+    FROM `issue_tag` t
+    JOIN `issue_main` m ON m.`issue_id` = t.`issue_id`
+    WHERE t.`tag_id` = d.`tag_id` AND m.`del_flag` = '0'
+);
+
+-- 5. 确认数据无误后可删除备份表
+-- DROP TABLE `issue_tag_bak`;
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+-- 由关联表还原原标签表结构(保留迁移后新增的标签)
+CREATE TABLE `issue_tag_restore` (
+    `tag_id` BIGINT NOT NULL AUTO_INCREMENT COMMENT '标签ID',
+    `issue_id` BIGINT NOT NULL COMMENT 'Issue ID',
+    `tag_name` VARCHAR(50) NOT NULL COMMENT '标签名称',
+    PRIMARY KEY (`tag_id`),
+    KEY `idx_issue_id` (`issue_id`),
+    KEY `idx_tag_name` (`tag_name`),
+    CONSTRAINT `fk_tag_issue_restore` FOREIGN KEY (`issue_id`) REFERENCES `issue_main` (`issue_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue标签表';
+
+INSERT INTO `issue_tag_restore` (`issue_id`, `tag_name`)
+SELECT t.`issue_id`, d.`tag_name`
+FROM `issue_tag` t
+JOIN `issue_tag_dict` d ON d.`tag_id` = t.`tag_id`;
+
+DROP TABLE `issue_tag`;
+DROP TABLE `issue_tag_dict`;
+DROP TABLE IF EXISTS `issue_tag_bak`;
+RENAME TABLE `issue_tag_restore` TO `issue_tag`;
+*/
@@ -0,0 +1,46 @@
+-- ========================================
+-- Issue附件分片上传(断点续传)会话表
+-- ========================================
+-- 说明：
+-- 1. 创建会话时按文件大小预分配临时文件(upload_session目录下的{upload_id}.part)
+-- 2. 各分片按偏移直接写入临时文件，可并发、乱序上传，完整写入后在issue_upload_chunk中记录
+-- 3. 全部分片到齐后完成上传：会话先置为completing(不再记录新分片)，临时文件在不持有行锁的情况下计算摘要，
+--    再移动到上传目录并生成临时附件记录，会话随之删除；写入分片及计算摘要期间均不持有数据库事务
+-- 4. 超过24小时未收到分片的会话由"清理临时附件"定时任务(job_id=100)一并清理
+-- ========================================
+
+CREATE TABLE `issue_upload_session` (
+    `upload_id` VARCHAR(32) NOT NULL COMMENT '上传会话ID',
+    `file_name` VARCHAR(255) NOT NULL COMMENT '原始文件名',
+    `file_size` BIGINT NOT NULL COMMENT '文件总大小(字节)',
+    `chunk_size` BIGINT NOT NULL COMMENT '分片大小(字节)',
+    `temp_path` VARCHAR(500) NOT NULL COMMENT '临时文件路径',
+    `upload_by` VARCHAR(64) DEFAULT NULL COMMENT '上传者',
+    `status` VARCHAR(16) NOT NULL DEFAULT 'uploading' COMMENT '会话状态(uploading上传中 completing完成中)',
+    `create_time` DATETIME DEFAULT NULL COMMENT '创建时间',
+    `update_time` DATETIME DEFAULT NULL COMMENT '最近一次收到分片的时间',
+    PRIMARY KEY (`upload_id`),
+    KEY `idx_upload_session_update_time` (`update_time`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue附件分片上传会话表';
+
+CREATE TABLE `issue_upload_chunk` (
+    `upload_id` VARCHAR(32) NOT NULL COMMENT '上传会话ID',
+    `chunk_index` BIGINT NOT NULL COMMENT '分片序号',
+    `chunk_size` BIGINT NOT NULL COMMENT '分片大小(字节)',
+    `upload_time` DATETIME DEFAULT NULL COMMENT '接收时间',
+    PRIMARY KEY (`upload_id`, `chunk_index`),
+    CONSTRAINT `fk_upload_chunk_session` FOREIGN KEY (`upload_id`) REFERENCES `issue_upload_session` (`upload_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='Issue附件分片上传已接收分片表';
+
+UPDATE `sys_job`
+SET `remark` = '自动清理超过24小时未关联的临时附件及过期的分片上传会话'
+WHERE `job_id` = 100;
+
+-- ========================================
+-- 回滚脚本（如果需要回退）
+-- ========================================
+/*
+UPDATE `sys_job` SET `remark` = '自动清理超过24小时未关联的临时附件' WHERE `job_id` = 100;
+DROP TABLE `issue_upload_chunk`;
+DROP TABLE `issue_upload_session`;
+*/
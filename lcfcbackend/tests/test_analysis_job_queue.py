@@ -0,0 +1,219 @@
+"""
+附件分析任务队列及worker单元测试
+"""
+
+import asyncio
+
+import pytest
+
+from config.constant import AnalysisJobConstant
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueDumpAnalysis, IssueLogEventFile
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from module_task.analysis_worker import run_once
+from utils.job_queue_util import AnalysisJobQueue, JobQueueUtil, MemoryJobQueue
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1705314600.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def job_queue(clock, monkeypatch):
+    queue = MemoryJobQueue(clock)
+    monkeypatch.setattr(JobQueueUtil, "_queue", queue)
+    return queue
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _add_issue(db_session, title, priority, attachments):
+    result = IssueService.add_issue_services(
+        db_session,
+        AddIssueModel(
+            title=title,
+            priority=priority,
+            issueType="BUG",
+            attachmentIds=[attachment.attachment_id for attachment in attachments],
+        ),
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def test_memory_queue_priority_retry_and_lease(clock, monkeypatch):
+    monkeypatch.setattr(AnalysisJobConstant, "MAX_ATTEMPTS", 2)
+    queue = MemoryJobQueue(clock)
+    low = queue.enqueue("log_events", 1, "low")
+    high = queue.enqueue("dump_analysis", 2, "high")
+    medium = queue.enqueue("log_events", 3, "medium")
+    sweep = queue.enqueue("dump_analysis")
+    with pytest.raises(ValueError):
+        queue.enqueue("unknown", 1, "high")
+
+    # 同一优先级按提交顺序执行，补偿任务使用低优先级
+    assert [queue.dequeue("w")["job_id"] for _ in range(4)] == [high, medium, low, sweep]
+    assert queue.dequeue("w") is None
+
+    job = queue.get_job(high)
+    assert (job["status"], job["attempts"], job["worker"]) == ("running", 1, "w")
+    assert queue.update_progress(job, 3, 4, "解析中")
+    assert (queue.get_job(high)["processed"], queue.get_job(high)["total"]) == (3, 4)
+
+    # 失败后按退避时间重试
+    assert queue.fail(job, "数据库连接失败")
+    retry = queue.get_job(high)
+    assert (retry["status"], retry["error"]) == ("queued", "数据库连接失败")
+    assert retry["next_run_time"].timestamp() == clock.now + AnalysisJobConstant.RETRY_DELAY
+    assert queue.dequeue("w") is None
+    clock.now += AnalysisJobConstant.RETRY_DELAY
+    job = queue.dequeue("w2")
+    assert (job["job_id"], job["attempts"], job["processed"]) == (high, 2, 0)
+    assert "next_run_time" not in job
+
+    # 租约过期后被收回，原worker的结果被忽略；达到最多执行次数后标记为失败
+    clock.now += AnalysisJobConstant.LEASE_SECONDS
+    assert queue.recover_expired() == 4
+    failed = queue.get_job(high)
+    assert (failed["status"], failed["error"]) == ("failed", "任务执行超时")
+    assert not queue.complete(job, "完成")
+    assert not queue.update_progress(job, 1, 1)
+    assert queue.get_job(low)["status"] == "queued"
+
+    clock.now += AnalysisJobConstant.RETRY_DELAY
+    job = queue.dequeue("w3")
+    assert job["job_id"] == medium
+    assert queue.complete(job, "完成")
+    assert (queue.get_job(medium)["status"], queue.get_job(medium)["message"]) == ("success", "完成")
+    assert [job["job_id"] for job in queue.get_issue_jobs(3)] == [medium]
+
+
+def test_incomplete_queue_cannot_be_created():
+    class IncompleteQueue(AnalysisJobQueue):
+        def enqueue(self, job_type, issue_id=None, priority=None):
+            return 1
+
+    with pytest.raises(TypeError):
+        IncompleteQueue()
+
+
+def test_link_attachments_enqueues_jobs(db_session, upload_path, job_queue, clock):
+    low_log = _upload(db_session, b"2024-01-15 10:30:00 [ERROR] wifi: disconnected\n", "wifi.log")
+    low_issue = _add_issue(db_session, "低优先级", "low", [low_log])
+    high_dump = _upload(db_session, b"not a minidump", "crash.dmp")
+    high_log = _upload(db_session, b"[2024-01-15 10:30:00.000] [ERROR] [iaStorAC] Port reset failed\n", "storage.log")
+    text = _upload(db_session, b"notes", "notes.txt")
+    high_issue = _add_issue(db_session, "高优先级", "high", [high_dump, high_log, text])
+    plain_issue = _add_issue(db_session, "没有分析附件", "high", [])
+
+    assert [(job["job_type"], job["status"]) for job in job_queue.get_issue_jobs(high_issue)] == [
+        ("dump_analysis", "queued"),
+        ("log_events", "queued"),
+    ]
+    assert IssueService.get_issue_analysis_jobs_services(db_session, plain_issue) == []
+
+    # 高优先级Issue的任务先执行，每个任务只处理所属Issue的附件
+    assert run_once(job_queue, "worker-1", lambda: db_session)
+    assert db_session.get(IssueDumpAnalysis, high_dump.file_hash).status == "failed"
+    assert run_once(job_queue, "worker-1", lambda: db_session)
+    assert db_session.get(IssueLogEventFile, high_log.file_hash).event_count == 1
+    assert db_session.get(IssueLogEventFile, low_log.file_hash) is None
+
+    jobs = IssueService.get_issue_analysis_jobs_services(db_session, high_issue)
+    assert [(job.job_type, job.status, job.processed, job.total, job.progress) for job in jobs] == [
+        ("dump_analysis", "success", 1, 1, 100),
+        ("log_events", "success", 1, 1, 100),
+    ]
+    assert jobs[0].message.startswith("分析dump附件完成，成功0个，失败1个")
+    assert jobs[1].worker == "worker-1"
+    low_job = IssueService.get_issue_analysis_jobs_services(db_session, low_issue)[0]
+    assert (low_job.status, low_job.progress) == ("queued", 0)
+
+    assert run_once(job_queue, "worker-1", lambda: db_session)
+    assert db_session.get(IssueLogEventFile, low_log.file_hash).event_count == 1
+    assert not run_once(job_queue, "worker-1", lambda: db_session)
+
+    # 再次提交时没有需要处理的附件
+    job_id = job_queue.enqueue("log_events", low_issue, "low")
+    assert run_once(job_queue, "worker-1", lambda: db_session)
+    job = IssueService.get_analysis_job_services(job_id)
+    assert (job.status, job.total, job.progress, job.message) == ("success", 0, 100, "提取日志事件完成，成功0个，失败0个")
+
+    with pytest.raises(ServiceException):
+        IssueService.get_analysis_job_services(job_id + 1)
+    with pytest.raises(ServiceException):
+        IssueService.get_issue_analysis_jobs_services(db_session, high_issue + 100)
+
+
+def test_failed_job_retried(db_session, upload_path, job_queue, clock, monkeypatch):
+    log = _upload(db_session, b"2024-01-15 10:30:00 [INFO] boot\n", "boot.log")
+    issue_id = _add_issue(db_session, "重试", "medium", [log])
+    original = IssueService.extract_log_events_services.__func__
+
+    def broken(cls, *args, **kwargs):
+        raise OSError("磁盘不可用")
+
+    monkeypatch.setattr(IssueService, "extract_log_events_services", classmethod(broken))
+    assert run_once(job_queue, "worker-1", lambda: db_session)
+    job = IssueService.get_issue_analysis_jobs_services(db_session, issue_id)[0]
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "磁盘不可用")
+    assert job.next_run_time is not None
+    assert not run_once(job_queue, "worker-1", lambda: db_session)
+
+    monkeypatch.setattr(IssueService, "extract_log_events_services", classmethod(original))
+    clock.now += AnalysisJobConstant.RETRY_DELAY
+    assert run_once(job_queue, "worker-2", lambda: db_session)
+    job = IssueService.get_issue_analysis_jobs_services(db_session, issue_id)[0]
+    assert (job.status, job.attempts, job.worker, job.next_run_time) == ("success", 2, "worker-2", None)
+    assert db_session.get(IssueLogEventFile, log.file_hash).status == "success"
+
+
+def test_queue_not_enabled(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(JobQueueUtil, "_queue", None)
+    log = _upload(db_session, b"2024-01-15 10:30:00 [INFO] boot\n", "boot.log")
+    issue_id = _add_issue(db_session, "未启用队列", "high", [log])
+
+    with pytest.raises(ServiceException):
+        IssueService.get_issue_analysis_jobs_services(db_session, issue_id)
+
+
+def test_jobs_enqueued_after_outer_commit(db_session, job_queue):
+    savepoint = db_session.begin_nested()
+    JobQueueUtil.enqueue_after_commit(db_session, "log_events", 1, "high")
+    JobQueueUtil.enqueue_after_commit(db_session, "log_events", 1, "high")
+    savepoint.commit()
+    # 释放保存点时不提交任务
+    assert job_queue.get_issue_jobs(1) == []
+    savepoint = db_session.begin_nested()
+    JobQueueUtil.enqueue_after_commit(db_session, "dump_analysis", 1, "high")
+    savepoint.rollback()
+    db_session.commit()
+    assert [job["job_type"] for job in job_queue.get_issue_jobs(1)] == ["log_events"]
@@ -0,0 +1,135 @@
+"""
+文件下载(Range/条件请求)单元测试
+"""
+
+import asyncio
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.service.issue_service import IssueService
+from utils.download_util import DownloadUtil, RangeFileResponse
+from utils.upload_util import UploadUtil
+
+DATA = os.urandom(3 * 1024 * 1024 + 17)
+
+
+@pytest.fixture
+def client(tmp_path):
+    file_path = tmp_path / "crash.dmp"
+    file_path.write_bytes(DATA)
+    app = FastAPI()
+
+    @app.api_route("/download", methods=["GET", "HEAD"])
+    def download(request: Request):
+        return DownloadUtil.file_response(request, str(file_path), "崩溃 dump.dmp")
+
+    return TestClient(app)
+
+
+def test_full_and_head(client):
+    response = client.get("/download")
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(DATA))
+    assert response.headers["content-disposition"].startswith("attachment; filename*=utf-8''")
+
+    head = client.head("/download")
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["content-length"] == str(len(DATA))
+    assert head.headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.parametrize(
+    "range_header, start, end",
+    [
+        ("bytes=0-99", 0, 99),
+        ("bytes=1048570-2097160", 1048570, 2097160),
+        ("bytes=3145000-", 3145000, len(DATA) - 1),
+        ("bytes=-10", len(DATA) - 10, len(DATA) - 1),
+        ("bytes=100-99999999", 100, len(DATA) - 1),
+    ],
+)
+def test_range(client, range_header, start, end):
+    response = client.get("/download", headers={"Range": range_header})
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(DATA)}"
+    assert response.content == DATA[start : end + 1]
+
+
+def test_unsatisfiable_and_ignored_range(client):
+    response = client.get("/download", headers={"Range": f"bytes={len(DATA)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(DATA)}"
+
+    # 多个区间或格式不合法时忽略Range返回完整文件
+    for range_header in ("bytes=0-1,5-9", "bytes=9-5", "items=0-1"):
+        response = client.get("/download", headers={"Range": range_header})
+        assert response.status_code == 200
+        assert len(response.content) == len(DATA)
+
+
+def test_conditional_requests(client):
+    headers = client.head("/download").headers
+    etag, last_modified = headers["etag"], headers["last-modified"]
+
+    assert client.get("/download", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/download", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/download", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # If-Range匹配时返回区间，不匹配时返回完整文件
+    for if_range in (etag, last_modified):
+        response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": if_range})
+        assert (response.status_code, response.content) == (206, DATA[:10])
+    for if_range in ('"stale"', "W/" + etag, "Thu, 01 Jan 1970 00:00:00 GMT"):
+        response = client.get("/download", headers={"Range": "bytes=0-9", "If-Range": if_range})
+        assert response.status_code == 200
+
+
+def test_zerocopy_send(tmp_path):
+    file_path = tmp_path / "blob"
+    file_path.write_bytes(DATA)
+    response = RangeFileResponse(str(file_path), 206, {}, "application/octet-stream", 10, 100)
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            os.lseek(message["file"].fileno(), message["offset"], os.SEEK_SET)
+            message = dict(message, body=message["file"].read(message["count"]))
+        messages.append(message)
+
+    scope = {"type": "http", "extensions": {"http.response.zerocopysend": {}}}
+    asyncio.run(response(scope, None, send))
+
+    assert messages[0]["status"] == 206
+    assert messages[1]["body"] == DATA[10:110]
+
+
+def test_generate_file_chunks(tmp_path):
+    file_path = tmp_path / "newlines.bin"
+    file_path.write_bytes(b"\n" * 1000)
+
+    assert [len(chunk) for chunk in UploadUtil.generate_file(str(file_path), 300)] == [300, 300, 300, 100]
+
+
+def test_attachment_file_service(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+
+    async def stream():
+        yield DATA
+
+    attachment = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, stream(), "crash.dmp", len(DATA), "tester")
+    ).result
+    orm_obj = IssueService.get_attachment_file_services(db_session, attachment.attachment_id)
+
+    assert (orm_obj.file_path, orm_obj.file_hash) == (attachment.file_path, attachment.file_hash)
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_file_services(db_session, attachment.attachment_id + 1)
@@ -0,0 +1,169 @@
+"""
+压缩包附件浏览(目录、单个文件下载及在线查看)单元测试
+"""
+
+import asyncio
+import io
+import os
+import random
+import zipfile
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.entity.vo.issue_vo import AttachmentSearchModel
+from module_admin.service.issue_service import IssueService
+from utils.download_util import DownloadUtil
+from utils.storage_util import StorageUtil
+from utils.zip_util import ZipMemberReader, ZipUtil
+
+LINES = [f"2024-01-15 10:{i % 60:02d}:00 [{'ERROR' if i % 997 == 0 else 'INFO'}] driver event id={i}" for i in range(5000)]
+LOG_DATA = "\n".join(LINES).encode()
+BINARY_DATA = random.Random(0).randbytes(2 * 1024 * 1024 + 7)
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="logs.zip"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("logs/", b"")
+        archive.writestr("logs/system.log", LOG_DATA, zipfile.ZIP_DEFLATED)
+        archive.writestr("dump/memory.dmp", BINARY_DATA, zipfile.ZIP_STORED)
+        archive.writestr("dump/memory.dmp.log", BINARY_DATA * 3, zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(db_session, upload_path):
+    app = FastAPI()
+
+    @app.api_route("/attachment/{attachment_id}/members/download", methods=["GET", "HEAD"])
+    def download(request: Request, attachment_id: int, memberName: str):
+        attachment, file_path, member = IssueService.get_archive_member_services(db_session, attachment_id, memberName)
+        return DownloadUtil.member_response(request, file_path, member, etag=attachment.file_hash)
+
+    return TestClient(app)
+
+
+def test_list_members(db_session, upload_path):
+    attachment = _upload(db_session, _archive())
+
+    archive = IssueService.get_archive_members_services(db_session, attachment.attachment_id)
+
+    assert archive.member_count == 4
+    assert archive.total_size == len(LOG_DATA) + len(BINARY_DATA) * 4
+    assert [(member.name, member.compress_type, member.viewable) for member in archive.members] == [
+        ("logs/", "stored", False),
+        ("logs/system.log", "deflated", True),
+        ("dump/memory.dmp", "stored", False),
+        ("dump/memory.dmp.log", "deflated", True),
+    ]
+    assert not archive.truncated
+    cache_path = StorageUtil.get_zip_directory_path(attachment.file_path)
+    assert os.path.exists(cache_path)
+
+    # 目录文件可独立于内存缓存使用
+    ZipUtil._directory_cache.clear()
+    assert ZipUtil.get_directory(StorageUtil.resolve_path(attachment.file_path), cache_path) == ZipUtil.read_directory(
+        attachment.file_path
+    )
+
+    log_attachment = _upload(db_session, LOG_DATA, "driver.log")
+    with pytest.raises(ServiceException):
+        IssueService.get_archive_members_services(db_session, log_attachment.attachment_id)
+    broken = _upload(db_session, b"PK\x03\x04 truncated archive", "broken.zip")
+    with pytest.raises(ServiceException):
+        IssueService.get_archive_members_services(db_session, broken.attachment_id)
+
+
+@pytest.mark.parametrize("member_name, data", [("dump/memory.dmp", BINARY_DATA), ("logs/system.log", LOG_DATA)])
+def test_download_member(db_session, client, member_name, data):
+    attachment = _upload(db_session, _archive())
+    url = f"/attachment/{attachment.attachment_id}/members/download?memberName={member_name}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["content-length"] == str(len(data))
+    assert response.headers["content-disposition"].endswith(os.path.basename(member_name))
+
+    response = client.get(url, headers={"Range": "bytes=100000-100099"})
+    assert response.status_code == 206
+    assert response.content == data[100000:100100]
+    assert response.headers["content-range"] == f"bytes 100000-100099/{len(data)}"
+
+    etag = client.head(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_member_random_read(db_session, upload_path):
+    attachment = _upload(db_session, _archive())
+    file_path = StorageUtil.resolve_path(attachment.file_path)
+    members = ZipUtil.get_directory(file_path, StorageUtil.get_zip_directory_path(attachment.file_path))
+    member = ZipUtil.find_member(members, "dump/memory.dmp.log")
+    data = BINARY_DATA * 3
+
+    rng = random.Random(1)
+    with ZipMemberReader(file_path, member) as reader:
+        for _ in range(20):
+            offset = rng.randrange(len(data))
+            assert reader.read(offset, 65536) == data[offset : offset + 65536]
+        assert reader.read(len(data) - 10, 100) == data[-10:]
+        assert reader.read(len(data), 100) == b""
+
+    for member_name in ("logs/", "missing.log"):
+        with pytest.raises(ServiceException):
+            IssueService.get_archive_member_services(db_session, attachment.attachment_id, member_name)
+
+
+def test_view_member_lines(db_session, upload_path):
+    attachment = _upload(db_session, _archive())
+
+    page = IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 2049, 20, "logs/system.log")
+    assert page.member_name == "logs/system.log"
+    assert page.lines == LINES[2048:2068]
+    assert page.total_lines == 5000
+    assert os.path.exists(StorageUtil.get_line_index_path(attachment.file_path, "logs/system.log"))
+
+    result = IssueService.search_attachment_services(
+        db_session,
+        attachment.attachment_id,
+        AttachmentSearchModel(pattern=r"\[ERROR\]", memberName="logs/system.log", maxResults=2),
+    )
+    assert [match.line_number for match in result.matches] == [1, 998]
+
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 1, 20, "dump/memory.dmp")
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 1, 20)
+
+
+def test_delete_removes_sidecars(db_session, upload_path):
+    attachment = _upload(db_session, _archive())
+    IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 1, 20, "logs/system.log")
+    assert len(StorageUtil.get_sidecar_paths(attachment.file_path)) == 2
+
+    assert IssueService.delete_attachment_services(db_session, attachment.attachment_id).is_success
+
+    assert not os.path.exists(attachment.file_path)
+    assert StorageUtil.get_sidecar_paths(attachment.file_path) == []
@@ -0,0 +1,121 @@
+"""
+Issue附件内容寻址存储单元测试
+"""
+
+import asyncio
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from config.env import UploadConfig
+from module_admin.entity.do.issue_do import IssueAttachment, IssueAttachmentBlob
+from module_admin.entity.vo.issue_vo import UploadByHashModel
+from module_admin.service.issue_service import IssueService
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="driver.log"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _blob_files(upload_path):
+    return sorted(
+        name
+        for root, _, names in os.walk(upload_path / "blob")
+        for name in names
+        if os.path.basename(root) != "tmp"
+    )
+
+
+def _ref_count(db_session, file_hash):
+    return db_session.execute(
+        select(IssueAttachmentBlob.ref_count).where(IssueAttachmentBlob.file_hash == file_hash)
+    ).scalar()
+
+
+def test_identical_uploads_share_one_blob(db_session, upload_path):
+    data = b"driver crash log" * 1000
+    file_hash = hashlib.sha256(data).hexdigest()
+
+    first = _upload(db_session, data, "a.log")
+    second = _upload(db_session, data, "b.log")
+    other = _upload(db_session, b"another file")
+
+    assert first.file_path == second.file_path != other.file_path
+    assert first.attachment_id != second.attachment_id
+    assert _blob_files(upload_path) == sorted([file_hash, other.file_hash])
+    assert _ref_count(db_session, file_hash) == 2
+    assert os.listdir(upload_path / "blob" / "tmp") == []
+
+    assert IssueService.delete_attachment_services(db_session, first.attachment_id).is_success
+    assert _ref_count(db_session, file_hash) == 1
+    with open(second.file_path, "rb") as f:
+        assert f.read() == data
+
+    assert IssueService.delete_attachment_services(db_session, second.attachment_id).is_success
+    assert _ref_count(db_session, file_hash) is None
+    assert _blob_files(upload_path) == [other.file_hash]
+
+
+def test_upload_by_hash(db_session, upload_path):
+    data = b"MDMP" + os.urandom(4096)
+    file_hash = hashlib.sha256(data).hexdigest()
+
+    def by_hash(file_size=len(data), digest=file_hash, file_name="crash.dmp"):
+        return IssueService.upload_attachment_by_hash_services(
+            db_session, UploadByHashModel(fileName=file_name, fileSize=file_size, fileHash=digest), "tester"
+        )
+
+    result = by_hash()
+    assert result.is_success and not result.result.hit
+
+    _upload(db_session, data, "crash.dmp")
+    result = by_hash()
+    assert result.is_success and result.result.hit
+    assert result.result.attachment.file_hash == file_hash
+    assert _ref_count(db_session, file_hash) == 2
+    assert db_session.execute(select(IssueAttachment)).scalars().all()[-1].status == "temporary"
+
+    # 大小不一致、摘要或文件类型不合法时不命中
+    assert not by_hash(file_size=len(data) + 1).result.hit
+    assert not by_hash(digest="../" + "a" * 61).is_success
+    assert not by_hash(file_name="tool.exe").is_success
+    assert _ref_count(db_session, file_hash) == 2
+
+
+def test_clean_temporary_releases_blobs(db_session, upload_path):
+    data = b"shared dump"
+    kept = _upload(db_session, data)
+    expired = _upload(db_session, data)
+    db_session.execute(
+        update(IssueAttachment)
+        .where(IssueAttachment.attachment_id == expired.attachment_id)
+        .values(upload_time=datetime.now() - timedelta(hours=25))
+    )
+    db_session.commit()
+
+    assert IssueService.clean_temporary_attachments_services(db_session, 24).is_success
+    assert _ref_count(db_session, kept.file_hash) == 1
+    assert os.path.exists(kept.file_path)
+
+    db_session.execute(update(IssueAttachment).values(upload_time=datetime.now() - timedelta(hours=25)))
+    db_session.commit()
+    assert IssueService.clean_temporary_attachments_services(db_session, 24).is_success
+    assert _ref_count(db_session, kept.file_hash) is None
+    assert _blob_files(upload_path) == []
@@ -0,0 +1,160 @@
+"""
+Issue附件流式打包下载单元测试
+"""
+
+import asyncio
+import io
+import os
+import tracemalloc
+import zipfile
+
+import pytest
+
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.zip_stream_util import ZipStreamEntry, ZipStreamUtil
+
+LOG_DATA = b"".join(f"2024-01-15 10:00:{i % 60:02d} [INFO] driver event id={i}\n".encode() for i in range(20000))
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _add_issue(db_session, title, attachments):
+    result = IssueService.add_issue_services(
+        db_session,
+        AddIssueModel(
+            title=title,
+            priority="low",
+            issueType="BUG",
+            attachmentIds=[attachment.attachment_id for attachment in attachments],
+        ),
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _zip(members: dict):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_bundle_issue_attachments(db_session, upload_path):
+    archive_data = _zip({"logs/system.log": LOG_DATA})
+    log = _upload(db_session, LOG_DATA, "driver.log")
+    archive = _upload(db_session, archive_data, "logs.zip")
+    duplicate = _upload(db_session, LOG_DATA[:1000], "DRIVER.log")
+    nested = _upload(db_session, b"dump", "..\\dumps/crash.dmp")
+    issue_id = _add_issue(db_session, "打包下载", [log, archive, duplicate, nested])
+    # 已压缩存储的附件解压后打包
+    assert IssueService.compress_blob_services(db_session, log.file_hash).result > 0
+
+    file_name, entries = IssueService.get_attachment_bundle_services(db_session, issue_id)
+    data = b"".join(ZipStreamUtil.iter_zip(entries))
+
+    assert file_name.endswith("_attachments.zip")
+    with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+        assert bundle.testzip() is None
+        assert [(info.filename, info.compress_type) for info in bundle.infolist()] == [
+            ("driver.log", zipfile.ZIP_DEFLATED),
+            ("logs.zip", zipfile.ZIP_STORED),
+            ("DRIVER (1).log", zipfile.ZIP_DEFLATED),
+            ("crash.dmp", zipfile.ZIP_DEFLATED),
+        ]
+        assert bundle.read("driver.log") == LOG_DATA
+        assert bundle.read("logs.zip") == archive_data
+        assert bundle.read("DRIVER (1).log") == LOG_DATA[:1000]
+        assert bundle.getinfo("driver.log").compress_size < len(LOG_DATA) // 4
+
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_bundle_services(db_session, issue_id + 1)
+    empty_issue_id = _add_issue(db_session, "没有附件", [])
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_bundle_services(db_session, empty_issue_id)
+
+
+def test_stream_constant_memory():
+    chunk = bytes(range(256)) * 4096
+    chunk_count = 256
+
+    def open_chunks():
+        for _ in range(chunk_count):
+            yield chunk
+
+    entries = [
+        ZipStreamEntry("stored.bin", len(chunk) * chunk_count, None, False, open_chunks),
+        ZipStreamEntry("deflated.bin", None, None, True, open_chunks),
+    ]
+    total = 0
+    tracemalloc.start()
+    try:
+        for data in ZipStreamUtil.iter_zip(entries):
+            total += len(data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # 共打包512MB数据，内存峰值只与读取块大小有关
+    assert total > len(chunk) * chunk_count
+    assert peak < 8 * 1024 * 1024
+
+
+def test_stream_zip64_entry():
+    entries = [ZipStreamEntry("unknown_size.log", None, None, True, lambda: iter([LOG_DATA]))]
+
+    data = b"".join(ZipStreamUtil.iter_zip(entries))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+        assert bundle.read("unknown_size.log") == LOG_DATA
+    # 大小未知时本地文件头带ZIP64扩展字段，数据描述符使用8字节大小
+    assert b"\x01\x00\x10\x00" in data[:100]
+
+
+def test_bundle_sources_opened_before_streaming(db_session, upload_path):
+    log = _upload(db_session, LOG_DATA, "driver.log")
+    notes = _upload(db_session, LOG_DATA[:5000], "notes.txt")
+    issue_id = _add_issue(db_session, "打包期间清理", [log, notes])
+
+    _, entries = IssueService.get_attachment_bundle_services(db_session, issue_id)
+    # 开始发送前附件被压缩替换、被清理
+    assert IssueService.compress_blob_services(db_session, log.file_hash).result > 0
+    os.remove(notes.file_path)
+    data = b"".join(ZipStreamUtil.iter_zip(entries))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+        assert bundle.read("driver.log") == LOG_DATA
+        assert bundle.read("notes.txt") == LOG_DATA[:5000]
+
+
+def test_stream_size_mismatch_fails():
+    closed = []
+    entries = [
+        ZipStreamEntry("first.log", 4, None, True, lambda: iter([b"full"]), lambda: closed.append("first")),
+        ZipStreamEntry("truncated.log", 10, None, True, lambda: iter([b"short"]), lambda: closed.append("truncated")),
+    ]
+
+    with pytest.raises(ValueError):
+        b"".join(ZipStreamUtil.iter_zip(entries))
+    # 出错时关闭全部文件
+    assert closed == ["first", "truncated"]
@@ -0,0 +1,142 @@
+"""
+Issue附件压缩存储单元测试
+"""
+
+import asyncio
+import io
+import os
+
+import pytest
+import zstandard
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from config.constant import AttachmentConstant
+from config.env import UploadConfig
+from module_admin.entity.do.issue_do import IssueAttachment, IssueAttachmentBlob
+from module_admin.service.issue_service import IssueService
+from utils.compress_util import CompressUtil
+from utils.download_util import DownloadUtil
+from utils.storage_util import StorageUtil
+
+LOG_DATA = b"".join(f"2024-01-15 10:00:{i % 60:02d} [INFO] driver event id={i}\n".encode() for i in range(20000))
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    monkeypatch.setattr(AttachmentConstant, "COMPRESS_FRAME_SIZE", 64 * 1024)
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="driver.log"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def test_seekable_format(tmp_path):
+    src_path, dst_path = tmp_path / "driver.log", tmp_path / "driver.log.zst"
+    src_path.write_bytes(LOG_DATA)
+
+    compressed_size = CompressUtil.compress_file(str(src_path), str(dst_path), 10000, 3)
+
+    assert compressed_size == os.path.getsize(dst_path) < len(LOG_DATA) // 5
+    seek_table = CompressUtil.read_seek_table(str(dst_path))
+    assert len(seek_table) == -(-len(LOG_DATA) // 10000)
+    assert CompressUtil.get_content_size(str(dst_path)) == len(LOG_DATA)
+    # 标准zstd解码器可直接解压整个文件(跳过帧索引)
+    with open(dst_path, "rb") as f:
+        assert zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read() == LOG_DATA
+    for offset, length in ((0, 10), (9995, 10), (123456, 50000), (len(LOG_DATA) - 7, 100)):
+        assert CompressUtil.read_range(str(dst_path), offset, length) == LOG_DATA[offset : offset + length]
+    with pytest.raises(ValueError):
+        CompressUtil.read_seek_table(str(src_path))
+
+
+def test_compress_blob_and_share(db_session, upload_path):
+    first = _upload(db_session, LOG_DATA)
+
+    result = IssueService.compress_blob_services(db_session, first.file_hash)
+
+    assert result.is_success, result.message
+    blob = db_session.execute(select(IssueAttachmentBlob)).scalars().one()
+    assert blob.compression == "zstd"
+    assert blob.compressed_size == os.path.getsize(first.file_path + StorageUtil.COMPRESSED_SUFFIX)
+    assert result.result == len(LOG_DATA) - blob.compressed_size
+    assert not os.path.exists(first.file_path)
+    assert db_session.execute(select(IssueAttachment.compressed_size)).scalar() == blob.compressed_size
+    # 再次压缩不做处理
+    assert IssueService.compress_blob_services(db_session, first.file_hash).result == 0
+
+    # 相同内容再次上传时引用已压缩的文件
+    second = _upload(db_session, LOG_DATA, "copy.log")
+    assert second.compressed_size == blob.compressed_size
+    assert not os.path.exists(second.file_path)
+    assert IssueService.get_attachment_file_services(db_session, second.attachment_id)
+
+    statistics = IssueService.get_attachment_storage_statistics_services(db_session)
+    assert (statistics.blob_count, statistics.compressed_count, statistics.pending_count) == (1, 1, 0)
+    assert statistics.saved_size == len(LOG_DATA) - blob.compressed_size
+    assert statistics.compression_ratio > 5
+
+    assert IssueService.delete_attachment_services(db_session, first.attachment_id).is_success
+    assert IssueService.delete_attachment_services(db_session, second.attachment_id).is_success
+    assert StorageUtil.resolve_path(first.file_path) is None
+
+
+def test_incompressible_and_pending(db_session, upload_path):
+    dump = _upload(db_session, os.urandom(200 * 1024), "crash.dmp")
+    _upload(db_session, LOG_DATA[:1000] * 50, "screen.png")
+
+    assert IssueService.get_compress_candidates_services(db_session) == [dump.file_hash]
+    assert IssueService.get_attachment_storage_statistics_services(db_session).pending_count == 1
+
+    result = IssueService.compress_blob_services(db_session, dump.file_hash)
+
+    assert result.is_success and result.result == 0
+    assert os.path.exists(dump.file_path)
+    assert not os.path.exists(dump.file_path + StorageUtil.COMPRESSED_SUFFIX)
+    assert IssueService.get_compress_candidates_services(db_session) == []
+    assert os.listdir(upload_path / "blob" / "tmp") == []
+
+
+def test_download_compressed(tmp_path):
+    src_path, file_path = tmp_path / "driver.log", tmp_path / "driver.log.zst"
+    src_path.write_bytes(LOG_DATA)
+    CompressUtil.compress_file(str(src_path), str(file_path), 64 * 1024, 3)
+    app = FastAPI()
+
+    @app.api_route("/download", methods=["GET", "HEAD"])
+    def download(request: Request):
+        return DownloadUtil.file_response(request, str(file_path), "driver.log", etag="abc", compressed=True)
+
+    client = TestClient(app)
+
+    response = client.get("/download", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.content == LOG_DATA
+    assert response.headers["content-length"] == str(len(LOG_DATA))
+    assert response.headers["etag"] == '"abc"'
+
+    response = client.get("/download", headers={"Accept-Encoding": "gzip", "Range": "bytes=100000-300000"})
+    assert response.status_code == 206
+    assert response.content == LOG_DATA[100000:300001]
+
+    # 客户端支持zstd时原样发送压缩文件
+    with client.stream("GET", "/download", headers={"Accept-Encoding": "zstd, gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "zstd"
+    assert response.headers["etag"] == '"abc-zstd"'
+    assert raw == file_path.read_bytes()
+    assert zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw), read_across_frames=True).read() == LOG_DATA
+
+    response = client.get("/download", headers={"Accept-Encoding": "zstd;q=0", "If-None-Match": '"abc"'})
+    assert response.status_code == 304
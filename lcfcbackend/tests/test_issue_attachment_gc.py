@@ -0,0 +1,142 @@
+"""
+临时附件分批清理及孤儿文件扫描单元测试
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from config.constant import AttachmentConstant, AttachmentGcConstant
+from config.env import UploadConfig
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueAttachment, IssueAttachmentBlob
+from module_admin.service.issue_service import IssueService
+from utils.storage_util import StorageUtil
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+@pytest.fixture
+def no_grace(monkeypatch):
+    monkeypatch.setattr(AttachmentGcConstant, "ORPHAN_GRACE_HOURS", -1)
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="driver.log"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _expire(db_session, attachment_ids):
+    db_session.execute(
+        update(IssueAttachment)
+        .where(IssueAttachment.attachment_id.in_(attachment_ids))
+        .values(upload_time=datetime.now() - timedelta(hours=25))
+    )
+    db_session.commit()
+
+
+def _attachment_ids(db_session):
+    return db_session.execute(select(IssueAttachment.attachment_id)).scalars().all()
+
+
+def test_sweep_in_batches(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(AttachmentGcConstant, "BATCH_SIZE", 3)
+    expired = [_upload(db_session, f"expired {index}".encode() * 100) for index in range(7)]
+    shared = _upload(db_session, b"expired 0" * 100)
+    kept = _upload(db_session, b"kept")
+    _expire(db_session, [attachment.attachment_id for attachment in expired])
+
+    result = IssueService.clean_temporary_attachments_services(db_session, 24, scan_orphans=False)
+
+    assert result.is_success, result.message
+    metrics = result.result
+    assert (metrics.attachment_count, metrics.batch_count, metrics.released_blob_count) == (7, 3, 6)
+    assert metrics.deleted_file_count == 6
+    assert metrics.freed_size == sum(len(f"expired {index}".encode() * 100) for index in range(1, 7))
+    assert sorted(_attachment_ids(db_session)) == [shared.attachment_id, kept.attachment_id]
+    # 仍被引用的存储文件保留
+    assert os.path.exists(shared.file_path)
+    assert not os.path.exists(expired[1].file_path)
+
+
+def test_resume_marked_and_linked(db_session, upload_path):
+    marked = _upload(db_session, b"marked before crash")
+    linked = _upload(db_session, b"linked in time")
+    # 上次任务标记为删除中后中断
+    db_session.execute(
+        update(IssueAttachment).where(IssueAttachment.attachment_id == marked.attachment_id).values(status="deleting")
+    )
+    db_session.commit()
+    # 删除中的附件不能再关联到Issue
+    IssueDao.link_attachments_to_issue(db_session, 1, [marked.attachment_id, linked.attachment_id])
+    db_session.commit()
+
+    result = IssueService.clean_temporary_attachments_services(db_session, 24, scan_orphans=False)
+
+    assert result.result.attachment_count == 1
+    assert _attachment_ids(db_session) == [linked.attachment_id]
+    assert not os.path.exists(marked.file_path)
+    assert os.path.exists(linked.file_path)
+
+
+def test_orphan_scan(db_session, upload_path, no_grace):
+    live = _upload(db_session, b"live attachment")
+    missing = _upload(db_session, b"file lost on disk")
+    interrupted = _upload(db_session, b"rename before failed commit")
+    os.remove(missing.file_path)
+    # 提交前中断的删除：存储文件已重命名但记录仍存在
+    os.replace(interrupted.file_path, interrupted.file_path + StorageUtil.DELETING_SUFFIX)
+    orphan_hash = "f" * 64
+    orphan_path = StorageUtil.get_blob_path(orphan_hash)
+    os.makedirs(os.path.dirname(orphan_path))
+    for path in (orphan_path, orphan_path + StorageUtil.LINE_INDEX_SUFFIX, live.file_path + ".1234.part"):
+        with open(path, "wb") as f:
+            f.write(b"orphan")
+    temp_path = StorageUtil.get_temp_path()
+    open(temp_path, "wb").close()
+    session_dir = upload_path / AttachmentConstant.SESSION_PATH
+    session_dir.mkdir()
+    (session_dir / "0123456789abcdef.part").write_bytes(b"x" * 10)
+
+    result = IssueService.clean_temporary_attachments_services(db_session, 24)
+
+    metrics = result.result
+    assert result.is_success, result.message
+    assert (metrics.orphan_file_count, metrics.orphan_size) == (5, 28)
+    assert (metrics.restored_file_count, metrics.missing_blob_count) == (1, 1)
+    assert os.path.exists(live.file_path)
+    assert os.path.exists(interrupted.file_path)
+    assert not os.path.exists(orphan_path)
+    assert not os.path.exists(temp_path)
+    assert os.listdir(session_dir) == []
+    assert db_session.execute(select(IssueAttachmentBlob.file_hash)).scalars().all()
+
+
+def test_orphan_scan_grace_period(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(AttachmentGcConstant, "ORPHAN_BATCH_SIZE", 1)
+    attachments = [_upload(db_session, f"attachment {index}".encode()) for index in range(3)]
+    orphan_path = StorageUtil.get_blob_path("0" * 64)
+    os.makedirs(os.path.dirname(orphan_path))
+    open(orphan_path, "wb").close()
+
+    metrics = IssueService.clean_temporary_attachments_services(db_session, 24).result
+
+    # 刚写入的文件可能属于未提交的上传，保留期内不删除
+    assert os.path.exists(orphan_path)
+    assert metrics.scanned_file_count == 4
+    assert (metrics.orphan_file_count, metrics.missing_blob_count) == (0, 0)
+    assert all(os.path.exists(attachment.file_path) for attachment in attachments)
@@ -0,0 +1,218 @@
+"""
+跨附件trigram索引及搜索单元测试
+"""
+
+import asyncio
+import io
+import os
+import zipfile
+
+import pytest
+
+from config.constant import AttachmentIndexConstant
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.vo.issue_vo import AddIssueModel, AttachmentGrepModel, EditIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.transaction_util import TransactionUtil
+from utils.trigram_util import TrigramIndex, TrigramUtil
+
+
+def _log(signature: str, lines: int = 3000):
+    return "".join(
+        f"2024-01-15 10:00:{i % 60:02d} [INFO] driver event id={i}\n" if i != lines // 2 else f"[ERROR] {signature}\n"
+        for i in range(lines)
+    ).encode()
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="driver.log"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _add_issue(db_session, title, attachments):
+    result = IssueService.add_issue_services(
+        db_session,
+        AddIssueModel(
+            title=title,
+            priority="low",
+            issueType="BUG",
+            attachmentIds=[attachment.attachment_id for attachment in attachments],
+        ),
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _zip(members: dict):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _grep(db_session, pattern, **kwargs):
+    return IssueService.grep_attachments_services(db_session, AttachmentGrepModel(pattern=pattern, **kwargs))
+
+
+def test_regex_required_trigrams():
+    def trigram_texts(pattern):
+        return {bytes([t >> 16, (t >> 8) & 0xFF, t & 0xFF]) for t in TrigramUtil.regex_trigrams(pattern)}
+
+    assert trigram_texts(rb"^Kernel.*\d+ ms") == {b"ker", b"ern", b"rne", b"nel", b" ms"}
+    assert trigram_texts(rb"(?:timeout|reset)ed") == set()
+    assert trigram_texts(rb"(nvlddmkm)+\.sys") == {b"nvl", b"vld", b"ldd", b"ddm", b"dmk", b"mkm", b".sy", b"sys"}
+    assert trigram_texts(rb"abc(?!def)") == {b"abc"}
+    assert trigram_texts(rb"x?abc") == {b"abc"}
+
+
+def test_index_segments_merge(tmp_path):
+    index = TrigramIndex(str(tmp_path / "index"))
+    docs = [
+        (doc_id, TrigramUtil.extract([f"doc{doc_id} {'needle' if doc_id % 3 == 0 else 'hay'}".encode()]))
+        for doc_id in range(1, 31)
+    ]
+    for start in range(0, 30, 10):
+        index.add_documents(docs[start : start + 10])
+    needle = TrigramUtil.literal_trigrams(b"NEEDLE")
+    assert index.lookup(needle) == set(range(3, 31, 3))
+
+    assert index.merge(1, 10**9, live_doc_ids=set(range(1, 21))) == 3
+    assert index.get_size()[:2] == (1, 20)
+    assert index.lookup(needle) == {3, 6, 9, 12, 15, 18}
+    assert len(os.listdir(tmp_path / "index")) == 2
+
+
+def test_grep_across_attachments(db_session, upload_path):
+    first = _upload(db_session, _log("nvlddmkm.sys TDR timeout 0x116"))
+    archive = _upload(
+        db_session,
+        _zip({"logs/system.log": _log("NVLDDMKM.SYS TDR timeout 0x117"), "readme.md": b"nvlddmkm.sys"}),
+        "logs.zip",
+    )
+    other = _upload(db_session, _log("usb reset"), "usb.txt")
+    shared = _upload(db_session, _log("nvlddmkm.sys TDR timeout 0x116"), "copy.log")
+    temporary = _upload(db_session, _log("nvlddmkm.sys TDR timeout 0x118"), "temporary.log")
+    first_issue = _add_issue(db_session, "显卡驱动超时", [first, other])
+    second_issue = _add_issue(db_session, "显卡驱动日志压缩包", [archive, shared])
+
+    result = IssueService.index_attachments_services(db_session)
+
+    assert result.is_success, result.message
+    # 相同内容的附件共用索引文档，临时附件不建立索引
+    assert result.result == 3
+    assert IssueService.index_attachments_services(db_session).result == 0
+    assert os.path.isdir(upload_path / AttachmentIndexConstant.INDEX_PATH)
+
+    grep_result = _grep(db_session, "nvlddmkm.sys TDR", ignoreCase=True)
+    assert grep_result.issue_ids == [second_issue, first_issue]
+    assert [(match.attachment_id, match.member_name) for match in grep_result.matches] == [
+        (archive.attachment_id, "logs/system.log"),
+        (shared.attachment_id, None),
+        (first.attachment_id, None),
+    ]
+    data = _log("nvlddmkm.sys TDR timeout 0x116")
+    assert grep_result.matches[2].offsets == [data.index(b"nvlddmkm")]
+    assert grep_result.scanned_count == 2
+    assert temporary.attachment_id not in [match.attachment_id for match in grep_result.matches]
+
+    # 大小写敏感时由扫描校验排除
+    assert [match.attachment_id for match in _grep(db_session, "NVLDDMKM.SYS").matches] == [archive.attachment_id]
+    grep_result = _grep(db_session, r"timeout 0x11[67]$", regex=True)
+    assert {match.attachment_id for match in grep_result.matches} == {
+        archive.attachment_id,
+        shared.attachment_id,
+        first.attachment_id,
+    }
+    grep_result = _grep(db_session, r"driver event id=\d+", regex=True, maxMatches=1, maxOffsets=5)
+    assert grep_result.truncated
+    assert len(grep_result.matches) == 1 and grep_result.matches[0].more_offsets
+    assert len(grep_result.matches[0].offsets) == 5
+    assert _grep(db_session, "not present anywhere").matches == []
+
+    with pytest.raises(ServiceException):
+        _grep(db_session, "ab")
+    with pytest.raises(ServiceException):
+        _grep(db_session, r"(timeout|reset)", regex=True)
+    with pytest.raises(ServiceException):
+        _grep(db_session, "(unclosed", regex=True)
+
+
+def test_grep_compressed_and_deleted(db_session, upload_path):
+    attachment = _upload(db_session, _log("ACPI BIOS ERROR 0xA5"))
+    broken = _upload(db_session, b"PK\x03\x04 truncated archive", "broken.zip")
+    issue_id = _add_issue(db_session, "ACPI", [attachment, broken])
+    assert IssueService.compress_blob_services(db_session, attachment.file_hash).result > 0
+
+    assert IssueService.index_attachments_services(db_session).result == 1
+    grep_result = _grep(db_session, "ACPI BIOS ERROR")
+    assert grep_result.issue_ids == [issue_id]
+    assert grep_result.matches[0].offsets == [_log("ACPI BIOS ERROR 0xA5").index(b"ACPI")]
+
+    assert IssueService.delete_attachment_services(db_session, attachment.attachment_id).is_success
+    assert _grep(db_session, "ACPI BIOS ERROR").matches == []
+    # 被删除附件的索引文档在下次任务中清理，合并索引段时丢弃其倒排项
+    IssueService.index_attachments_services(db_session)
+    # 只剩损坏压缩包的空文档
+    assert len(IssueDao.get_index_doc_ids(db_session)) == 1
+
+
+def test_linking_attachments_triggers_index_after_commit(db_session, upload_path, monkeypatch):
+    triggered = []
+    monkeypatch.setattr(IssueService, "attachment_index_trigger", lambda: triggered.append(True))
+    first = _upload(db_session, _log("first"), "first.log")
+    second = _upload(db_session, _log("second"), "second.log")
+    issue_id = _add_issue(db_session, "索引触发", [first])
+    assert triggered == [True]
+
+    # 编辑Issue关联附件与新增Issue一样触发索引，编辑失败时不触发
+    result = IssueService.edit_issue_services(
+        db_session, EditIssueModel(issueId=issue_id, attachmentIds=[second.attachment_id])
+    )
+    assert result.is_success, result.message
+    assert triggered == [True, True]
+    assert IssueService.index_attachments_services(db_session).result == 2
+    result = IssueService.edit_issue_services(
+        db_session, EditIssueModel(issueId=issue_id, title="", attachmentIds=[second.attachment_id])
+    )
+    assert not result.is_success
+    assert triggered == [True, True]
+    assert {attachment.attachment_id for attachment in IssueDao.get_issue_attachments(db_session, issue_id)} == {
+        first.attachment_id,
+        second.attachment_id,
+    }
+
+
+def test_after_commit_callbacks(db_session):
+    calls = []
+    TransactionUtil.after_commit(db_session, lambda: calls.append("outer"))
+    savepoint = db_session.begin_nested()
+    TransactionUtil.after_commit(db_session, lambda: calls.append("released"), key="same")
+    TransactionUtil.after_commit(db_session, lambda: calls.append("duplicate"), key="same")
+    savepoint.commit()
+    assert calls == []
+    savepoint = db_session.begin_nested()
+    TransactionUtil.after_commit(db_session, lambda: calls.append("rolled back"))
+    savepoint.rollback()
+    db_session.commit()
+    assert calls == ["outer", "released"]
+
+    TransactionUtil.after_commit(db_session, lambda: calls.append("discarded"))
+    db_session.rollback()
+    db_session.commit()
+    assert calls == ["outer", "released"]
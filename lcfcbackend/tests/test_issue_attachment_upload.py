@@ -0,0 +1,81 @@
+"""
+Issue附件流式上传单元测试
+"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from sqlalchemy import select
+
+from config.constant import AttachmentConstant
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.entity.do.issue_do import IssueAttachment
+from module_admin.service.issue_service import IssueService
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path))
+    return tmp_path
+
+
+async def _stream(data: bytes, chunk_size: int = 64 * 1024):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset : offset + chunk_size]
+
+
+def _upload(db_session, data: bytes, file_name: str, content_length=None):
+    return asyncio.run(
+        IssueService.upload_attachment_stream_services(
+            db_session, _stream(data), file_name, content_length, "tester"
+        )
+    )
+
+
+def _files(upload_path):
+    return [os.path.join(root, name) for root, _, names in os.walk(upload_path) for name in names]
+
+
+def test_stream_upload_writes_once_and_hashes(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(AttachmentConstant, "STREAM_WRITE_SIZE", 100 * 1024)
+    data = os.urandom(1024 * 1024 + 123)
+
+    result = _upload(db_session, data, "crash.dmp", len(data))
+
+    assert result.is_success, result.message
+    attachment = result.result
+    assert attachment.attachment_id is not None
+    assert (attachment.file_size, attachment.file_hash) == (len(data), hashlib.sha256(data).hexdigest())
+    assert _files(upload_path) == [attachment.file_path]
+    with open(attachment.file_path, "rb") as f:
+        assert f.read() == data
+    row = db_session.execute(select(IssueAttachment)).scalars().one()
+    assert (row.attachment_id, row.file_hash, row.status) == (
+        attachment.attachment_id,
+        attachment.file_hash,
+        "temporary",
+    )
+
+
+def test_stream_upload_enforces_size_limit(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(AttachmentConstant, "MAX_SIZE", 1000)
+
+    with pytest.raises(ServiceException):
+        _upload(db_session, b"x" * 10, "big.dmp", 1001)
+    # 未声明长度时在接收过程中超限
+    with pytest.raises(ServiceException):
+        _upload(db_session, b"x" * 1001, "big.dmp")
+
+    assert _files(upload_path) == []
+    assert db_session.execute(select(IssueAttachment)).first() is None
+
+    assert _upload(db_session, b"x" * 1000, "exact.log").is_success
+
+
+def test_stream_upload_rejects_file_type(db_session, upload_path):
+    with pytest.raises(ServiceException):
+        _upload(db_session, b"MZ", "tool.exe")
+    assert _files(upload_path) == []
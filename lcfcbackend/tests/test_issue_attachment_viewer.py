@@ -0,0 +1,127 @@
+"""
+文本附件在线查看(分页读取及搜索)单元测试
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from config.constant import LogViewConstant
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.entity.vo.issue_vo import AttachmentSearchModel
+from module_admin.service.issue_service import IssueService
+from utils.log_view_util import LogViewUtil
+from utils.storage_util import StorageUtil
+
+LINES = [f"2024-01-15 10:{i % 60:02d}:00 [{'ERROR' if i % 997 == 0 else 'INFO'}] driver event id={i}" for i in range(5000)]
+LOG_DATA = "\r\n".join(LINES).encode()
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name="driver.log"):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _search(db_session, attachment_id, **kwargs):
+    return IssueService.search_attachment_services(db_session, attachment_id, AttachmentSearchModel(**kwargs))
+
+
+def test_read_lines(db_session, upload_path):
+    attachment = _upload(db_session, LOG_DATA)
+
+    page = IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 1, 100)
+    assert (page.total_lines, page.next_line) == (5000, 101)
+    assert page.lines == LINES[:100]
+
+    for start_line in (1024, 1025, 2049, 4990):
+        page = IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, start_line, 20)
+        assert page.lines == LINES[start_line - 1 : start_line + 19]
+    assert page.next_line is None
+    assert IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 6000, 20).lines == []
+    assert os.path.exists(StorageUtil.get_line_index_path(attachment.file_path))
+
+
+def test_search_with_context(db_session, upload_path):
+    attachment = _upload(db_session, LOG_DATA)
+    error_lines = [i for i in range(5000) if i % 997 == 0]
+
+    result = _search(db_session, attachment.attachment_id, pattern=r"\[error\]", ignoreCase=True, contextLines=2, maxResults=3)
+
+    assert [match.line_number for match in result.matches] == [i + 1 for i in error_lines[:3]]
+    assert result.matches[0].before == []
+    assert result.matches[1].before == LINES[995:997]
+    assert result.matches[1].after == LINES[998:1000]
+    assert result.next_line == error_lines[2] + 2
+
+    # 从nextLine继续搜索
+    result = _search(db_session, attachment.attachment_id, pattern=r"\[ERROR\]", startLine=result.next_line)
+    assert [match.line_number for match in result.matches] == [i + 1 for i in error_lines[3:]]
+    assert result.next_line is None
+
+    assert _search(db_session, attachment.attachment_id, pattern=r"\[error\]").matches == []
+    with pytest.raises(ServiceException):
+        _search(db_session, attachment.attachment_id, pattern="(unclosed")
+
+
+def test_search_scan_limit(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(LogViewConstant, "SCAN_SIZE", 16 * 1024)
+    monkeypatch.setattr(LogViewConstant, "MAX_SEARCH_BYTES", 64 * 1024)
+    attachment = _upload(db_session, LOG_DATA)
+    error_lines = [i + 1 for i in range(5000) if i % 997 == 0]
+
+    # 每次最多扫描MAX_SEARCH_BYTES，从nextLine继续搜索可找到全部匹配行
+    found = []
+    start_line, requests = 1, 0
+    while start_line is not None:
+        result = _search(db_session, attachment.attachment_id, pattern=r"\[ERROR\]", startLine=start_line)
+        found.extend(match.line_number for match in result.matches)
+        assert result.truncated == (result.next_line is not None)
+        start_line, requests = result.next_line, requests + 1
+    assert found == error_lines
+    assert requests > 1
+
+    # 超时后至少扫描一个块，保证继续搜索时有进展
+    monkeypatch.setattr(LogViewConstant, "MAX_SEARCH_SECONDS", 0)
+    result = _search(db_session, attachment.attachment_id, pattern=r"\[ERROR\]")
+    assert result.truncated and [match.line_number for match in result.matches] == [1]
+    assert 1 < result.next_line < 5000
+
+
+def test_compressed_attachment_reuses_index(db_session, upload_path, monkeypatch):
+    attachment = _upload(db_session, LOG_DATA)
+    expected = IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 3000, 50)
+    assert IssueService.compress_blob_services(db_session, attachment.file_hash).result > 0
+    assert not os.path.exists(attachment.file_path)
+
+    # 索引按原始数据偏移记录，压缩后直接复用持久化的索引
+    LogViewUtil._index_cache.clear()
+    monkeypatch.setattr(LogViewUtil, "build_line_index", classmethod(lambda cls, reader, interval=0: pytest.fail()))
+    page = IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 3000, 50)
+    assert page == expected
+    result = _search(db_session, attachment.attachment_id, pattern="id=4999$", contextLines=1)
+    assert [(match.line_number, match.before) for match in result.matches] == [(5000, [LINES[4998]])]
+
+    assert IssueService.delete_attachment_services(db_session, attachment.attachment_id).is_success
+    assert os.listdir(os.path.dirname(attachment.file_path)) == []
+
+
+def test_non_text_attachment(db_session, upload_path):
+    attachment = _upload(db_session, b"MDMP" + os.urandom(100), "crash.dmp")
+
+    with pytest.raises(ServiceException):
+        IssueService.get_attachment_lines_services(db_session, attachment.attachment_id, 1, 10)
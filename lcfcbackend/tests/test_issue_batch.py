@@ -0,0 +1,155 @@
+"""
+Issue批量操作单元测试
+"""
+
+import io
+import json
+from contextlib import contextmanager
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.vo.issue_vo import (
+    AddIssueModel,
+    BatchIssueModel,
+    DeleteIssueModel,
+    IssueBatchFilterModel,
+    IssuePageQueryModel,
+)
+from module_admin.service.issue_service import IssueService
+
+
+@contextmanager
+def _count_statements(db_session):
+    statements = []
+    engine = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _add_issues(db_session, count, **kwargs):
+    rows = [
+        dict(dict(title=f"批量操作{i}", priority="low", issueType="BUG"), **kwargs)
+        for i in range(count)
+    ]
+    import_result = IssueService.import_issue_services(
+        db_session, _jsonl(rows), "issues.jsonl"
+    )
+    assert import_result.failure_count == 0
+    return [issue["issueId"] for issue in IssueDao.get_issue_list(db_session, IssuePageQueryModel())]
+
+
+def _jsonl(rows):
+    return io.BytesIO("\n".join(json.dumps(row, ensure_ascii=False) for row in rows).encode())
+
+
+def _assert_counters_consistent(db_session):
+    assert IssueService.get_issue_statistics_services(db_session).model_dump() == (
+        IssueDao.get_issue_statistics(db_session)
+    )
+
+
+def test_batch_delete_by_ids_is_chunked(db_session, monkeypatch):
+    monkeypatch.setattr(IssueDao, "ID_CHUNK_SIZE", 50)
+    issue_ids = _add_issues(db_session, 120)
+    IssueService.get_issue_statistics_services(db_session)
+
+    with _count_statements(db_session) as statements:
+        result = IssueService.batch_delete_issue_services(
+            db_session, BatchIssueModel(issueIds=issue_ids[:110] + [999999])
+        )
+
+    assert result.is_success, result.message
+    assert result.result.affected_count == 110
+    # 每个分片一次加锁查询和一次UPDATE
+    assert len([sql for sql in statements if sql.startswith("UPDATE issue_main")]) == 3
+    assert len(IssueDao.get_issue_list(db_session, IssuePageQueryModel())) == 10
+    _assert_counters_consistent(db_session)
+
+
+def test_batch_status_by_filter_skips_unchanged(db_session):
+    _add_issues(db_session, 3, priority="high")
+    _add_issues(db_session, 2, priority="low", status="completed")
+    IssueService.get_issue_statistics_services(db_session)
+
+    result = IssueService.batch_change_issue_status_services(
+        db_session, BatchIssueModel(filter=IssueBatchFilterModel(priority="high"), status="completed")
+    )
+    assert result.is_success, result.message
+    assert (result.result.matched_count, result.result.affected_count) == (3, 3)
+
+    result = IssueService.batch_change_issue_status_services(
+        db_session, BatchIssueModel(filter=IssueBatchFilterModel(status="completed"), status="completed")
+    )
+    assert (result.result.matched_count, result.result.affected_count) == (5, 0)
+    _assert_counters_consistent(db_session)
+    assert IssueService.get_issue_statistics_services(db_session).completed_count == 5
+
+
+def test_batch_priority_by_keyword_filter(db_session):
+    _add_issues(db_session, 2, description="显卡驱动崩溃")
+    _add_issues(db_session, 2, description="网络异常")
+    IssueService.get_issue_statistics_services(db_session)
+
+    result = IssueService.batch_change_issue_priority_services(
+        db_session, BatchIssueModel(filter=IssueBatchFilterModel(keyword="显卡驱动"), priority="high")
+    )
+    assert result.result.affected_count == 2
+    _assert_counters_consistent(db_session)
+    assert IssueService.get_issue_statistics_services(db_session).high_priority_count == 2
+
+
+def test_batch_requires_ids_or_filter(db_session):
+    _add_issues(db_session, 2)
+
+    result = IssueService.batch_delete_issue_services(db_session, BatchIssueModel())
+    assert not result.is_success
+    result = IssueService.batch_delete_issue_services(
+        db_session, BatchIssueModel(filter=IssueBatchFilterModel())
+    )
+    assert not result.is_success
+    # 只有空白关键字或只有开始时间时不构成过滤条件
+    for empty_filter in (IssueBatchFilterModel(keyword="  "), IssueBatchFilterModel(beginTime="2024-01-01")):
+        result = IssueService.batch_delete_issue_services(db_session, BatchIssueModel(filter=empty_filter))
+        assert not result.is_success
+    result = IssueService.batch_change_issue_status_services(db_session, BatchIssueModel(issueIds=[1]))
+    assert not result.is_success
+    assert len(IssueDao.get_issue_list(db_session, IssuePageQueryModel())) == 2
+
+
+def test_batch_filter_rejects_unsupported_fields(db_session):
+    _add_issues(db_session, 3)
+
+    # 列表查询不支持的字段不能被忽略，否则会作用于全部Issue
+    for filter_fields in ({"description": "x"}, {"delFlag": "2"}, {"createTime": "2024-01-01 00:00:00"}):
+        with pytest.raises(ValidationError):
+            BatchIssueModel.model_validate({"filter": filter_fields, "status": "completed"})
+    assert len(IssueDao.get_issue_list(db_session, IssuePageQueryModel())) == 3
+
+
+def test_delete_issue_services_uses_batch_path(db_session):
+    issue_ids = _add_issues(db_session, 3)
+
+    result = IssueService.delete_issue_services(
+        db_session, DeleteIssueModel(issueIds=",".join(str(issue_id) for issue_id in issue_ids[:2]))
+    )
+    assert result.is_success
+    assert result.message == "删除成功"
+    assert [issue["issueId"] for issue in IssueDao.get_issue_list(db_session, IssuePageQueryModel())] == [
+        issue_ids[2]
+    ]
+
+    # ID格式错误时返回删除失败，不删除任何Issue
+    result = IssueService.delete_issue_services(db_session, DeleteIssueModel(issueIds=f"{issue_ids[2]},abc"))
+    assert not result.is_success
+    assert result.message.startswith("删除失败")
+    assert len(IssueDao.get_issue_list(db_session, IssuePageQueryModel())) == 1
@@ -0,0 +1,114 @@
+"""
+Issue详情加载及写操作前置校验单元测试
+"""
+
+from contextlib import contextmanager
+
+from pydantic.alias_generators import to_camel
+from sqlalchemy import event
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.vo.issue_vo import (
+    AddDiagnosisLogModel,
+    AddIssueModel,
+    DeleteIssueModel,
+    EditIssueModel,
+    IssuePageQueryModel,
+    IssueSystemEnvModel,
+)
+from module_admin.service.issue_service import IssueService
+
+
+@contextmanager
+def _count_statements(db_session):
+    statements = []
+    engine = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _system_env(data):
+    return IssueSystemEnvModel(**{to_camel(key): value for key, value in data.items()})
+
+
+def _add_issue(db_session, title, **kwargs):
+    result = IssueService.add_issue_services(
+        db_session, AddIssueModel(title=title, priority="low", issueType="BUG", **kwargs)
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def test_detail_loads_all_relations(db_session, sample_system_env_data):
+    issue_id = _add_issue(
+        db_session,
+        "详情加载",
+        systemEnv=_system_env(sample_system_env_data),
+        tags=["bsod", "gpu"],
+    )
+    for step in ("步骤一", "步骤二"):
+        IssueService.add_diagnosis_log_services(
+            db_session, AddDiagnosisLogModel(issueId=issue_id, stepName=step, operator="tester")
+        )
+    db_session.expire_all()
+
+    with _count_statements(db_session) as statements:
+        detail = IssueService.get_issue_detail_services(db_session, issue_id)
+
+    assert detail.issue_info.status == "diagnosing"
+    assert detail.system_env.cpu_info == sample_system_env_data["cpu_info"]
+    assert sorted(tag.tag_name for tag in detail.tags) == ["bsod", "gpu"]
+    assert len(detail.diagnosis_logs) == 2
+    assert detail.attachments == []
+    # 主表与系统环境一次JOIN，三个集合各一次IN查询
+    assert len(statements) == 4
+
+
+def test_missing_issue(db_session):
+    assert IssueService.get_issue_detail_services(db_session, 999) is None
+    assert IssueDao.check_issue_exists(db_session, 999) is False
+    assert IssueDao.lock_issue(db_session, 999) is None
+
+    result = IssueService.edit_issue_services(db_session, EditIssueModel(issueId=999, title="x"))
+    assert not result.is_success
+    result = IssueService.add_diagnosis_log_services(
+        db_session, AddDiagnosisLogModel(issueId=999, stepName="x", operator="tester")
+    )
+    assert not result.is_success
+
+
+def test_edit_updates_existing_system_env(db_session, sample_system_env_data):
+    issue_id = _add_issue(
+        db_session, "环境编辑", systemEnv=_system_env(sample_system_env_data)
+    )
+    env_id = IssueDao.get_system_env_id(db_session, issue_id)
+
+    env = dict(sample_system_env_data, os_info="Windows 10")
+    result = IssueService.edit_issue_services(
+        db_session, EditIssueModel(issueId=issue_id, systemEnv=_system_env(env))
+    )
+    assert result.is_success, result.message
+
+    detail = IssueDao.get_issue_by_id(db_session, issue_id)
+    assert detail["system_env"].env_id == env_id
+    assert detail["system_env"].os_info == "Windows 10"
+
+
+def test_get_issues_by_ids_and_batch_delete(db_session):
+    ids = [_add_issue(db_session, f"批量{i}") for i in range(3)]
+
+    issues = IssueDao.get_issues_by_ids(db_session, [ids[2], 999, ids[0], ids[2]])
+    assert [issue.issue_id for issue in issues] == [ids[2], ids[0]]
+
+    result = IssueService.delete_issue_services(
+        db_session, DeleteIssueModel(issueIds=f"{ids[0]},{ids[1]},999")
+    )
+    assert result.is_success, result.message
+    assert [issue.issue_id for issue in IssueDao.get_issues_by_ids(db_session, ids)] == [ids[2]]
@@ -0,0 +1,98 @@
+"""
+Issue诊断记录批量新增单元测试
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event, func, select
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueDiagnosisLog, IssueMain
+from module_admin.entity.vo.issue_vo import (
+    AddDiagnosisLogModel,
+    AddIssueModel,
+    BatchAddDiagnosisLogModel,
+    IssuePageQueryModel,
+)
+from module_admin.service.issue_service import IssueService
+
+
+@contextmanager
+def _count_statements(db_session):
+    statements = []
+    engine = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _add_issue(db_session, title, status="pending"):
+    IssueService.add_issue_services(
+        db_session, AddIssueModel(title=title, priority="low", status=status, issueType="BUG")
+    )
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _batch(*steps):
+    return BatchAddDiagnosisLogModel(
+        logs=[
+            AddDiagnosisLogModel(issueId=issue_id, stepName=step_name, operator="robot")
+            for issue_id, step_name in steps
+        ]
+    )
+
+
+def _log_count(db_session):
+    return db_session.execute(select(func.count()).select_from(IssueDiagnosisLog)).scalar()
+
+
+def test_batch_add_for_many_issues(db_session):
+    pending_id = _add_issue(db_session, "待诊断")
+    completed_id = _add_issue(db_session, "已完成", status="completed")
+    IssueService.get_issue_statistics_services(db_session)
+
+    with _count_statements(db_session) as statements:
+        result = IssueService.batch_add_diagnosis_log_services(
+            db_session,
+            _batch(
+                *[(pending_id, f"检查驱动{i}") for i in range(30)],
+                *[(completed_id, f"复查日志{i}") for i in range(20)],
+            ),
+        )
+
+    assert result.is_success, result.message
+    assert (result.result.log_count, result.result.issue_count, result.result.diagnosing_count) == (50, 2, 1)
+    assert _log_count(db_session) == 50
+    assert len([sql for sql in statements if sql.startswith("INSERT INTO issue_diagnosis_log")]) == 1
+    assert len([sql for sql in statements if sql.startswith("UPDATE issue_main")]) == 1
+    statuses = dict(db_session.execute(select(IssueMain.issue_id, IssueMain.status)).all())
+    assert statuses == {pending_id: "diagnosing", completed_id: "completed"}
+
+    statistics = IssueService.get_issue_statistics_services(db_session)
+    assert statistics.model_dump() == IssueDao.get_issue_statistics(db_session)
+    assert (statistics.diagnosis_count, statistics.pending_count) == (50, 0)
+    # 诊断步骤进入全文检索文档
+    assert [issue["issueId"] for issue in IssueDao.get_issue_list(db_session, IssuePageQueryModel(keyword="复查日志"))] == [
+        completed_id
+    ]
+
+
+def test_batch_add_rejects_missing_issue(db_session):
+    issue_id = _add_issue(db_session, "存在")
+
+    result = IssueService.batch_add_diagnosis_log_services(
+        db_session, _batch((issue_id, "步骤一"), (999, "步骤二"), (998, "步骤三"))
+    )
+    assert not result.is_success
+    assert "998,999" in result.message
+    assert _log_count(db_session) == 0
+
+    result = IssueService.batch_add_diagnosis_log_services(db_session, _batch((issue_id, " ")))
+    assert not result.is_success
+    assert "第1条" in result.message
@@ -0,0 +1,400 @@
+"""
+dump附件解析及自动分析单元测试
+"""
+
+import asyncio
+import multiprocessing
+import struct
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select, update
+
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueAttachment, IssueCrashBucket, IssueCrashBucketHit, IssueDumpAnalysis
+from module_admin.entity.vo.issue_vo import AddIssueModel, DeleteIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from module_task import analyze_dumps
+from utils.minidump_util import MinidumpUtil
+
+CRASH_TIME = datetime(2024, 1, 15, 10, 30, 0)
+BUILD_STRING = "19041.1.amd64fre.vb_release.191206-1406"
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+class _BytesReader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.size = len(data)
+
+    def read(self, offset: int, length: int):
+        return self.data[offset : offset + length]
+
+
+def _string(value: str):
+    data = value.encode("utf-16-le")
+    return struct.pack("<I", len(data)) + data + b"\x00\x00"
+
+
+def build_minidump(modules=(), exception_address=None, exception_code=0xC0000005, thread_count=3, padding=0):
+    """
+    构造用户态minidump
+
+    :param modules: (模块路径, 基址, 大小, 版本)列表
+    :param exception_address: 异常地址，为空时不包含异常流
+    :param exception_code: 异常代码
+    :param thread_count: 线程数
+    :param padding: 附加的内存数据大小
+    :return: dump内容
+    """
+    streams = []
+    streams.append((7, struct.pack("<HHHBBIIIIIHH", 9, 6, 0x9E0A, 8, 1, 10, 0, 19041, 2, 0, 0x100, 0).ljust(56, b"\x00")))
+    misc_info = bytearray(832)
+    struct.pack_into("<IIIIII", misc_info, 0, 832, 0x1, 4242, 0, 0, 0)
+    build = BUILD_STRING.encode("utf-16-le")
+    misc_info[232 : 232 + len(build)] = build
+    streams.append((15, bytes(misc_info)))
+    streams.append((3, struct.pack("<I", thread_count) + b"\x00" * 48 * thread_count))
+    if exception_address is not None:
+        streams.append(
+            (6, struct.pack("<II" + "IIQQII15Q", 77, 0, exception_code, 0, 0, exception_address, 2, 0, 1, 0xDEAD, *[0] * 13) + b"\x00" * 8)
+        )
+
+    # 依次排列: 文件头、流目录、模块名、各数据流
+    directory_size = 12 * (len(streams) + (1 if modules else 0))
+    blob = bytearray()
+    offset = 32 + directory_size
+    name_rvas = []
+    for path, *_ in modules:
+        name_rvas.append(offset + len(blob))
+        blob += _string(path)
+    entries = []
+    if modules:
+        module_list = struct.pack("<I", len(modules))
+        for (path, base, size, version), name_rva in zip(modules, name_rvas):
+            fixed = [0] * 13
+            if version:
+                major, minor, build_number, revision = version
+                fixed[:4] = [0xFEEF04BD, 0x10000, major << 16 | minor, build_number << 16 | revision]
+            module_list += struct.pack("<QIIII13I8x8x8x8x", base, size, 0, 0x5F000000, name_rva, *fixed)
+        streams.insert(0, (4, module_list))
+    for stream_type, data in streams:
+        entries.append((stream_type, len(data), offset + len(blob)))
+        blob += data
+    blob += b"\xcc" * padding
+
+    header = struct.pack("<4sIIIIIQ", b"MDMP", 0xA793, len(entries), 32, 0, int(CRASH_TIME.timestamp()), 0)
+    directory = b"".join(struct.pack("<III", *entry) for entry in entries)
+    return header + directory + bytes(blob)
+
+
+def build_kernel_dump():
+    header = bytearray(0x1000)
+    struct.pack_into(
+        "<4s4sIIQQQQIII4xQQQQ", header, 0, b"PAGE", b"DU64", 15, 19041, 0, 0, 0, 0, 0x8664, 4, 0xD1, 0x28, 2, 0, 0xFFFFF80012345678
+    )
+    struct.pack_into("<IIQQ", header, 0xF00, 0xC0000005, 0, 0, 0xFFFFF80012345678)
+    # 系统时间为FILETIME(自1601年起的100纳秒数)
+    struct.pack_into("<Q", header, 0xFA8, (1705314600 + 11644473600) * 10**7)
+    return bytes(header)
+
+
+DRIVER_MODULES = (
+    ("C:\\Program Files\\LCFC\\service.exe", 0x400000, 0x10000, (1, 2, 3, 4)),
+    ("C:\\Windows\\System32\\ntdll.dll", 0x7FF800000000, 0x200000, (10, 0, 19041, 1)),
+    ("C:\\Windows\\System32\\lcfcdrv.dll", 0x7FF900000000, 0x80000, None),
+)
+USER_DUMP = build_minidump(DRIVER_MODULES, exception_address=0x7FF800001234)
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _add_issue(db_session, title, attachments):
+    result = IssueService.add_issue_services(
+        db_session,
+        AddIssueModel(
+            title=title,
+            priority="high",
+            issueType="BUG",
+            attachmentIds=[attachment.attachment_id for attachment in attachments],
+        ),
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def test_parse_user_dump():
+    info = MinidumpUtil.parse(_BytesReader(USER_DUMP))
+
+    assert (info.dump_type, info.crash_time, info.thread_count) == ("user", CRASH_TIME, 3)
+    assert (info.exception_code, info.exception_address, info.exception_thread_id) == (0xC0000005, 0x7FF800001234, 77)
+    assert info.exception_parameters == [1, 0xDEAD]
+    assert (info.faulting_module, info.faulting_offset, info.faulting_module_version) == ("ntdll.dll", 0x1234, "10.0.19041.1")
+    assert (info.process_name, info.process_id) == ("service.exe", 4242)
+    assert (info.os_version, info.os_build) == ("10.0.19041", BUILD_STRING)
+    assert (info.processor_architecture, info.processor_count) == ("x64", 8)
+    assert [(module.name, module.version) for module in info.modules] == [
+        ("service.exe", "1.2.3.4"),
+        ("ntdll.dll", "10.0.19041.1"),
+        ("lcfcdrv.dll", None),
+    ]
+
+    result = MinidumpUtil.to_dict(info)
+    assert (result["exception_code"], result["exception_address"], result["faulting_offset"]) == (
+        "0xC0000005",
+        "0x7ff800001234",
+        "0x1234",
+    )
+    assert result["crash_time"] == "2024-01-15 10:30:00"
+
+
+def test_parse_kernel_dump_and_invalid():
+    info = MinidumpUtil.parse(_BytesReader(build_kernel_dump()))
+
+    assert (info.dump_type, info.exception_code, info.os_build) == ("kernel", 0xD1, "19041")
+    assert info.exception_parameters == [0x28, 2, 0, 0xFFFFF80012345678]
+    assert (info.exception_address, info.processor_architecture, info.processor_count) == (0xFFFFF80012345678, "x64", 4)
+    assert info.crash_time == datetime.fromtimestamp(1705314600)
+
+    with pytest.raises(ValueError):
+        MinidumpUtil.parse(_BytesReader(b"not a dump file"))
+    # 流目录超出文件范围
+    with pytest.raises(ValueError):
+        MinidumpUtil.parse(_BytesReader(USER_DUMP[:40]))
+
+
+def test_analyze_dumps_cached_by_hash(db_session, upload_path):
+    first = _upload(db_session, USER_DUMP, "service_crash.dmp")
+    shared = _upload(db_session, USER_DUMP, "service_crash_copy.DMP")
+    corrupt = _upload(db_session, b"MDMP" + b"\xff" * 60, "corrupt.dmp")
+    log = _upload(db_session, b"not analyzed", "driver.log")
+    temporary = _upload(db_session, build_minidump(), "temporary.dmp")
+    issue_id = _add_issue(db_session, "dump分析", [first, shared, corrupt, log])
+
+    pending = IssueService.get_issue_dump_analyses_services(db_session, issue_id)
+    assert [(item.file_name, item.status) for item in pending] == [
+        ("service_crash.dmp", "pending"),
+        ("service_crash_copy.DMP", "pending"),
+        ("corrupt.dmp", "pending"),
+    ]
+
+    result = IssueService.analyze_dumps_services(db_session)
+    assert result.is_success, result.message
+    # 相同内容只分析一次，未关联Issue的附件不分析
+    assert result.result == (1, 1)
+    assert IssueService.analyze_dumps_services(db_session).result == (0, 0)
+    assert len(db_session.execute(select(IssueDumpAnalysis)).scalars().all()) == 2
+    assert temporary.file_hash not in db_session.execute(select(IssueDumpAnalysis.file_hash)).scalars().all()
+
+    analyses = IssueService.get_issue_dump_analyses_services(db_session, issue_id)
+    assert [item.status for item in analyses] == ["success", "success", "failed"]
+    assert analyses[0].model_dump(exclude={"attachment_id", "file_name", "analyze_time"}) == analyses[1].model_dump(
+        exclude={"attachment_id", "file_name", "analyze_time"}
+    )
+    analysis = analyses[0]
+    assert (analysis.exception_code, analysis.faulting_module, analysis.faulting_offset) == ("0xC0000005", "ntdll.dll", "0x1234")
+    assert (analysis.os_build, analysis.thread_count, analysis.crash_time) == (BUILD_STRING, 3, CRASH_TIME)
+    assert analysis.modules[2].model_dump(by_alias=True) == {
+        "name": "lcfcdrv.dll",
+        "baseAddress": "0x7ff900000000",
+        "size": 0x80000,
+        "version": None,
+        "timestamp": 0x5F000000,
+    }
+    assert analyses[2].error_message and not analyses[2].modules
+
+    with pytest.raises(ServiceException):
+        IssueService.get_issue_dump_analyses_services(db_session, issue_id + 1)
+
+
+def test_analyze_compressed_dump_in_process_pool(db_session, upload_path):
+    dumps = [
+        build_minidump(DRIVER_MODULES, exception_address=0x7FF900000010 + index, thread_count=index + 1, padding=256 * 1024)
+        for index in range(4)
+    ]
+    attachments = [_upload(db_session, data, f"crash_{index}.dmp") for index, data in enumerate(dumps)]
+    issue_id = _add_issue(db_session, "dump进程池分析", attachments)
+    assert IssueService.compress_blob_services(db_session, attachments[0].file_hash).result > 0
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork")) as executor:
+        result = IssueService.analyze_dumps_services(db_session, executor)
+
+    assert result.result == (4, 0)
+    analyses = IssueService.get_issue_dump_analyses_services(db_session, issue_id)
+    assert [(item.thread_count, item.faulting_module, item.faulting_offset) for item in analyses] == [
+        (index + 1, "lcfcdrv.dll", f"0x{0x10 + index:x}") for index in range(4)
+    ]
+    assert all(item.process_id == 4242 for item in analyses)
+
+
+class _BrokenPool:
+    def submit(self, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("子进程异常退出"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_broken_process_pool_is_recreated(db_session, upload_path, monkeypatch):
+    attachment = _upload(db_session, build_minidump(DRIVER_MODULES, exception_address=0x7FF900000010), "crash.dmp")
+    issue_id = _add_issue(db_session, "进程池重建", [attachment])
+    monkeypatch.setattr(analyze_dumps, "SessionLocal", lambda: nullcontext(db_session))
+    monkeypatch.setattr(analyze_dumps, "_process_pool", _BrokenPool())
+
+    # 进程池损坏时丢弃，不保存失败结果，下次执行时重新创建
+    assert analyze_dumps._analyze_dumps() == (0, 0)
+    assert analyze_dumps._process_pool is None
+    assert db_session.get(IssueDumpAnalysis, attachment.file_hash) is None
+
+    try:
+        assert analyze_dumps._analyze_dumps() == (1, 0)
+        assert analyze_dumps._process_pool._mp_context.get_start_method() != "fork"
+    finally:
+        analyze_dumps._discard_process_pool()
+    assert IssueService.get_issue_dump_analyses_services(db_session, issue_id)[0].faulting_module == "lcfcdrv.dll"
+
+
+def test_crash_buckets_saved_by_concurrent_workers(db_session):
+    signature = "a" * 40
+    bucket = dict(
+        signature=signature,
+        dump_type="user",
+        exception_code="0xc0000005",
+        faulting_module="lcfcdrv.dll",
+        faulting_offset="0x10",
+        first_hit_time=datetime(2024, 1, 5),
+        last_hit_time=datetime(2024, 1, 5),
+    )
+    concurrent = {"pending": True}
+
+    @event.listens_for(db_session.get_bind(), "before_cursor_execute")
+    def other_worker(conn, cursor, statement, parameters, context, executemany):
+        # 模拟另一个worker在本次写入前提交了相同附件的命中记录及分组
+        if concurrent["pending"] and statement.startswith("INSERT INTO issue_crash_bucket_hit"):
+            concurrent["pending"] = False
+            cursor.execute(
+                "INSERT INTO issue_crash_bucket_hit (attachment_id, signature, issue_id, hit_time) "
+                "VALUES (1, ?, 1, '2024-01-05 00:00:00.000000')",
+                (signature,),
+            )
+            cursor.execute(
+                "INSERT INTO issue_crash_bucket (signature, first_hit_time, last_hit_time) "
+                "VALUES (?, '2024-01-05 00:00:00.000000', '2024-01-05 00:00:00.000000')",
+                (signature,),
+            )
+
+    try:
+        IssueDao.save_crash_bucket_hits(
+            db_session,
+            [
+                dict(attachment_id=2, signature=signature, issue_id=2, hit_time=datetime(2024, 1, 9)),
+                dict(attachment_id=1, signature=signature, issue_id=1, hit_time=datetime(2024, 1, 5)),
+            ],
+            [dict(bucket, first_hit_time=datetime(2024, 1, 5), last_hit_time=datetime(2024, 1, 9))],
+        )
+        db_session.commit()
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", other_worker)
+    assert not concurrent["pending"]
+
+    IssueDao.save_crash_bucket_hits(
+        db_session,
+        [dict(attachment_id=3, signature=signature, issue_id=3, hit_time=datetime(2024, 1, 1))],
+        [dict(bucket, first_hit_time=datetime(2024, 1, 1), last_hit_time=datetime(2024, 1, 1))],
+    )
+    db_session.commit()
+    saved = db_session.get(IssueCrashBucket, signature)
+    db_session.refresh(saved)
+    assert (saved.first_hit_time, saved.last_hit_time) == (datetime(2024, 1, 1), datetime(2024, 1, 9))
+    assert db_session.execute(select(func.count()).select_from(IssueCrashBucketHit)).scalar() == 3
+
+
+def test_crash_signature():
+    result = MinidumpUtil.to_dict(MinidumpUtil.parse(_BytesReader(USER_DUMP)))
+    signature = MinidumpUtil.get_signature(result)
+
+    # 模块名大小写及模块版本不影响签名
+    assert MinidumpUtil.get_signature(dict(result, faulting_module="NTDLL.DLL", faulting_module_version="10.0.1")) == signature
+    assert MinidumpUtil.get_signature(dict(result, faulting_offset="0x1235")) != signature
+    assert MinidumpUtil.get_signature(dict(result, exception_code="0xC0000409")) != signature
+    # 异常地址不在模块内时只按异常代码分组
+    unknown = dict(result, faulting_module=None, faulting_offset=None)
+    assert MinidumpUtil.get_signature(dict(unknown, exception_address="0x1")) == MinidumpUtil.get_signature(unknown)
+    assert MinidumpUtil.get_signature(dict(result, exception_code=None)) is None
+    kernel = MinidumpUtil.to_dict(MinidumpUtil.parse(_BytesReader(build_kernel_dump())))
+    assert MinidumpUtil.get_signature(kernel) == MinidumpUtil.get_signature(dict(kernel, exception_parameters=[]))
+
+
+def test_crash_buckets(db_session, upload_path):
+    ntdll_crash = build_minidump(DRIVER_MODULES, exception_address=0x7FF800001234, thread_count=5)
+    driver_crash = build_minidump(DRIVER_MODULES, exception_address=0x7FF900000100)
+    first = _upload(db_session, USER_DUMP, "first.dmp")
+    issue_a = _add_issue(db_session, "崩溃A", [first, _upload(db_session, driver_crash, "driver.dmp")])
+    issue_b = _add_issue(db_session, "崩溃B", [_upload(db_session, ntdll_crash, "second.dmp")])
+    old = _upload(db_session, build_minidump(DRIVER_MODULES, exception_address=0x7FF900000100, thread_count=9), "old.dmp")
+    issue_c = _add_issue(db_session, "崩溃C", [old])
+    db_session.execute(
+        update(IssueAttachment)
+        .where(IssueAttachment.attachment_id == old.attachment_id)
+        .values(upload_time=datetime.now() - timedelta(days=30))
+    )
+    db_session.commit()
+
+    assert IssueService.analyze_dumps_services(db_session).result == (4, 0)
+    assert IssueService.bucket_crash_dumps_services(db_session).result == 4
+    assert IssueService.bucket_crash_dumps_services(db_session).result == 0
+
+    buckets = IssueService.get_issue_crash_buckets_services(db_session, issue_a)
+    assert [(bucket.faulting_module, bucket.hit_count, bucket.issue_count) for bucket in buckets] == [
+        ("lcfcdrv.dll", 2, 2),
+        ("ntdll.dll", 2, 2),
+    ]
+    assert [issue.issue_id for issue in buckets[1].issues] == [issue_b, issue_a]
+    assert buckets[1].first_hit_time <= buckets[1].last_hit_time
+
+    # 热门分组只统计时间范围内的命中
+    top = IssueService.get_top_crash_buckets_services(db_session, days=7)
+    assert [(bucket.faulting_module, bucket.hit_count) for bucket in top] == [("ntdll.dll", 2), ("lcfcdrv.dll", 1)]
+    assert [bucket.faulting_module for bucket in IssueService.get_top_crash_buckets_services(db_session, 7, 1)] == ["ntdll.dll"]
+    assert IssueService.get_top_crash_buckets_services(db_session, days=60)[0].hit_count == 2
+
+    # 已分析的内容关联到新Issue时直接归入分组，不重复分析
+    issue_d = _add_issue(db_session, "崩溃D", [_upload(db_session, USER_DUMP, "again.dmp")])
+    assert IssueService.analyze_dumps_services(db_session).result == (0, 0)
+    assert IssueService.bucket_crash_dumps_services(db_session).result == 1
+    assert IssueService.get_issue_crash_buckets_services(db_session, issue_d)[0].issue_count == 3
+
+    # 已删除的Issue及附件不计入统计
+    IssueService.delete_issue_services(db_session, DeleteIssueModel(issueIds=str(issue_b)))
+    IssueService.delete_attachment_services(db_session, first.attachment_id)
+    bucket = IssueService.get_issue_crash_buckets_services(db_session, issue_d)[0]
+    assert (bucket.hit_count, bucket.issue_count) == (1, 1)
+    assert [issue.issue_number for issue in bucket.issues] == [
+        IssueDao.get_issues_by_ids(db_session, [issue_d])[0].issue_number
+    ]
+    assert db_session.execute(
+        select(IssueCrashBucketHit).where(IssueCrashBucketHit.attachment_id == first.attachment_id)
+    ).first() is None
+    assert IssueService.get_issue_crash_buckets_services(db_session, issue_c)[0].hit_count == 2
@@ -0,0 +1,98 @@
+"""
+Issue流式导出单元测试
+"""
+
+import csv
+import io
+from datetime import datetime
+from itertools import count, islice
+
+from openpyxl import load_workbook
+from sqlalchemy import func, select
+
+from config.constant import ExportConstant
+from module_admin.entity.do.issue_do import IssueMain
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.export_util import ExportUtil
+
+HEADER = [
+    "Issue编号", "Issue标题", "优先级", "状态", "Issue类型", "Issue来源", "问题描述", "解决方案",
+    "预期解决日期", "创建者", "创建时间", "更新者", "更新时间",
+]
+
+
+def _add_issues(db_session):
+    for i in range(30):
+        result = IssueService.add_issue_services(
+            db_session,
+            AddIssueModel(
+                title=f"导出{i:02d}",
+                priority="high" if i % 3 == 0 else "low",
+                issueType="BUG",
+                description='<驱动> & "蓝屏"\x07\n第二行' if i == 0 else None,
+                expectedResolveDate=datetime(2024, 1, 15, 10, 30) if i == 0 else None,
+            ),
+        )
+        assert result.is_success, result.message
+    # 创建时间相同，按issue_id倒序
+    db_session.execute(IssueMain.__table__.update().values(create_time=datetime(2024, 1, 1, 8, 0)))
+    db_session.commit()
+
+
+def _export(db_session, query_object, file_format):
+    return list(IssueService.export_issue_list_services(db_session, query_object, file_format))
+
+
+def test_export_xlsx_streams_in_chunks(db_session, monkeypatch):
+    monkeypatch.setattr(ExportConstant, "BATCH_SIZE", 4)
+    monkeypatch.setattr(ExportConstant, "CHUNK_SIZE", 512)
+    _add_issues(db_session)
+
+    chunks = _export(db_session, IssuePageQueryModel(), "xlsx")
+    assert len(chunks) > 1
+
+    sheet = load_workbook(io.BytesIO(b"".join(chunks))).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == HEADER
+    assert sheet["A1"].font.b
+    assert [row[1] for row in rows[1:]] == [f"导出{i:02d}" for i in reversed(range(30))]
+    first = dict(zip(HEADER, rows[-1]))
+    assert (first["优先级"], first["状态"], first["Issue类型"]) == ("高", "待诊断", "BUG")
+    # 非法的控制字符被去除，特殊字符及换行保留
+    assert first["问题描述"] == '<驱动> & "蓝屏"\n第二行'
+    assert (first["预期解决日期"], first["创建时间"]) == ("2024-01-15", "2024-01-01 08:00:00")
+    assert first["Issue编号"].startswith("ISU-")
+    assert rows[-2][2] == "低" and rows[-2][6] is None
+
+
+def test_export_csv_with_query_and_reimport(db_session):
+    _add_issues(db_session)
+
+    content = b"".join(_export(db_session, IssuePageQueryModel(priority="high"), "csv"))
+    assert content.startswith(b"\xef\xbb\xbf")
+    rows = list(csv.reader(io.StringIO(content.decode("utf-8-sig"))))
+    assert rows[0] == HEADER
+    assert [row[1] for row in rows[1:]] == [f"导出{i:02d}" for i in reversed(range(0, 30, 3))]
+    assert {row[2] for row in rows[1:]} == {"高"}
+
+    # 导出的文件可以直接导入
+    result = IssueService.import_issue_services(db_session, io.BytesIO(content), "issues.csv")
+    assert (result.total_count, result.success_count, result.failure_count) == (10, 10, 0)
+    assert db_session.execute(
+        select(func.count()).select_from(IssueMain).where(IssueMain.priority == "high")
+    ).scalar() == 20
+
+    # 标题模糊匹配导出00~09及刚导入的4个
+    xlsx = b"".join(_export(db_session, IssuePageQueryModel(title="导出0"), "xlsx"))
+    result = IssueService.import_issue_services(db_session, io.BytesIO(xlsx), "issues.xlsx")
+    assert (result.total_count, result.success_count) == (14, 14)
+
+
+def test_export_util_is_lazy(monkeypatch):
+    monkeypatch.setattr(ExportConstant, "CHUNK_SIZE", 1024)
+    # 数据行无限时也能输出前面的数据块
+    rows = ((i, f"行{i}") for i in count())
+    assert list(islice(ExportUtil.iter_csv(["编号", "内容"], rows), 3))
+    rows = ((i, f"行{i}") for i in count())
+    assert len(list(islice(ExportUtil.iter_xlsx(["编号", "内容"], rows), 3))) == 3
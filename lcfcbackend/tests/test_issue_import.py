@@ -0,0 +1,135 @@
+"""
+Issue批量导入单元测试
+"""
+
+import io
+import json
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import func, select
+
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueMain, IssueSystemEnv, IssueTag
+from module_admin.entity.vo.issue_vo import IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+
+
+def _import(db_session, content: bytes, filename: str):
+    return IssueService.import_issue_services(db_session, io.BytesIO(content), filename)
+
+
+def _count(db_session, model):
+    return db_session.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_import_jsonl_reports_bad_rows(db_session):
+    lines = [
+        json.dumps({"title": "蓝屏", "issueType": "BUG", "priority": "high", "tags": ["bsod", "bsod"]}),
+        "",
+        "{not json",
+        json.dumps({"title": "驱动异常", "issueType": "BUG", "systemEnv": {"cpuInfo": "i7", "osInfo": "Win11"}}),
+        json.dumps({"title": "优先级错误", "issueType": "BUG", "priority": "urgent"}),
+        json.dumps({"title": "", "issueType": "BUG"}),
+        json.dumps(["not", "object"]),
+    ]
+    result = _import(db_session, "\n".join(lines).encode(), "issues.jsonl")
+
+    assert (result.total_count, result.success_count, result.failure_count) == (6, 2, 4)
+    assert [error.row_number for error in result.errors] == [3, 5, 6, 7]
+    assert "priority" in result.errors[1].message
+
+    issues = IssueDao.get_issue_list(db_session, IssuePageQueryModel())
+    assert {issue["title"] for issue in issues} == {"蓝屏", "驱动异常"}
+    assert len({issue["issueNumber"] for issue in issues}) == 2
+    assert _count(db_session, IssueTag) == 1
+    env = db_session.execute(select(IssueSystemEnv)).scalars().one()
+    assert (env.cpu_info, env.os_info) == ("i7", "Win11")
+    assert IssueService.get_issue_statistics_services(db_session).high_priority_count == 1
+    # 导入的Issue同样可被全文检索
+    assert len(IssueDao.get_issue_list(db_session, IssuePageQueryModel(keyword="驱动异常"))) == 1
+
+
+def test_import_csv_with_export_headers(db_session):
+    content = (
+        "Issue标题,Issue类型,优先级,状态,标签,CPU信息\n"
+        "风扇噪音,BUG,高,已完成,\"风扇,散热\",AMD\n"
+        ",BUG,低,,,\n"
+        "\n"
+        "唤醒失败,BUG,低,待诊断,,\n"
+    ).encode("utf-8-sig")
+    result = _import(db_session, content, "issues.csv")
+
+    assert (result.total_count, result.success_count, result.failure_count) == (3, 2, 1)
+    assert result.errors[0].row_number == 3
+    fan = db_session.execute(select(IssueMain).where(IssueMain.title == "风扇噪音")).scalars().one()
+    assert (fan.priority, fan.status) == ("high", "completed")
+    assert sorted(tag.tag_name for tag in IssueDao.get_issue_by_id(db_session, fan.issue_id)["tags"]) == [
+        "散热",
+        "风扇",
+    ]
+
+
+def test_import_csv_multiline_cell_row_numbers(db_session):
+    content = (
+        "Issue标题,Issue类型,优先级,问题描述\n"
+        "蓝屏,BUG,高,\"第一行\n第二行\n第三行\"\n"
+        ",BUG,低,缺少标题\n"
+        "\n"
+        "唤醒失败,BUG,低,\"多行\r\n描述\"\n"
+        "优先级错误,BUG,紧急,\"描述\n\"\n"
+    ).encode("utf-8")
+    result = _import(db_session, content, "issues.csv")
+
+    assert (result.total_count, result.success_count, result.failure_count) == (4, 2, 2)
+    # 行号为记录在文件中起始的行，而不是第几条记录
+    assert [error.row_number for error in result.errors] == [5, 9]
+    blue_screen = db_session.execute(select(IssueMain).where(IssueMain.title == "蓝屏")).scalars().one()
+    assert blue_screen.description == "第一行\n第二行\n第三行"
+
+
+def test_import_xlsx_in_batches(db_session, monkeypatch):
+    monkeypatch.setattr(IssueService, "IMPORT_BATCH_SIZE", 4)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["title", "issue_type", "issue_source", "description"])
+    for i in range(10):
+        sheet.append([f"批量导入{i}", "BUG", 123, "超长描述" * 2000 if i == 6 else None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    result = _import(db_session, buffer.getvalue(), "issues.xlsx")
+
+    assert (result.total_count, result.success_count, result.failure_count) == (10, 9, 1)
+    assert result.errors[0].row_number == 8
+    assert result.errors[0].title == "批量导入6"
+    assert _count(db_session, IssueMain) == 9
+    assert IssueService.get_issue_statistics_services(db_session).total_count == 9
+
+
+def test_import_isolates_rows_failing_on_write(db_session, monkeypatch):
+    batch_add_tag_dao = IssueDao.batch_add_tag_dao
+
+    def failing_batch_add_tag_dao(db, tags):
+        if any(tag["tag_name"] == "坏数据" for tag in tags):
+            raise RuntimeError("constraint violated")
+        batch_add_tag_dao(db, tags)
+
+    monkeypatch.setattr(IssueDao, "batch_add_tag_dao", failing_batch_add_tag_dao)
+    lines = [
+        json.dumps({"title": f"写入{i}", "issueType": "BUG", "tags": ["坏数据" if i == 1 else "正常"]})
+        for i in range(3)
+    ]
+    result = _import(db_session, "\n".join(lines).encode(), "issues.jsonl")
+
+    assert (result.success_count, result.failure_count) == (2, 1)
+    assert result.errors[0].row_number == 2
+    assert "constraint violated" in result.errors[0].message
+    assert _count(db_session, IssueMain) == 2
+    assert _count(db_session, IssueTag) == 2
+
+
+def test_import_rejects_unknown_format(db_session):
+    with pytest.raises(ServiceException):
+        _import(db_session, b"", "issues.txt")
@@ -0,0 +1,221 @@
+"""
+日志附件结构化事件提取及查询单元测试
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from config.constant import LogEventConstant
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueLogEventFile
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel, LogEventQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.log_event_util import LogEventFile, LogEventUtil
+from utils.storage_util import StorageUtil
+
+MIXED_LOG = (
+    b"[2024-01-15 10:30:00.123] [ERROR] [iaStorAC] Port reset failed, status 0xc0000185\r\n"
+    b"    at iaStorAC!PortReset+0x42\r\n"
+    b"2024-01-15 10:30:01, Error                 CBS    Failed to resolve package [HRESULT = 0x800f0831]\r\n"
+    b"Error\t1/15/2024 10:30:02 AM\tKernel-Power\t41\t(63)\tThe system has rebooted without cleanly shutting down\r\n"
+    b"[DXE] ERROR: PciBus start failed, Status = 0x8000000E\r\n"
+    b"PEI: POST Code: 0xA2\r\n"
+    b"2024-01-15 10:30:05 [INFO] wifi: connected\r\n"
+    b"2024-01-15 10:30:06 WARNING something slow\r\n"
+    b"plain text line"
+)
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    return tmp_path / "upload"
+
+
+class _BytesReader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.size = len(data)
+
+    def read(self, offset: int, length: int):
+        return self.data[offset : offset + length]
+
+
+async def _stream(data: bytes):
+    yield data
+
+
+def _upload(db_session, data: bytes, file_name):
+    result = asyncio.run(
+        IssueService.upload_attachment_stream_services(db_session, _stream(data), file_name, len(data), "tester")
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _add_issue(db_session, title, attachments):
+    result = IssueService.add_issue_services(
+        db_session,
+        AddIssueModel(
+            title=title,
+            priority="low",
+            issueType="BUG",
+            attachmentIds=[attachment.attachment_id for attachment in attachments],
+        ),
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _query(db_session, issue_id, **kwargs):
+    return IssueService.get_issue_log_events_services(db_session, issue_id, LogEventQueryModel(**kwargs))
+
+
+def test_extract_builtin_patterns(tmp_path, monkeypatch):
+    # 块边界落在行中间时与下一块拼接
+    monkeypatch.setattr(LogEventConstant, "SCAN_SIZE", 128)
+    columns, line_count = LogEventUtil.extract(_BytesReader(MIXED_LOG))
+
+    assert line_count == 9
+    assert columns.line_numbers.tolist() == [1, 3, 4, 5, 6, 7, 8]
+    assert [LogEventUtil.LEVELS[level] for level in columns.levels] == ["ERROR", "ERROR", "ERROR", "ERROR", "", "INFO", "WARN"]
+    assert [columns.component_names[index] for index in columns.components] == [
+        "iaStorAC", "CBS", "Kernel-Power", "DXE", "PEI", "wifi", ""
+    ]
+    assert [columns.code_names[index] for index in columns.codes] == [
+        "0xC0000185", "0x800F0831", "41", "0x8000000E", "0xA2", "", ""
+    ]
+    assert [LogEventUtil.to_datetime(timestamp) for timestamp in columns.timestamps.tolist()] == [
+        datetime(2024, 1, 15, 10, 30, 0, 123000),
+        datetime(2024, 1, 15, 10, 30, 1),
+        datetime(2024, 1, 15, 10, 30, 2),
+        None,
+        None,
+        datetime(2024, 1, 15, 10, 30, 5),
+        datetime(2024, 1, 15, 10, 30, 6),
+    ]
+    offset, length = int(columns.offsets[3]), int(columns.lengths[3])
+    assert MIXED_LOG[offset : offset + length].rstrip(b"\r") == b"[DXE] ERROR: PciBus start failed, Status = 0x8000000E"
+
+    event_path = str(tmp_path / "mixed.evt")
+    LogEventUtil.write(event_path, columns)
+    with LogEventFile(event_path) as events:
+        assert events.event_count == 7
+        assert events.filter(min_level=4).tolist() == [0, 1, 2, 3]
+        assert events.filter(component="KERNEL-power").tolist() == [2]
+        assert events.filter(code="0x8000000e").tolist() == [3]
+        # 没有时间的事件不满足时间条件
+        begin = LogEventUtil.to_timestamp(datetime(2024, 1, 15, 10, 30, 1))
+        end = LogEventUtil.to_timestamp(datetime(2024, 1, 15, 10, 30, 6))
+        assert events.filter(begin, end).tolist() == [1, 2, 5]
+        assert events.filter(component="missing").tolist() == []
+
+
+def test_register_pattern(monkeypatch):
+    monkeypatch.setattr(LogEventUtil, "PATTERNS", list(LogEventUtil.PATTERNS))
+    monkeypatch.setattr(LogEventUtil, "_compiled", None)
+    data = b"15.01.2024 10:30:00 E/ec_fw: battery fault code=0x00000042\nsecond line\n"
+
+    assert LogEventUtil.extract(_BytesReader(data))[0].levels.tolist() == []
+
+    LogEventUtil.register_pattern(
+        "ec", r"(?P<time>\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2}) (?P<level>[EWI])/%{COMPONENT:component}:", "%d.%m.%Y %H:%M:%S", "generic"
+    )
+    columns, line_count = LogEventUtil.extract(_BytesReader(data))
+
+    assert [pattern.name for pattern in LogEventUtil.PATTERNS][-2:] == ["ec", "generic"]
+    assert line_count == 2
+    assert columns.component_names[columns.components[0]] == "ec_fw"
+    assert columns.code_names[columns.codes[0]] == "0x00000042"
+    assert LogEventUtil.to_datetime(int(columns.timestamps[0])) == datetime(2024, 1, 15, 10, 30)
+    with pytest.raises(ValueError):
+        LogEventUtil.register_pattern("bad", r"%{UNKNOWN:time}")
+
+
+def test_issue_log_events(db_session, upload_path):
+    driver_log = b"".join(
+        f"[2024-01-15 10:{minute:02d}:00.000] [{'ERROR' if minute % 10 == 0 else 'INFO'}] [iaStorAC] event {minute}\n".encode()
+        for minute in range(60)
+    )
+    mixed = _upload(db_session, MIXED_LOG, "mixed.log")
+    driver = _upload(db_session, driver_log, "driver.log")
+    text = _upload(db_session, b"2024-01-15 10:30:00 [ERROR] not a log attachment", "notes.txt")
+    issue_id = _add_issue(db_session, "日志事件", [mixed, driver, text])
+    assert IssueService.compress_blob_services(db_session, driver.file_hash).result > 0
+
+    pending = _query(db_session, issue_id)
+    assert (pending.total, pending.pending_count) == (0, 2)
+
+    assert IssueService.extract_log_events_services(db_session).result == (2, 0)
+    assert IssueService.extract_log_events_services(db_session).result == (0, 0)
+    event_file = db_session.get(IssueLogEventFile, driver.file_hash)
+    assert (event_file.event_count, event_file.line_count) == (60, 60)
+    assert (event_file.begin_time, event_file.end_time) == (datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 10, 59))
+
+    result = _query(db_session, issue_id, level="ERROR", beginTime=datetime(2024, 1, 15, 10, 20), endTime=datetime(2024, 1, 15, 10, 41))
+    assert (result.total, result.file_count, result.pending_count) == (6, 2, 0)
+    assert [(event.file_name, event.line_number, event.component) for event in result.events] == [
+        ("driver.log", 21, "iaStorAC"),
+        ("driver.log", 31, "iaStorAC"),
+        ("mixed.log", 1, "iaStorAC"),
+        ("mixed.log", 3, "CBS"),
+        ("mixed.log", 4, "Kernel-Power"),
+        ("driver.log", 41, "iaStorAC"),
+    ]
+    assert result.events[2].message == "[2024-01-15 10:30:00.123] [ERROR] [iaStorAC] Port reset failed, status 0xc0000185"
+    assert result.events[2].error_code == "0xC0000185"
+    assert result.events[0].event_time == datetime(2024, 1, 15, 10, 20)
+
+    # 时间范围不相交的文件直接跳过
+    later = _query(db_session, issue_id, beginTime=datetime(2024, 1, 15, 10, 45))
+    assert (later.total, later.file_count) == (15, 1)
+    limited = _query(db_session, issue_id, component="iastorac", limit=3)
+    assert limited.total == 61
+    assert [event.line_number for event in limited.events] == [1, 2, 3]
+    assert _query(db_session, issue_id, errorCode="41").events[0].message.startswith("Error\t1/15/2024")
+
+    with pytest.raises(ServiceException):
+        _query(db_session, issue_id, beginTime=datetime(2024, 1, 2), endTime=datetime(2024, 1, 1))
+    with pytest.raises(ServiceException):
+        _query(db_session, issue_id + 1)
+
+
+def test_event_file_removed_with_blob(db_session, upload_path):
+    log = _upload(db_session, MIXED_LOG, "mixed.log")
+    _add_issue(db_session, "删除日志", [log])
+    IssueService.extract_log_events_services(db_session)
+    event_path = StorageUtil.get_event_path(log.file_path)
+    assert os.path.exists(event_path)
+    with LogEventFile(event_path) as events:
+        assert isinstance(events.timestamps, np.ndarray)
+
+    IssueService.delete_attachment_services(db_session, log.attachment_id)
+
+    assert not os.path.exists(event_path)
+    assert db_session.execute(select(IssueLogEventFile)).first() is None
+
+
+def test_corrupt_compressed_log(db_session, upload_path):
+    corrupt = _upload(db_session, b"2024-01-15 10:30:00 [ERROR] corrupt\n" * 200, "corrupt.log")
+    other = _upload(db_session, MIXED_LOG, "mixed.log")
+    _add_issue(db_session, "损坏日志", [corrupt, other])
+    assert IssueService.compress_blob_services(db_session, corrupt.file_hash).result > 0
+    compressed_path = StorageUtil.resolve_path(corrupt.file_path)
+    with open(compressed_path, "r+b") as f:
+        # 保留zstd帧头，破坏压缩数据
+        f.seek(4)
+        f.write(b"\xff" * 64)
+
+    # 损坏的文件记录为失败，其余文件继续提取
+    assert IssueService.extract_log_events_services(db_session).result == (1, 1)
+    event_file = db_session.get(IssueLogEventFile, corrupt.file_hash)
+    assert event_file.status == "failed" and event_file.error_message
+    assert db_session.get(IssueLogEventFile, other.file_hash).status == "success"
+    assert IssueService.extract_log_events_services(db_session).result == (0, 0)
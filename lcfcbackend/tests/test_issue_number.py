@@ -0,0 +1,105 @@
+"""
+Issue编号分配单元测试
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from config.database import Base
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueMain, IssueNumberSequence
+from module_admin.entity.vo.issue_vo import AddIssueModel
+from module_admin.service.issue_service import IssueService
+
+DAY = datetime(2024, 3, 5)
+
+
+@pytest.fixture
+def file_session_factory(tmp_path):
+    """基于文件的SQLite数据库，每个会话使用独立连接，用于并发测试"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'issue_number.db'}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=64,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def test_allocate_block(db_session):
+    assert IssueDao.allocate_issue_numbers(db_session, 3, DAY) == [
+        "ISU-2024-03-05-0001",
+        "ISU-2024-03-05-0002",
+        "ISU-2024-03-05-0003",
+    ]
+    assert IssueDao.allocate_issue_numbers(db_session, 1, DAY) == ["ISU-2024-03-05-0004"]
+    assert IssueDao.allocate_issue_numbers(db_session, 1, datetime(2024, 3, 6)) == ["ISU-2024-03-06-0001"]
+    assert IssueDao.allocate_issue_numbers(db_session, 0, DAY) == []
+
+
+def test_sequence_seeded_from_existing_numbers(db_session):
+    db_session.execute(
+        insert(IssueMain),
+        [
+            dict(issue_number=number, title="历史数据", issue_type="BUG")
+            for number in ("ISU-2024-03-05-0009", "ISU-2024-03-05-10000", "ISU-2024-03-04-0500")
+        ],
+    )
+    db_session.commit()
+
+    assert IssueDao.allocate_issue_numbers(db_session, 1, DAY) == ["ISU-2024-03-05-10001"]
+
+
+def test_sequence_survives_restart(file_session_factory):
+    with file_session_factory() as db:
+        IssueDao.allocate_issue_numbers(db, 5, DAY)
+        # 编号随业务事务回滚而回收
+        db.rollback()
+        assert IssueDao.allocate_issue_numbers(db, 2, DAY) == ["ISU-2024-03-05-0001", "ISU-2024-03-05-0002"]
+        db.commit()
+
+    with file_session_factory() as db:
+        assert IssueDao.allocate_issue_numbers(db, 1, DAY) == ["ISU-2024-03-05-0003"]
+
+
+def test_create_uses_single_connection(tmp_path):
+    """连接池只有一个连接时新增Issue不会因额外借用连接而阻塞"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'single_connection.db'}", pool_size=1, max_overflow=0, pool_timeout=1
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        with sessionmaker(autocommit=False, autoflush=False, bind=engine)() as db:
+            # 模拟请求会话已持有连接(获取当前用户等查询)
+            db.execute(select(IssueMain.issue_id)).all()
+            result = IssueService.add_issue_services(
+                db, AddIssueModel(title="单连接新增", priority="low", issueType="BUG")
+            )
+        assert result.is_success, result.message
+    finally:
+        engine.dispose()
+
+
+def test_parallel_creates_get_unique_numbers(file_session_factory):
+    total = 200
+
+    def create(index):
+        with file_session_factory() as db:
+            return IssueService.add_issue_services(
+                db, AddIssueModel(title=f"并发新增{index}", priority="low", issueType="BUG")
+            )
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(create, range(total)))
+
+    assert [result.message for result in results if not result.is_success] == []
+    with file_session_factory() as db:
+        numbers = db.execute(select(IssueMain.issue_number)).scalars().all()
+        last_value = db.execute(select(IssueNumberSequence.last_value)).scalar()
+    assert len(set(numbers)) == total
+    assert last_value == total
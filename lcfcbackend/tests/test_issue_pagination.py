@@ -0,0 +1,84 @@
+"""
+Issue列表游标分页单元测试
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from exceptions.exception import ServiceException
+from module_admin.entity.do.issue_do import IssueMain
+from module_admin.entity.vo.issue_vo import IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+
+
+@pytest.fixture(scope="function")
+def issues(db_session):
+    base_time = datetime(2024, 1, 1, 8, 0, 0)
+    for i in range(23):
+        db_session.add(
+            IssueMain(
+                issue_number=f"ISU-TEST-{i:04d}",
+                title=f"分页测试{i}",
+                priority="high" if i % 3 == 0 else "low",
+                status="pending",
+                issue_type="BUG",
+                # 每3条共用一个创建时间，验证相同时间下按ID定位
+                create_time=base_time + timedelta(minutes=i // 3),
+                del_flag="0",
+            )
+        )
+    db_session.commit()
+
+
+def _walk(db_session, page_size, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        result = IssueService.get_issue_list_services(
+            db_session,
+            IssuePageQueryModel(pageMode="cursor", cursor=cursor, pageSize=page_size, **kwargs),
+            is_page=True,
+        )
+        pages.append(result)
+        if not result.has_next:
+            return pages
+        cursor = result.next_cursor
+
+
+def test_cursor_pages_match_offset_order(db_session, issues):
+    offset_result = IssueService.get_issue_list_services(
+        db_session, IssuePageQueryModel(pageSize=100), is_page=True
+    )
+    expected = [row.issue_id for row in offset_result.rows]
+
+    pages = _walk(db_session, 5)
+
+    assert [len(page.rows) for page in pages] == [5, 5, 5, 5, 3]
+    assert [row.issue_id for page in pages for row in page.rows] == expected
+    assert all(page.total is None for page in pages)
+    assert pages[-1].next_cursor is None
+
+
+def test_cursor_mode_keeps_filters_and_optional_total(db_session, issues):
+    pages = _walk(db_session, 4, priority="high", withTotal=True)
+
+    rows = [row for page in pages for row in page.rows]
+    assert len(rows) == 8
+    assert all(row.priority == "high" for row in rows)
+    assert pages[0].total == 8
+
+
+def test_cursor_response_serializes_next_cursor(db_session, issues):
+    result = IssueService.get_issue_list_services(
+        db_session, IssuePageQueryModel(pageMode="cursor", pageSize=2), is_page=True
+    )
+
+    assert result.model_dump(by_alias=True)["nextCursor"] == result.next_cursor
+
+
+def test_invalid_cursor(db_session, issues):
+    with pytest.raises(ServiceException):
+        IssueService.get_issue_list_services(
+            db_session,
+            IssuePageQueryModel(pageMode="cursor", cursor="not-a-cursor"),
+            is_page=True,
+        )
@@ -0,0 +1,147 @@
+"""
+Issue全文检索单元测试
+"""
+
+import re
+from types import SimpleNamespace
+
+from sqlalchemy import and_, delete, literal, select, update
+
+from module_admin.dao import issue_dao
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueMain
+from module_admin.entity.vo.issue_vo import (
+    AddDiagnosisLogModel,
+    AddIssueModel,
+    EditIssueModel,
+    IssuePageQueryModel,
+)
+from module_admin.service.issue_service import IssueService
+from utils.search_util import InvertedIndex, NgramTokenizer, SearchIndexUtil
+
+
+def _add_issue(db_session, **kwargs):
+    data = dict(title="默认标题", priority="low", issueType="BUG")
+    data.update(kwargs)
+    result = IssueService.add_issue_services(db_session, AddIssueModel(**data))
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(
+        db_session, IssuePageQueryModel(title=data["title"])
+    )[0]["issueId"]
+
+
+def _search(db_session, keyword, **kwargs):
+    query = IssuePageQueryModel(keyword=keyword, **kwargs)
+    return [row["issueId"] for row in IssueDao.get_issue_list(db_session, query)]
+
+
+def test_ngram_tokenizer():
+    assert NgramTokenizer.tokenize("蓝屏 BSOD") == ["蓝屏", "bs", "so", "od"]
+    assert NgramTokenizer.tokenize("a") == ["a"]
+    assert NgramTokenizer.tokenize("") == []
+
+
+def test_inverted_index_ranking_and_removal():
+    index = InvertedIndex()
+    index.add_document(1, "显卡驱动 显卡驱动 显卡驱动 蓝屏")
+    index.add_document(2, "显卡驱动导致系统崩溃，日志很长很长很长很长很长")
+    index.add_document(3, "网络连接异常")
+
+    assert [doc_id for doc_id, _ in index.search("显卡驱动")] == [1, 2]
+    assert index.search("显卡 网络") == []
+
+    index.add_document(1, "网络")
+    assert [doc_id for doc_id, _ in index.search("显卡驱动")] == [2]
+    index.remove_document(2)
+    assert index.search("显卡驱动") == []
+    assert len(index) == 2
+
+
+def test_keyword_search_covers_all_fields(db_session):
+    title_id = _add_issue(db_session, title="Windows 11蓝屏问题")
+    description_id = _add_issue(
+        db_session, title="问题B", description="启动时出现蓝屏，错误代码0x3b"
+    )
+    tag_id = _add_issue(db_session, title="问题C", tags=["NVIDIA"])
+    solution_id = _add_issue(db_session, title="问题D")
+    IssueService.edit_issue_services(
+        db_session, EditIssueModel(issueId=solution_id, solution="回滚NVIDIA驱动版本")
+    )
+    log_id = _add_issue(db_session, title="问题E")
+    IssueService.add_diagnosis_log_services(
+        db_session,
+        AddDiagnosisLogModel(
+            issueId=log_id, stepName="内存转储分析", operator="tester"
+        ),
+    )
+
+    assert set(_search(db_session, "蓝屏")) == {title_id, description_id}
+    assert set(_search(db_session, "nvidia")) == {tag_id, solution_id}
+    assert _search(db_session, "转储") == [log_id]
+    assert _search(db_session, "不存在的关键字") == []
+
+
+def test_keyword_search_keeps_structured_filters(db_session):
+    high_id = _add_issue(db_session, title="驱动崩溃一", priority="high")
+    _add_issue(db_session, title="驱动崩溃二", priority="low")
+
+    assert _search(db_session, "驱动崩溃", priority="high") == [high_id]
+
+
+def test_keyword_search_ranks_by_relevance(db_session):
+    weak_id = _add_issue(
+        db_session,
+        title="偶发问题",
+        description="系统偶尔卡顿，与多个因素相关，其中可能包含显卡驱动" + "，其他说明" * 30,
+    )
+    strong_id = _add_issue(
+        db_session, title="显卡驱动崩溃", description="显卡驱动反复崩溃"
+    )
+
+    assert _search(db_session, "显卡驱动") == [strong_id, weak_id]
+
+
+def test_mixed_short_keyword_consistent_across_backends(db_session, monkeypatch):
+    match_id = _add_issue(db_session, title="A盘蓝屏")
+    _add_issue(db_session, title="B盘蓝屏")
+    _add_issue(db_session, title="系统A盘启动慢")
+
+    def like_match(column, against):
+        # 以模糊匹配模拟MySQL布尔模式下的+"term"全文检索
+        clause = literal(0)
+        clause.in_boolean_mode = lambda: and_(
+            *[column.contains(term) for term in re.findall(r'\+"([^"]+)"', against)]
+        )
+        return clause
+
+    monkeypatch.setattr(issue_dao, "mysql_match", like_match)
+    mysql_db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+
+    for keyword in ("A 蓝屏", "蓝屏 a", "A", "B 启动"):
+        mysql_query = IssueDao._apply_keyword_search(mysql_db, select(IssueMain.issue_id), keyword)
+        assert set(db_session.execute(mysql_query).scalars()) == set(_search(db_session, keyword))
+    assert _search(db_session, "A 蓝屏") == [match_id]
+    assert _search(db_session, "B 启动") == []
+
+
+def test_search_index_updated_after_commit(db_session):
+    issue_id = _add_issue(db_session, title="休眠唤醒失败")
+
+    db_session.execute(update(IssueMain).where(IssueMain.issue_id == issue_id).values(title="网卡掉线"))
+    IssueDao.refresh_search_doc(db_session, [issue_id])
+    db_session.rollback()
+    # 回滚后进程内索引保持提交时的内容
+    assert _search(db_session, "网卡掉线") == []
+    assert _search(db_session, "休眠唤醒") == [issue_id]
+
+    db_session.execute(update(IssueMain).where(IssueMain.issue_id == issue_id).values(title="网卡掉线"))
+    IssueDao.refresh_search_doc(db_session, [issue_id])
+    db_session.commit()
+    assert _search(db_session, "网卡掉线") == [issue_id]
+    assert _search(db_session, "休眠唤醒") == []
+
+    # Issue已不存在时从索引中删除
+    db_session.execute(delete(IssueMain).where(IssueMain.issue_id == issue_id))
+    IssueDao.refresh_search_doc(db_session, [issue_id])
+    db_session.commit()
+    assert SearchIndexUtil.get_index(db_session.get_bind().engine).search("网卡掉线") == []
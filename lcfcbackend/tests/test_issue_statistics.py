@@ -0,0 +1,94 @@
+"""
+Issue统计计数单元测试
+"""
+
+from sqlalchemy import update
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueStatCounter
+from module_admin.entity.vo.issue_vo import (
+    AddDiagnosisLogModel,
+    AddIssueModel,
+    DeleteIssueModel,
+    EditIssueModel,
+    IssuePageQueryModel,
+)
+from module_admin.service.issue_service import IssueService
+
+
+def _add_issue(db_session, title, **kwargs):
+    data = dict(title=title, priority="low", issueType="BUG")
+    data.update(kwargs)
+    result = IssueService.add_issue_services(db_session, AddIssueModel(**data))
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _statistics(db_session):
+    return IssueService.get_issue_statistics_services(db_session).model_dump()
+
+
+def test_aggregate_statistics(db_session):
+    _add_issue(db_session, "统计一", priority="high")
+    _add_issue(db_session, "统计二", status="completed")
+
+    assert IssueDao.get_issue_statistics(db_session) == {
+        "total_count": 2,
+        "monthly_new_count": 2,
+        "pending_count": 1,
+        "diagnosis_count": 0,
+        "high_priority_count": 1,
+        "completed_count": 1,
+    }
+
+
+def test_counters_follow_writes(db_session):
+    first_id = _add_issue(db_session, "计数一")
+    # 首次读取时以实时聚合结果初始化计数表
+    assert IssueDao.get_issue_stat_counters(db_session) is None
+    assert _statistics(db_session)["total_count"] == 1
+    assert IssueDao.get_issue_stat_counters(db_session) is not None
+
+    second_id = _add_issue(db_session, "计数二", priority="high")
+    assert _statistics(db_session) == IssueDao.get_issue_statistics(db_session)
+
+    IssueService.add_diagnosis_log_services(
+        db_session, AddDiagnosisLogModel(issueId=first_id, stepName="分析", operator="tester")
+    )
+    assert _statistics(db_session) == IssueDao.get_issue_statistics(db_session)
+
+    IssueService.edit_issue_services(
+        db_session, EditIssueModel(issueId=second_id, status="completed", priority="low")
+    )
+    assert _statistics(db_session) == IssueDao.get_issue_statistics(db_session)
+
+    IssueService.delete_issue_services(db_session, DeleteIssueModel(issueIds=f"{first_id},{second_id}"))
+    assert _statistics(db_session) == IssueDao.get_issue_statistics(db_session)
+    assert _statistics(db_session)["total_count"] == 0
+    assert _statistics(db_session)["diagnosis_count"] == 1
+
+
+def test_failed_write_does_not_change_counters(db_session):
+    _add_issue(db_session, "计数回滚")
+    before = _statistics(db_session)
+
+    result = IssueService.edit_issue_services(db_session, EditIssueModel(issueId=999, status="completed"))
+    assert not result.is_success
+    assert _statistics(db_session) == before
+
+
+def test_reconcile_fixes_drift(db_session):
+    _add_issue(db_session, "校准")
+    _statistics(db_session)
+    db_session.execute(
+        update(IssueStatCounter)
+        .where(IssueStatCounter.counter_key == "total_count")
+        .values(counter_value=42)
+    )
+    db_session.commit()
+    assert _statistics(db_session)["total_count"] == 42
+
+    result = IssueService.reconcile_issue_statistics_services(db_session)
+    assert result.is_success, result.message
+    assert result.result == {"total_count": (42, 1)}
+    assert _statistics(db_session)["total_count"] == 1
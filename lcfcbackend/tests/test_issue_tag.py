@@ -0,0 +1,109 @@
+"""
+Issue标签字典及差集更新单元测试
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event, select, update
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueTagDict
+from module_admin.entity.vo.issue_vo import (
+    AddIssueModel,
+    DeleteIssueModel,
+    EditIssueModel,
+    IssuePageQueryModel,
+)
+from module_admin.service.issue_service import IssueService
+
+
+@contextmanager
+def _count_statements(db_session):
+    statements = []
+    engine = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _add_issue(db_session, title, tags):
+    result = IssueService.add_issue_services(
+        db_session, AddIssueModel(title=title, priority="low", issueType="BUG", tags=tags)
+    )
+    assert result.is_success, result.message
+    return IssueDao.get_issue_list(db_session, IssuePageQueryModel(title=title))[0]["issueId"]
+
+
+def _usage(db_session):
+    return dict(db_session.execute(select(IssueTagDict.tag_name, IssueTagDict.usage_count)).all())
+
+
+def _tag_names(db_session, issue_id):
+    return sorted(tag.tag_name for tag in IssueDao.get_issue_by_id(db_session, issue_id)["tags"])
+
+
+def test_tags_are_shared_and_counted(db_session):
+    first_id = _add_issue(db_session, "标签一", ["windows", "蓝屏", " windows "])
+    second_id = _add_issue(db_session, "标签二", ["Windows", "网络"])
+
+    assert _usage(db_session) == {"windows": 2, "蓝屏": 1, "网络": 1}
+    assert _tag_names(db_session, first_id) == ["windows", "蓝屏"]
+    assert _tag_names(db_session, second_id) == ["windows", "网络"]
+
+
+def test_edit_only_touches_changed_tags(db_session):
+    issue_id = _add_issue(db_session, "差集更新", ["a", "b", "c"])
+
+    with _count_statements(db_session) as statements:
+        IssueService.edit_issue_services(
+            db_session, EditIssueModel(issueId=issue_id, tags=["c", "b", "a"])
+        )
+    assert not [sql for sql in statements if "issue_tag" in sql and not sql.startswith("SELECT")]
+
+    with _count_statements(db_session) as statements:
+        IssueService.edit_issue_services(
+            db_session, EditIssueModel(issueId=issue_id, tags=["a", "b", "d"])
+        )
+    tag_writes = [sql for sql in statements if sql.startswith(("INSERT INTO issue_tag ", "DELETE FROM issue_tag "))]
+    assert len(tag_writes) == 2
+    assert _tag_names(db_session, issue_id) == ["a", "b", "d"]
+    assert _usage(db_session) == {"a": 1, "b": 1, "c": 0, "d": 1}
+
+
+def test_tag_filter_and_top_tags(db_session):
+    first_id = _add_issue(db_session, "过滤一", ["gpu", "bsod"])
+    second_id = _add_issue(db_session, "过滤二", ["gpu"])
+    _add_issue(db_session, "过滤三", ["network"])
+
+    def _filter(tag_names):
+        return sorted(
+            issue["issueId"]
+            for issue in IssueDao.get_issue_list(db_session, IssuePageQueryModel(tagNames=tag_names))
+        )
+
+    assert _filter("gpu") == sorted([first_id, second_id])
+    assert _filter("gpu,bsod") == [first_id]
+    assert _filter("不存在") == []
+
+    top_tags = IssueService.get_top_tags_services(db_session, 2)
+    assert [(tag.tag_name, tag.usage_count) for tag in top_tags] == [("gpu", 2), ("bsod", 1)]
+
+    IssueService.delete_issue_services(db_session, DeleteIssueModel(issueIds=f"{first_id},{second_id}"))
+    assert [tag.tag_name for tag in IssueService.get_top_tags_services(db_session, 10)] == ["network"]
+
+
+def test_reconcile_fixes_usage_drift(db_session):
+    _add_issue(db_session, "校准标签", ["x"])
+    db_session.execute(update(IssueTagDict).values(usage_count=7))
+    db_session.commit()
+
+    result = IssueService.reconcile_issue_statistics_services(db_session)
+    assert result.is_success, result.message
+    assert result.result["tag_usage_count"] == 1
+    assert _usage(db_session) == {"x": 1}
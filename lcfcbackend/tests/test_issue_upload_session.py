@@ -0,0 +1,254 @@
+"""
+Issue附件分片上传(断点续传)单元测试
+"""
+
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from config.constant import AttachmentConstant
+from config.database import Base
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueAttachment, IssueUploadChunk, IssueUploadSession
+from module_admin.entity.vo.issue_vo import CreateUploadSessionModel
+from module_admin.service.issue_service import IssueService
+from utils.upload_util import UploadUtil
+
+CHUNK_SIZE = 1000
+
+
+@pytest.fixture
+def upload_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadConfig, "UPLOAD_PATH", str(tmp_path / "upload"))
+    monkeypatch.setattr(AttachmentConstant, "MIN_CHUNK_SIZE", 1)
+    return tmp_path / "upload"
+
+
+async def _stream(data: bytes):
+    for offset in range(0, len(data), 300):
+        yield data[offset : offset + 300]
+
+
+def _create(db_session, data: bytes, file_name="crash.dmp", upload_by="engineer"):
+    result = IssueService.create_upload_session_services(
+        db_session,
+        CreateUploadSessionModel(fileName=file_name, fileSize=len(data), chunkSize=CHUNK_SIZE),
+        upload_by,
+    )
+    assert result.is_success, result.message
+    return result.result
+
+
+def _put(db_session, upload_id, data: bytes, index: int, upload_by="engineer"):
+    offset = index * CHUNK_SIZE
+    return asyncio.run(
+        IssueService.upload_chunk_services(
+            db_session, upload_id, offset, _stream(data[offset : offset + CHUNK_SIZE]), upload_by
+        )
+    )
+
+
+def _session_path(upload_path, upload_id):
+    return upload_path / AttachmentConstant.SESSION_PATH / f"{upload_id}.part"
+
+
+def test_out_of_order_resume_and_complete(db_session, upload_path):
+    data = os.urandom(4 * CHUNK_SIZE + 321)
+    upload_session = _create(db_session, data)
+    assert (upload_session.chunk_count, upload_session.uploaded_chunks) == (5, [])
+
+    for index in (4, 1, 1, 3):
+        assert _put(db_session, upload_session.upload_id, data, index).is_success
+    progress = IssueService.get_upload_session_services(db_session, upload_session.upload_id, "engineer")
+    assert progress.uploaded_chunks == [1, 3, 4]
+    assert progress.uploaded_size == 2 * CHUNK_SIZE + 321
+
+    result = IssueService.complete_upload_session_services(db_session, upload_session.upload_id, "engineer")
+    assert not result.is_success
+    assert "2个分片" in result.message
+
+    # 断线重连后只补传缺失的分片
+    for index in (2, 0):
+        assert _put(db_session, upload_session.upload_id, data, index).is_success
+    result = IssueService.complete_upload_session_services(db_session, upload_session.upload_id, "engineer")
+
+    assert result.is_success, result.message
+    attachment = result.result
+    assert (attachment.file_size, attachment.file_hash) == (len(data), hashlib.sha256(data).hexdigest())
+    with open(attachment.file_path, "rb") as f:
+        assert f.read() == data
+    row = db_session.execute(select(IssueAttachment)).scalars().one()
+    assert (row.attachment_id, row.status) == (attachment.attachment_id, "temporary")
+    assert db_session.execute(select(IssueUploadSession)).first() is None
+    assert db_session.execute(select(IssueUploadChunk)).first() is None
+    assert os.listdir(upload_path / AttachmentConstant.SESSION_PATH) == []
+
+
+def test_chunk_validation(db_session, upload_path):
+    data = os.urandom(2 * CHUNK_SIZE)
+    upload_session = _create(db_session, data)
+
+    for offset in (-1, 10, 2 * CHUNK_SIZE):
+        with pytest.raises(ServiceException):
+            asyncio.run(
+                IssueService.upload_chunk_services(
+                    db_session, upload_session.upload_id, offset, _stream(b"x"), "engineer"
+                )
+            )
+    # 分片数据不完整或超长时不记录
+    with pytest.raises(ServiceException):
+        asyncio.run(
+            IssueService.upload_chunk_services(
+                db_session, upload_session.upload_id, 0, _stream(data[:500]), "engineer"
+            )
+        )
+    with pytest.raises(ServiceException):
+        asyncio.run(
+            IssueService.upload_chunk_services(
+                db_session, upload_session.upload_id, 0, _stream(data + b"x"), "engineer"
+            )
+        )
+    # 其他用户无法访问会话
+    with pytest.raises(ServiceException):
+        _put(db_session, upload_session.upload_id, data, 0, upload_by="someone")
+    assert IssueService.get_upload_session_services(
+        db_session, upload_session.upload_id, "engineer"
+    ).uploaded_chunks == []
+
+    result = IssueService.create_upload_session_services(
+        db_session, CreateUploadSessionModel(fileName="tool.exe", fileSize=10), "engineer"
+    )
+    assert not result.is_success
+
+
+def test_chunk_streamed_without_transaction(db_session, upload_path):
+    data = os.urandom(2 * CHUNK_SIZE)
+    upload_session = _create(db_session, data)
+    in_transaction = []
+
+    async def stream(chunk: bytes):
+        in_transaction.append(db_session.in_transaction())
+        yield chunk
+
+    # 接收分片期间不持有事务，也就不占用连接和行锁
+    result = asyncio.run(
+        IssueService.upload_chunk_services(db_session, upload_session.upload_id, 0, stream(data[:CHUNK_SIZE]), "engineer")
+    )
+    assert result.is_success and in_transaction == [False]
+
+    # 分片写入期间会话进入完成中状态时，分片不被记录
+    async def completing_stream(chunk: bytes):
+        assert IssueDao.update_upload_session_status(db_session, upload_session.upload_id, "completing", "uploading")
+        db_session.commit()
+        yield chunk
+
+    result = asyncio.run(
+        IssueService.upload_chunk_services(
+            db_session, upload_session.upload_id, CHUNK_SIZE, completing_stream(data[CHUNK_SIZE:]), "engineer"
+        )
+    )
+    assert not result.is_success
+    assert db_session.execute(select(IssueUploadChunk.chunk_index)).scalars().all() == [0]
+    # 完成中的会话不再接收分片，也不能取消
+    with pytest.raises(ServiceException):
+        _put(db_session, upload_session.upload_id, data, 1)
+    result = IssueService.delete_upload_session_services(db_session, upload_session.upload_id, "engineer")
+    assert not result.is_success
+
+
+def test_complete_detects_concurrent_chunk_write(db_session, upload_path, monkeypatch):
+    data = os.urandom(2 * CHUNK_SIZE)
+    upload_session = _create(db_session, data)
+    for index in range(2):
+        assert _put(db_session, upload_session.upload_id, data, index).is_success
+    hash_file = UploadUtil.hash_file
+
+    def hash_during_write(filepath, *args):
+        # 计算摘要期间仍在写入的重复分片修改了文件
+        assert not db_session.in_transaction()
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return hash_file(filepath, *args)
+
+    monkeypatch.setattr(UploadUtil, "hash_file", hash_during_write)
+    result = IssueService.complete_upload_session_services(db_session, upload_session.upload_id, "engineer")
+    assert not result.is_success
+    # 临时文件及会话状态已恢复，可以重试
+    assert os.path.exists(_session_path(upload_path, upload_session.upload_id))
+    assert db_session.get(IssueUploadSession, upload_session.upload_id).status == "uploading"
+
+    monkeypatch.setattr(UploadUtil, "hash_file", hash_file)
+    result = IssueService.complete_upload_session_services(db_session, upload_session.upload_id, "engineer")
+    assert result.is_success, result.message
+    assert result.result.file_hash == hashlib.sha256(data).hexdigest()
+    assert os.listdir(upload_path / AttachmentConstant.SESSION_PATH) == []
+
+
+def test_chunk_write_stops_after_file_moved(db_session, upload_path, monkeypatch):
+    monkeypatch.setattr(AttachmentConstant, "STREAM_WRITE_SIZE", 100)
+    data = os.urandom(CHUNK_SIZE)
+    upload_session = _create(db_session, data)
+    temp_path = _session_path(upload_path, upload_session.upload_id)
+
+    async def stream():
+        yield data[:500]
+        # 完成上传已将临时文件移走
+        os.replace(temp_path, f"{temp_path}.moved")
+        yield data[500:]
+
+    with pytest.raises(ServiceException):
+        asyncio.run(IssueService.upload_chunk_services(db_session, upload_session.upload_id, 0, stream(), "engineer"))
+    with open(f"{temp_path}.moved", "rb") as f:
+        assert f.read(CHUNK_SIZE)[500:] == bytes(CHUNK_SIZE - 500)
+
+
+def test_parallel_chunk_uploads(tmp_path, upload_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'upload_session.db'}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    data = os.urandom(16 * CHUNK_SIZE)
+    with session_factory() as db:
+        upload_session = _create(db, data)
+
+    def put(index):
+        with session_factory() as db:
+            return _put(db, upload_session.upload_id, data, index)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(put, reversed(range(16))))
+    assert all(result.is_success for result in results)
+
+    with session_factory() as db:
+        result = IssueService.complete_upload_session_services(db, upload_session.upload_id, "engineer")
+    assert result.is_success, result.message
+    assert result.result.file_hash == hashlib.sha256(data).hexdigest()
+    engine.dispose()
+
+
+def test_expired_sessions_are_cleaned(db_session, upload_path):
+    data = os.urandom(CHUNK_SIZE)
+    expired = _create(db_session, data)
+    active = _create(db_session, data)
+    db_session.execute(
+        update(IssueUploadSession)
+        .where(IssueUploadSession.upload_id == expired.upload_id)
+        .values(update_time=datetime.now() - timedelta(hours=25))
+    )
+    db_session.commit()
+
+    result = IssueService.clean_temporary_attachments_services(db_session, 24)
+
+    assert result.is_success, result.message
+    assert db_session.execute(select(IssueUploadSession.upload_id)).scalars().all() == [active.upload_id]
+    assert os.listdir(upload_path / AttachmentConstant.SESSION_PATH) == [f"{active.upload_id}.part"]
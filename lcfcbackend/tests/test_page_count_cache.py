@@ -0,0 +1,73 @@
+"""
+分页总数缓存单元测试
+"""
+
+from sqlalchemy import update
+
+from module_admin.dao.issue_dao import IssueDao
+from module_admin.entity.do.issue_do import IssueMain
+from module_admin.entity.vo.issue_vo import AddIssueModel, IssuePageQueryModel
+from module_admin.service.issue_service import IssueService
+from utils.page_util import PageCountCache
+
+
+def _add_issues(db_session, count, **kwargs):
+    for i in range(count):
+        data = dict(title=f"缓存测试{i}", priority="low", issueType="BUG")
+        data.update(kwargs)
+        result = IssueService.add_issue_services(db_session, AddIssueModel(**data))
+        assert result.is_success, result.message
+
+
+def _page(db_session, **kwargs):
+    return IssueDao.get_issue_list(
+        db_session, IssuePageQueryModel(pageSize=5, **kwargs), is_page=True
+    )
+
+
+def test_total_is_cached_across_pages(db_session):
+    _add_issues(db_session, 12)
+    PageCountCache.clear()
+
+    assert _page(db_session, pageNum=1).total == 12
+    assert _page(db_session, pageNum=2).total == 12
+    assert _page(db_session, pageNum=3).total == 12
+
+    stats = PageCountCache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_filters_are_cached_separately(db_session):
+    _add_issues(db_session, 3, priority="high")
+    _add_issues(db_session, 2, priority="low")
+    PageCountCache.clear()
+
+    assert _page(db_session, priority="high").total == 3
+    assert _page(db_session, priority="low").total == 2
+    assert PageCountCache.stats()["misses"] == 2
+
+
+def test_commit_invalidates_total(db_session):
+    _add_issues(db_session, 4)
+    PageCountCache.clear()
+    assert _page(db_session).total == 4
+
+    _add_issues(db_session, 1)
+    assert _page(db_session).total == 5
+
+    db_session.execute(update(IssueMain).values(del_flag="2"))
+    assert _page(db_session).total == 5
+    db_session.commit()
+    assert _page(db_session).total == 0
+
+
+def test_rollback_keeps_cache(db_session):
+    _add_issues(db_session, 2)
+    PageCountCache.clear()
+    assert _page(db_session).total == 2
+
+    db_session.execute(update(IssueMain).values(del_flag="2"))
+    db_session.rollback()
+    assert _page(db_session).total == 2
+    assert PageCountCache.stats()["hits"] == 1
@@ -0,0 +1,184 @@
+import os
+import struct
+import zstandard
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+
+class CompressUtil:
+    """
+    zstd可寻址压缩工具类
+
+    文件按固定原始大小切分为相互独立的zstd帧，文件末尾追加记录各帧压缩前后大小的跳过帧(seek table)，
+    格式与zstd官方contrib/seekable_format一致：标准zstd解码器可直接解压整个文件，
+    读取任意字节区间时只需解压覆盖该区间的帧
+    """
+
+    SKIPPABLE_MAGIC = 0x184D2A5E
+    SEEKABLE_MAGIC = 0x8F92EAB1
+    FOOTER_SIZE = 9
+    ENTRY_SIZE = 8
+
+    @classmethod
+    def compress_file(cls, src_path: str, dst_path: str, frame_size: int, level: int):
+        """
+        将文件压缩为zstd可寻址格式
+
+        :param src_path: 原始文件路径
+        :param dst_path: 压缩文件路径
+        :param frame_size: 每帧的原始数据大小
+        :param level: 压缩级别
+        :return: 压缩文件大小
+        """
+        compressor = zstandard.ZstdCompressor(level=level, write_checksum=True, write_content_size=True)
+        entries = []
+        with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(frame_size), b''):
+                frame = compressor.compress(chunk)
+                dst.write(frame)
+                entries.append((len(frame), len(chunk)))
+            dst.write(cls._build_seek_table(entries))
+            dst.flush()
+            os.fsync(dst.fileno())
+
+            return dst.tell()
+
+    @classmethod
+    def read_seek_table(cls, file_path: str) -> List[Tuple[int, int]]:
+        """
+        读取压缩文件的帧索引
+
+        :param file_path: 压缩文件路径
+        :return: 各帧的(压缩后大小, 原始大小)列表
+        """
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size < cls.FOOTER_SIZE + 8:
+                raise ValueError(f'不是zstd可寻址格式文件: {file_path}')
+            f.seek(file_size - cls.FOOTER_SIZE)
+            frame_count, descriptor, magic = struct.unpack('<IBI', f.read(cls.FOOTER_SIZE))
+            entry_size = cls.ENTRY_SIZE + (4 if descriptor & 0x80 else 0)
+            table_size = frame_count * entry_size
+            if magic != cls.SEEKABLE_MAGIC or file_size < table_size + cls.FOOTER_SIZE + 8:
+                raise ValueError(f'不是zstd可寻址格式文件: {file_path}')
+            f.seek(file_size - cls.FOOTER_SIZE - table_size)
+            table = f.read(table_size)
+
+        return [struct.unpack_from('<II', table, index * entry_size) for index in range(frame_count)]
+
+    @classmethod
+    def get_content_size(cls, file_path: str):
+        """
+        获取压缩文件的原始数据大小
+
+        :param file_path: 压缩文件路径
+        :return: 原始数据大小
+        """
+        return sum(content_size for _, content_size in cls.read_seek_table(file_path))
+
+    @classmethod
+    def iter_range(cls, file_path: str, offset: int, length: int) -> Iterator[bytes]:
+        """
+        按原始数据偏移读取压缩文件的字节区间，每次解压一帧
+
+        :param file_path: 压缩文件路径
+        :param offset: 原始数据起始偏移
+        :param length: 读取长度
+        :yield: 解压后的数据
+        """
+        decompressor = zstandard.ZstdDecompressor()
+        end = offset + length
+        compressed_offset = content_offset = 0
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            for compressed_size, content_size in cls.read_seek_table(file_path):
+                if content_offset >= end:
+                    break
+                if content_offset + content_size > offset:
+                    frame = os.pread(fd, compressed_size, compressed_offset)
+                    data = decompressor.decompress(frame, max_output_size=content_size)
+                    yield data[max(offset - content_offset, 0) : end - content_offset]
+                compressed_offset += compressed_size
+                content_offset += content_size
+        finally:
+            os.close(fd)
+
+    @classmethod
+    def read_range(cls, file_path: str, offset: int, length: int):
+        """
+        按原始数据偏移读取压缩文件的字节区间
+
+        :param file_path: 压缩文件路径
+        :param offset: 原始数据起始偏移
+        :param length: 读取长度
+        :return: 解压后的数据
+        """
+        return b''.join(cls.iter_range(file_path, offset, length))
+
+    @classmethod
+    def _build_seek_table(cls, entries: List[Tuple[int, int]]):
+        table = b''.join(struct.pack('<II', compressed_size, content_size) for compressed_size, content_size in entries)
+        footer = struct.pack('<IBI', len(entries), 0, cls.SEEKABLE_MAGIC)
+
+        return struct.pack('<II', cls.SKIPPABLE_MAGIC, len(table) + len(footer)) + table + footer
+
+
+class SeekableZstdReader:
+    """
+    zstd可寻址格式压缩文件的随机读取对象，按原始数据偏移读取，缓存最近解压的一帧
+    """
+
+    def __init__(self, file_path: str):
+        self.content_offsets = []
+        self.compressed_offsets = []
+        self.frame_sizes = []
+        compressed_offset = content_offset = 0
+        for compressed_size, content_size in CompressUtil.read_seek_table(file_path):
+            self.compressed_offsets.append(compressed_offset)
+            self.content_offsets.append(content_offset)
+            self.frame_sizes.append((compressed_size, content_size))
+            compressed_offset += compressed_size
+            content_offset += content_size
+        self.size = content_offset
+        self._fd = os.open(file_path, os.O_RDONLY)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._frame_index = -1
+        self._frame = b''
+
+    def read(self, offset: int, length: int):
+        """
+        读取原始数据的字节区间
+
+        :param offset: 原始数据起始偏移
+        :param length: 读取长度
+        :return: 解压后的数据，超出文件末尾的部分被截断
+        """
+        parts = []
+        end = min(offset + length, self.size)
+        while offset < end:
+            frame_index = bisect_right(self.content_offsets, offset) - 1
+            frame = self._read_frame(frame_index)
+            start = offset - self.content_offsets[frame_index]
+            part = frame[start : start + end - offset]
+            parts.append(part)
+            offset += len(part)
+
+        return b''.join(parts)
+
+    def close(self):
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _read_frame(self, frame_index: int):
+        if frame_index != self._frame_index:
+            compressed_size, content_size = self.frame_sizes[frame_index]
+            frame = os.pread(self._fd, compressed_size, self.compressed_offsets[frame_index])
+            self._frame = self._decompressor.decompress(frame, max_output_size=content_size)
+            self._frame_index = frame_index
+
+        return self._frame
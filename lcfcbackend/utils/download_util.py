@@ -0,0 +1,343 @@
+import mimetypes
+import os
+import re
+import zipfile
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from functools import partial
+from typing import Callable, Optional, Tuple
+from urllib.parse import quote
+from utils.compress_util import CompressUtil
+from utils.zip_util import ZipMember, ZipUtil
+
+
+class RangeFileResponse(Response):
+    """
+    按字节区间发送文件的响应，服务器支持ASGI zerocopysend扩展时使用sendfile零拷贝发送，否则按固定大小分块读取
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        status_code: int,
+        headers: dict,
+        media_type: Optional[str],
+        offset: int = 0,
+        length: int = 0,
+        send_body: bool = True,
+        background: Optional[BackgroundTask] = None,
+    ):
+        self.path = path
+        self.status_code = status_code
+        self.media_type = media_type
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+        self.background = background
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        if not self.send_body or self.length <= 0:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        else:
+            await self.send_file_body(scope, send)
+        if self.background is not None:
+            await self.background()
+
+    async def send_file_body(self, scope: Scope, send: Send):
+        if 'http.response.zerocopysend' in scope.get('extensions', {}):
+            file = await run_in_threadpool(open, self.path, 'rb')
+            try:
+                await send(
+                    {
+                        'type': 'http.response.zerocopysend',
+                        'file': file,
+                        'offset': self.offset,
+                        'count': self.length,
+                        'more_body': False,
+                    }
+                )
+            finally:
+                await run_in_threadpool(file.close)
+        else:
+            fd = await run_in_threadpool(os.open, self.path, os.O_RDONLY)
+            try:
+                position = self.offset
+                remaining = self.length
+                while remaining > 0:
+                    data = await run_in_threadpool(os.pread, fd, min(self.chunk_size, remaining), position)
+                    if not data:
+                        # 文件在发送过程中被截断
+                        break
+                    position += len(data)
+                    remaining -= len(data)
+                    await send({'type': 'http.response.body', 'body': data, 'more_body': remaining > 0})
+                if remaining > 0:
+                    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            finally:
+                await run_in_threadpool(os.close, fd)
+
+
+class ZstdRangeResponse(RangeFileResponse):
+    """
+    从zstd可寻址格式的压缩文件中按原始数据的字节区间解压发送的响应
+    """
+
+    async def send_file_body(self, scope: Scope, send: Send):
+        remaining = self.length
+        async for data in iterate_in_threadpool(CompressUtil.iter_range(self.path, self.offset, self.length)):
+            remaining -= len(data)
+            await send({'type': 'http.response.body', 'body': data, 'more_body': remaining > 0})
+        if remaining > 0:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+
+class ZipMemberRangeResponse(RangeFileResponse):
+    """
+    发送压缩包内单个文件字节区间的响应，存储(未压缩)的文件直接按区间从压缩包发送，其余按需解压
+    """
+
+    def __init__(self, *args, member: ZipMember, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.member = member
+        if member.compress_type == zipfile.ZIP_STORED:
+            self.offset += member.data_offset
+
+    async def send_file_body(self, scope: Scope, send: Send):
+        if self.member.compress_type == zipfile.ZIP_STORED:
+            await super().send_file_body(scope, send)
+            return
+        remaining = self.length
+        async for data in iterate_in_threadpool(
+            ZipUtil.iter_member_range(self.path, self.member, self.offset, self.length)
+        ):
+            remaining -= len(data)
+            await send({'type': 'http.response.body', 'body': data, 'more_body': remaining > 0})
+        if remaining > 0:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+
+class DownloadUtil:
+    """
+    文件下载工具类，支持Range/If-Range断点续传、ETag/Last-Modified条件请求及HEAD请求，
+    zstd可寻址格式的压缩文件在客户端支持时直接发送压缩数据，否则按需解压；压缩包内的文件不解压整个压缩包直接发送
+    """
+
+    RANGE_PATTERN = re.compile(r'^bytes=\s*(\d*)\s*-\s*(\d*)\s*$')
+
+    @classmethod
+    def file_response(
+        cls,
+        request: Request,
+        file_path: str,
+        file_name: Optional[str] = None,
+        etag: Optional[str] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        compressed: bool = False,
+    ):
+        """
+        根据请求头构建文件下载响应
+
+        :param request: Request对象
+        :param file_path: 文件路径
+        :param file_name: 下载文件名，指定时以附件形式下载
+        :param etag: 实体标签(不含引号)，未指定时根据文件修改时间和大小生成
+        :param media_type: 媒体类型，未指定时根据文件名推断
+        :param background: 响应发送完成后执行的后台任务
+        :param compressed: 文件是否为zstd可寻址格式的压缩文件，是时file_name及media_type描述解压后的内容
+        :return: 文件下载响应
+        """
+        stat_result = os.stat(file_path)
+        file_size = stat_result.st_size
+        etag = etag or f'{int(stat_result.st_mtime_ns):x}-{file_size:x}'
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        headers = {'accept-ranges': 'bytes', 'last-modified': last_modified}
+        if file_name:
+            headers['content-disposition'] = f"attachment; filename*=utf-8''{quote(file_name)}"
+        media_type = (
+            media_type or mimetypes.guess_type(file_name or file_path)[0] or 'application/octet-stream'
+        )
+        response_class = RangeFileResponse
+        if compressed:
+            headers['vary'] = 'accept-encoding'
+            if 'range' not in request.headers and cls._accepts_encoding(request, 'zstd'):
+                # 客户端支持zstd时原样发送压缩文件，由客户端解压
+                headers['content-encoding'] = 'zstd'
+                etag = f'{etag}-zstd'
+            else:
+                response_class = ZstdRangeResponse
+                file_size = CompressUtil.get_content_size(file_path)
+
+        return cls._build_response(
+            request,
+            file_path,
+            headers,
+            f'"{etag}"',
+            int(stat_result.st_mtime),
+            file_size,
+            media_type,
+            background,
+            response_class,
+        )
+
+    @classmethod
+    def member_response(
+        cls,
+        request: Request,
+        file_path: str,
+        member: ZipMember,
+        etag: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        """
+        构建压缩包内单个文件的下载响应，支持与file_response相同的断点续传及条件请求
+
+        :param request: Request对象
+        :param file_path: 压缩包路径
+        :param member: 压缩包内的文件
+        :param etag: 压缩包的实体标签(不含引号)，未指定时根据文件修改时间和大小生成
+        :param background: 响应发送完成后执行的后台任务
+        :return: 文件下载响应
+        """
+        stat_result = os.stat(file_path)
+        etag = etag or f'{int(stat_result.st_mtime_ns):x}-{stat_result.st_size:x}'
+        file_name = member.name.rstrip('/').rsplit('/', 1)[-1]
+        headers = {
+            'accept-ranges': 'bytes',
+            'last-modified': formatdate(stat_result.st_mtime, usegmt=True),
+            'content-disposition': f"attachment; filename*=utf-8''{quote(file_name)}",
+        }
+        media_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+
+        return cls._build_response(
+            request,
+            file_path,
+            headers,
+            f'"{etag}-{member.header_offset:x}-{member.crc:08x}"',
+            int(stat_result.st_mtime),
+            member.file_size,
+            media_type,
+            background,
+            partial(ZipMemberRangeResponse, member=member),
+        )
+
+    @classmethod
+    def _build_response(
+        cls,
+        request: Request,
+        file_path: str,
+        headers: dict,
+        etag: str,
+        mtime: int,
+        file_size: int,
+        media_type: str,
+        background: Optional[BackgroundTask],
+        response_class: Callable[..., RangeFileResponse],
+    ):
+        """
+        根据条件请求及Range请求头构建304、206、416或200响应
+        """
+        headers['etag'] = etag
+        send_body = request.method != 'HEAD'
+        if cls._is_not_modified(request, etag, mtime):
+            return RangeFileResponse(file_path, 304, headers, None, send_body=False, background=background)
+
+        range_header = request.headers.get('range')
+        if range_header and cls._is_range_fresh(request.headers.get('if-range'), etag, mtime):
+            byte_range = cls.parse_range(range_header, file_size)
+            if byte_range is not None:
+                start, end = byte_range
+                if start >= file_size:
+                    headers['content-range'] = f'bytes */{file_size}'
+                    headers['content-length'] = '0'
+                    return RangeFileResponse(file_path, 416, headers, None, send_body=False, background=background)
+                headers['content-range'] = f'bytes {start}-{end}/{file_size}'
+                headers['content-length'] = str(end - start + 1)
+                return response_class(
+                    file_path, 206, headers, media_type, start, end - start + 1, send_body, background
+                )
+
+        headers['content-length'] = str(file_size)
+        return response_class(file_path, 200, headers, media_type, 0, file_size, send_body, background)
+
+    @classmethod
+    def parse_range(cls, range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+        """
+        解析单个字节区间的Range请求头，多个区间或格式不合法时返回None(按RFC 9110忽略Range返回完整文件)
+
+        :param range_header: Range请求头
+        :param file_size: 文件大小
+        :return: (起始偏移, 结束偏移)，起始偏移不小于文件大小时表示区间无法满足
+        """
+        match = cls.RANGE_PATTERN.match(range_header)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = file_size - 1 if not last else min(int(last), file_size - 1)
+            if last and int(last) < start:
+                return None
+        elif last:
+            # 后缀区间bytes=-n表示最后n个字节
+            start = max(file_size - int(last), 0) if int(last) else file_size
+            end = file_size - 1
+        else:
+            return None
+
+        return start, end
+
+    @classmethod
+    def _accepts_encoding(cls, request: Request, encoding: str):
+        for item in request.headers.get('accept-encoding', '').split(','):
+            name, _, params = item.partition(';')
+            if name.strip().lower() == encoding:
+                quality = params.strip().lower()
+                if not quality.startswith('q='):
+                    return True
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+
+        return False
+
+    @classmethod
+    def _is_not_modified(cls, request: Request, etag: str, mtime: int):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = cls._parse_http_date(request.headers.get('if-modified-since'))
+
+        return if_modified_since is not None and mtime <= if_modified_since
+
+    @classmethod
+    def _is_range_fresh(cls, if_range: Optional[str], etag: str, mtime: int):
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            # If-Range使用强比较，弱标签永远不匹配
+            return if_range == etag
+
+        return cls._parse_http_date(if_range) == mtime
+
+    @classmethod
+    def _parse_http_date(cls, value: Optional[str]):
+        if not value:
+            return None
+        try:
+            return int(parsedate_to_datetime(value).timestamp())
+        except (TypeError, ValueError):
+            return None
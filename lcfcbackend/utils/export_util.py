@@ -0,0 +1,182 @@
+import csv
+import io
+import re
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+from config.constant import ExportConstant
+from utils.zip_stream_util import ZipStreamEntry, ZipStreamUtil
+
+
+class ExportUtil:
+    """
+    流式导出工具类，逐行生成csv或xlsx文件并按块输出，内存占用与导出的行数无关
+    """
+
+    # XML 1.0不允许的控制字符，Excel无法打开包含这些字符的文件
+    ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+    XLSX_CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    )
+    XLSX_ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    )
+    XLSX_WORKBOOK = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+    XLSX_WORKBOOK_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    # 样式1为表头使用的粗体
+    XLSX_STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+    XLSX_SHEET_HEAD = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" '
+        'state="frozen"/></sheetView></sheetViews>'
+        '<sheetData>'
+    )
+    XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+
+    @classmethod
+    def format_value(cls, value: Any):
+        """
+        将单元格的值转换为导出的文本
+
+        :param value: 单元格的值
+        :return: 文本，空值为空字符串
+        """
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        if isinstance(value, date):
+            return value.strftime('%Y-%m-%d')
+        return str(value)
+
+    @classmethod
+    def iter_csv(cls, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+        """
+        流式生成csv文件，带BOM以便Excel识别UTF-8编码
+
+        :param header: 表头
+        :param rows: 数据行
+        :yield: csv文件数据
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow([cls.format_value(value) for value in row])
+            if buffer.tell() >= ExportConstant.CHUNK_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+
+    @classmethod
+    def iter_xlsx(
+        cls, header: Sequence[str], rows: Iterable[Sequence[Any]], sheet_name: str = 'Sheet1'
+    ) -> Iterator[bytes]:
+        """
+        流式生成只包含一个工作表的xlsx文件，单元格以内联字符串写入，工作表边生成边压缩边输出
+
+        :param header: 表头
+        :param rows: 数据行
+        :param sheet_name: 工作表名称
+        :yield: xlsx文件数据
+        """
+        now = datetime.now()
+        parts = [
+            ('[Content_Types].xml', cls.XLSX_CONTENT_TYPES),
+            ('_rels/.rels', cls.XLSX_ROOT_RELS),
+            ('xl/workbook.xml', cls.XLSX_WORKBOOK.format(sheet_name=escape(sheet_name, {'"': '&quot;'}))),
+            ('xl/_rels/workbook.xml.rels', cls.XLSX_WORKBOOK_RELS),
+            ('xl/styles.xml', cls.XLSX_STYLES),
+        ]
+        entries: List[ZipStreamEntry] = []
+        for name, content in parts:
+            data = content.encode('utf-8')
+            entries.append(ZipStreamEntry(name, len(data), now, True, partial(iter, [data])))
+        entries.append(
+            ZipStreamEntry('xl/worksheets/sheet1.xml', None, now, True, partial(cls._iter_sheet_xml, header, rows))
+        )
+        return ZipStreamUtil.iter_zip(entries)
+
+    @classmethod
+    def _iter_sheet_xml(cls, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+        """
+        按块生成工作表xml
+        """
+        parts = [cls.XLSX_SHEET_HEAD, cls._row_xml(header, 1)]
+        size = 0
+        for row in rows:
+            row_xml = cls._row_xml(row)
+            parts.append(row_xml)
+            size += len(row_xml)
+            if size >= ExportConstant.CHUNK_SIZE:
+                yield ''.join(parts).encode('utf-8')
+                parts.clear()
+                size = 0
+        parts.append(cls.XLSX_SHEET_TAIL)
+        yield ''.join(parts).encode('utf-8')
+
+    @classmethod
+    def _row_xml(cls, values: Sequence[Any], style: int = 0):
+        """
+        生成一行的xml，单元格不写坐标，按顺序排列
+        """
+        style_attr = f' s="{style}"' if style else ''
+        cells = []
+        for value in values:
+            if isinstance(value, int) and not isinstance(value, bool):
+                cells.append(f'<c{style_attr}><v>{value}</v></c>')
+                continue
+            text = cls.ILLEGAL_XML_CHARS.sub('', cls.format_value(value))[: ExportConstant.MAX_CELL_LENGTH]
+            if text:
+                cells.append(f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{escape(text)}</t></is></c>')
+            else:
+                cells.append(f'<c{style_attr}/>')
+        return f'<row>{"".join(cells)}</row>'
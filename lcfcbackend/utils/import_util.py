@@ -0,0 +1,110 @@
+import codecs
+import csv
+import json
+import os
+from openpyxl import load_workbook
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+from exceptions.exception import ServiceException
+
+
+class ImportUtil:
+    """
+    导入文件解析工具类，逐行读取上传文件，不一次性加载到内存
+    """
+
+    FILE_FORMATS = {
+        '.jsonl': 'jsonl',
+        '.ndjson': 'jsonl',
+        '.csv': 'csv',
+        '.xlsx': 'xlsx',
+        '.xlsm': 'xlsx',
+    }
+
+    @classmethod
+    def get_file_format(cls, filename: str) -> str:
+        """
+        根据文件名获取导入文件格式
+
+        :param filename: 文件名
+        :return: 文件格式(jsonl、csv、xlsx)
+        """
+        file_format = cls.FILE_FORMATS.get(os.path.splitext(filename or '')[1].lower())
+        if not file_format:
+            raise ServiceException(message='仅支持导入JSONL、CSV、Excel(xlsx)格式的文件')
+
+        return file_format
+
+    @classmethod
+    def iter_rows(
+        cls, file: BinaryIO, file_format: str
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        逐行解析导入文件
+
+        :param file: 二进制文件对象
+        :param file_format: 文件格式
+        :return: (行号, 行数据字典, 解析错误信息)迭代器，行号从1开始，CSV/Excel的表头为第1行，CSV的行号为记录起始所在的行
+        """
+        if file_format == 'jsonl':
+            yield from cls._iter_jsonl_rows(file)
+        elif file_format == 'csv':
+            yield from cls._iter_csv_rows(file)
+        elif file_format == 'xlsx':
+            yield from cls._iter_xlsx_rows(file)
+        else:
+            raise ServiceException(message=f'不支持的导入文件格式: {file_format}')
+
+    @classmethod
+    def _iter_jsonl_rows(cls, file: BinaryIO):
+        for row_number, line in enumerate(codecs.iterdecode(file, 'utf-8-sig'), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, None, f'JSON格式错误: {e}'
+                continue
+            if not isinstance(row, dict):
+                yield row_number, None, '每行必须是一个JSON对象'
+                continue
+            yield row_number, row, None
+
+    @classmethod
+    def _iter_csv_rows(cls, file: BinaryIO):
+        reader = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+        header = None
+        line_number = 0
+        for values in reader:
+            # 引号内的单元格可以包含换行，行号取记录起始所在的行
+            row_number, line_number = line_number + 1, reader.line_num
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+            row = cls._build_row(header, values)
+            if row:
+                yield row_number, row, None
+
+    @classmethod
+    def _iter_xlsx_rows(cls, file: BinaryIO):
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            header = None
+            for row_number, values in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+                if header is None:
+                    header = [str(value).strip() if value is not None else '' for value in values]
+                    continue
+                row = cls._build_row(header, values)
+                if row:
+                    yield row_number, row, None
+        finally:
+            workbook.close()
+
+    @classmethod
+    def _build_row(cls, header, values):
+        row = {}
+        for key, value in zip(header, values):
+            if isinstance(value, str):
+                value = value.strip()
+            if key and value not in (None, ''):
+                row[key] = value
+        return row
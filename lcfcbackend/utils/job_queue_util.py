@@ -0,0 +1,473 @@
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Optional
+from redis import Redis
+from sqlalchemy.orm import Session
+from config.constant import AnalysisJobConstant
+from utils.log_util import logger
+from utils.transaction_util import TransactionUtil
+
+
+class AnalysisJobQueue(ABC):
+    """
+    附件分析任务队列
+
+    任务按优先级(AnalysisJobConstant.PRIORITIES)先后执行，同一优先级按提交顺序执行。worker领取任务时获得租约，
+    上报进度时续约，租约过期(worker退出或卡死)的任务与执行失败的任务一样按指数退避重试，达到最多执行次数后标记为失败。
+    任务以字典表示，状态为queued(等待执行，含等待重试)、running、success、failed
+    """
+
+    INT_FIELDS = ('job_id', 'issue_id', 'attempts', 'max_attempts', 'processed', 'total', 'score')
+    TIME_FIELDS = ('enqueue_time', 'start_time', 'finish_time', 'next_run_time')
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        :param clock: 返回当前时间戳的函数
+        """
+        self.clock = clock
+
+    @abstractmethod
+    def enqueue(self, job_type: str, issue_id: Optional[int] = None, priority: Optional[str] = None):
+        """
+        提交任务
+
+        :param job_type: 任务类型
+        :param issue_id: Issue ID，为空时处理全部Issue的附件
+        :param priority: Issue优先级
+        :return: 任务ID
+        """
+
+    @abstractmethod
+    def dequeue(self, worker: str):
+        """
+        领取优先级最高的任务，已到重试时间的任务先放回队列
+
+        :param worker: worker名称
+        :return: 任务，队列为空时返回None
+        """
+
+    @abstractmethod
+    def update_progress(self, job: dict, processed: int, total: int, message: Optional[str] = None):
+        """
+        上报任务进度并续约
+
+        :param job: 领取的任务
+        :param processed: 已处理数
+        :param total: 总数
+        :param message: 进度说明
+        :return: 是否仍持有任务，任务已因租约过期被收回时返回False
+        """
+
+    def complete(self, job: dict, message: Optional[str] = None):
+        """
+        标记任务执行成功
+
+        :param job: 领取的任务
+        :param message: 执行结果
+        :return: 是否仍持有任务
+        """
+        return self._finish(job, 'success', dict(message=message, finish_time=self._now()))
+
+    def fail(self, job: dict, error: str):
+        """
+        标记任务执行失败，未达到最多执行次数时等待后重试
+
+        :param job: 领取的任务
+        :param error: 失败原因
+        :return: 是否仍持有任务
+        """
+        return self._finish(job, *self._get_failure(job, error))
+
+    @abstractmethod
+    def recover_expired(self):
+        """
+        收回租约已过期的任务，按执行失败处理
+
+        :return: 收回的任务数
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: int):
+        """
+        获取任务
+
+        :param job_id: 任务ID
+        :return: 任务，不存在或已过期时返回None
+        """
+
+    @abstractmethod
+    def get_issue_jobs(self, issue_id: int):
+        """
+        获取Issue的全部任务
+
+        :param issue_id: Issue ID
+        :return: 按提交顺序排列的任务列表
+        """
+
+    @abstractmethod
+    def _finish(self, job: dict, status: str, fields: dict):
+        """
+        结束worker持有的任务
+
+        :param job: 领取的任务
+        :param status: 结束后的状态
+        :param fields: 更新的字段
+        :return: 是否仍持有任务
+        """
+
+    def _new_job(self, job_id: int, job_type: str, issue_id: Optional[int], priority: Optional[str]):
+        """
+        构建新任务
+        """
+        if job_type not in AnalysisJobConstant.JOB_TYPES:
+            raise ValueError(f'不支持的任务类型: {job_type}')
+        if priority not in AnalysisJobConstant.PRIORITIES:
+            priority = AnalysisJobConstant.DEFAULT_PRIORITY
+        return dict(
+            job_id=job_id,
+            job_type=job_type,
+            issue_id=issue_id,
+            priority=priority,
+            status='queued',
+            attempts=0,
+            max_attempts=AnalysisJobConstant.MAX_ATTEMPTS,
+            processed=0,
+            total=0,
+            # 同一优先级按任务ID先后执行
+            score=AnalysisJobConstant.PRIORITIES[priority] * 10**12 + job_id,
+            enqueue_time=self._now(),
+        )
+
+    def _get_failure(self, job: dict, error: str):
+        """
+        根据已执行次数确定失败后的状态
+
+        :return: (状态, 更新的字段)
+        """
+        fields = dict(error=error[: AnalysisJobConstant.MAX_ERROR_LENGTH])
+        if job['attempts'] < job['max_attempts']:
+            delay = AnalysisJobConstant.RETRY_DELAY * 2 ** (job['attempts'] - 1)
+            fields['next_run_time'] = self._now(delay)
+            return 'queued', fields
+        fields['finish_time'] = self._now()
+        return 'failed', fields
+
+    def _now(self, delay: float = 0):
+        return datetime.fromtimestamp(int(self.clock() + delay))
+
+
+class MemoryJobQueue(AnalysisJobQueue):
+    """
+    进程内的任务队列，与RedisJobQueue行为一致，用于测试及单进程运行
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        super().__init__(clock)
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, dict] = {}
+        self._queue = []
+        self._delayed: Dict[int, float] = {}
+        self._running: Dict[int, float] = {}
+
+    def enqueue(self, job_type: str, issue_id: Optional[int] = None, priority: Optional[str] = None):
+        with self._lock:
+            job = self._new_job(len(self._jobs) + 1, job_type, issue_id, priority)
+            self._jobs[job['job_id']] = job
+            heapq.heappush(self._queue, (job['score'], job['job_id']))
+            return job['job_id']
+
+    def dequeue(self, worker: str):
+        with self._lock:
+            now = self.clock()
+            for job_id, ready_time in list(self._delayed.items()):
+                if ready_time <= now:
+                    del self._delayed[job_id]
+                    heapq.heappush(self._queue, (self._jobs[job_id]['score'], job_id))
+            if not self._queue:
+                return None
+            _, job_id = heapq.heappop(self._queue)
+            job = self._jobs[job_id]
+            job.update(status='running', worker=worker, start_time=self._now(), processed=0, total=0)
+            job.pop('next_run_time', None)
+            job['attempts'] += 1
+            self._running[job_id] = now + AnalysisJobConstant.LEASE_SECONDS
+            return dict(job)
+
+    def update_progress(self, job: dict, processed: int, total: int, message: Optional[str] = None):
+        with self._lock:
+            if not self._holds(job):
+                return False
+            self._running[job['job_id']] = self.clock() + AnalysisJobConstant.LEASE_SECONDS
+            self._jobs[job['job_id']].update(processed=processed, total=total)
+            if message is not None:
+                self._jobs[job['job_id']]['message'] = message
+            return True
+
+    def recover_expired(self):
+        with self._lock:
+            now = self.clock()
+            expired = [job_id for job_id, deadline in self._running.items() if deadline <= now]
+        return sum(
+            self._finish(job, *self._get_failure(job, '任务执行超时'))
+            for job in filter(None, map(self.get_job, expired))
+        )
+
+    def get_job(self, job_id: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def get_issue_jobs(self, issue_id: int):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values() if job['issue_id'] == issue_id]
+
+    def _holds(self, job: dict):
+        return job['job_id'] in self._running and self._jobs[job['job_id']]['attempts'] == job['attempts']
+
+    def _finish(self, job: dict, status: str, fields: dict):
+        with self._lock:
+            if not self._holds(job):
+                return False
+            del self._running[job['job_id']]
+            self._jobs[job['job_id']].update(status=status, **fields)
+            if status == 'queued':
+                self._delayed[job['job_id']] = fields['next_run_time'].timestamp()
+            return True
+
+
+class RedisJobQueue(AnalysisJobQueue):
+    """
+    基于redis的任务队列，可由多个进程及服务器共享
+
+    键名(前缀为AnalysisJobConstant.KEY_PREFIX)：
+    id: 任务ID计数器
+    queue: 等待执行的任务(有序集合，分值为优先级及任务ID)
+    delayed: 等待重试的任务(有序集合，分值为重试时间戳)
+    running: 执行中的任务(有序集合，分值为租约到期时间戳)
+    job:{任务ID}: 任务信息(哈希)，任务结束后保留AnalysisJobConstant.JOB_TTL秒
+    issue:{Issue ID}: Issue的任务ID(有序集合)
+    领取、续约及结束任务均在lua脚本中原子执行，并校验执行次数，租约过期后被收回的任务不会被原worker覆盖
+    """
+
+    # KEYS: queue, delayed, running  ARGV: 当前时间戳, 租约到期时间戳, worker, 开始时间, 任务键名前缀
+    DEQUEUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, job_id in ipairs(due) do
+    redis.call('ZREM', KEYS[2], job_id)
+    local score = redis.call('HGET', ARGV[5] .. job_id, 'score')
+    if score then
+        redis.call('ZADD', KEYS[1], score, job_id)
+    end
+end
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then
+    return false
+end
+local job_key = ARGV[5] .. popped[1]
+redis.call('HSET', job_key, 'status', 'running', 'worker', ARGV[3], 'start_time', ARGV[4], 'processed', 0, 'total', 0)
+redis.call('HDEL', job_key, 'next_run_time')
+redis.call('HINCRBY', job_key, 'attempts', 1)
+redis.call('ZADD', KEYS[3], ARGV[2], popped[1])
+return popped[1]
+"""
+    # KEYS: running, 任务键名  ARGV: 任务ID, 执行次数, 租约到期时间戳, 更新的字段及值...
+    PROGRESS_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'attempts') ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('HSET', KEYS[2], unpack(ARGV, 4))
+return 1
+"""
+    # KEYS: running, delayed, 任务键名  ARGV: 任务ID, 执行次数, 状态, 重试时间戳, 保留秒数, 更新的字段及值...
+    FINISH_SCRIPT = """
+if redis.call('HGET', KEYS[3], 'attempts') ~= ARGV[2] or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[3], 'status', ARGV[3], unpack(ARGV, 6))
+if ARGV[3] == 'queued' then
+    redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+else
+    redis.call('EXPIRE', KEYS[3], ARGV[5])
+end
+return 1
+"""
+
+    def __init__(self, redis: Redis, clock: Callable[[], float] = time.time):
+        """
+        :param redis: redis连接对象(decode_responses=True)
+        :param clock: 返回当前时间戳的函数
+        """
+        super().__init__(clock)
+        self.redis = redis
+        self._dequeue_script = redis.register_script(self.DEQUEUE_SCRIPT)
+        self._progress_script = redis.register_script(self.PROGRESS_SCRIPT)
+        self._finish_script = redis.register_script(self.FINISH_SCRIPT)
+
+    def enqueue(self, job_type: str, issue_id: Optional[int] = None, priority: Optional[str] = None):
+        job = self._new_job(self.redis.incr(self._key('id')), job_type, issue_id, priority)
+        pipeline = self.redis.pipeline()
+        pipeline.hset(self._job_key(job['job_id']), mapping=self._encode(job))
+        pipeline.zadd(self._key('queue'), {job['job_id']: job['score']})
+        if issue_id is not None:
+            pipeline.zadd(self._key(f'issue:{issue_id}'), {job['job_id']: job['job_id']})
+            pipeline.expire(self._key(f'issue:{issue_id}'), AnalysisJobConstant.JOB_TTL)
+        pipeline.execute()
+        return job['job_id']
+
+    def dequeue(self, worker: str):
+        now = self.clock()
+        job_id = self._dequeue_script(
+            keys=[self._key('queue'), self._key('delayed'), self._key('running')],
+            args=[now, now + AnalysisJobConstant.LEASE_SECONDS, worker, self._encode_value(self._now()), self._job_key('')],
+        )
+        return self.get_job(int(job_id)) if job_id else None
+
+    def update_progress(self, job: dict, processed: int, total: int, message: Optional[str] = None):
+        fields = dict(processed=processed, total=total, message=message)
+        return bool(
+            self._progress_script(
+                keys=[self._key('running'), self._job_key(job['job_id'])],
+                args=[
+                    job['job_id'],
+                    job['attempts'],
+                    self.clock() + AnalysisJobConstant.LEASE_SECONDS,
+                    *self._flatten(fields),
+                ],
+            )
+        )
+
+    def recover_expired(self):
+        expired = self.redis.zrangebyscore(self._key('running'), '-inf', self.clock())
+        return sum(
+            self._finish(job, *self._get_failure(job, '任务执行超时'))
+            for job in filter(None, (self.get_job(int(job_id)) for job_id in expired))
+        )
+
+    def get_job(self, job_id: int):
+        return self._decode(self.redis.hgetall(self._job_key(job_id)))
+
+    def get_issue_jobs(self, issue_id: int):
+        issue_key = self._key(f'issue:{issue_id}')
+        job_ids = self.redis.zrange(issue_key, 0, -1)
+        pipeline = self.redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipeline.hgetall(self._job_key(job_id))
+        jobs = [self._decode(values) for values in pipeline.execute()]
+        # 已过期的任务从索引中移除
+        expired = [job_id for job_id, job in zip(job_ids, jobs) if job is None]
+        if expired:
+            self.redis.zrem(issue_key, *expired)
+        return [job for job in jobs if job]
+
+    def _finish(self, job: dict, status: str, fields: dict):
+        ready_time = fields['next_run_time'].timestamp() if status == 'queued' else 0
+        return bool(
+            self._finish_script(
+                keys=[self._key('running'), self._key('delayed'), self._job_key(job['job_id'])],
+                args=[
+                    job['job_id'],
+                    job['attempts'],
+                    status,
+                    ready_time,
+                    AnalysisJobConstant.JOB_TTL,
+                    *self._flatten(fields),
+                ],
+            )
+        )
+
+    @classmethod
+    def _key(cls, name: str):
+        return f'{AnalysisJobConstant.KEY_PREFIX}:{name}'
+
+    @classmethod
+    def _job_key(cls, job_id):
+        return cls._key(f'job:{job_id}')
+
+    @classmethod
+    def _encode_value(cls, value):
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ')
+        return value
+
+    @classmethod
+    def _encode(cls, job: dict):
+        return {key: cls._encode_value(value) for key, value in job.items() if value is not None}
+
+    @classmethod
+    def _flatten(cls, fields: dict):
+        """
+        将字段展开为lua脚本参数，值为空的字段不更新
+        """
+        return [item for key, value in cls._encode(fields).items() for item in (key, value)]
+
+    @classmethod
+    def _decode(cls, values: dict):
+        if not values:
+            return None
+        job = dict(values)
+        for key in cls.INT_FIELDS:
+            if key in job:
+                job[key] = int(job[key])
+        for key in cls.TIME_FIELDS:
+            if key in job:
+                job[key] = datetime.fromisoformat(job[key])
+        return job
+
+
+class JobQueueUtil:
+    """
+    附件分析任务队列工具类
+    """
+
+    _queue: Optional[AnalysisJobQueue] = None
+
+    @classmethod
+    def init_queue(cls, queue: Optional[AnalysisJobQueue]):
+        """
+        设置当前进程使用的任务队列，未设置时附件关联到Issue后不提交任务，由定时任务补偿分析
+
+        :param queue: 任务队列
+        """
+        cls._queue = queue
+
+    @classmethod
+    def get_queue(cls):
+        """
+        获取当前进程使用的任务队列
+
+        :return: 任务队列，未设置时返回None
+        """
+        return cls._queue
+
+    @classmethod
+    def enqueue_after_commit(cls, db: Session, job_type: str, issue_id: Optional[int], priority: Optional[str]):
+        """
+        在数据库事务提交后提交任务，避免worker读取到未提交的附件；事务回滚时丢弃
+
+        :param db: orm对象
+        :param job_type: 任务类型
+        :param issue_id: Issue ID
+        :param priority: Issue优先级
+        """
+        if cls._queue is None:
+            return
+        # 同一事务中相同的任务只提交一次
+        TransactionUtil.after_commit(
+            db, partial(cls._enqueue_job, job_type, issue_id, priority), key=('analysis_job', job_type, issue_id)
+        )
+
+    @classmethod
+    def _enqueue_job(cls, job_type: str, issue_id: Optional[int], priority: Optional[str]):
+        queue = cls._queue
+        if queue is None:
+            return
+        try:
+            queue.enqueue(job_type, issue_id, priority)
+        except Exception as e:
+            # 提交失败不影响已提交的事务，由定时任务补偿分析
+            logger.error(f'[分析任务] 提交任务失败: {str(e)}')
@@ -0,0 +1,531 @@
+import mmap
+import os
+import re
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from config.constant import LogEventConstant
+
+
+class LogPattern(NamedTuple):
+    """
+    日志格式，正则表达式从行首匹配，命名分组time、level、component、code分别为时间、级别、组件及错误代码(均可省略)；
+    time_format为空时时间按ISO 8601格式解析，否则按strptime格式解析
+    """
+
+    name: str
+    grok: str
+    time_format: Optional[str]
+
+
+class LogEventColumns(NamedTuple):
+    """
+    日志事件列存数据：每个事件(匹配某一日志格式的行)在各数组中占一个元素，组件及错误代码以字典编号存放，编号0为空
+    """
+
+    timestamps: np.ndarray
+    levels: np.ndarray
+    components: np.ndarray
+    codes: np.ndarray
+    line_numbers: np.ndarray
+    offsets: np.ndarray
+    lengths: np.ndarray
+    component_names: List[str]
+    code_names: List[str]
+
+
+class LogEventUtil:
+    """
+    日志结构化事件提取工具类
+
+    按块扫描日志，将各日志格式合并为一个正则表达式在块内查找事件行(不匹配的行如堆栈、续行被忽略)，
+    提取时间、级别、组件及错误代码，写入按列存放的事件文件；日志格式可通过register_pattern扩展，
+    其中可使用 %{名称} 或 %{名称:分组} 引用GROK中的常用表达式
+    """
+
+    GROK = {
+        'TIMESTAMP': r'\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d{1,9})?',
+        'US_DATETIME': r'\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}:\d{2} [AP]M',
+        'LEVEL': r'(?i:trace|verbose|debug|information|info|notice|warning|warn|error|err|critical|crit|fatal|assert)\b',
+        'COMPONENT': r'[\w.\-]+',
+        'HEX': r'0x[0-9A-Fa-f]+',
+        'INT': r'\d+',
+    }
+    GROK_REFERENCE = re.compile(r'%\{(\w+)(?::(\w+))?\}')
+    LEVELS = ('', 'DEBUG', 'INFO', 'WARN', 'ERROR', 'FATAL')
+    LEVEL_CODES = {
+        b'trace': 1,
+        b'verbose': 1,
+        b'debug': 1,
+        b'info': 2,
+        b'information': 2,
+        b'notice': 2,
+        b'warn': 3,
+        b'warning': 3,
+        b'err': 4,
+        b'error': 4,
+        b'crit': 5,
+        b'critical': 5,
+        b'fatal': 5,
+        b'assert': 5,
+    }
+    # 格式中没有错误代码时，从行内查找32位十六进制状态码(HRESULT、NTSTATUS、EFI_STATUS)
+    CODE_PATTERN = re.compile(rb'\b0x[0-9A-Fa-f]{8}\b')
+    FIELDS = ('time', 'level', 'component', 'code')
+    MAX_NAME_LENGTH = 64
+
+    PATTERNS: List[LogPattern] = [
+        # 驱动日志: [2024-01-15 10:30:00.123] [ERROR] [iaStorAC] Port reset failed, status 0xC0000185
+        LogPattern(
+            'driver', r'\[%{TIMESTAMP:time}\]\s*\[%{LEVEL:level}\]\s*(?:\[%{COMPONENT:component}\])?', None
+        ),
+        # CBS/DISM日志: 2024-01-15 10:30:00, Error                 CBS    Failed to ... [HRESULT = 0x800f0831]
+        LogPattern('windows_cbs', r'%{TIMESTAMP:time},\s+%{LEVEL:level}\s+%{COMPONENT:component}\s', None),
+        # 系统事件导出(级别、时间、来源、事件ID以制表符分隔): Error	1/15/2024 10:30:00 AM	Kernel-Power	41	...
+        LogPattern(
+            'windows_event',
+            r'%{LEVEL:level}\t%{US_DATETIME:time}\t(?P<component>[^\t]+)\t%{INT:code}\t',
+            '%m/%d/%Y %I:%M:%S %p',
+        ),
+        # BIOS串口日志: [DXE] ERROR: PciBus start failed, Status = 0x8000000E / PEI: POST Code: 0xA2
+        LogPattern(
+            'bios',
+            r'(?:\[%{TIMESTAMP:time}\]\s*)?\[?(?P<component>SEC|PEI|DXE|SMM|BDS|UEFI|BIOS|EC)\]?[:\s]\s*'
+            r'(?:%{LEVEL:level}\s*[:\-]?)?(?:[^\n]*?(?:POST Code|Status)\s*[:=]\s*%{HEX:code})?',
+            None,
+        ),
+        # 通用格式: 2024-01-15 10:30:00 [INFO] component: message
+        LogPattern(
+            'generic', r'%{TIMESTAMP:time}\s+\[?%{LEVEL:level}\]?\s+(?:%{COMPONENT:component}:\s)?', None
+        ),
+    ]
+
+    _compiled = None
+
+    @classmethod
+    def register_pattern(cls, name: str, grok: str, time_format: Optional[str] = None, before: Optional[str] = None):
+        """
+        注册日志格式，已存在同名格式时替换；新增或修改格式后需要升级LogEventConstant.PATTERN_VERSION以重新提取
+
+        :param name: 格式名称
+        :param grok: 从行首匹配的正则表达式，可使用 %{名称:分组} 引用常用表达式
+        :param time_format: 时间的strptime格式，为空时按ISO 8601格式解析
+        :param before: 插入到该格式之前(先匹配)，为空时追加到最后
+        :return:
+        """
+        pattern = LogPattern(name, grok, time_format)
+        cls._compile([pattern])
+        patterns = [item for item in cls.PATTERNS if item.name != name]
+        names = [item.name for item in patterns]
+        patterns.insert(names.index(before) if before in names else len(patterns), pattern)
+        cls.PATTERNS = patterns
+        cls._compiled = None
+
+    @classmethod
+    def expand_grok(cls, grok: str):
+        """
+        展开 %{名称} 及 %{名称:分组} 引用
+
+        :param grok: 日志格式表达式
+        :return: 正则表达式
+        """
+
+        def replace(match):
+            if match.group(1) not in cls.GROK:
+                raise ValueError(f'未定义的表达式: {match.group(1)}')
+            expression = cls.GROK[match.group(1)]
+            return f'(?P<{match.group(2)}>{expression})' if match.group(2) else f'(?:{expression})'
+
+        return cls.GROK_REFERENCE.sub(replace, grok)
+
+    @classmethod
+    def _compile(cls, patterns: List[LogPattern]):
+        """
+        将各日志格式合并为一个从行首匹配的正则表达式，格式i的整体分组名为pi，其中的字段分组名为pi_字段
+        """
+        alternatives = []
+        for index, pattern in enumerate(patterns):
+            expression = cls.expand_grok(pattern.grok)
+            expression = re.sub(r'\(\?P<(\w+)>', lambda match: f'(?P<p{index}_{match.group(1)}>', expression)
+            alternatives.append(f'(?P<p{index}>{expression})')
+        regex = re.compile(('^(?:' + '|'.join(alternatives) + ')').encode(), re.MULTILINE)
+        fields = [
+            {field: regex.groupindex.get(f'p{index}_{field}') for field in cls.FIELDS} for index in range(len(patterns))
+        ]
+        return regex, fields
+
+    @classmethod
+    def _get_compiled(cls):
+        if cls._compiled is None:
+            cls._compiled = (cls.PATTERNS, *cls._compile(cls.PATTERNS))
+        return cls._compiled
+
+    @classmethod
+    def extract(cls, reader) -> Tuple[LogEventColumns, int]:
+        """
+        从日志中提取事件
+
+        :param reader: 随机读取对象，需提供size属性及read(offset, length)方法
+        :return: (事件列存数据, 文件总行数)
+        """
+        patterns, regex, fields = cls._get_compiled()
+        builder = _LogEventBuilder(patterns)
+        offset = 0
+        base = 0
+        line_number = 1
+        pending = b''
+        while offset < reader.size:
+            block = reader.read(offset, LogEventConstant.SCAN_SIZE)
+            if not block:
+                break
+            offset += len(block)
+            data = pending + block if pending else block
+            # 只处理完整的行，最后不完整的行与下一块拼接；超过一块仍没有换行的超长行直接处理
+            cut = data.rfind(b'\n') + 1 if offset < reader.size else len(data)
+            if cut == 0:
+                cut = len(data)
+            chunk = data[:cut] if cut < len(data) else data
+            line_number = cls._scan_chunk(chunk, base, line_number, regex, fields, builder)
+            base += cut
+            pending = data[cut:]
+        if pending:
+            line_number = cls._scan_chunk(pending, base, line_number, regex, fields, builder)
+        line_count = line_number - 1
+        # 最后一行没有换行符
+        if reader.size and reader.read(reader.size - 1, 1) != b'\n':
+            line_count += 1
+
+        return builder.build(), line_count
+
+    @classmethod
+    def _scan_chunk(cls, chunk: bytes, base: int, line_number: int, regex, fields, builder: '_LogEventBuilder'):
+        """
+        在由完整行组成的块内查找事件行
+
+        :return: 块之后下一行的行号
+        """
+        position = 0
+        for match in regex.finditer(chunk):
+            start = match.start()
+            line_number += chunk.count(b'\n', position, start)
+            position = start
+            end = chunk.find(b'\n', start)
+            if end < 0:
+                end = len(chunk)
+            pattern_index = int(match.lastgroup[1:])
+            values = [match.group(index) if index else None for index in fields[pattern_index].values()]
+            if values[3] is None:
+                code = cls.CODE_PATTERN.search(chunk, match.end(), end)
+                values[3] = code.group() if code else None
+            builder.add(pattern_index, *values, line_number, base + start, end - start)
+
+        return line_number + chunk.count(b'\n', position)
+
+    @classmethod
+    def write(cls, file_path: str, columns: LogEventColumns):
+        """
+        写入事件文件(先写临时文件再原子替换)
+
+        :param file_path: 事件文件路径
+        :param columns: 事件列存数据
+        :return: 文件大小
+        """
+        component_offsets, component_bytes = cls._encode_names(columns.component_names)
+        code_offsets, code_bytes = cls._encode_names(columns.code_names)
+        timestamps = columns.timestamps.astype(np.int64)
+        flags = 0
+        valid = timestamps != LogEventFile.NAT
+        if valid.all() and (len(timestamps) < 2 or bool(np.all(timestamps[1:] >= timestamps[:-1]))):
+            flags |= LogEventFile.FLAG_SORTED
+        temp_path = f'{file_path}.part'
+        with open(temp_path, 'wb') as f:
+            f.write(
+                LogEventFile.HEADER.pack(
+                    LogEventFile.MAGIC,
+                    len(timestamps),
+                    len(columns.component_names),
+                    len(columns.code_names),
+                    len(component_bytes),
+                    len(code_bytes),
+                    flags,
+                    0,
+                )
+            )
+            for array_data in (
+                timestamps,
+                columns.offsets.astype(np.uint64),
+                columns.line_numbers.astype(np.uint32),
+                columns.lengths.astype(np.uint32),
+                columns.components.astype(np.uint32),
+                columns.codes.astype(np.uint32),
+                columns.levels.astype(np.uint8),
+                component_offsets,
+            ):
+                f.write(array_data.tobytes())
+            f.write(component_bytes)
+            f.write(code_offsets.tobytes())
+            f.write(code_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(temp_path, file_path)
+
+        return size
+
+    @classmethod
+    def _encode_names(cls, names: List[str]):
+        encoded = [name.encode('utf-8') for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+
+        return offsets, b''.join(encoded)
+
+    @classmethod
+    def get_time_range(cls, columns: LogEventColumns):
+        """
+        获取事件的时间范围
+
+        :param columns: 事件列存数据
+        :return: (最早时间, 最晚时间)，没有带时间的事件时均为None
+        """
+        timestamps = columns.timestamps[columns.timestamps != LogEventFile.NAT]
+        if not len(timestamps):
+            return None, None
+
+        return cls.to_datetime(int(timestamps.min())), cls.to_datetime(int(timestamps.max()))
+
+    @classmethod
+    def to_timestamp(cls, value: datetime):
+        """
+        将时间转换为事件文件中的毫秒时间戳(按日志中的本地时间，不做时区转换)
+        """
+        return int(np.datetime64(value, 'ms').astype(np.int64))
+
+    @classmethod
+    def to_datetime(cls, timestamp: int):
+        """
+        将事件文件中的毫秒时间戳转换为时间
+        """
+        return None if timestamp == LogEventFile.NAT else np.datetime64(timestamp, 'ms').astype(datetime)
+
+
+class _LogEventBuilder:
+    """
+    逐个追加事件，按批次转换时间并对组件、错误代码进行字典编码
+    """
+
+    def __init__(self, patterns: List[LogPattern]):
+        self.patterns = patterns
+        self.timestamps = array('q')
+        self.levels = array('B')
+        self.components = array('I')
+        self.codes = array('I')
+        self.line_numbers = array('I')
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self.component_ids: Dict[bytes, int] = {b'': 0}
+        self.component_names = ['']
+        self.code_ids: Dict[bytes, int] = {b'': 0}
+        self.code_names = ['']
+        self.pending_times: List[Tuple[int, Optional[bytes]]] = []
+        self.time_cache: Dict[Tuple[int, bytes], int] = {}
+
+    def add(self, pattern_index, time, level, component, code, line_number, offset, length):
+        self.pending_times.append((pattern_index, time))
+        self.levels.append(LogEventUtil.LEVEL_CODES.get(level.lower(), 0) if level else 0)
+        self.components.append(self._encode(component.strip() if component else b'', self.component_ids, self.component_names))
+        if code and code[:2] in (b'0x', b'0X'):
+            code = b'0x' + code[2:].upper()
+        self.codes.append(self._encode(code or b'', self.code_ids, self.code_names))
+        self.line_numbers.append(line_number)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        if len(self.pending_times) >= LogEventConstant.BATCH_EVENTS:
+            self._flush_times()
+
+    @classmethod
+    def _encode(cls, value: bytes, ids: Dict[bytes, int], names: List[str]):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(names)
+            names.append(value.decode('utf-8', errors='replace')[: LogEventUtil.MAX_NAME_LENGTH])
+        return value_id
+
+    def _flush_times(self):
+        """
+        批量转换时间：ISO 8601格式的时间以numpy向量化解析，其他格式逐个解析并缓存
+        """
+        if not self.pending_times:
+            return
+        batch = np.full(len(self.pending_times), LogEventFile.NAT, dtype=np.int64)
+        iso_positions = []
+        iso_values = []
+        for position, (pattern_index, time) in enumerate(self.pending_times):
+            if time is None:
+                continue
+            time_format = self.patterns[pattern_index].time_format
+            if time_format is None:
+                iso_positions.append(position)
+                iso_values.append(time[:23].replace(b'/', b'-').replace(b',', b'.'))
+            else:
+                batch[position] = self._parse_time(pattern_index, time, time_format)
+        if iso_values:
+            try:
+                batch[iso_positions] = np.array(iso_values).astype('datetime64[ms]').astype(np.int64)
+            except ValueError:
+                # 存在无效时间(如月份超出范围)时逐个解析
+                for position, value in zip(iso_positions, iso_values):
+                    try:
+                        batch[position] = np.datetime64(value.decode(), 'ms').astype(np.int64)
+                    except ValueError:
+                        pass
+        self.timestamps.frombytes(batch.tobytes())
+        self.pending_times = []
+
+    def _parse_time(self, pattern_index: int, time: bytes, time_format: str):
+        key = (pattern_index, time)
+        timestamp = self.time_cache.get(key)
+        if timestamp is None:
+            try:
+                timestamp = LogEventUtil.to_timestamp(datetime.strptime(time.decode(), time_format))
+            except ValueError:
+                timestamp = LogEventFile.NAT
+            if len(self.time_cache) >= LogEventConstant.BATCH_EVENTS:
+                self.time_cache.clear()
+            self.time_cache[key] = timestamp
+        return timestamp
+
+    def build(self):
+        self._flush_times()
+        return LogEventColumns(
+            timestamps=np.frombuffer(self.timestamps, dtype=np.int64),
+            levels=np.frombuffer(self.levels, dtype=np.uint8),
+            components=np.frombuffer(self.components, dtype=np.uint32),
+            codes=np.frombuffer(self.codes, dtype=np.uint32),
+            line_numbers=np.frombuffer(self.line_numbers, dtype=np.uint32),
+            offsets=np.frombuffer(self.offsets, dtype=np.uint64),
+            lengths=np.frombuffer(self.lengths, dtype=np.uint32),
+            component_names=self.component_names,
+            code_names=self.code_names,
+        )
+
+
+class LogEventFile:
+    """
+    日志事件文件(只读，内存映射)
+
+    文件格式：头部(魔数、事件数、组件数、错误代码数、组件字典字节数、错误代码字典字节数、标志)，
+    其后依次为时间戳(int64毫秒，无时间为最小值)、行首偏移、行号、行长度、组件编号、错误代码编号、级别各列，
+    以及组件、错误代码字典(各项起始位置数组及UTF-8内容)
+    """
+
+    MAGIC = b'LCFCEVT1'
+    HEADER = struct.Struct('<8sQIIIIII')
+    NAT = np.iinfo(np.int64).min
+    FLAG_SORTED = 0x1
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, component_count, code_count, component_size, code_size, self.flags, _ = (
+                self.HEADER.unpack_from(self._mmap, 0)
+            )
+            if magic != self.MAGIC:
+                raise ValueError(f'不是日志事件文件: {file_path}')
+            offset = self.HEADER.size
+            columns = []
+            for dtype in (np.int64, np.uint64, np.uint32, np.uint32, np.uint32, np.uint32, np.uint8):
+                columns.append(np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset))
+                offset += columns[-1].nbytes
+            (
+                self.timestamps,
+                self.offsets,
+                self.line_numbers,
+                self.lengths,
+                self.components,
+                self.codes,
+                self.levels,
+            ) = columns
+            self.component_names, offset = self._read_names(offset, component_count, component_size)
+            self.code_names, offset = self._read_names(offset, code_count, code_size)
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def _read_names(self, offset: int, count: int, size: int):
+        positions = np.frombuffer(self._mmap, dtype=np.uint32, count=count + 1, offset=offset).tolist()
+        offset += 4 * (count + 1)
+        data = self._mmap[offset : offset + size]
+        names = [data[positions[index] : positions[index + 1]].decode('utf-8') for index in range(count)]
+
+        return names, offset + size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        # 数组引用内存映射，需先释放
+        self.timestamps = self.offsets = self.line_numbers = self.lengths = None
+        self.components = self.codes = self.levels = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    @property
+    def event_count(self):
+        return len(self.levels)
+
+    def filter(
+        self,
+        begin: Optional[int] = None,
+        end: Optional[int] = None,
+        min_level: int = 0,
+        component: Optional[str] = None,
+        code: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        按条件向量化筛选事件，时间有序时按二分查找确定时间范围
+
+        :param begin: 起始时间戳(毫秒，包含)
+        :param end: 结束时间戳(毫秒，不包含)
+        :param min_level: 最低级别编号
+        :param component: 组件名(忽略大小写)
+        :param code: 错误代码(忽略大小写)
+        :return: 满足条件的事件下标数组
+        """
+        start, stop = 0, self.event_count
+        if self.flags & self.FLAG_SORTED:
+            if begin is not None:
+                start = int(np.searchsorted(self.timestamps, begin, side='left'))
+            if end is not None:
+                stop = int(np.searchsorted(self.timestamps, end, side='left'))
+            begin = end = None
+        if start >= stop:
+            return np.empty(0, dtype=np.int64)
+        mask = np.ones(stop - start, dtype=bool)
+        if begin is not None or end is not None:
+            timestamps = self.timestamps[start:stop]
+            # 没有时间的事件不满足时间条件
+            mask &= timestamps != self.NAT
+            if begin is not None:
+                mask &= timestamps >= begin
+            if end is not None:
+                mask &= timestamps < end
+        if min_level:
+            mask &= self.levels[start:stop] >= min_level
+        for value, names, column in ((component, self.component_names, self.components), (code, self.code_names, self.codes)):
+            if value:
+                ids = [index for index, name in enumerate(names) if index and name.lower() == value.lower()]
+                if not ids:
+                    return np.empty(0, dtype=np.int64)
+                mask &= np.isin(column[start:stop], ids)
+
+        return np.flatnonzero(mask) + start
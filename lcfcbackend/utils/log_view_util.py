@@ -0,0 +1,339 @@
+import mmap
+import os
+import re
+import struct
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from config.constant import LogViewConstant
+from utils.compress_util import SeekableZstdReader
+from utils.zip_util import ZipMember, ZipMemberReader
+
+
+class MmapReader:
+    """
+    基于内存映射的文件随机读取对象
+    """
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def read(self, offset: int, length: int):
+        """
+        读取文件的字节区间
+
+        :param offset: 起始偏移
+        :param length: 读取长度
+        :return: 读取的数据，超出文件末尾的部分被截断
+        """
+        return self._mmap[offset : offset + length] if self._mmap is not None else b''
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+class LineIndex(NamedTuple):
+    """
+    稀疏行索引：checkpoints[i]为第i * interval行(从0开始)的行首偏移
+    """
+
+    interval: int
+    line_count: int
+    content_size: int
+    checkpoints: array
+
+
+class LogViewUtil:
+    """
+    大文本文件在线查看工具类，基于内存映射(压缩文件按帧解压，压缩包内的文件从解压保存点继续解压)及持久化的稀疏行索引，
+    读取任意一页的代价与页大小相关而与文件大小无关
+    """
+
+    INDEX_MAGIC = b'LCFCLIDX'
+    INDEX_HEADER = struct.Struct('<8sIQQ')
+    INDEX_CACHE_SIZE = 32
+
+    _index_cache = OrderedDict()
+    _index_cache_lock = Lock()
+
+    @classmethod
+    @contextmanager
+    def open_text(cls, file_path: str, compressed: bool = False, member: Optional[ZipMember] = None):
+        """
+        打开文本文件用于随机读取
+
+        :param file_path: 文件实际存放路径
+        :param compressed: 是否为zstd可寻址格式的压缩文件
+        :param member: 压缩包内的文件，指定时读取file_path压缩包中的该文件
+        :return: 读取对象
+        """
+        if member is not None:
+            reader = ZipMemberReader(file_path, member)
+        else:
+            reader = SeekableZstdReader(file_path) if compressed else MmapReader(file_path)
+        try:
+            yield reader
+        finally:
+            reader.close()
+
+    @classmethod
+    def get_line_index(cls, reader, index_path: str, interval: int = LogViewConstant.LINE_INDEX_INTERVAL):
+        """
+        获取行索引，依次从内存缓存、索引文件读取，均不可用时扫描文件建立并持久化
+
+        :param reader: 读取对象
+        :param index_path: 行索引文件路径
+        :param interval: 每隔多少行记录一次行首偏移
+        :return: 行索引
+        """
+        with cls._index_cache_lock:
+            line_index = cls._index_cache.get(index_path)
+            if line_index is not None:
+                cls._index_cache.move_to_end(index_path)
+        if not cls._is_index_valid(line_index, reader, interval):
+            line_index = cls._load_line_index(index_path)
+            if not cls._is_index_valid(line_index, reader, interval):
+                line_index = cls.build_line_index(reader, interval)
+                cls._save_line_index(line_index, index_path)
+            with cls._index_cache_lock:
+                cls._index_cache[index_path] = line_index
+                while len(cls._index_cache) > cls.INDEX_CACHE_SIZE:
+                    cls._index_cache.popitem(last=False)
+
+        return line_index
+
+    @classmethod
+    def build_line_index(cls, reader, interval: int = LogViewConstant.LINE_INDEX_INTERVAL):
+        """
+        扫描文件建立稀疏行索引，按块读取并用正则一次跳过interval行，不逐行循环
+
+        :param reader: 读取对象
+        :param interval: 每隔多少行记录一次行首偏移
+        :return: 行索引
+        """
+        checkpoints = array('Q', [0])
+        group_pattern = re.compile(rb'(?:[^\n]*\n){%d}' % interval)
+        newline_count = offset = 0
+        while offset < reader.size:
+            block = reader.read(offset, LogViewConstant.SCAN_SIZE)
+            end = block.rfind(b'\n') + 1
+            if end == 0:
+                # 整块位于同一行内
+                offset += len(block)
+                continue
+            newlines = block.count(b'\n', 0, end)
+            remaining = interval - newline_count % interval
+            if newlines >= remaining:
+                match = re.compile(rb'(?:[^\n]*\n){%d}' % remaining).match(block, 0, end)
+                while match:
+                    checkpoints.append(offset + match.end())
+                    match = group_pattern.match(block, match.end(), end)
+            newline_count += newlines
+            offset += end
+        line_count = newline_count
+        if reader.size and reader.read(reader.size - 1, 1) != b'\n':
+            line_count += 1
+
+        return LineIndex(interval, line_count, reader.size, checkpoints)
+
+    @classmethod
+    def read_lines(cls, reader, line_index: LineIndex, start: int, count: int):
+        """
+        读取指定行
+
+        :param reader: 读取对象
+        :param line_index: 行索引
+        :param start: 起始行号(从0开始)
+        :param count: 行数
+        :return: 行内容列表，超长的行被截断
+        """
+        lines = []
+        if start >= line_index.line_count or count <= 0:
+            return lines
+        for line in cls._iter_lines(reader, cls._seek_line(reader, line_index, start)):
+            lines.append(cls._decode(line))
+            if len(lines) >= count:
+                break
+
+        return lines
+
+    @classmethod
+    def search(
+        cls, reader, line_index: LineIndex, pattern: re.Pattern, start: int, max_results: int
+    ) -> Tuple[List[Tuple[int, str]], Optional[int], bool]:
+        """
+        从指定行开始按正则表达式搜索，每行最多返回一次；单次扫描的字节数或耗时超过上限时在扫描块边界停止
+
+        :param reader: 读取对象
+        :param line_index: 行索引
+        :param pattern: 已编译的bytes正则表达式
+        :param start: 起始行号(从0开始)
+        :param max_results: 最多返回的匹配行数
+        :return: (匹配行号(从0开始)及内容列表, 未搜索完时继续搜索的起始行号, 是否因扫描上限停止)
+        """
+        matches = []
+        line_number = start
+        offset = begin_offset = cls._seek_line(reader, line_index, start)
+        deadline = time.monotonic() + LogViewConstant.MAX_SEARCH_SECONDS
+        while offset < reader.size:
+            if offset > begin_offset and (
+                offset - begin_offset >= LogViewConstant.MAX_SEARCH_BYTES or time.monotonic() >= deadline
+            ):
+                # 起始行超长时跳过该行剩余部分，保证继续搜索时有进展
+                next_line = max(line_number, start + 1)
+                return matches, next_line if next_line < line_index.line_count else None, True
+            block = reader.read(offset, LogViewConstant.SCAN_SIZE)
+            end = len(block) if offset + len(block) >= reader.size else block.rfind(b'\n') + 1
+            if end == 0:
+                # 超长行按扫描块切分
+                end = len(block)
+            position = counted = 0
+            while position < end:
+                match = pattern.search(block, position, end)
+                if not match or (match.start() == end and block[end - 1 : end] == b'\n'):
+                    break
+                line_start = block.rfind(b'\n', 0, match.start()) + 1
+                line_end = block.find(b'\n', match.start(), end)
+                line_end = end if line_end == -1 else line_end
+                line_number += block.count(b'\n', counted, line_start)
+                counted = line_start
+                matches.append((line_number, cls._decode(block[line_start:line_end])))
+                if len(matches) >= max_results:
+                    next_line = line_number + 1
+                    return matches, next_line if next_line < line_index.line_count else None, False
+                position = line_end + 1
+            line_number += block.count(b'\n', counted, end)
+            offset += end
+
+        return matches, None, False
+
+    @classmethod
+    def find_offsets(
+        cls, chunks: Iterable[bytes], pattern: re.Pattern, max_count: int, scan_size: int = LogViewConstant.SCAN_SIZE
+    ) -> Tuple[List[int], bool]:
+        """
+        顺序扫描数据块，查找正则表达式的匹配位置，数据块在行边界处拼接，不跨行匹配
+
+        :param chunks: 数据块
+        :param pattern: 已编译的bytes正则表达式
+        :param max_count: 最多返回的匹配数
+        :param scan_size: 超长行按该大小切分扫描
+        :return: (匹配起始偏移列表, 是否还有未返回的匹配)
+        """
+        offsets = []
+        base = 0
+        pending = b''
+        for chunk in chunks:
+            block = pending + chunk
+            end = block.rfind(b'\n') + 1
+            if end == 0:
+                if len(block) < scan_size:
+                    pending = block
+                    continue
+                end = len(block)
+            for match in pattern.finditer(block, 0, end):
+                if len(offsets) >= max_count:
+                    return offsets, True
+                offsets.append(base + match.start())
+            base += end
+            pending = block[end:]
+        for match in pattern.finditer(pending):
+            if len(offsets) >= max_count:
+                return offsets, True
+            offsets.append(base + match.start())
+
+        return offsets, False
+
+    @classmethod
+    def _seek_line(cls, reader, line_index: LineIndex, line: int):
+        """
+        获取指定行的行首偏移，从最近的索引点向后最多扫描interval行
+        """
+        if line >= line_index.line_count:
+            return reader.size
+        checkpoint = min(line // line_index.interval, len(line_index.checkpoints) - 1)
+        offset = line_index.checkpoints[checkpoint]
+        skip = line - checkpoint * line_index.interval
+        while skip > 0:
+            block = reader.read(offset, LogViewConstant.READ_SIZE)
+            if not block:
+                break
+            newlines = block.count(b'\n')
+            if newlines < skip:
+                skip -= newlines
+                offset += len(block)
+                continue
+            position = -1
+            for _ in range(skip):
+                position = block.find(b'\n', position + 1)
+            return offset + position + 1
+
+        return offset
+
+    @classmethod
+    def _iter_lines(cls, reader, offset: int) -> Iterator[bytes]:
+        """
+        从指定偏移开始逐行读取(不含换行符)，超过MAX_LINE_BYTES的部分丢弃
+        """
+        max_bytes = LogViewConstant.MAX_LINE_BYTES
+        pending = b''
+        while offset < reader.size:
+            block = reader.read(offset, LogViewConstant.READ_SIZE)
+            offset += len(block)
+            lines = block.split(b'\n')
+            if len(lines) == 1:
+                pending = (pending + block)[:max_bytes] if len(pending) < max_bytes else pending
+                continue
+            yield (pending + lines[0])[:max_bytes]
+            for line in lines[1:-1]:
+                yield line[:max_bytes]
+            pending = lines[-1][:max_bytes]
+        if pending:
+            yield pending
+
+    @classmethod
+    def _decode(cls, line: bytes):
+        return line[: LogViewConstant.MAX_LINE_BYTES].rstrip(b'\r').decode('utf-8', errors='replace')
+
+    @classmethod
+    def _is_index_valid(cls, line_index: Optional[LineIndex], reader, interval: int):
+        return line_index is not None and line_index.interval == interval and line_index.content_size == reader.size
+
+    @classmethod
+    def _load_line_index(cls, index_path: str):
+        try:
+            with open(index_path, 'rb') as f:
+                magic, interval, line_count, content_size = cls.INDEX_HEADER.unpack(f.read(cls.INDEX_HEADER.size))
+                checkpoints = array('Q')
+                checkpoints.frombytes(f.read())
+        except (OSError, struct.error, ValueError):
+            return None
+        if magic != cls.INDEX_MAGIC or not checkpoints:
+            return None
+
+        return LineIndex(interval, line_count, content_size, checkpoints)
+
+    @classmethod
+    def _save_line_index(cls, line_index: LineIndex, index_path: str):
+        temp_path = f'{index_path}.{uuid.uuid4().hex}.part'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(
+                    cls.INDEX_HEADER.pack(
+                        cls.INDEX_MAGIC, line_index.interval, line_index.line_count, line_index.content_size
+                    )
+                )
+                line_index.checkpoints.tofile(f)
+            os.replace(temp_path, index_path)
+        except OSError:
+            # 索引写入失败不影响本次读取，下次请求重新建立
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,339 @@
+import hashlib
+import os
+import struct
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from utils.log_view_util import LogViewUtil
+
+
+class MinidumpModule(NamedTuple):
+    """
+    dump中加载的模块
+    """
+
+    name: str
+    base_address: int
+    size: int
+    version: Optional[str]
+    timestamp: int
+
+
+class MinidumpInfo(NamedTuple):
+    """
+    dump解析结果，dump_type为user(用户态MDMP格式)或kernel(内核蓝屏dump)；
+    内核dump的exception_code为蓝屏代码，exception_parameters为蓝屏参数
+    """
+
+    dump_type: str
+    crash_time: Optional[datetime]
+    exception_code: Optional[int]
+    exception_address: Optional[int]
+    exception_parameters: List[int]
+    exception_thread_id: Optional[int]
+    faulting_module: Optional[str]
+    faulting_offset: Optional[int]
+    faulting_module_version: Optional[str]
+    process_name: Optional[str]
+    process_id: Optional[int]
+    os_version: Optional[str]
+    os_build: Optional[str]
+    processor_architecture: Optional[str]
+    processor_count: Optional[int]
+    thread_count: int
+    modules: List[MinidumpModule]
+
+
+class MinidumpUtil:
+    """
+    Windows dump解析工具类，不依赖调试器，只按需读取文件头、流目录及所需的数据流
+
+    支持用户态minidump(MDMP)的异常记录、模块列表、线程列表、系统信息及进程信息，
+    以及内核蓝屏dump(PAGEDUMP/PAGEDU64)文件头中的蓝屏代码、参数、异常记录及系统版本
+    """
+
+    MDMP_SIGNATURE = b'MDMP'
+    KERNEL_SIGNATURES = {b'PAGEDUMP': 32, b'PAGEDU64': 64}
+    HEADER = struct.Struct('<4sIIIIIQ')
+    DIRECTORY_ENTRY = struct.Struct('<III')
+    THREAD_LIST_STREAM = 3
+    MODULE_LIST_STREAM = 4
+    EXCEPTION_STREAM = 6
+    SYSTEM_INFO_STREAM = 7
+    MISC_INFO_STREAM = 15
+    MODULE = struct.Struct('<QIIII13I8x8x8x8x')
+    EXCEPTION = struct.Struct('<II' + 'IIQQII15Q')
+    SYSTEM_INFO = struct.Struct('<HHHBBIIIIIHH')
+    MISC_INFO = struct.Struct('<IIIIII')
+    MISC_INFO_BUILD_STRING_OFFSET = 232
+    MISC_INFO_4_SIZE = 832
+    MISC1_PROCESS_ID = 0x1
+    VS_FIXED_FILE_INFO_SIGNATURE = 0xFEEF04BD
+    MAX_STREAMS = 1024
+    MAX_MODULES = 4096
+    MAX_STRING_LENGTH = 1024
+    KERNEL_HEADER_64 = struct.Struct('<4s4sIIQQQQIII4xQQQQ')
+    KERNEL_HEADER_32 = struct.Struct('<4s4sIIIIIIIIIIIII')
+    KERNEL_EXCEPTION_OFFSET_64 = 0xF00
+    KERNEL_SYSTEM_TIME_OFFSET_64 = 0xFA8
+    FILETIME_EPOCH = 116444736000000000
+    PROCESSOR_ARCHITECTURES = {0: 'x86', 5: 'arm', 6: 'ia64', 9: 'x64', 12: 'arm64'}
+    MACHINE_TYPES = {0x14C: 'x86', 0x8664: 'x64', 0xAA64: 'arm64', 0x1C4: 'arm'}
+
+    @classmethod
+    def parse(cls, reader) -> MinidumpInfo:
+        """
+        解析dump
+
+        :param reader: 随机读取对象，需提供size属性及read(offset, length)方法
+        :return: 解析结果
+        """
+        signature = reader.read(0, 8)
+        if signature[:4] == cls.MDMP_SIGNATURE:
+            return cls._parse_user_dump(reader)
+        if signature in cls.KERNEL_SIGNATURES:
+            return cls._parse_kernel_dump(reader, cls.KERNEL_SIGNATURES[signature])
+        raise ValueError('不是有效的dump文件')
+
+    @classmethod
+    def analyze_file(cls, file_path: str, compressed: bool = False):
+        """
+        解析dump文件，可作为进程池任务执行
+
+        :param file_path: 文件实际存放路径
+        :param compressed: 是否为zstd可寻址格式的压缩文件
+        :return: 解析结果字典
+        """
+        with LogViewUtil.open_text(file_path, compressed) as reader:
+            return cls.to_dict(cls.parse(reader))
+
+    @classmethod
+    def to_dict(cls, info: MinidumpInfo):
+        """
+        将解析结果转换为可序列化为JSON的字典，地址及代码格式化为十六进制字符串
+
+        :param info: 解析结果
+        :return: 解析结果字典
+        """
+        return dict(
+            dump_type=info.dump_type,
+            crash_time=info.crash_time.strftime('%Y-%m-%d %H:%M:%S') if info.crash_time else None,
+            exception_code=cls.format_code(info.exception_code),
+            exception_address=cls.format_address(info.exception_address),
+            exception_parameters=[cls.format_address(parameter) for parameter in info.exception_parameters],
+            exception_thread_id=info.exception_thread_id,
+            faulting_module=info.faulting_module,
+            faulting_offset=cls.format_address(info.faulting_offset),
+            faulting_module_version=info.faulting_module_version,
+            process_name=info.process_name,
+            process_id=info.process_id,
+            os_version=info.os_version,
+            os_build=info.os_build,
+            processor_architecture=info.processor_architecture,
+            processor_count=info.processor_count,
+            thread_count=info.thread_count,
+            modules=[
+                dict(
+                    name=module.name,
+                    base_address=cls.format_address(module.base_address),
+                    size=module.size,
+                    version=module.version,
+                    timestamp=module.timestamp,
+                )
+                for module in info.modules
+            ],
+        )
+
+    @classmethod
+    def get_signature(cls, result: dict):
+        """
+        计算崩溃签名，异常代码、异常所在模块(忽略大小写及版本)及模块内偏移相同的dump归为同一崩溃；
+        异常不在任何模块内时地址受地址随机化影响，只按异常代码分组；内核dump按蓝屏代码分组
+
+        :param result: 解析结果字典
+        :return: 崩溃签名(SHA-1摘要)，没有异常记录的dump返回None
+        """
+        if not result['exception_code']:
+            return None
+        if result['dump_type'] == 'kernel':
+            parts = ['kernel', result['exception_code']]
+        else:
+            module = (result['faulting_module'] or '').lower()
+            parts = ['user', result['exception_code'], module, result['faulting_offset'] if module else '']
+
+        return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+    @classmethod
+    def format_code(cls, code: Optional[int]):
+        return None if code is None else f'0x{code:08X}'
+
+    @classmethod
+    def format_address(cls, address: Optional[int]):
+        return None if address is None else f'0x{address:x}'
+
+    @classmethod
+    def _read_exact(cls, reader, offset: int, length: int):
+        data = reader.read(offset, length)
+        if len(data) != length:
+            raise ValueError(f'dump文件不完整: 偏移{offset}处需要{length}字节')
+        return data
+
+    @classmethod
+    def _parse_user_dump(cls, reader):
+        _, _, stream_count, directory_rva, _, timestamp, _ = cls.HEADER.unpack(
+            cls._read_exact(reader, 0, cls.HEADER.size)
+        )
+        if stream_count > cls.MAX_STREAMS:
+            raise ValueError(f'dump流数量异常: {stream_count}')
+        directory = cls._read_exact(reader, directory_rva, stream_count * cls.DIRECTORY_ENTRY.size)
+        streams = {}
+        for stream_type, data_size, rva in cls.DIRECTORY_ENTRY.iter_unpack(directory):
+            # 同类型的流只取第一个
+            streams.setdefault(stream_type, (data_size, rva))
+
+        modules = cls._parse_modules(reader, streams.get(cls.MODULE_LIST_STREAM))
+        thread_count = 0
+        if cls.THREAD_LIST_STREAM in streams:
+            thread_count = struct.unpack('<I', cls._read_exact(reader, streams[cls.THREAD_LIST_STREAM][1], 4))[0]
+        exception_code = exception_address = exception_thread_id = None
+        exception_parameters = []
+        if cls.EXCEPTION_STREAM in streams:
+            fields = cls.EXCEPTION.unpack(cls._read_exact(reader, streams[cls.EXCEPTION_STREAM][1], cls.EXCEPTION.size))
+            exception_thread_id, exception_code, exception_address = fields[0], fields[2], fields[5]
+            exception_parameters = list(fields[8 : 8 + min(fields[6], 15)])
+        os_version = os_build = processor_architecture = processor_count = None
+        if cls.SYSTEM_INFO_STREAM in streams:
+            (architecture, _, _, processor_count, _, major, minor, build, _, csd_rva, _, _) = cls.SYSTEM_INFO.unpack(
+                cls._read_exact(reader, streams[cls.SYSTEM_INFO_STREAM][1], cls.SYSTEM_INFO.size)
+            )
+            processor_architecture = cls.PROCESSOR_ARCHITECTURES.get(architecture, str(architecture))
+            os_version = f'{major}.{minor}.{build}'
+            os_build = str(build)
+            service_pack = cls._read_string(reader, csd_rva) if csd_rva else ''
+            if service_pack:
+                os_version = f'{os_version} {service_pack}'
+        process_id, build_string = cls._parse_misc_info(reader, streams.get(cls.MISC_INFO_STREAM))
+        if build_string:
+            # Windows 10及以上的完整版本号，如19041.1.amd64fre.vb_release.191206-1406
+            os_build = build_string
+
+        faulting_module = cls._find_module(modules, exception_address)
+
+        return MinidumpInfo(
+            dump_type='user',
+            crash_time=datetime.fromtimestamp(timestamp) if timestamp else None,
+            exception_code=exception_code,
+            exception_address=exception_address,
+            exception_parameters=exception_parameters,
+            exception_thread_id=exception_thread_id,
+            faulting_module=faulting_module.name if faulting_module else None,
+            faulting_offset=exception_address - faulting_module.base_address if faulting_module else None,
+            faulting_module_version=faulting_module.version if faulting_module else None,
+            # 模块列表的第一个模块为进程的可执行文件
+            process_name=modules[0].name if modules else None,
+            process_id=process_id,
+            os_version=os_version,
+            os_build=os_build,
+            processor_architecture=processor_architecture,
+            processor_count=processor_count,
+            thread_count=thread_count,
+            modules=modules,
+        )
+
+    @classmethod
+    def _parse_modules(cls, reader, stream: Optional[tuple]):
+        if stream is None:
+            return []
+        module_count = struct.unpack('<I', cls._read_exact(reader, stream[1], 4))[0]
+        if module_count > cls.MAX_MODULES:
+            raise ValueError(f'dump模块数量异常: {module_count}')
+        data = cls._read_exact(reader, stream[1] + 4, module_count * cls.MODULE.size)
+        modules = []
+        for fields in cls.MODULE.iter_unpack(data):
+            base_address, size, _, timestamp, name_rva = fields[:5]
+            signature, _, file_version_ms, file_version_ls = fields[5:9]
+            version = None
+            if signature == cls.VS_FIXED_FILE_INFO_SIGNATURE:
+                version = (
+                    f'{file_version_ms >> 16}.{file_version_ms & 0xFFFF}.'
+                    f'{file_version_ls >> 16}.{file_version_ls & 0xFFFF}'
+                )
+            # 模块名为完整路径，兼容Windows及POSIX路径分隔符
+            name = cls._read_string(reader, name_rva).replace('\\', '/')
+            modules.append(MinidumpModule(os.path.basename(name), base_address, size, version, timestamp))
+
+        return modules
+
+    @classmethod
+    def _parse_misc_info(cls, reader, stream: Optional[tuple]):
+        if stream is None or stream[0] < cls.MISC_INFO.size:
+            return None, None
+        size_of_info, flags, process_id = cls.MISC_INFO.unpack(
+            cls._read_exact(reader, stream[1], cls.MISC_INFO.size)
+        )[:3]
+        build_string = None
+        if size_of_info >= cls.MISC_INFO_4_SIZE and stream[0] >= cls.MISC_INFO_4_SIZE:
+            data = cls._read_exact(reader, stream[1] + cls.MISC_INFO_BUILD_STRING_OFFSET, 520)
+            build_string = data.decode('utf-16-le', errors='replace').split('\x00', 1)[0] or None
+
+        return (process_id if flags & cls.MISC1_PROCESS_ID else None), build_string
+
+    @classmethod
+    def _read_string(cls, reader, rva: int):
+        """
+        读取MINIDUMP_STRING(4字节长度 + UTF-16LE字符串)
+        """
+        length = struct.unpack('<I', cls._read_exact(reader, rva, 4))[0]
+        length = min(length, cls.MAX_STRING_LENGTH * 2)
+
+        return cls._read_exact(reader, rva + 4, length).decode('utf-16-le', errors='replace')
+
+    @classmethod
+    def _find_module(cls, modules: List[MinidumpModule], address: Optional[int]):
+        if address is None:
+            return None
+        for module in modules:
+            if module.base_address <= address < module.base_address + module.size:
+                return module
+
+        return None
+
+    @classmethod
+    def _parse_kernel_dump(cls, reader, bits: int):
+        exception_address = crash_time = None
+        if bits == 64:
+            fields = cls.KERNEL_HEADER_64.unpack(cls._read_exact(reader, 0, cls.KERNEL_HEADER_64.size))
+            build, machine_type, processor_count, bugcheck_code = fields[3], fields[8], fields[9], fields[10]
+            bugcheck_parameters = list(fields[11:15])
+            if reader.size >= cls.KERNEL_SYSTEM_TIME_OFFSET_64 + 8:
+                # 异常记录: ExceptionCode, ExceptionFlags, ExceptionRecord, ExceptionAddress
+                exception_address = struct.unpack(
+                    '<IIQQ', cls._read_exact(reader, cls.KERNEL_EXCEPTION_OFFSET_64, 24)
+                )[3] or None
+                # 系统时间为FILETIME(自1601年起的100纳秒数)
+                system_time = struct.unpack('<Q', cls._read_exact(reader, cls.KERNEL_SYSTEM_TIME_OFFSET_64, 8))[0]
+                if system_time > cls.FILETIME_EPOCH:
+                    crash_time = datetime.fromtimestamp((system_time - cls.FILETIME_EPOCH) / 10**7)
+        else:
+            fields = cls.KERNEL_HEADER_32.unpack(cls._read_exact(reader, 0, cls.KERNEL_HEADER_32.size))
+            build, machine_type, processor_count, bugcheck_code = fields[3], fields[8], fields[9], fields[10]
+            bugcheck_parameters = list(fields[11:15])
+
+        return MinidumpInfo(
+            dump_type='kernel',
+            crash_time=crash_time,
+            exception_code=bugcheck_code,
+            exception_address=exception_address,
+            exception_parameters=bugcheck_parameters,
+            exception_thread_id=None,
+            faulting_module=None,
+            faulting_offset=None,
+            faulting_module_version=None,
+            process_name=None,
+            process_id=None,
+            os_version=None,
+            os_build=str(build),
+            processor_architecture=cls.MACHINE_TYPES.get(machine_type, f'0x{machine_type:x}'),
+            processor_count=processor_count,
+            thread_count=0,
+            modules=[],
+        )
@@ -1,10 +1,19 @@
+import base64
+import itertools
+import json
 import math
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
-from sqlalchemy import func, select, Select
+from sqlalchemy import and_, event, func, or_, select, Select
 from sqlalchemy.orm.session import Session
-from sqlalchemy.orm.session import Session
-from typing import Optional, List
+from sqlalchemy.sql.util import find_tables
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from exceptions.exception import ServiceException
 from utils.common_util import CamelCaseUtil
 
 
@@ -18,8 +27,176 @@ class PageResponseModel(BaseModel):
     rows: List = []
     page_num: Optional[int] = None
     page_size: Optional[int] = None
-    total: int
+    total: Optional[int] = None
     has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
+
+
+class PageCountCache:
+    """
+    分页总数缓存
+
+    以查询语句结构及其绑定参数(即规范化后的过滤条件，不含分页参数)为键缓存count(*)结果，
+    缓存项记录计算时所涉及各表的版本号，写操作提交后对应表版本号递增，旧缓存项随即失效
+    """
+
+    # 最大缓存条数
+    MAX_ENTRIES = 2048
+    # 缓存有效期(秒)，多进程部署时各进程表版本号互不可见，以此兜底
+    TTL_SECONDS = 60
+    # 会话中待提交时递增版本号的表名集合
+    SESSION_KEY = 'page_count_dirty_tables'
+
+    _lock = threading.Lock()
+    _engine_tokens = weakref.WeakKeyDictionary()
+    _token_counter = itertools.count(1)
+    _entries: 'OrderedDict[Any, Tuple[Tuple, int, float]]' = OrderedDict()
+    _versions: Dict[str, int] = {}
+    _hits = 0
+    _misses = 0
+    _invalidations = 0
+
+    @classmethod
+    def _engine_token(cls, db: Session):
+        # 不同数据库引擎(如测试库、压测库)的计数互不干扰
+        engine = db.get_bind()
+        with cls._lock:
+            token = cls._engine_tokens.get(engine)
+            if token is None:
+                token = next(cls._token_counter)
+                cls._engine_tokens[engine] = token
+            return token
+
+    @classmethod
+    def _make_key(cls, db: Session, query: Select):
+        cache_key = query._generate_cache_key()
+        if cache_key is None:
+            return None
+        params = []
+        for bind in cache_key.bindparams:
+            value = bind.effective_value
+            params.append(tuple(value) if isinstance(value, list) else value)
+        try:
+            key = (cls._engine_token(db), cache_key.key, tuple(params))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def _snapshot(cls, tables: Iterable[str]):
+        with cls._lock:
+            return tuple(sorted((table, cls._versions.get(table, 0)) for table in tables))
+
+    @classmethod
+    def get_total(cls, db: Session, query: Select):
+        """
+        获取查询语句对应的总数，命中缓存时不再执行count(*)
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :return: 总数
+        """
+        key = cls._make_key(db, query)
+        if key is None:
+            return (db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
+        tables = {table.name for table in find_tables(query, include_joins=True, include_aliases=True)}
+        # 先取版本号快照再计数，计数期间发生的写入会使该缓存项在下次读取时失效
+        versions = cls._snapshot(tables)
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry[0] == versions and entry[2] > now:
+                cls._entries.move_to_end(key)
+                cls._hits += 1
+                return entry[1]
+            cls._misses += 1
+        total = (db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
+        with cls._lock:
+            cls._entries[key] = (versions, total, now + cls.TTL_SECONDS)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > cls.MAX_ENTRIES:
+                cls._entries.popitem(last=False)
+        return total
+
+    @classmethod
+    def bump(cls, tables: Iterable[str]):
+        """
+        递增表版本号，使涉及这些表的缓存项失效
+
+        :param tables: 表名列表
+        :return:
+        """
+        with cls._lock:
+            for table in tables:
+                cls._versions[table] = cls._versions.get(table, 0) + 1
+                cls._invalidations += 1
+
+    @classmethod
+    def mark_dirty(cls, db: Session, tables: Iterable[str]):
+        """
+        记录会话中被写入的表，事务提交后递增其版本号
+
+        :param db: orm对象
+        :param tables: 表名列表
+        :return:
+        """
+        db.info.setdefault(cls.SESSION_KEY, set()).update(tables)
+
+    @classmethod
+    def clear(cls):
+        """
+        清空缓存及统计信息
+
+        :return:
+        """
+        with cls._lock:
+            cls._entries.clear()
+            cls._hits = cls._misses = cls._invalidations = 0
+
+    @classmethod
+    def stats(cls):
+        """
+        获取缓存命中统计
+
+        :return: 统计信息字典
+        """
+        with cls._lock:
+            lookups = cls._hits + cls._misses
+            return dict(
+                hits=cls._hits,
+                misses=cls._misses,
+                hit_rate=round(cls._hits / lookups, 4) if lookups else 0.0,
+                invalidations=cls._invalidations,
+                size=len(cls._entries),
+            )
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    tables = {obj.__table__.name for obj in [*session.new, *session.dirty, *session.deleted] if hasattr(obj, '__table__')}
+    if tables:
+        PageCountCache.mark_dirty(session, tables)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and hasattr(table, 'name'):
+            PageCountCache.mark_dirty(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_tables(session):
+    tables = session.info.pop(PageCountCache.SESSION_KEY, None)
+    if tables:
+        PageCountCache.bump(tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_tables(session):
+    session.info.pop(PageCountCache.SESSION_KEY, None)
 
 
 class PageUtil:
@@ -64,7 +241,7 @@ class PageUtil:
         :return: 分页数据对象
         """
         if is_page:
-            total = (db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
+            total = PageCountCache.get_total(db, query)
             query_result = db.execute(query.offset((page_num - 1) * page_size).limit(page_size))
             paginated_data = []
             for row in query_result:
@@ -92,6 +269,94 @@ class PageUtil:
 
         return result
 
+    @classmethod
+    def encode_cursor(cls, values: Sequence[Any]):
+        """
+        将排序键值编码为不透明游标
+
+        :param values: 排序键值列表
+        :return: 游标字符串
+        """
+        payload = [
+            {'t': 'datetime', 'v': value.isoformat()} if isinstance(value, datetime) else {'t': 'raw', 'v': value}
+            for value in values
+        ]
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls, cursor: str, size: int):
+        """
+        解码游标为排序键值列表
+
+        :param cursor: 游标字符串
+        :param size: 排序键数量
+        :return: 排序键值列表
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values = [
+                datetime.fromisoformat(item['v']) if item['t'] == 'datetime' else item['v'] for item in payload
+            ]
+        except (ValueError, TypeError, KeyError):
+            raise ServiceException(message='分页游标不合法')
+        if len(values) != size:
+            raise ServiceException(message='分页游标不合法')
+        return values
+
+    @classmethod
+    def cursor_paginate(
+        cls,
+        db: Session,
+        query: Select,
+        sort_columns: List[Tuple[Any, bool]],
+        cursor: Optional[str],
+        page_size: int,
+        with_total: bool = False,
+    ):
+        """
+        输入查询语句和游标信息，按排序键定位(keyset)返回下一页数据，无需OFFSET扫描已翻过的数据
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句(不含排序)
+        :param sort_columns: 排序键列表，元素为(列, 是否降序)，最后一列须唯一以保证顺序稳定
+        :param cursor: 上一页返回的游标，为空时查询第一页
+        :param page_size: 当前页面数据量
+        :param with_total: 是否统计总数
+        :return: 分页数据对象
+        """
+        total = None
+        if with_total:
+            total = PageCountCache.get_total(db, query.order_by(None))
+        if cursor:
+            values = cls.decode_cursor(cursor, len(sort_columns))
+            # (a, b) < (x, y) 展开为 a < x OR (a = x AND b < y)，保证各数据库均可走联合索引
+            seek_conditions = []
+            for index, (column, descending) in enumerate(sort_columns):
+                equal_conditions = [
+                    prev_column == values[prev_index] for prev_index, (prev_column, _) in enumerate(sort_columns[:index])
+                ]
+                compare = column < values[index] if descending else column > values[index]
+                seek_conditions.append(and_(*equal_conditions, compare))
+            query = query.where(or_(*seek_conditions))
+        query = query.order_by(None).order_by(
+            *[column.desc() if descending else column.asc() for column, descending in sort_columns]
+        )
+        query_result = db.execute(query.limit(page_size + 1)).all()
+        has_next = len(query_result) > page_size
+        paginated_data = [row[0] if row and len(row) == 1 else row for row in query_result[:page_size]]
+        next_cursor = None
+        if has_next:
+            last_row = paginated_data[-1]
+            next_cursor = cls.encode_cursor([getattr(last_row, column.key) for column, _ in sort_columns])
+
+        return PageResponseModel(
+            rows=CamelCaseUtil.transform_result(paginated_data),
+            pageSize=page_size,
+            total=total,
+            hasNext=has_next,
+            nextCursor=next_cursor,
+        )
+
 
 def get_page_obj(data_list: List, page_num: int, page_size: int):
     """
@@ -0,0 +1,158 @@
+import math
+import re
+import threading
+import weakref
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+
+class NgramTokenizer:
+    """
+    ngram分词工具类，与MySQL ngram全文解析器(ngram_token_size=2)保持一致的切分方式
+    """
+
+    TOKEN_SIZE = 2
+    WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """
+        将文本切分为ngram词元列表
+
+        :param text: 原始文本
+        :return: 词元列表
+        """
+        if not text:
+            return []
+        tokens = []
+        for word in cls.WORD_PATTERN.findall(text.lower()):
+            if len(word) < cls.TOKEN_SIZE:
+                tokens.append(word)
+                continue
+            tokens.extend(word[i : i + cls.TOKEN_SIZE] for i in range(len(word) - cls.TOKEN_SIZE + 1))
+        return tokens
+
+
+class InvertedIndex:
+    """
+    进程内倒排索引，作为非MySQL数据库(如SQLite测试库)下全文检索的兜底实现
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.loaded = False
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add_document(self, doc_id: int, text: str):
+        """
+        新增或替换文档
+
+        :param doc_id: 文档ID
+        :param text: 文档文本
+        :return:
+        """
+        terms = Counter(NgramTokenizer.tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = tf
+            length = sum(terms.values())
+            self._doc_terms[doc_id] = terms
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+
+    def remove_document(self, doc_id: int):
+        """
+        删除文档
+
+        :param doc_id: 文档ID
+        :return:
+        """
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: int):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id, 0)
+
+    def search(self, query: str, limit: int = None) -> List[Tuple[int, float]]:
+        """
+        检索同时包含查询中全部词元的文档，并按BM25得分降序返回
+
+        :param query: 查询文本
+        :param limit: 最大返回条数
+        :return: (文档ID, 得分)列表
+        """
+        query_terms = set(NgramTokenizer.tokenize(query))
+        if not query_terms:
+            return []
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if doc_count == 0:
+                return []
+            postings_list = []
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    return []
+                postings_list.append((term, postings))
+            # 从最短的倒排链开始求交集
+            postings_list.sort(key=lambda item: len(item[1]))
+            candidates = set(postings_list[0][1])
+            for _, postings in postings_list[1:]:
+                candidates.intersection_update(postings)
+                if not candidates:
+                    return []
+            avg_length = self._total_length / doc_count
+            scores = {}
+            for doc_id in candidates:
+                doc_length = self._doc_lengths[doc_id]
+                norm = self.k1 * (1 - self.b + self.b * doc_length / avg_length)
+                score = 0.0
+                for _, postings in postings_list:
+                    tf = postings[doc_id]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    score += idf * tf * (self.k1 + 1) / (tf + norm)
+                scores[doc_id] = score
+        result = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return result[:limit] if limit else result
+
+
+class SearchIndexUtil:
+    """
+    全文检索兜底索引管理工具类，每个数据库引擎对应一个进程内倒排索引
+    """
+
+    _indexes = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_index(cls, engine) -> InvertedIndex:
+        """
+        获取数据库引擎对应的倒排索引
+
+        :param engine: sqlalchemy引擎对象
+        :return: 倒排索引对象
+        """
+        with cls._lock:
+            index = cls._indexes.get(engine)
+            if index is None:
+                index = InvertedIndex()
+                cls._indexes[engine] = index
+            return index
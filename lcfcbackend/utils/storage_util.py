@@ -0,0 +1,226 @@
+import glob
+import hashlib
+import os
+import re
+import uuid
+from typing import Iterator, List, Tuple
+from config.constant import AttachmentConstant
+from config.env import UploadConfig
+
+
+class StorageUtil:
+    """
+    按内容寻址的附件存储工具类，文件以SHA-256摘要为名存放在 blob/摘要前2位/摘要3-4位/摘要 下，
+    后台压缩后改为存放zstd可寻址格式的 摘要.zst，文本附件在线查看时在旁边生成行索引 摘要.lidx，
+    浏览压缩包时在旁边缓存目录 摘要.zdir，压缩包内文本文件的行索引为 摘要.文件名摘要.lidx，
+    日志附件提取的结构化事件存放在 摘要.evt
+    """
+
+    HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+    DELETING_SUFFIX = '.deleting'
+    COMPRESSED_SUFFIX = '.zst'
+    LINE_INDEX_SUFFIX = '.lidx'
+    ZIP_DIRECTORY_SUFFIX = '.zdir'
+    EVENT_SUFFIX = '.evt'
+
+    @classmethod
+    def is_valid_hash(cls, file_hash: str):
+        """
+        校验SHA-256摘要格式(64位小写十六进制)
+
+        :param file_hash: 文件摘要
+        :return: 校验结果
+        """
+        return bool(file_hash) and cls.HASH_PATTERN.match(file_hash) is not None
+
+    @classmethod
+    def get_blob_path(cls, file_hash: str):
+        """
+        获取文件摘要对应的存储路径
+
+        :param file_hash: 文件SHA-256摘要
+        :return: 存储路径
+        """
+        if not cls.is_valid_hash(file_hash):
+            raise ValueError(f'文件摘要格式不合法: {file_hash}')
+
+        return os.path.join(
+            UploadConfig.UPLOAD_PATH, AttachmentConstant.BLOB_PATH, file_hash[:2], file_hash[2:4], file_hash
+        )
+
+    @classmethod
+    def get_temp_dir(cls):
+        """
+        获取存储目录下的临时文件目录
+
+        :return: 临时文件目录
+        """
+        return os.path.join(UploadConfig.UPLOAD_PATH, AttachmentConstant.BLOB_PATH, 'tmp')
+
+    @classmethod
+    def get_temp_path(cls):
+        """
+        获取与存储目录位于同一文件系统的临时文件路径，写完后可原子移动到存储路径
+
+        :return: 临时文件路径
+        """
+        temp_dir = cls.get_temp_dir()
+        os.makedirs(temp_dir, exist_ok=True)
+
+        return os.path.join(temp_dir, f'{uuid.uuid4().hex}.part')
+
+    @classmethod
+    def resolve_path(cls, file_path: str):
+        """
+        获取文件实际存放的路径，原文件已被压缩时返回压缩文件路径
+
+        :param file_path: 文件路径
+        :return: 实际存放路径，文件不存在时为None
+        """
+        for path in (file_path, file_path + cls.COMPRESSED_SUFFIX):
+            if os.path.isfile(path):
+                return path
+
+        return None
+
+    @classmethod
+    def is_compressed(cls, file_path: str):
+        """
+        判断实际存放路径是否为压缩文件
+
+        :param file_path: resolve_path返回的实际存放路径
+        :return: 判断结果
+        """
+        return file_path.endswith(cls.COMPRESSED_SUFFIX)
+
+    @classmethod
+    def get_line_index_path(cls, file_path: str, member_name: str = None):
+        """
+        获取文件的行索引路径
+
+        :param file_path: 文件路径
+        :param member_name: 压缩包内的文件名，指定时获取压缩包内文件的行索引路径
+        :return: 行索引路径
+        """
+        if member_name:
+            member_digest = hashlib.sha1(member_name.encode('utf-8')).hexdigest()[:16]
+            return f'{file_path}.{member_digest}{cls.LINE_INDEX_SUFFIX}'
+
+        return file_path + cls.LINE_INDEX_SUFFIX
+
+    @classmethod
+    def get_zip_directory_path(cls, file_path: str):
+        """
+        获取压缩包的目录缓存路径
+
+        :param file_path: 文件路径
+        :return: 目录缓存路径
+        """
+        return file_path + cls.ZIP_DIRECTORY_SUFFIX
+
+    @classmethod
+    def get_event_path(cls, file_path: str):
+        """
+        获取日志附件的结构化事件文件路径
+
+        :param file_path: 文件路径
+        :return: 事件文件路径
+        """
+        return file_path + cls.EVENT_SUFFIX
+
+    @classmethod
+    def get_sidecar_paths(cls, file_path: str):
+        """
+        获取文件旁生成的压缩文件、行索引、目录缓存等附属文件
+
+        :param file_path: 文件路径
+        :return: 已存在的附属文件路径列表
+        """
+        return sorted(
+            path
+            for path in glob.glob(glob.escape(file_path) + '.*')
+            if not path.endswith(cls.DELETING_SUFFIX) and not path.endswith('.part')
+        )
+
+    @classmethod
+    def iter_blob_files(cls) -> Iterator[Tuple[str, str]]:
+        """
+        按文件名顺序遍历存储目录下的全部文件(含附属文件，不含临时目录)，文件名以摘要开头，因此也按摘要有序
+
+        :yield: (文件所属的摘要, 文件路径)，文件名不以合法摘要开头时摘要为None
+        """
+        blob_root = os.path.join(UploadConfig.UPLOAD_PATH, AttachmentConstant.BLOB_PATH)
+        for first in cls._sorted_entries(blob_root):
+            if len(first.name) != 2 or not first.is_dir():
+                continue
+            for second in cls._sorted_entries(first.path):
+                if not second.is_dir():
+                    continue
+                for entry in cls._sorted_entries(second.path):
+                    if entry.is_file():
+                        file_hash = entry.name[:64]
+                        yield (file_hash if cls.is_valid_hash(file_hash) else None), entry.path
+
+    @classmethod
+    def _sorted_entries(cls, path: str):
+        try:
+            with os.scandir(path) as entries:
+                return sorted(entries, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return []
+
+    @classmethod
+    def store_blob(cls, temp_path: str, blob_path: str):
+        """
+        将临时文件移动到存储路径，存储路径已有相同内容(含压缩后的文件)时保留临时文件，由调用方自行删除
+
+        :param temp_path: 临时文件路径
+        :param blob_path: 存储路径
+        :return: 是否新建了存储文件
+        """
+        if cls.resolve_path(blob_path):
+            return False
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(temp_path, blob_path)
+
+        return True
+
+    @classmethod
+    def detach_blobs(cls, blob_paths: List[str]):
+        """
+        将待删除的存储文件重命名为删除中状态，事务提交后再调用purge_blobs删除，回滚时调用restore_blobs恢复
+
+        :param blob_paths: 存储路径列表
+        :return: 删除中状态的文件路径列表
+        """
+        detached_paths = []
+        for blob_path in blob_paths:
+            for path in [blob_path] + cls.get_sidecar_paths(blob_path):
+                if os.path.exists(path):
+                    os.replace(path, path + cls.DELETING_SUFFIX)
+                    detached_paths.append(path + cls.DELETING_SUFFIX)
+
+        return detached_paths
+
+    @classmethod
+    def restore_blobs(cls, detached_paths: List[str]):
+        """
+        恢复删除中状态的存储文件
+
+        :param detached_paths: 删除中状态的文件路径列表
+        :return:
+        """
+        for detached_path in detached_paths:
+            os.replace(detached_path, detached_path[: -len(cls.DELETING_SUFFIX)])
+
+    @classmethod
+    def purge_blobs(cls, detached_paths: List[str]):
+        """
+        删除删除中状态的存储文件
+
+        :param detached_paths: 删除中状态的文件路径列表
+        :return:
+        """
+        for detached_path in detached_paths:
+            if os.path.exists(detached_path):
+                os.remove(detached_path)
@@ -0,0 +1,63 @@
+from typing import Callable, Hashable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.log_util import logger
+
+
+class TransactionUtil:
+    """
+    数据库事务工具类
+    """
+
+    INFO_KEY = 'after_commit_callbacks'
+
+    @classmethod
+    def after_commit(cls, db: Session, callback: Callable[[], None], key: Optional[Hashable] = None):
+        """
+        在数据库事务提交后执行回调，用于同步进程内状态或触发后台任务，避免读取到或保留未提交的数据；
+        事务回滚时丢弃，回滚到保存点时丢弃该保存点内注册的回调
+
+        :param db: orm对象
+        :param callback: 回调函数
+        :param key: 回调标识，同一事务中标识相同的回调只执行一次
+        """
+        # 尚未开始事务时开始事务，使回调归属于本次事务
+        transaction = db.get_nested_transaction() or db.get_transaction() or db.begin()
+        db.info.setdefault(cls.INFO_KEY, []).append((transaction, key, callback))
+        if not event.contains(db, 'after_commit', cls._run_callbacks):
+            event.listen(db, 'after_commit', cls._run_callbacks)
+            event.listen(db, 'after_soft_rollback', cls._discard_callbacks)
+
+    @classmethod
+    def _run_callbacks(cls, db: Session):
+        # 释放保存点时同样触发after_commit，只在最外层事务提交后执行
+        if db.in_nested_transaction():
+            return
+        callbacks: List[tuple] = db.info.pop(cls.INFO_KEY, [])
+        keys = set()
+        for _, key, callback in callbacks:
+            if key is not None:
+                if key in keys:
+                    continue
+                keys.add(key)
+            try:
+                callback()
+            except Exception as e:
+                # 回调失败不影响已提交的事务
+                logger.error(f'事务提交后执行回调失败: {str(e)}')
+
+    @classmethod
+    def _discard_callbacks(cls, db: Session, previous_transaction):
+        if not previous_transaction.nested:
+            db.info.pop(cls.INFO_KEY, None)
+            return
+        callbacks: List[tuple] = db.info.get(cls.INFO_KEY, [])
+        callbacks[:] = [item for item in callbacks if not cls._is_within(item[0], previous_transaction)]
+
+    @staticmethod
+    def _is_within(transaction, ancestor):
+        while transaction is not None:
+            if transaction is ancestor:
+                return True
+            transaction = transaction.parent
+        return False
@@ -0,0 +1,339 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+class TrigramUtil:
+    """
+    三字节组(trigram)提取工具类，内容按ASCII转小写后提取，每个trigram编码为24位整数
+    """
+
+    LOWER_TABLE = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+
+    @classmethod
+    def extract(cls, chunks: Iterable[bytes]) -> np.ndarray:
+        """
+        提取内容中出现过的全部trigram
+
+        :param chunks: 内容数据块
+        :return: 去重并升序排列的trigram数组(uint32)
+        """
+        seen = np.zeros(1 << 24, dtype=bool)
+        tail = b''
+        for chunk in chunks:
+            data = (tail + chunk).translate(cls.LOWER_TABLE)
+            if len(data) >= 3:
+                values = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+                seen[(values[:-2] << 16) | (values[1:-1] << 8) | values[2:]] = True
+            tail = data[-2:]
+
+        return np.flatnonzero(seen).astype(np.uint32)
+
+    @classmethod
+    def literal_trigrams(cls, literal: bytes) -> Set[int]:
+        """
+        获取字符串包含的trigram
+
+        :param literal: 字符串
+        :return: trigram集合
+        """
+        data = literal.translate(cls.LOWER_TABLE)
+        return {(data[i] << 16) | (data[i + 1] << 8) | data[i + 2] for i in range(len(data) - 2)}
+
+    @classmethod
+    def regex_trigrams(cls, pattern: bytes, flags: int = 0) -> Set[int]:
+        """
+        获取正则表达式的任一匹配都必须包含的trigram，只分析顺序连接的普通字符，分支、字符集、可选重复等视为任意内容
+
+        :param pattern: bytes正则表达式
+        :param flags: 正则表达式标志
+        :return: trigram集合，为空时无法用索引缩小范围
+        """
+        trigrams = set()
+        for literal in cls._required_literals(sre_parse.parse(pattern, flags)):
+            trigrams |= cls.literal_trigrams(literal)
+
+        return trigrams
+
+    @classmethod
+    def _required_literals(cls, parsed) -> List[bytes]:
+        literals = []
+        current = bytearray()
+        for op, value in parsed:
+            if op is sre_parse.LITERAL:
+                current.append(value)
+                continue
+            if op is sre_parse.AT:
+                # 行首、行尾等零宽断言不打断连续的普通字符
+                continue
+            if op is sre_parse.SUBPATTERN:
+                # 分组内部的必需字符串只在分组内部连续
+                literals.extend(cls._required_literals(value[-1]))
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and value[0] >= 1:
+                literals.extend(cls._required_literals(value[2]))
+            literals.append(bytes(current))
+            current = bytearray()
+        literals.append(bytes(current))
+
+        return [literal for literal in literals if len(literal) >= 3]
+
+
+class TrigramSegment:
+    """
+    trigram倒排索引段文件(只读，内存映射)
+
+    文件格式：头部(魔数、文档数、trigram数、倒排项数)，
+    其后依次为文档ID数组、升序trigram数组、各trigram倒排链起始位置数组、倒排链(文档ID升序)
+    """
+
+    MAGIC = b'LCFCTRI1'
+    HEADER = struct.Struct('<8sIIQ')
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, doc_count, trigram_count, posting_count = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f'不是trigram索引段文件: {file_path}')
+        offset = self.HEADER.size
+        self.doc_ids = np.frombuffer(self._mmap, dtype=np.uint32, count=doc_count, offset=offset)
+        offset += 4 * doc_count
+        self.trigrams = np.frombuffer(self._mmap, dtype=np.uint32, count=trigram_count, offset=offset)
+        offset += 4 * trigram_count
+        self.offsets = np.frombuffer(self._mmap, dtype=np.uint64, count=trigram_count + 1, offset=offset)
+        offset += 8 * (trigram_count + 1)
+        self.postings = np.frombuffer(self._mmap, dtype=np.uint32, count=posting_count, offset=offset)
+
+    def lookup(self, trigrams: List[int]) -> np.ndarray:
+        """
+        查找同时包含全部trigram的文档
+
+        :param trigrams: trigram列表
+        :return: 文档ID数组
+        """
+        postings_list = []
+        positions = np.searchsorted(self.trigrams, np.asarray(trigrams, dtype=np.uint32))
+        for trigram, position in zip(trigrams, positions):
+            if position >= len(self.trigrams) or self.trigrams[position] != trigram:
+                return np.empty(0, dtype=np.uint32)
+            postings_list.append(self.postings[int(self.offsets[position]) : int(self.offsets[position + 1])])
+        # 从最短的倒排链开始求交集
+        postings_list.sort(key=len)
+        result = postings_list[0]
+        for postings in postings_list[1:]:
+            result = np.intersect1d(result, postings, assume_unique=True)
+            if not len(result):
+                break
+
+        return result
+
+    def iter_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        展开为(trigram, 文档ID)对，用于合并索引段
+
+        :return: (trigram数组, 文档ID数组)
+        """
+        counts = np.diff(self.offsets).astype(np.int64)
+        return np.repeat(self.trigrams, counts), np.asarray(self.postings)
+
+    @property
+    def posting_count(self):
+        return len(self.postings)
+
+    @classmethod
+    def write(cls, file_path: str, trigrams: np.ndarray, doc_ids: np.ndarray):
+        """
+        将(trigram, 文档ID)对写入索引段文件
+
+        :param file_path: 索引段文件路径
+        :param trigrams: trigram数组
+        :param doc_ids: 与trigrams一一对应的文档ID数组
+        :return: 倒排项数
+        """
+        order = np.lexsort((doc_ids, trigrams))
+        trigrams, doc_ids = trigrams[order].astype(np.uint32), doc_ids[order].astype(np.uint32)
+        unique_trigrams, starts = np.unique(trigrams, return_index=True)
+        offsets = np.append(starts, len(trigrams)).astype(np.uint64)
+        segment_doc_ids = np.unique(doc_ids).astype(np.uint32)
+        temp_path = f'{file_path}.part'
+        with open(temp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(segment_doc_ids), len(unique_trigrams), len(doc_ids)))
+            for array in (segment_doc_ids, unique_trigrams.astype(np.uint32), offsets, doc_ids):
+                f.write(array.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+
+        return len(doc_ids)
+
+
+class TrigramIndex:
+    """
+    由多个只读索引段组成的增量trigram倒排索引，当前生效的索引段记录在manifest.json中(原子替换)
+
+    新文档批量写入新的索引段；索引段数超过上限时把较小的索引段合并为一个，并丢弃已删除文档的倒排项
+    """
+
+    MANIFEST = 'manifest.json'
+
+    _segment_cache: Dict[str, TrigramSegment] = {}
+    _cache_lock = threading.Lock()
+    _manifest_lock = threading.Lock()
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+
+    def load_manifest(self) -> List[dict]:
+        """
+        读取当前生效的索引段列表
+
+        :return: 索引段信息列表(name, doc_count, posting_count)
+        """
+        try:
+            with open(os.path.join(self.index_path, self.MANIFEST), encoding='utf-8') as f:
+                return json.load(f)['segments']
+        except FileNotFoundError:
+            return []
+
+    def add_documents(self, documents: List[Tuple[int, np.ndarray]]):
+        """
+        将一批文档写入新的索引段
+
+        :param documents: (文档ID, trigram数组)列表
+        :return: 新增的倒排项数
+        """
+        documents = [(doc_id, trigrams) for doc_id, trigrams in documents if len(trigrams)]
+        if not documents:
+            return 0
+        trigrams = np.concatenate([trigrams for _, trigrams in documents])
+        doc_ids = np.concatenate(
+            [np.full(len(trigrams), doc_id, dtype=np.uint32) for doc_id, trigrams in documents]
+        )
+        segment = self._write_segment(trigrams, doc_ids)
+        with self._manifest_lock:
+            self._save_manifest(self.load_manifest() + [segment])
+
+        return segment['posting_count']
+
+    def merge(self, max_segments: int, max_postings: int, live_doc_ids: Optional[Set[int]] = None):
+        """
+        索引段数超过上限时，将倒排项最少的若干索引段合并为一个
+
+        :param max_segments: 索引段数上限
+        :param max_postings: 单次合并的倒排项总数上限
+        :param live_doc_ids: 仍然有效的文档ID，指定时合并时丢弃其他文档的倒排项
+        :return: 被合并的索引段数
+        """
+        segments = self.load_manifest()
+        if len(segments) <= max_segments:
+            return 0
+        candidates = sorted(segments, key=lambda segment: segment['posting_count'])
+        selected = []
+        total_postings = 0
+        for segment in candidates:
+            if len(selected) >= 2 and total_postings + segment['posting_count'] > max_postings:
+                break
+            selected.append(segment)
+            total_postings += segment['posting_count']
+        if len(selected) < 2:
+            return 0
+
+        pairs = [self._open_segment(segment['name']).iter_pairs() for segment in selected]
+        trigrams = np.concatenate([pair[0] for pair in pairs])
+        doc_ids = np.concatenate([pair[1] for pair in pairs])
+        if live_doc_ids is not None:
+            live = np.isin(doc_ids, np.fromiter(live_doc_ids, dtype=np.uint32, count=len(live_doc_ids)))
+            trigrams, doc_ids = trigrams[live], doc_ids[live]
+        merged = [self._write_segment(trigrams, doc_ids)] if len(doc_ids) else []
+        selected_names = {segment['name'] for segment in selected}
+        with self._manifest_lock:
+            # 合并期间可能有新的索引段写入，重新读取manifest
+            remaining = [segment for segment in self.load_manifest() if segment['name'] not in selected_names]
+            self._save_manifest(remaining + merged)
+        for name in selected_names:
+            self._remove_segment(name)
+
+        return len(selected)
+
+    def lookup(self, trigrams: Set[int]) -> Set[int]:
+        """
+        查找同时包含全部trigram的文档
+
+        :param trigrams: trigram集合
+        :return: 文档ID集合
+        """
+        trigram_list = sorted(trigrams)
+        for attempt in range(2):
+            try:
+                doc_ids = set()
+                for segment in self.load_manifest():
+                    doc_ids.update(int(doc_id) for doc_id in self._open_segment(segment['name']).lookup(trigram_list))
+                return doc_ids
+            except FileNotFoundError:
+                # 读取manifest后索引段被合并删除，重新读取manifest
+                if attempt:
+                    raise
+
+    def get_size(self):
+        """
+        获取索引占用的磁盘大小
+
+        :return: (索引段数, 文档数, 倒排项数, 字节数)
+        """
+        segments = self.load_manifest()
+        file_size = sum(
+            os.path.getsize(os.path.join(self.index_path, segment['name']))
+            for segment in segments
+            if os.path.exists(os.path.join(self.index_path, segment['name']))
+        )
+
+        return (
+            len(segments),
+            sum(segment['doc_count'] for segment in segments),
+            sum(segment['posting_count'] for segment in segments),
+            file_size,
+        )
+
+    def _write_segment(self, trigrams: np.ndarray, doc_ids: np.ndarray):
+        os.makedirs(self.index_path, exist_ok=True)
+        name = f'{uuid.uuid4().hex}.tri'
+        posting_count = TrigramSegment.write(os.path.join(self.index_path, name), trigrams, doc_ids)
+
+        return dict(name=name, doc_count=int(len(np.unique(doc_ids))), posting_count=posting_count)
+
+    def _save_manifest(self, segments: List[dict]):
+        manifest_path = os.path.join(self.index_path, self.MANIFEST)
+        temp_path = f'{manifest_path}.{uuid.uuid4().hex}.part'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'segments': segments}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, manifest_path)
+
+    def _open_segment(self, name: str) -> TrigramSegment:
+        file_path = os.path.join(self.index_path, name)
+        with self._cache_lock:
+            segment = self._segment_cache.get(file_path)
+            if segment is None:
+                segment = self._segment_cache[file_path] = TrigramSegment(file_path)
+
+        return segment
+
+    def _remove_segment(self, name: str):
+        file_path = os.path.join(self.index_path, name)
+        with self._cache_lock:
+            # 已打开的内存映射在文件删除后仍然有效，由正在执行的查询自行释放
+            self._segment_cache.pop(file_path, None)
+        if os.path.exists(file_path):
+            os.remove(file_path)
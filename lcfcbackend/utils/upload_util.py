@@ -1,8 +1,12 @@
+import hashlib
 import os
 import random
 from datetime import datetime
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, Tuple
 from config.env import UploadConfig
+from exceptions.exception import ServiceException
 
 
 class UploadUtil:
@@ -21,6 +25,162 @@ class UploadUtil:
 
         return f'{random_number:03}'
 
+    @classmethod
+    def generate_upload_file_path(cls, original_filename: str):
+        """
+        按上传日期目录和文件命名规则生成上传文件的相对目录与文件名
+
+        :param original_filename: 原始文件名
+        :return: (相对目录, 新文件名)
+        """
+        now = datetime.now()
+        relative_path = f'upload/{now.strftime("%Y")}/{now.strftime("%m")}/{now.strftime("%d")}'
+        filename = f'{original_filename.rsplit(".", 1)[0]}_{now.strftime("%Y%m%d%H%M%S")}{UploadConfig.UPLOAD_MACHINE}{cls.generate_random_number()}.{original_filename.rsplit(".")[-1]}'
+
+        return relative_path, filename
+
+    @classmethod
+    async def save_stream(
+        cls, stream: AsyncIterator[bytes], filepath: str, max_size: int, write_size: int
+    ) -> Tuple[int, str]:
+        """
+        将异步字节流单次写入目标文件，写入的同时统计大小并计算SHA-256
+
+        文件先写入同目录下的.part临时文件，完成后原子替换为目标文件；超过大小上限或写入异常时删除临时文件。
+        写盘和哈希计算在线程池中执行，不阻塞事件循环。
+
+        :param stream: 异步字节流(如request.stream())
+        :param filepath: 目标文件路径
+        :param max_size: 大小上限(字节)
+        :param write_size: 累积多少字节后写盘一次
+        :return: (文件大小, SHA-256十六进制摘要)
+        """
+        temp_path = f'{filepath}.part'
+        sha256 = hashlib.sha256()
+        size = 0
+        buffer = []
+        buffer_size = 0
+        file = await run_in_threadpool(open, temp_path, 'wb')
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_size:
+                    raise ServiceException(message=f'文件大小不能超过{max_size // (1024 * 1024)}MB')
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+                if buffer_size >= write_size:
+                    await run_in_threadpool(cls._write_and_hash, file, sha256, b''.join(buffer))
+                    buffer, buffer_size = [], 0
+            if buffer:
+                await run_in_threadpool(cls._write_and_hash, file, sha256, b''.join(buffer))
+            await run_in_threadpool(file.close)
+            await run_in_threadpool(os.replace, temp_path, filepath)
+        except BaseException:
+            await run_in_threadpool(cls._discard_file, file, temp_path)
+            raise
+
+        return size, sha256.hexdigest()
+
+    @classmethod
+    async def write_stream_at(
+        cls, stream: AsyncIterator[bytes], filepath: str, offset: int, length: int, write_size: int
+    ):
+        """
+        将异步字节流写入已存在文件的指定偏移处，要求字节流长度恰好为length，多个写入可并发进行；
+        每次写盘前确认目标路径仍指向打开的文件，文件被移走(如上传已完成)后停止写入
+
+        :param stream: 异步字节流(如request.stream())
+        :param filepath: 目标文件路径
+        :param offset: 写入起始偏移
+        :param length: 期望写入的字节数
+        :param write_size: 累积多少字节后写盘一次
+        :return:
+        """
+        fd = await run_in_threadpool(os.open, filepath, os.O_WRONLY)
+        try:
+            position = offset
+            received = 0
+            buffer = []
+            buffer_size = 0
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                received += len(chunk)
+                if received > length:
+                    raise ServiceException(message=f'分片大小超过预期的{length}字节')
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+                if buffer_size >= write_size:
+                    await run_in_threadpool(cls._pwrite_target, fd, filepath, b''.join(buffer), position)
+                    position += buffer_size
+                    buffer, buffer_size = [], 0
+            if buffer:
+                await run_in_threadpool(cls._pwrite_target, fd, filepath, b''.join(buffer), position)
+            if received != length:
+                raise ServiceException(message=f'分片数据不完整，期望{length}字节，实际收到{received}字节')
+        finally:
+            await run_in_threadpool(os.close, fd)
+
+    @classmethod
+    def allocate_file(cls, filepath: str, size: int):
+        """
+        创建指定大小的空文件(稀疏文件)，供分片按偏移写入
+
+        :param filepath: 文件路径
+        :param size: 文件大小
+        :return:
+        """
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'wb') as f:
+            f.truncate(size)
+
+    @classmethod
+    def hash_file(cls, filepath: str, read_size: int = 1024 * 1024):
+        """
+        计算文件的SHA-256摘要
+
+        :param filepath: 文件路径
+        :param read_size: 每次读取的字节数
+        :return: SHA-256十六进制摘要
+        """
+        sha256 = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(read_size), b''):
+                sha256.update(chunk)
+
+        return sha256.hexdigest()
+
+    @classmethod
+    def _pwrite_target(cls, fd: int, filepath: str, data: bytes, position: int):
+        try:
+            moved = not os.path.samestat(os.fstat(fd), os.stat(filepath))
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            raise ServiceException(message='目标文件已被移走，停止写入')
+        cls._pwrite_all(fd, data, position)
+
+    @classmethod
+    def _pwrite_all(cls, fd: int, data: bytes, position: int):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, position)
+            view = view[written:]
+            position += written
+
+    @classmethod
+    def _write_and_hash(cls, file, sha256, data: bytes):
+        file.write(data)
+        sha256.update(data)
+
+    @classmethod
+    def _discard_file(cls, file, filepath: str):
+        file.close()
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
     @classmethod
     def check_file_exists(cls, filepath: str):
         """
@@ -85,15 +245,17 @@ class UploadUtil:
         return False
 
     @classmethod
-    def generate_file(cls, filepath: str):
+    def generate_file(cls, filepath: str, read_size: int = 1024 * 1024):
         """
         根据文件生成二进制数据
 
         :param filepath: 文件路径
+        :param read_size: 每次读取的字节数
         :yield: 二进制数据
         """
         with open(filepath, 'rb') as response_file:
-            yield from response_file
+            # 按固定大小读取，避免按换行符切分二进制文件产生大量碎片
+            yield from iter(lambda: response_file.read(read_size), b'')
 
     @classmethod
     def delete_file(cls, filepath: str):
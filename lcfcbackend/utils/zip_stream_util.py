@@ -0,0 +1,139 @@
+import os
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, Optional
+from config.constant import ArchiveConstant
+
+
+class ZipStreamEntry(NamedTuple):
+    """
+    流式打包的文件，open_chunks在写入该文件时才被调用，返回按块读取文件内容的迭代器；
+    读取磁盘文件时应在打包前打开文件，由close在打包结束(包括中途失败)时关闭
+    """
+
+    name: str
+    file_size: Optional[int]
+    modify_time: Optional[datetime]
+    compress: bool
+    open_chunks: Callable[[], Iterable[bytes]]
+    close: Optional[Callable[[], None]] = None
+
+
+class _ZipStreamSink:
+    """
+    zipfile的输出对象，只支持追加写入，zipfile据此使用数据描述符记录各文件的CRC及大小；
+    写入的数据暂存在缓冲区中，由生成器在每次写入后取出发送
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    @property
+    def size(self):
+        return len(self._buffer)
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class ZipStreamUtil:
+    """
+    zip流式打包工具类，边读取边压缩边输出，不生成临时文件，也不在内存中保存完整文件；
+    文件或压缩包超过4GB时自动使用ZIP64格式
+    """
+
+    @classmethod
+    def iter_zip(cls, entries: List[ZipStreamEntry]) -> Iterator[bytes]:
+        """
+        将文件流式打包为zip压缩包，文件的实际大小与file_size不一致时抛出异常，不写入中央目录，
+        客户端收到的压缩包不完整而无法打开，不会得到内容被截断的压缩包
+
+        :param entries: 待打包的文件
+        :yield: 压缩包数据
+        """
+        try:
+            sink = _ZipStreamSink()
+            with zipfile.ZipFile(sink, 'w', allowZip64=True) as archive:
+                for entry in entries:
+                    info = zipfile.ZipInfo(entry.name, (entry.modify_time or datetime.now()).timetuple()[:6])
+                    info.external_attr = 0o644 << 16
+                    if entry.compress:
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        # Python 3.13起支持单独指定压缩级别，之前的版本使用deflate默认级别
+                        if hasattr(zipfile.ZipInfo, 'compress_level'):
+                            info.compress_level = ArchiveConstant.BUNDLE_COMPRESS_LEVEL
+                    # 已知原始大小时由zipfile判断是否需要ZIP64，未知时强制使用
+                    force_zip64 = entry.file_size is None
+                    if not force_zip64:
+                        info.file_size = entry.file_size
+                    with archive.open(info, 'w', force_zip64=force_zip64) as dest:
+                        size = 0
+                        for chunk in entry.open_chunks():
+                            dest.write(chunk)
+                            size += len(chunk)
+                            if sink.size >= ArchiveConstant.READ_SIZE:
+                                yield sink.drain()
+                        if entry.file_size is not None and size != entry.file_size:
+                            raise ValueError(f'{entry.name}的实际大小{size}与预期大小{entry.file_size}不一致')
+                if sink.size:
+                    yield sink.drain()
+            # 中央目录在压缩包关闭时写入
+            yield sink.drain()
+        finally:
+            for entry in entries:
+                if entry.close:
+                    entry.close()
+
+    @classmethod
+    def iter_file(cls, file: BinaryIO) -> Iterator[bytes]:
+        """
+        按块读取已打开文件的内容
+
+        :param file: 已打开的文件
+        :yield: 文件内容
+        """
+        yield from iter(lambda: file.read(ArchiveConstant.READ_SIZE), b'')
+
+    @classmethod
+    def iter_reader(cls, reader) -> Iterator[bytes]:
+        """
+        按块读取随机读取对象(如SeekableZstdReader)的内容
+
+        :param reader: 读取对象
+        :yield: 文件内容
+        """
+        offset = 0
+        while offset < reader.size:
+            data = reader.read(offset, ArchiveConstant.READ_SIZE)
+            if not data:
+                break
+            offset += len(data)
+            yield data
+
+    @classmethod
+    def unique_name(cls, file_name: str, used_names: set):
+        """
+        获取压缩包内不重复的文件名，去除路径分隔符，重名时在扩展名前追加序号
+
+        :param file_name: 原始文件名
+        :param used_names: 已使用的文件名(小写)，会加入本次返回的文件名
+        :return: 压缩包内的文件名
+        """
+        name = os.path.basename((file_name or '').replace('\\', '/')).strip() or 'attachment'
+        stem, ext = os.path.splitext(name)
+        index = 1
+        while name.lower() in used_names:
+            name = f'{stem} ({index}){ext}'
+            index += 1
+        used_names.add(name.lower())
+
+        return name
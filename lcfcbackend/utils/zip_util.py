@@ -0,0 +1,328 @@
+import json
+import os
+import struct
+import uuid
+import zipfile
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Iterator, List, NamedTuple, Optional
+from config.constant import ArchiveConstant
+
+
+class ZipMember(NamedTuple):
+    """
+    压缩包内文件的目录信息，data_offset为文件数据在压缩包中的起始偏移
+    """
+
+    name: str
+    file_size: int
+    compress_size: int
+    compress_type: int
+    crc: int
+    modify_time: str
+    header_offset: int
+    data_offset: int
+    is_dir: bool
+    encrypted: bool
+
+
+class ZipUtil:
+    """
+    zip压缩包浏览工具类，只读取中央目录及各文件的本地文件头，不解压整个压缩包；
+    目录解析结果缓存在内存及压缩包旁的目录文件中
+    """
+
+    DIRECTORY_VERSION = 1
+    LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+    LOCAL_HEADER_MAGIC = b'PK\x03\x04'
+    COMPRESS_TYPE_NAMES = {
+        zipfile.ZIP_STORED: 'stored',
+        zipfile.ZIP_DEFLATED: 'deflated',
+        zipfile.ZIP_BZIP2: 'bzip2',
+        zipfile.ZIP_LZMA: 'lzma',
+    }
+
+    _directory_cache = OrderedDict()
+    _directory_cache_lock = Lock()
+
+    @classmethod
+    def read_directory(cls, file_path: str) -> List[ZipMember]:
+        """
+        读取压缩包的中央目录，并根据本地文件头计算各文件数据的起始偏移
+
+        :param file_path: 压缩包路径
+        :return: 压缩包内文件列表
+        """
+        members = []
+        with open(file_path, 'rb') as f, zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                f.seek(info.header_offset)
+                header = f.read(cls.LOCAL_HEADER.size)
+                if len(header) < cls.LOCAL_HEADER.size or header[:4] != cls.LOCAL_HEADER_MAGIC:
+                    raise zipfile.BadZipFile(f'本地文件头损坏: {info.filename}')
+                name_length, extra_length = cls.LOCAL_HEADER.unpack(header)[-2:]
+                members.append(
+                    ZipMember(
+                        name=info.filename,
+                        file_size=info.file_size,
+                        compress_size=info.compress_size,
+                        compress_type=info.compress_type,
+                        crc=info.CRC,
+                        modify_time=datetime(*info.date_time).strftime('%Y-%m-%d %H:%M:%S'),
+                        header_offset=info.header_offset,
+                        data_offset=info.header_offset + cls.LOCAL_HEADER.size + name_length + extra_length,
+                        is_dir=info.is_dir(),
+                        encrypted=bool(info.flag_bits & 0x1),
+                    )
+                )
+
+        return members
+
+    @classmethod
+    def get_directory(cls, file_path: str, cache_path: str) -> List[ZipMember]:
+        """
+        获取压缩包目录，依次从内存缓存、目录文件读取，均不可用时读取压缩包并持久化
+
+        :param file_path: 压缩包路径
+        :param cache_path: 目录文件路径
+        :return: 压缩包内文件列表
+        """
+        archive_size = os.path.getsize(file_path)
+        with cls._directory_cache_lock:
+            cached = cls._directory_cache.get(cache_path)
+            if cached is not None:
+                cls._directory_cache.move_to_end(cache_path)
+        if cached is None or cached[0] != archive_size:
+            cached = cls._load_directory(cache_path)
+            if cached is None or cached[0] != archive_size:
+                cached = (archive_size, cls.read_directory(file_path))
+                cls._save_directory(cached, cache_path)
+            with cls._directory_cache_lock:
+                cls._directory_cache[cache_path] = cached
+                while len(cls._directory_cache) > ArchiveConstant.DIRECTORY_CACHE_SIZE:
+                    cls._directory_cache.popitem(last=False)
+
+        return cached[1]
+
+    @classmethod
+    def find_member(cls, members: List[ZipMember], name: str) -> Optional[ZipMember]:
+        """
+        按文件名查找压缩包内的文件，同名文件取最后一个(与zipfile一致)
+
+        :param members: 压缩包内文件列表
+        :param name: 文件名
+        :return: 文件目录信息，不存在时为None
+        """
+        for member in reversed(members):
+            if member.name == name:
+                return member
+
+        return None
+
+    @classmethod
+    def get_compress_type_name(cls, compress_type: int):
+        """
+        获取压缩方式名称
+
+        :param compress_type: 压缩方式
+        :return: 压缩方式名称
+        """
+        return cls.COMPRESS_TYPE_NAMES.get(compress_type, str(compress_type))
+
+    @classmethod
+    def iter_member_range(cls, file_path: str, member: ZipMember, offset: int, length: int) -> Iterator[bytes]:
+        """
+        按原始数据偏移读取压缩包内文件的字节区间，读取完整文件时校验CRC
+
+        :param file_path: 压缩包路径
+        :param member: 文件目录信息
+        :param offset: 起始偏移
+        :param length: 读取长度
+        :yield: 解压后的数据
+        """
+        end = min(offset + length, member.file_size)
+        crc = 0 if offset == 0 and end == member.file_size else None
+        with ZipMemberReader(file_path, member) as reader:
+            while offset < end:
+                data = reader.read(offset, min(ArchiveConstant.READ_SIZE * 4, end - offset))
+                if not data:
+                    raise zipfile.BadZipFile(f'文件数据不完整: {member.name}')
+                if crc is not None:
+                    crc = zlib.crc32(data, crc)
+                offset += len(data)
+                yield data
+        if crc is not None and crc != member.crc:
+            raise zipfile.BadZipFile(f'文件CRC校验失败: {member.name}')
+
+    @classmethod
+    def _load_directory(cls, cache_path: str):
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                directory = json.load(f)
+            if directory.get('version') != cls.DIRECTORY_VERSION:
+                return None
+            return directory['archive_size'], [ZipMember(*member) for member in directory['members']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def _save_directory(cls, cached: tuple, cache_path: str):
+        temp_path = f'{cache_path}.{uuid.uuid4().hex}.part'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': cls.DIRECTORY_VERSION, 'archive_size': cached[0], 'members': cached[1]},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # 目录文件写入失败不影响本次读取，下次请求重新读取压缩包
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class ZipMemberReader:
+    """
+    压缩包内单个文件的随机读取对象，按原始数据偏移读取：
+    存储(未压缩)的文件直接读取压缩包的对应区间；deflate压缩的文件在顺序解压时每隔CHECKPOINT_INTERVAL保存一次解压状态，
+    随机读取时从最近的保存点继续解压；其他压缩方式从文件开头顺序解压
+    """
+
+    _checkpoint_cache = OrderedDict()
+    _checkpoint_lock = Lock()
+
+    def __init__(self, file_path: str, member: ZipMember):
+        if member.is_dir or member.encrypted:
+            raise ValueError(f'不支持读取的文件: {member.name}')
+        self.file_path = file_path
+        self.member = member
+        self.size = member.file_size
+        self._fd = os.open(file_path, os.O_RDONLY)
+        self._block = b''
+        self._block_start = 0
+        self._stream = None
+        self._inflater = None
+        self._in_pos = 0
+        self._out_pos = 0
+        self._pending = b''
+        if member.compress_type == zipfile.ZIP_DEFLATED:
+            self._checkpoints = self._get_checkpoints(file_path, member)
+
+    def read(self, offset: int, length: int):
+        """
+        读取原始数据的字节区间
+
+        :param offset: 起始偏移
+        :param length: 读取长度
+        :return: 解压后的数据，超出文件末尾的部分被截断
+        """
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b''
+        if self.member.compress_type == zipfile.ZIP_STORED:
+            return os.pread(self._fd, end - offset, self.member.data_offset + offset)
+        parts = []
+        while offset < end:
+            if self._block_start <= offset < self._block_start + len(self._block):
+                part = self._block[offset - self._block_start : end - self._block_start]
+                parts.append(part)
+                offset += len(part)
+                continue
+            self._seek(offset)
+            if not self._decode_block():
+                raise zipfile.BadZipFile(f'文件数据不完整: {self.member.name}')
+
+        return b''.join(parts)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._archive.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @classmethod
+    def _get_checkpoints(cls, file_path: str, member: ZipMember):
+        key = (file_path, member.header_offset)
+        with cls._checkpoint_lock:
+            checkpoints = cls._checkpoint_cache.get(key)
+            if checkpoints is None:
+                checkpoints = cls._checkpoint_cache[key] = [(0, 0, zlib.decompressobj(-zlib.MAX_WBITS))]
+                while len(cls._checkpoint_cache) > ArchiveConstant.CHECKPOINT_CACHE_SIZE:
+                    cls._checkpoint_cache.popitem(last=False)
+            else:
+                cls._checkpoint_cache.move_to_end(key)
+
+        return checkpoints
+
+    def _seek(self, offset: int):
+        """
+        将解压位置移动到不超过offset的位置，当前位置比最近的保存点更近时继续使用当前位置
+        """
+        if self.member.compress_type != zipfile.ZIP_DEFLATED:
+            if self._stream is None or self._out_pos > offset:
+                self._open_stream()
+            return
+        with self._checkpoint_lock:
+            index = bisect_right(self._checkpoints, offset, key=lambda checkpoint: checkpoint[0]) - 1
+            out_pos, in_pos, inflater = self._checkpoints[index]
+            if self._inflater is None or self._out_pos > offset or out_pos > self._out_pos:
+                self._inflater = inflater.copy()
+                self._out_pos, self._in_pos, self._pending = out_pos, in_pos, b''
+
+    def _open_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._archive.close()
+        self._archive = zipfile.ZipFile(self.file_path)
+        self._stream = self._archive.open(self.member.name)
+        self._out_pos = 0
+
+    def _decode_block(self):
+        """
+        从当前解压位置解压一块数据到缓存
+
+        :return: 是否解压出数据
+        """
+        read_size = ArchiveConstant.READ_SIZE
+        if self.member.compress_type != zipfile.ZIP_DEFLATED:
+            block = self._stream.read(read_size)
+        else:
+            parts = []
+            produced = 0
+            while produced < read_size and not self._inflater.eof:
+                if not self._pending:
+                    remaining = self.member.compress_size - self._in_pos
+                    if remaining <= 0:
+                        break
+                    self._pending = os.pread(
+                        self._fd, min(read_size, remaining), self.member.data_offset + self._in_pos
+                    )
+                    if not self._pending:
+                        break
+                data = self._inflater.decompress(self._pending, read_size - produced)
+                self._in_pos += len(self._pending) - len(self._inflater.unconsumed_tail)
+                self._pending = self._inflater.unconsumed_tail
+                parts.append(data)
+                produced += len(data)
+            block = b''.join(parts)
+        self._block_start, self._block = self._out_pos, block
+        self._out_pos += len(block)
+        if self.member.compress_type == zipfile.ZIP_DEFLATED:
+            self._save_checkpoint()
+
+        return bool(block)
+
+    def _save_checkpoint(self):
+        with self._checkpoint_lock:
+            if self._out_pos >= self._checkpoints[-1][0] + ArchiveConstant.CHECKPOINT_INTERVAL:
+                self._checkpoints.append((self._out_pos, self._in_pos, self._inflater.copy()))